@@ -0,0 +1,131 @@
+# alert_stream.py - Live Budget Alerts over Server-Sent Events
+# Personal Finance Tracker - My Paldea
+# Course: IST 303 Fall 2025
+#
+# Open tabs subscribe to /budget/alerts/stream instead of polling
+# /budget/alerts. Budget and transaction writes already call
+# invalidate_progress(); that now also notifies the broker, which recomputes
+# the user's alerts once (only if someone is subscribed) and pushes them to
+# every subscriber of that user - but only when a category has crossed one
+# of the alert thresholds (80/90/100%), not on every write.
+#
+# The broker is in-process: subscribers see writes made by this process.
+# Each open stream holds a WSGI worker thread, so a stream ends after
+# ALERT_STREAM_MAX_SECONDS and the browser's EventSource reconnects (and is
+# sent the current alerts again), freeing the thread in between.
+
+import json
+import queue
+import threading
+
+DEFAULT_KEEPALIVE = 15.0  # seconds between SSE comment lines on a quiet stream
+DEFAULT_MAX_STREAM_SECONDS = 300.0  # a stream is closed after this long
+SUBSCRIBER_BACKLOG = 8    # alert snapshots buffered per slow subscriber
+
+def alert_signature(alerts):
+    """The threshold band of every alerting category; alerts only change when this does"""
+    return tuple(sorted((alert['category'], alert['level']) for alert in alerts))
+
+def format_event(alerts, event_id):
+    """Serialize an alert snapshot as one SSE event"""
+    return f"id: {event_id}\nevent: alerts\ndata: {json.dumps(alerts)}\n\n"
+
+class Subscription:
+    """One stream's queue of alert snapshots"""
+
+    def __init__(self, user_id):
+        self.user_id = user_id
+        self.queue = queue.Queue(maxsize=SUBSCRIBER_BACKLOG)
+
+    def put(self, item):
+        """Queue a snapshot, dropping the oldest if the subscriber has fallen behind"""
+        while True:
+            try:
+                self.queue.put_nowait(item)
+                return
+            except queue.Full:
+                try:
+                    self.queue.get_nowait()
+                except queue.Empty:
+                    pass
+
+    def get(self, timeout):
+        """Next (event_id, alerts), or None if nothing arrived within timeout"""
+        try:
+            return self.queue.get(timeout=timeout)
+        except queue.Empty:
+            return None
+
+class AlertBroker:
+    """Fans alert changes out to every subscriber of a user from one computation"""
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._subscribers = {}  # user_id -> set of Subscription
+        self._state = {}        # user_id -> (month, signature, event_id)
+        self.computations = 0
+        self.published = 0
+
+    def subscribe(self, user_id, month, alerts):
+        """Register a stream; `alerts` is what it was just sent"""
+        subscription = Subscription(user_id)
+        with self._lock:
+            self._subscribers.setdefault(user_id, set()).add(subscription)
+            state = self._state.get(user_id)
+            if state is None or state[0] != month:
+                self._state[user_id] = (month, alert_signature(alerts), 0)
+        return subscription
+
+    def unsubscribe(self, subscription):
+        with self._lock:
+            subscribers = self._subscribers.get(subscription.user_id, set())
+            subscribers.discard(subscription)
+            if not subscribers:
+                self._subscribers.pop(subscription.user_id, None)
+                self._state.pop(subscription.user_id, None)
+
+    def subscriber_count(self, user_id=None):
+        with self._lock:
+            if user_id is not None:
+                return len(self._subscribers.get(user_id, ()))
+            return sum(len(subscribers) for subscribers in self._subscribers.values())
+
+    def current_event_id(self, user_id):
+        with self._lock:
+            state = self._state.get(user_id)
+            return state[2] if state else 0
+
+    def notify(self, user_id, month, compute_alerts):
+        """
+        A write touched user_id/month. If anyone is watching that user-month,
+        recompute the alerts once and publish them if a threshold was crossed.
+        Returns True when an event was published.
+        """
+        with self._lock:
+            state = self._state.get(user_id)
+            if state is None or state[0] != month:
+                return False
+
+        alerts = compute_alerts()
+        signature = alert_signature(alerts)
+        with self._lock:
+            self.computations += 1
+            state = self._state.get(user_id)
+            if state is None or state[0] != month or state[1] == signature:
+                return False
+            event_id = state[2] + 1
+            self._state[user_id] = (month, signature, event_id)
+            subscribers = list(self._subscribers.get(user_id, ()))
+            self.published += 1
+
+        for subscription in subscribers:
+            subscription.put((event_id, alerts))
+        return True
+
+    def stats(self):
+        return {
+            'subscribers': self.subscriber_count(),
+            'users': len(self._subscribers),
+            'computations': self.computations,
+            'published': self.published,
+        }
@@ -1,10 +1,40 @@
 from flask import Flask
+from flask_login import LoginManager, UserMixin
 
-app = Flask(__name__)
+from budget_routes import budget_bp
 
-@app.route('/')
-def home():
-    return "Hello, Team Paldea!"
+DEFAULT_CONFIG = {
+    'SECRET_KEY': 'dev-secret-key-change-me',
+    'DATABASE': 'finance.db',
+}
+
+class User(UserMixin):
+    """Logged-in user (only the id is needed by the budget routes)"""
+    def __init__(self, user_id):
+        self.id = user_id
+
+def create_app(config=None):
+    """
+    Create the Flask app. Nothing here touches the database: the budget
+    schema is checked on the first request (once per process), and heavy
+    libraries are imported by the features that use them.
+    """
+    app = Flask(__name__)
+    app.config.update(DEFAULT_CONFIG)
+    app.config.update(config or {})
+
+    login_manager = LoginManager(app)
+    login_manager.user_loader(lambda user_id: User(int(user_id)))
+
+    app.register_blueprint(budget_bp)
+
+    @app.route('/')
+    def home():
+        return "Hello, Team Paldea!"
+
+    return app
+
+app = create_app()
 
 if __name__ == "__main__":
     app.run(debug=True)
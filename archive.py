@@ -0,0 +1,336 @@
+#!/usr/bin/env python3
+"""
+Transaction Archive
+Personal Finance Tracker - My Paldea
+Course: IST 303 Fall 2025
+
+Moves closed months out of the transactions table into an attached archive
+database (finance_archive.db next to finance.db), so transactions and its
+indexes only hold recent months however long the history gets.
+
+- rows dated before the cutoff month are moved a batch at a time: copied
+  into archive.transactions in one transaction, then deleted from
+  transactions in the next, so a crash in between leaves a copy in both
+  places and never loses a row
+- the rollup keeps every month: the delete transaction sets
+  archive_state.deleting, which the rollup delete trigger skips, so
+  progress, trends and alerts for archived months do not change
+- archive_state records the boundary; an interrupted run leaves
+  moving_before set and the next run finishes it first
+- transactions_source() is the query router: queries that start at or
+  after the boundary read transactions only, earlier ones read
+  transactions UNION ALL the archive
+- an archive written before categories were referenced by id (TEXT
+  category column) is read by mapping names to ids, and converted the next
+  time archive.py runs
+
+Usage:
+    python archive.py [--database finance.db] [--keep-months 3] [--batch-size 2000]
+    python archive.py --status [--database finance.db]
+"""
+
+import argparse
+import os
+import sqlite3
+import sys
+import threading
+import time
+from datetime import date
+
+ARCHIVE_SCHEMA = 'archive'
+DEFAULT_KEEP_MONTHS = 3
+DEFAULT_BATCH_SIZE = 2000
+
+# Pause between batches, as in migrations.BATCH_PAUSE, so app writers
+# waiting on the lock get in
+BATCH_PAUSE = 0.1
+
+COLUMNS = ('id', 'user_id', 'amount_cents', 'category_id', 'description', 'date', 'type', 'created_at')
+
+# Same columns as transactions; ids are kept, so copying a row twice is a no-op
+ARCHIVE_TABLE_SQL = '''
+    CREATE TABLE IF NOT EXISTS archive.transactions (
+        id INTEGER PRIMARY KEY,
+        user_id INTEGER NOT NULL,
+        amount_cents INTEGER NOT NULL,
+        category_id INTEGER NOT NULL,
+        description TEXT,
+        date DATE NOT NULL,
+        type TEXT NOT NULL CHECK (type IN ('income', 'expense')),
+        created_at TIMESTAMP
+    )
+'''
+
+ARCHIVE_INDEX_SQL = '''
+    CREATE INDEX IF NOT EXISTS archive.idx_archive_covering
+    ON transactions (user_id, type, category_id, date, amount_cents)
+'''
+
+# An archive still keyed by category name reads the same columns with the
+# name looked up in categories
+LEGACY_COLUMNS = tuple(
+    '(SELECT c.id FROM main.categories c WHERE c.name = a.category) AS category_id'
+    if column == 'category_id' else column for column in COLUMNS)
+
+# Both tables under the name `transactions`. Archive rows still in the hot
+# table (copied but not yet deleted) are only counted once.
+UNION_SOURCE_SQL = '''(
+        SELECT {columns} FROM main.transactions
+        UNION ALL
+        SELECT {archive_columns} FROM archive.transactions a
+        WHERE NOT EXISTS (SELECT 1 FROM main.transactions h WHERE h.id = a.id)
+    ) AS transactions'''
+UNION_SOURCE = UNION_SOURCE_SQL.format(columns=', '.join(COLUMNS), archive_columns=', '.join(COLUMNS))
+LEGACY_UNION_SOURCE = UNION_SOURCE_SQL.format(columns=', '.join(COLUMNS),
+                                              archive_columns=', '.join(LEGACY_COLUMNS))
+
+# Categories used only by archived rows, before the archive is converted
+LEGACY_CATEGORIES_SQL = '''
+    INSERT OR IGNORE INTO main.categories (name, type)
+    SELECT category, CASE WHEN MIN(type) = MAX(type) THEN MIN(type) ELSE 'both' END
+    FROM archive.transactions
+    GROUP BY category
+'''
+
+SELECT_BATCH_SQL = '''
+    INSERT INTO temp.archive_batch
+    SELECT id FROM main.transactions WHERE date < ? ORDER BY date LIMIT ?
+'''
+
+COPY_BATCH_SQL = f'''
+    INSERT OR IGNORE INTO archive.transactions ({', '.join(COLUMNS)})
+    SELECT {', '.join(COLUMNS)} FROM main.transactions
+    WHERE id IN (SELECT id FROM temp.archive_batch)
+'''
+
+# archive_state.deleting tells the rollup delete trigger to skip these rows
+DELETE_BATCH_SQL = '''
+    DELETE FROM main.transactions WHERE id IN (SELECT id FROM temp.archive_batch)
+'''
+
+def get_state(conn):
+    """Return (archive path, archived_before, moving_before); all None before the first run"""
+    try:
+        row = conn.execute('''
+            SELECT archive_path, archived_before, moving_before FROM archive_state WHERE id = 1
+        ''').fetchone()
+    except sqlite3.OperationalError:
+        return None, None, None  # schema older than add_archive_state
+    return tuple(row) if row else (None, None, None)
+
+def archive_boundary(conn):
+    """First month that is only in transactions, or None if nothing was archived"""
+    _, archived_before, moving_before = get_state(conn)
+    return max(filter(None, (archived_before, moving_before)), default=None)
+
+def database_path(conn, schema='main'):
+    """File behind an attached schema ('' for in-memory, None if not attached)"""
+    for _, name, path in conn.execute('PRAGMA database_list').fetchall():
+        if name == schema:
+            return path
+    return None
+
+def default_archive_path(database):
+    """finance.db -> finance_archive.db"""
+    base, ext = os.path.splitext(database)
+    return f'{base}_archive{ext or ".db"}'
+
+def resolve_archive_path(conn, archive_path):
+    """Stored archive paths are relative to the main database's directory"""
+    return os.path.join(os.path.dirname(database_path(conn) or ''), archive_path)
+
+def attach_archive(conn, archive_path=None, create=False):
+    """
+    Attach the archive database as `archive` (once per connection); with
+    create, also create or convert its table. Returns False when nothing
+    has been archived yet.
+    """
+    if database_path(conn, ARCHIVE_SCHEMA) is None:
+        if archive_path is None:
+            stored_path = get_state(conn)[0]
+            if stored_path is None:
+                return False
+            archive_path = resolve_archive_path(conn, stored_path)
+        if not create and not os.path.exists(archive_path):
+            raise FileNotFoundError(f'Archive database not found: {archive_path}')
+        conn.execute('ATTACH DATABASE ? AS archive', (archive_path,))
+
+    if create:
+        conn.execute(ARCHIVE_TABLE_SQL)
+        upgrade_archive(conn)
+        conn.execute(ARCHIVE_INDEX_SQL)
+        conn.commit()
+    return True
+
+def archive_columns(conn):
+    """Column names of archive.transactions"""
+    return [row[1] for row in conn.execute(f'PRAGMA {ARCHIVE_SCHEMA}.table_info(transactions)')]
+
+def upgrade_archive(conn):
+    """Convert an archive keyed by category name to category ids (no commit)"""
+    if 'category' not in archive_columns(conn):
+        return False
+    conn.execute(LEGACY_CATEGORIES_SQL)
+    conn.execute(ARCHIVE_TABLE_SQL.replace('archive.transactions', 'archive.transactions_new', 1))
+    conn.execute(f'''
+        INSERT INTO archive.transactions_new ({', '.join(COLUMNS)})
+        SELECT {', '.join(LEGACY_COLUMNS)} FROM archive.transactions a
+    ''')
+    conn.execute('DROP TABLE archive.transactions')
+    conn.execute('ALTER TABLE archive.transactions_new RENAME TO transactions')
+    conn.execute(ARCHIVE_INDEX_SQL)
+    return True
+
+def transactions_source(conn, first_month=None):
+    """
+    FROM-clause source for transactions dated first_month onwards (None =
+    all history): `transactions` unless the range reaches into the archive.
+    """
+    boundary = archive_boundary(conn)
+    if boundary is None or (first_month is not None and first_month >= boundary):
+        return 'transactions'
+    attach_archive(conn)
+    if 'category' in archive_columns(conn):
+        return LEGACY_UNION_SOURCE
+    return UNION_SOURCE
+
+def cutoff_month(today, keep_months=DEFAULT_KEEP_MONTHS):
+    """First month kept in transactions: the current month plus keep_months closed ones"""
+    index = today.year * 12 + today.month - 1 - keep_months
+    return f'{index // 12:04d}-{index % 12 + 1:02d}'
+
+def _in_transaction(conn, work):
+    """Run work() inside BEGIN IMMEDIATE ... COMMIT"""
+    conn.execute('BEGIN IMMEDIATE')
+    try:
+        result = work()
+        conn.commit()
+    except Exception:
+        conn.rollback()
+        raise
+    return result
+
+def archive_batches(conn, before_month, batch_size=DEFAULT_BATCH_SIZE):
+    """
+    Move transactions dated before before_month into the attached archive,
+    oldest first; yields the number of rows moved by each batch.
+    """
+    conn.execute('CREATE TEMP TABLE IF NOT EXISTS archive_batch (id INTEGER PRIMARY KEY)')
+    cutoff_date = f'{before_month}-01'
+
+    def copy():
+        conn.execute('DELETE FROM temp.archive_batch')
+        conn.execute(SELECT_BATCH_SQL, (cutoff_date, batch_size))
+        conn.execute(COPY_BATCH_SQL)
+        return conn.execute('SELECT COUNT(*) FROM temp.archive_batch').fetchone()[0]
+
+    def delete():
+        conn.execute('UPDATE archive_state SET deleting = 1 WHERE id = 1')
+        conn.execute(DELETE_BATCH_SQL)
+        conn.execute('UPDATE archive_state SET deleting = 0 WHERE id = 1')
+
+    while True:
+        moved = _in_transaction(conn, copy)
+        if not moved:
+            return
+        _in_transaction(conn, delete)
+        yield moved
+
+def run_archive(conn, archive_path=None, keep_months=DEFAULT_KEEP_MONTHS,
+                batch_size=DEFAULT_BATCH_SIZE, today=None, report=print):
+    """Archive every month before the cutoff (finishing an interrupted run first); return rows moved"""
+    report = report or (lambda message: None)
+    if conn.in_transaction:
+        conn.commit()
+
+    stored_path, archived_before, moving_before = get_state(conn)
+    main_path = database_path(conn)
+    if archive_path is not None:
+        archive_path = os.path.abspath(archive_path)
+        if stored_path is not None and archive_path != os.path.abspath(resolve_archive_path(conn, stored_path)):
+            raise ValueError(f'Transactions are already archived in {stored_path}')
+    elif stored_path is not None:
+        archive_path = resolve_archive_path(conn, stored_path)
+    else:
+        archive_path = default_archive_path(main_path)
+    attach_archive(conn, archive_path, create=True)
+
+    target = max(filter(None, (cutoff_month(today or date.today(), keep_months),
+                               archived_before, moving_before)))
+    with conn:
+        conn.execute('''
+            UPDATE archive_state
+            SET archive_path = ?, moving_before = ?, updated_at = CURRENT_TIMESTAMP
+            WHERE id = 1
+        ''', (os.path.relpath(archive_path, os.path.dirname(main_path)), target))
+
+    moved = 0
+    batch_start = time.perf_counter()
+    for rows in archive_batches(conn, target, batch_size):
+        moved += rows
+        report(f"   ... {moved:,} rows archived")
+        time.sleep(min(BATCH_PAUSE, time.perf_counter() - batch_start))
+        batch_start = time.perf_counter()
+
+    with conn:
+        conn.execute('''
+            UPDATE archive_state
+            SET archived_before = ?, moving_before = NULL, updated_at = CURRENT_TIMESTAMP
+            WHERE id = 1
+        ''', (target,))
+    return moved
+
+def start_archive_job(database, **options):
+    """Run run_archive on its own connection in a daemon thread and return the thread"""
+    def job():
+        conn = sqlite3.connect(database, timeout=5.0)
+        try:
+            run_archive(conn, report=None, **options)
+        finally:
+            conn.close()
+
+    thread = threading.Thread(target=job, name='transaction-archive', daemon=True)
+    thread.start()
+    return thread
+
+def main(argv=None):
+    """Command-line entry point"""
+    parser = argparse.ArgumentParser(description='Move closed months of transactions to the archive database')
+    parser.add_argument('--database', default='finance.db')
+    parser.add_argument('--archive', help='Archive database (default: <database>_archive.db)')
+    parser.add_argument('--keep-months', type=int, default=DEFAULT_KEEP_MONTHS,
+                        help='Closed months to keep in transactions besides the current one')
+    parser.add_argument('--batch-size', type=int, default=DEFAULT_BATCH_SIZE)
+    parser.add_argument('--status', action='store_true', help='Only report the archive boundary')
+    args = parser.parse_args(argv)
+
+    if not os.path.exists(args.database):
+        print(f"❌ Database not found: {args.database}")
+        return 1
+
+    conn = sqlite3.connect(args.database, timeout=5.0)
+    if args.status:
+        stored_path, archived_before, moving_before = get_state(conn)
+        hot = conn.execute('SELECT COUNT(*) FROM transactions').fetchone()[0]
+        print(f"📊 {hot:,} transactions in {args.database}")
+        if stored_path is None:
+            print("ℹ️  Nothing archived yet")
+        else:
+            attach_archive(conn)
+            archived = conn.execute('SELECT COUNT(*) FROM archive.transactions').fetchone()[0]
+            print(f"📦 {archived:,} transactions before {archived_before or moving_before} in {stored_path}")
+            if moving_before:
+                print(f"⚠️  A move up to {moving_before} was interrupted; run again to finish it")
+        conn.close()
+        return 0
+
+    print(f"📦 Archiving months before {cutoff_month(date.today(), args.keep_months)}...")
+    start = time.perf_counter()
+    moved = run_archive(conn, args.archive, args.keep_months, args.batch_size)
+    elapsed = time.perf_counter() - start
+    conn.close()
+    print(f"✅ Archived {moved:,} transactions in {elapsed:.1f}s")
+    return 0
+
+if __name__ == '__main__':
+    sys.exit(main())
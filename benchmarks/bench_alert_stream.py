@@ -0,0 +1,133 @@
+#!/usr/bin/env python3
+"""
+Benchmark: polling /budget/alerts vs. the /budget/alerts/stream SSE feed
+Personal Finance Tracker - My Paldea
+
+Simulates one minute of dashboards: every user has TABS tabs open while
+WRITES random transactions are added (each write goes through
+invalidate_progress, as the routes do).
+
+- polling: every tab calls /budget/alerts every POLL_SECONDS
+- stream:  every tab holds /budget/alerts/stream; each write recomputes the
+           user's alerts once and pushes them only if a threshold is crossed
+
+Reports server time, SQL statements and messages sent for each approach.
+
+Run from the repository root:
+    python -m benchmarks.bench_alert_stream [--users 200] [--tabs 5] [--writes 600]
+"""
+
+import argparse
+import os
+import random
+import tempfile
+import time
+from datetime import datetime
+
+import db
+from benchmarks.common import create_bench_app
+from budget_routes import invalidate_progress
+from generate_data import generate_database, category_names
+
+POLL_SECONDS = 5
+SIMULATED_SECONDS = 60
+
+def random_writes(users, count, month, seed=303):
+    """(user_id, category, amount in cents) for `count` expense transactions this month"""
+    rng = random.Random(seed)
+    categories = category_names(10)
+    return [(rng.randint(1, users), rng.choice(categories), round(rng.uniform(5, 150) * 100))
+            for _ in range(count)]
+
+def apply_writes(app, writes, month):
+    """Insert each transaction and invalidate its user-month; return total ms"""
+    elapsed = 0.0
+    for user_id, category, amount_cents in writes:
+        with app.app_context():
+            conn = db.get_db_connection()
+            conn.execute('''
+                INSERT INTO transactions (user_id, amount_cents, category_id, date, type)
+                VALUES (?, ?, (SELECT id FROM categories WHERE name = ?), ?, 'expense')
+            ''', (user_id, amount_cents, category, month + '-15'))
+            conn.commit()
+            start = time.perf_counter()
+            invalidate_progress(user_id, month)
+            elapsed += time.perf_counter() - start
+    return elapsed * 1000
+
+def sql_count(response):
+    return int(response.headers.get('X-DB-Queries', 0))
+
+def run_polling(database, args, writes, month):
+    app = create_bench_app(database)
+    client = app.test_client()
+    polls_per_write = args.users * args.tabs * (SIMULATED_SECONDS // POLL_SECONDS) // len(writes)
+
+    rng = random.Random(args.users)
+    served_ms, statements, messages = 0.0, 0, 0
+    for write in writes:
+        for _ in range(polls_per_write):
+            user_id = rng.randint(1, args.users)
+            begin = time.perf_counter()
+            response = client.get('/budget/alerts', headers={'X-Bench-User': str(user_id)})
+            served_ms += (time.perf_counter() - begin) * 1000
+            statements += sql_count(response)
+            messages += 1
+        served_ms += apply_writes(app, [write], month)
+    return served_ms, statements, messages
+
+def run_stream(database, args, writes, month):
+    app = create_bench_app(database)
+    client = app.test_client()
+    broker = app.extensions['budget_alert_broker']
+
+    served_ms, statements, streams = 0.0, 0, []
+    for user_id in range(1, args.users + 1):
+        for _ in range(args.tabs):
+            begin = time.perf_counter()
+            response = client.get('/budget/alerts/stream', headers={'X-Bench-User': str(user_id)},
+                                  buffered=False)
+            served_ms += (time.perf_counter() - begin) * 1000
+            statements += sql_count(response)
+            streams.append(response)
+
+    write_ms = apply_writes(app, writes, month)
+    stats = broker.stats()
+    for response in streams:
+        response.close()
+    # Each recomputation is one progress query
+    return served_ms + write_ms, statements + stats['computations'], \
+        len(streams) + stats['published'] * args.tabs, stats
+
+def main():
+    parser = argparse.ArgumentParser(description='Benchmark alert polling vs. SSE')
+    parser.add_argument('--users', type=int, default=200)
+    parser.add_argument('--tabs', type=int, default=5)
+    parser.add_argument('--writes', type=int, default=600)
+    args = parser.parse_args()
+
+    month = datetime.now().strftime('%Y-%m')
+    writes = random_writes(args.users, args.writes, month)
+    results = {}
+    with tempfile.TemporaryDirectory() as tmp:
+        for kind, run in (('polling', run_polling), ('stream', run_stream)):
+            database = os.path.join(tmp, f'{kind}.db')
+            generate_database(database, users=args.users, categories=10, months=3,
+                              transactions=50000, report=lambda message: None)
+            db.close_all_pools()
+            results[kind] = run(database, args, writes, month)
+            db.close_all_pools()
+
+    stats = results['stream'][3]
+    print(f"{args.users} users x {args.tabs} tabs, {args.writes} writes, "
+          f"{SIMULATED_SECONDS}s simulated (polling every {POLL_SECONDS}s)\n")
+    print(f"{'approach':<10} | {'server ms':>10} | {'SQL statements':>14} | {'messages sent':>13}")
+    print("-" * 56)
+    for kind in ('polling', 'stream'):
+        served_ms, statements, messages = results[kind][:3]
+        print(f"{kind:<10} | {served_ms:>10.0f} | {statements:>14,} | {messages:>13,}")
+    print(f"\nstream: {stats['computations']} recomputations for {args.writes} writes, "
+          f"{stats['published']} threshold crossings pushed to {args.tabs} tabs each")
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,128 @@
+#!/usr/bin/env python3
+"""
+Benchmark: one transactions table vs. hot table + archive
+Personal Finance Tracker - My Paldea
+
+Builds a generated database with two years of history, copies it, and
+archives every month but the last four in the copy (archive.py). Then
+compares the two for:
+- current-month spend-to-date lookups (budget_analytics.SPEND_TO_DATE_SQL)
+- single-row inserts into the current month
+- a historical month, which the archived copy reads through the router
+- pages used by transactions and its indexes (dbstat)
+
+The archive run itself is timed with a writer thread inserting alongside
+it, which records its longest wait for the write lock.
+
+Run from the repository root:
+    python -m benchmarks.bench_archive [--users 2000] [--transactions 1000000]
+"""
+
+import argparse
+import os
+import random
+import shutil
+import sqlite3
+import tempfile
+from datetime import date
+
+import db
+from archive import run_archive, transactions_source
+from benchmarks.bench_migrations import with_writer
+from benchmarks.common import percentiles, time_call
+from budget_analytics import SPEND_TO_DATE_SQL
+from budget_engine import month_bounds
+from generate_data import generate_database, recent_months
+from rollups import verify_rollup
+
+MONTHS = 24
+KEEP_MONTHS = 3
+LOOKUPS = 2000
+INSERTS = 2000
+
+def hot_bytes(conn):
+    """Bytes of the main database's transactions table and its indexes"""
+    return conn.execute('''
+        SELECT SUM(pgsize) FROM dbstat
+        WHERE name = 'transactions' OR name IN (
+            SELECT name FROM sqlite_master WHERE type = 'index' AND tbl_name = 'transactions')
+    ''').fetchone()[0]
+
+def measure(database, users, current, historical):
+    """p50 ms for the lookup and insert workloads, plus hot table size"""
+    conn = sqlite3.connect(database)
+    rng = random.Random(1)
+
+    def lookups(month):
+        start, end = month_bounds(month)
+        sql = SPEND_TO_DATE_SQL.format(source=transactions_source(conn, month))
+        for _ in range(LOOKUPS):
+            conn.execute(sql, (rng.randrange(1, users + 1), start, end)).fetchall()
+
+    def inserts():
+        for i in range(INSERTS):
+            conn.execute('''
+                INSERT INTO transactions (user_id, amount_cents, category_id, date, type)
+                VALUES (?, 1250, 1, ?, 'expense')
+            ''', (rng.randrange(1, users + 1), f'{current}-{i % 28 + 1:02d}'))
+        conn.rollback()
+
+    results = {
+        f'{LOOKUPS} current-month lookups': percentiles(time_call(lambda: lookups(current), 5))['p50'],
+        f'{LOOKUPS} historical lookups': percentiles(time_call(lambda: lookups(historical), 5))['p50'],
+        f'{INSERTS} current-month inserts': percentiles(time_call(inserts, 5))['p50'],
+    }
+    size = hot_bytes(conn)
+    conn.close()
+    return results, size
+
+def main():
+    parser = argparse.ArgumentParser(description='Benchmark archiving closed months of transactions')
+    parser.add_argument('--users', type=int, default=2000)
+    parser.add_argument('--transactions', type=int, default=1000000)
+    args = parser.parse_args()
+
+    months = recent_months(MONTHS)
+    current, historical = months[-1], months[2]
+
+    with tempfile.TemporaryDirectory() as tmp:
+        single = os.path.join(tmp, 'single.db')
+        archived = os.path.join(tmp, 'archived.db')
+        generate_database(single, users=args.users, categories=10, months=MONTHS,
+                          transactions=args.transactions, report=lambda message: None)
+        db.close_all_pools()
+        conn = sqlite3.connect(single)
+        conn.execute('PRAGMA journal_mode = WAL')
+        conn.execute('VACUUM')
+        conn.close()
+        shutil.copy(single, archived)
+
+        moved = []
+
+        def archive_run():
+            conn = sqlite3.connect(archived, timeout=600)
+            moved.append(run_archive(conn, keep_months=KEEP_MONTHS, today=date.today(), report=None))
+            conn.close()
+
+        seconds, longest_wait = with_writer(archived, archive_run)
+
+        conn = sqlite3.connect(archived)
+        drift = len(verify_rollup(conn))
+        conn.execute('VACUUM')
+        conn.close()
+
+        before, single_size = measure(single, args.users, current, historical)
+        after, archived_size = measure(archived, args.users, current, historical)
+
+    print(f"{args.transactions:,} transactions over {MONTHS} months, {args.users:,} users; "
+          f"archive keeps {KEEP_MONTHS} closed months + the current one hot\n")
+    print(f"Archived {moved[0]:,} rows in {seconds:.1f}s ({moved[0] / seconds:,.0f} rows/s); "
+          f"longest writer wait {longest_wait * 1000:.1f} ms; rollup drift {drift} rows\n")
+    print(f"{'workload':<30} | {'one table ms':>12} | {'archived ms':>11} | {'speedup':>7}")
+    print("-" * 70)
+    for name in before:
+        print(f"{name:<30} | {before[name]:>12.1f} | {after[name]:>11.1f} | {before[name] / after[name]:>6.2f}x")
+    print(f"\ntransactions + indexes: {single_size / 1e6:.1f} MB -> {archived_size / 1e6:.1f} MB (after VACUUM)")
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,156 @@
+#!/usr/bin/env python3
+"""
+Load test: async vs. sync budget read endpoints
+Personal Finance Tracker - My Paldea
+
+Starts the app twice against the same generated database:
+- sync:  gunicorn, one gthread worker with 8 threads, Flask routes
+         (/budget/progress, /budget/alerts, /budget/api/progress/<category>)
+- async: uvicorn, one worker, budget_async with 8 reader threads
+         (/budget/async/progress, /budget/async/alerts, ...)
+
+A bundled asyncio HTTP client then keeps N keep-alive connections busy,
+each polling the three dashboard endpoints as random users, and reports
+requests/second and latency at every concurrency level. The progress
+cache is off so every request reaches SQLite.
+
+Run from the repository root (needs gunicorn and uvicorn installed):
+    python -m benchmarks.bench_async [--seconds 5] [--concurrency 1 16 64 256]
+"""
+
+import argparse
+import asyncio
+import os
+import random
+import socket
+import subprocess
+import sys
+import tempfile
+import time
+
+import db
+from benchmarks.common import create_bench_app, percentiles
+from generate_data import generate_database
+
+USERS = 200
+SERVER_THREADS = 8
+SYNC_PATHS = ['/budget/progress', '/budget/alerts', '/budget/api/progress/Food']
+ASYNC_PATHS = ['/budget/async/progress', '/budget/async/alerts', '/budget/async/api/progress/Food']
+
+def bench_config():
+    return {'BUDGET_CACHE_TTL': 0, 'BUDGET_ASYNC_READERS': SERVER_THREADS}
+
+def sync_app():
+    """gunicorn entry point"""
+    return create_bench_app(os.environ['BENCH_DATABASE'], **bench_config())
+
+def async_app():
+    """uvicorn --factory entry point"""
+    from budget_async import create_asgi_app
+    return create_asgi_app(create_bench_app(os.environ['BENCH_DATABASE'], **bench_config()))
+
+def session_cookies(database):
+    """A signed session cookie for every user"""
+    app = create_bench_app(database)
+    serializer = app.session_interface.get_signing_serializer(app)
+    name = app.config['SESSION_COOKIE_NAME']
+    return [f"{name}={serializer.dumps({'_user_id': str(user_id)})}" for user_id in range(1, USERS + 1)]
+
+def free_port():
+    with socket.socket() as sock:
+        sock.bind(('127.0.0.1', 0))
+        return sock.getsockname()[1]
+
+def start_server(kind, database, port):
+    """Start gunicorn (sync) or uvicorn (async) and wait until it accepts connections"""
+    if kind == 'sync':
+        command = [sys.executable, '-m', 'gunicorn', '--worker-class', 'gthread', '--workers', '1',
+                   '--threads', str(SERVER_THREADS), '--bind', f'127.0.0.1:{port}',
+                   '--log-level', 'warning', 'benchmarks.bench_async:sync_app()']
+    else:
+        command = [sys.executable, '-m', 'uvicorn', '--factory', 'benchmarks.bench_async:async_app',
+                   '--port', str(port), '--log-level', 'warning', '--no-access-log']
+    env = dict(os.environ, BENCH_DATABASE=database)
+    process = subprocess.Popen(command, env=env)
+
+    deadline = time.time() + 30
+    while time.time() < deadline:
+        try:
+            socket.create_connection(('127.0.0.1', port), timeout=0.2).close()
+            return process
+        except OSError:
+            time.sleep(0.1)
+    process.kill()
+    raise RuntimeError(f'{kind} server did not start')
+
+async def poll(port, paths, cookies, stop_at, latencies, errors, rng):
+    """One dashboard: keep one connection busy until stop_at"""
+    reader, writer = await asyncio.open_connection('127.0.0.1', port)
+    try:
+        while time.perf_counter() < stop_at:
+            request = (f'GET {paths[rng.randrange(len(paths))]} HTTP/1.1\r\n'
+                       f'Host: bench\r\nCookie: {cookies[rng.randrange(len(cookies))]}\r\n\r\n')
+            start = time.perf_counter()
+            writer.write(request.encode())
+            status_line = await reader.readline()
+            length = 0
+            while True:
+                line = await reader.readline()
+                if line in (b'\r\n', b''):
+                    break
+                name, _, value = line.decode('latin-1').partition(':')
+                if name.lower() == 'content-length':
+                    length = int(value)
+            await reader.readexactly(length)
+            latencies.append((time.perf_counter() - start) * 1000)
+            if b' 200 ' not in status_line:
+                errors.append(status_line)
+    finally:
+        writer.close()
+
+async def load(port, paths, cookies, concurrency, seconds):
+    """Run `concurrency` dashboards for `seconds`; return (requests/s, latency stats, errors)"""
+    latencies, errors = [], []
+    stop_at = time.perf_counter() + seconds
+    await asyncio.gather(*(poll(port, paths, cookies, stop_at, latencies, errors, random.Random(n))
+                           for n in range(concurrency)))
+    return len(latencies) / seconds, percentiles(latencies), len(errors)
+
+def main():
+    parser = argparse.ArgumentParser(description='Load test async vs sync budget endpoints')
+    parser.add_argument('--seconds', type=float, default=5)
+    parser.add_argument('--concurrency', type=int, nargs='+', default=[1, 16, 64, 256])
+    args = parser.parse_args()
+
+    results = {}
+    with tempfile.TemporaryDirectory() as tmp:
+        database = os.path.join(tmp, 'finance.db')
+        generate_database(database, users=USERS, categories=10, months=12,
+                          transactions=200000, report=lambda message: None)
+        db.close_all_pools()
+        cookies = session_cookies(database)
+
+        for kind, paths in (('sync', SYNC_PATHS), ('async', ASYNC_PATHS)):
+            port = free_port()
+            server = start_server(kind, database, port)
+            try:
+                asyncio.run(load(port, paths, cookies, 4, 1))  # warm up
+                for concurrency in args.concurrency:
+                    results[kind, concurrency] = asyncio.run(
+                        load(port, paths, cookies, concurrency, args.seconds))
+            finally:
+                server.terminate()
+                server.wait()
+
+    print(f"{'concurrency':>11} | {'sync req/s':>10} | {'p50 ms':>7} | {'p99 ms':>7} | "
+          f"{'async req/s':>11} | {'p50 ms':>7} | {'p99 ms':>7} | {'errors':>6}")
+    print("-" * 90)
+    for concurrency in args.concurrency:
+        sync_rate, sync_stats, sync_errors = results['sync', concurrency]
+        async_rate, async_stats, async_errors = results['async', concurrency]
+        print(f"{concurrency:>11} | {sync_rate:>10.0f} | {sync_stats['p50']:>7.1f} | {sync_stats['p99']:>7.1f} | "
+              f"{async_rate:>11.0f} | {async_stats['p50']:>7.1f} | {async_stats['p99']:>7.1f} | "
+              f"{sync_errors + async_errors:>6}")
+
+if __name__ == '__main__':
+    main()
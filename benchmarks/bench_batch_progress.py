@@ -0,0 +1,60 @@
+#!/usr/bin/env python3
+"""
+Benchmark: batch progress API vs. one request per category
+Personal Finance Tracker - My Paldea
+
+A dashboard with 12 categories used to make 12 calls to
+/budget/api/progress/<category>. /budget/api/progress returns the whole
+category x month matrix in one call. The progress cache is disabled
+(BUDGET_CACHE_TTL=0) so every call recomputes.
+
+Run from the repository root:
+    python -m benchmarks.bench_batch_progress
+"""
+
+import os
+import tempfile
+
+import db
+from benchmarks.common import create_bench_app, recent_months, seed_user, percentiles, time_call
+
+CATEGORIES = [f'Category {i:02d}' for i in range(12)]
+REPEATS = 200
+
+def main():
+    with tempfile.TemporaryDirectory() as tmp:
+        database = os.path.join(tmp, 'finance.db')
+        app = create_bench_app(database, BUDGET_CACHE_TTL=0)
+        months = recent_months(12)
+        seed_user(database, 1, CATEGORIES, months)
+
+        client = app.test_client()
+        headers = {'X-Bench-User': '1'}
+
+        def single_calls():
+            for category in CATEGORIES:
+                assert client.get(f'/budget/api/progress/{category}', headers=headers).status_code == 200
+
+        def batch_current_month():
+            assert client.get('/budget/api/progress', headers=headers).status_code == 200
+
+        def batch_year():
+            url = f'/budget/api/progress?months={months[0]}..{months[-1]}'
+            assert client.get(url, headers=headers).status_code == 200
+
+        cases = [
+            (f'{len(CATEGORIES)} single-category calls (current month)', single_calls),
+            ('1 batch call (current month)', batch_current_month),
+            (f'1 batch call ({len(CATEGORIES)} categories x 12 months)', batch_year),
+        ]
+        print(f"{'case':<52} | {'p50 ms':>7} | {'p95 ms':>7}")
+        print("-" * 73)
+        for name, func in cases:
+            func()  # warm up
+            stats = percentiles(time_call(func, REPEATS))
+            print(f"{name:<52} | {stats['p50']:>7.2f} | {stats['p95']:>7.2f}")
+
+        db.close_all_pools()
+
+if __name__ == '__main__':
+    main()
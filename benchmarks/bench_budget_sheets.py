@@ -0,0 +1,124 @@
+#!/usr/bin/env python3
+"""
+Benchmark: bulk budget sheet vs. one form POST per budget
+Personal Finance Tracker - My Paldea
+
+Writes a 12-month x 30-category budget sheet (360 budgets):
+- through /budget/set, one POST (and one commit) per budget
+- through /budget/api/budgets, one POST and one transaction
+and copies January's 30 budgets to February..December:
+- with one /budget/set POST per copied budget
+- with one /budget/api/budgets/copy POST (a single INSERT ... SELECT)
+
+The same sheet is also written straight through SQL, comparing the old
+SELECT-then-UPDATE/INSERT per budget with the executemany upsert.
+
+Run from the repository root:
+    python -m benchmarks.bench_budget_sheets
+"""
+
+import os
+import sqlite3
+import tempfile
+
+import db
+from benchmarks.common import create_bench_app, percentiles, time_call
+from budget_sheets import upsert_budgets
+from categories import ensure_category_ids
+
+CATEGORIES = [f'Category {i:02d}' for i in range(30)]
+MONTHS = [f'2025-{month:02d}' for month in range(1, 13)]
+REPEATS = 20
+
+def legacy_set_budget(conn, user_id, category_id, month, amount_cents):
+    """The per-form path before upserts: SELECT, then UPDATE or INSERT, then commit"""
+    existing = conn.execute('''
+        SELECT id FROM budgets WHERE user_id = ? AND category_id = ? AND month = ?
+    ''', (user_id, category_id, month)).fetchone()
+    if existing:
+        conn.execute('UPDATE budgets SET amount_cents = ?, updated_at = CURRENT_TIMESTAMP WHERE id = ?',
+                     (amount_cents, existing[0]))
+    else:
+        conn.execute('INSERT INTO budgets (user_id, category_id, amount_cents, month) VALUES (?, ?, ?, ?)',
+                     (user_id, category_id, amount_cents, month))
+    conn.commit()
+
+def main():
+    with tempfile.TemporaryDirectory() as tmp:
+        database = os.path.join(tmp, 'finance.db')
+        app = create_bench_app(database, BUDGET_CACHE_TTL=0)
+        # No cookies: unfollowed redirects would pile flash messages into the session
+        client = app.test_client(use_cookies=False)
+        headers = {'X-Bench-User': '1'}
+        sheet = [{'category': category, 'month': month, 'amount': f'{100 + i}.50'}
+                 for month in MONTHS for i, category in enumerate(CATEGORIES)]
+
+        def form_posts():
+            for row in sheet:
+                client.post('/budget/set', data=row, headers=headers)
+
+        def sheet_post():
+            assert client.post('/budget/api/budgets', json={'budgets': sheet}, headers=headers).status_code == 200
+
+        def copy_by_form():
+            for month in MONTHS[1:]:
+                for i, category in enumerate(CATEGORIES):
+                    client.post('/budget/set', data={'category': category, 'month': month,
+                                                     'amount': f'{100 + i}.50'}, headers=headers)
+
+        def copy_post():
+            response = client.post('/budget/api/budgets/copy', headers=headers,
+                                   json={'from': MONTHS[0], 'to': f'{MONTHS[1]}..{MONTHS[-1]}', 'overwrite': True})
+            assert response.status_code == 200
+
+        conn = sqlite3.connect(database)
+        conn.execute('PRAGMA synchronous = NORMAL')
+        rows = [(category, month, 10050 + i * 100) for month in MONTHS for i, category in enumerate(CATEGORIES)]
+        with conn:
+            category_ids = ensure_category_ids(conn, CATEGORIES)
+
+        def legacy_sql():
+            for category, month, amount_cents in rows:
+                legacy_set_budget(conn, 2, category_ids[category], month, amount_cents)
+
+        def upsert_sql():
+            upsert_budgets(conn, 2, rows)
+
+        def reset_user_2():
+            with conn:
+                conn.execute('DELETE FROM budgets WHERE user_id = 2')
+
+        cases = [
+            (f'{len(sheet)} form POSTs (sheet)', form_posts),
+            ('1 sheet POST', sheet_post),
+            (f'{len(sheet) - len(CATEGORIES)} form POSTs (copy forward)', copy_by_form),
+            ('1 copy POST', copy_post),
+            (f'SQL: {len(rows)} SELECT + write + commit', legacy_sql),
+            (f'SQL: {len(rows)} upserts, one transaction', upsert_sql),
+        ]
+        results = {}
+        for name, func in cases:
+            func()  # warm up (and create the rows, so every timed run updates)
+            results[name] = percentiles(time_call(func, REPEATS))
+
+        # First write of a sheet (inserts rather than updates)
+        inserts = {}
+        for name, func in [('SQL: select + write', legacy_sql), ('SQL: upsert', upsert_sql)]:
+            samples = []
+            for _ in range(REPEATS):
+                reset_user_2()
+                samples.extend(time_call(func, 1))
+            inserts[name] = percentiles(samples)['p50']
+        conn.close()
+        db.close_all_pools()
+
+    print(f"{len(CATEGORIES)} categories x {len(MONTHS)} months, updates of existing budgets\n")
+    print(f"{'case':<40} | {'p50 ms':>8} | {'p95 ms':>8}")
+    print("-" * 62)
+    for name, stats in results.items():
+        print(f"{name:<40} | {stats['p50']:>8.2f} | {stats['p95']:>8.2f}")
+    print(f"\nFirst write (inserts): select + write {inserts['SQL: select + write']:.2f} ms, "
+          f"upsert {inserts['SQL: upsert']:.2f} ms (p50)")
+
+if __name__ == '__main__':
+    main()
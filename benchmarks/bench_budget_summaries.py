@@ -0,0 +1,148 @@
+#!/usr/bin/env python3
+"""
+Benchmark: nightly budget summary report over every user
+Personal Finance Tracker - My Paldea
+
+Builds a generated database and produces the summary of every user's
+budgets for one month four ways:
+- the old get_budget_summary (COUNT/SUM/MIN/MAX/AVG over budgets) called
+  once per user, opening a new connection per user
+- the same loop on a pooled connection
+- load_budget_summaries aggregating budgets for every user in one query
+- load_budget_summaries reading the budget_month_summary snapshot
+Then measures what the snapshot triggers add to budget writes (bulk sheet
+upserts) by repeating them with the triggers dropped.
+
+Run from the repository root:
+    python -m benchmarks.bench_budget_summaries [--users 100000]
+"""
+
+import argparse
+import os
+import random
+import sqlite3
+import tempfile
+import time
+
+import db
+from budget_sheets import upsert_budgets
+from budget_summaries import load_budget_summaries
+from generate_data import generate_database, recent_months
+from money import cents_to_float
+
+CATEGORIES = 10
+MONTHS = 2
+SHEETS = 500
+
+# get_budget_summary before the snapshot
+OLD_SUMMARY_SQL = '''
+    SELECT
+        COUNT(*) as total_categories,
+        SUM(amount_cents) as total_budget,
+        MIN(amount_cents) as min_budget,
+        MAX(amount_cents) as max_budget,
+        AVG(amount_cents) as avg_budget
+    FROM budgets
+    WHERE user_id = ? AND month = ?
+'''
+
+def old_summary(conn, user_id, month):
+    """The old per-user summary, converted to dollars like get_budget_summary did"""
+    row = conn.execute(OLD_SUMMARY_SQL, (user_id, month)).fetchone()
+    return [row[0]] + [None if value is None else cents_to_float(value) for value in row[1:]]
+
+def timed(func):
+    """(seconds, result) of one call"""
+    start = time.perf_counter()
+    result = func()
+    return time.perf_counter() - start, result
+
+def report_cases(database, users, month):
+    """{case: seconds} for one month's summaries of every user"""
+    pool = db.get_pool(database)
+
+    def pooled_loop():
+        for user_id in range(1, users + 1):
+            conn = pool.acquire()
+            try:
+                old_summary(conn, user_id, month)
+            finally:
+                pool.release(conn)
+
+    def connect_loop():
+        for user_id in range(1, users + 1):
+            conn = sqlite3.connect(database)
+            old_summary(conn, user_id, month)
+            conn.close()
+
+    conn = sqlite3.connect(database)
+    cases = {
+        'per-user query, new connection': connect_loop,
+        'per-user query, pooled connection': pooled_loop,
+        'batch query over budgets': lambda: load_budget_summaries(conn, [month], from_snapshot=False),
+        'batch read of the snapshot': lambda: load_budget_summaries(conn, [month]),
+    }
+    results = {}
+    for name, func in cases.items():
+        results[name], summaries = timed(func)
+        if summaries is not None:
+            assert len(summaries) == users
+    conn.close()
+    return results
+
+def sheet_upserts(database, users, months, seed=1):
+    """Seconds for SHEETS bulk upserts (one user's full sheet each)"""
+    rng = random.Random(seed)
+    conn = sqlite3.connect(database)
+    names = [row[0] for row in conn.execute("SELECT name FROM categories WHERE type = 'expense' LIMIT ?",
+                                            (CATEGORIES,))]
+    ids = dict(conn.execute('SELECT name, id FROM categories'))
+
+    def upserts():
+        for _ in range(SHEETS):
+            rows = [(name, month, rng.randrange(100, 100000) * 100) for name in names for month in months]
+            upsert_budgets(conn, rng.randrange(1, users + 1), rows, ids)
+
+    seconds, _ = timed(upserts)
+    conn.close()
+    return seconds
+
+def main():
+    parser = argparse.ArgumentParser(description='Benchmark batch budget summaries')
+    parser.add_argument('--users', type=int, default=100000)
+    args = parser.parse_args()
+    months = recent_months(MONTHS)
+    month = months[-1]
+
+    with tempfile.TemporaryDirectory() as tmp:
+        database = os.path.join(tmp, 'summaries.db')
+        generate_database(database, users=args.users, categories=CATEGORIES, months=MONTHS,
+                          transactions=args.users, report=lambda message: None)
+        db.close_all_pools()
+
+        reports = report_cases(database, args.users, month)
+        db.close_all_pools()
+
+        writes = {'with triggers': sheet_upserts(database, args.users, months)}
+        conn = sqlite3.connect(database)
+        for trigger in ('insert', 'delete', 'update'):
+            conn.execute(f'DROP TRIGGER trg_budgets_summary_{trigger}')
+        conn.commit()
+        conn.close()
+        writes['without triggers'] = sheet_upserts(database, args.users, months)
+
+    print(f"{args.users:,} users x {CATEGORIES} categories x {MONTHS} months of budgets, "
+          f"summaries for {month}\n")
+    print(f"{'report over every user':<36} | {'seconds':>8} | {'users/s':>10}")
+    print("-" * 62)
+    for name, seconds in reports.items():
+        print(f"{name:<36} | {seconds:>8.2f} | {args.users / seconds:>10,.0f}")
+
+    print(f"\n{SHEETS} sheet upserts ({CATEGORIES * MONTHS} budgets each)")
+    print(f"{'':<36} | {'seconds':>8} | {'ms/sheet':>10}")
+    print("-" * 62)
+    for name, seconds in writes.items():
+        print(f"{name:<36} | {seconds:>8.2f} | {seconds * 1000 / SHEETS:>10.2f}")
+
+if __name__ == '__main__':
+    main()
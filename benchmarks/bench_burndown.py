@@ -0,0 +1,130 @@
+#!/usr/bin/env python3
+"""
+Benchmark: rendering many burndown charts in one process
+Personal Finance Tracker - My Paldea
+
+- renders --charts charts (each a different sprint CSV) with
+  make_burndown.make_chart and samples the process RSS every 100 charts
+- repeats make_chart on the unchanged inputs (content-hash skip)
+- renders --old-charts charts the way make_chart used to: pyplot's global
+  current figure, never closed
+- reads a large multi-sprint CSV in chunks, tracing the memory kept and
+  the peak (tracemalloc)
+
+Run from the repository root:
+    python -m benchmarks.bench_burndown [--charts 1000] [--old-charts 200] [--rows 1000000]
+"""
+
+import argparse
+import os
+import random
+import resource
+import tempfile
+import time
+import tracemalloc
+
+import make_burndown
+
+SAMPLE_EVERY = 100
+
+def rss_mb():
+    """Current resident set size in MB (peak RSS where /proc is unavailable)"""
+    try:
+        with open('/proc/self/statm') as f:
+            return int(f.read().split()[1]) * os.sysconf('SC_PAGE_SIZE') / 1e6
+    except OSError:
+        return resource.getrusage(resource.RUSAGE_SELF).ru_maxrss / 1e3
+
+def write_sprint_csv(path, rng, days=14):
+    """A one-sprint burndown CSV with a random slope"""
+    remaining = rng.randrange(20, 60)
+    with open(path, 'w') as f:
+        f.write('Day,Tasks Remaining\n')
+        for day in range(1, days + 1):
+            f.write(f'{day},{remaining}\n')
+            remaining = max(0, remaining - rng.randrange(0, 6))
+
+def write_large_csv(path, rows, sprints=20):
+    """A Sprint,Day,Tasks Remaining,Bugs Open CSV with `rows` rows"""
+    per_sprint = rows // sprints
+    with open(path, 'w') as f:
+        f.write('Sprint,Day,Tasks Remaining,Bugs Open\n')
+        for sprint in range(sprints):
+            f.writelines(f'S{sprint},{day},{per_sprint - day},{day % 7}\n' for day in range(per_sprint))
+
+def old_make_chart(csv_path, output):
+    """make_chart before the renderer: pyplot global state, figure never closed"""
+    import matplotlib.pyplot as plt
+    import pandas as pd
+
+    df = pd.read_csv(csv_path)
+    plt.plot(df['Day'], df['Tasks Remaining'], marker='o')
+    plt.title('Burndown Chart')
+    plt.xlabel('Day')
+    plt.ylabel('Tasks Remaining')
+    plt.savefig(output)
+
+def render_many(render, inputs, outputs):
+    """(seconds, [(charts done, RSS MB)]) for rendering every input"""
+    samples = [(0, rss_mb())]
+    start = time.perf_counter()
+    for done, (csv_path, output) in enumerate(zip(inputs, outputs), 1):
+        render(csv_path, output)
+        if done % SAMPLE_EVERY == 0:
+            samples.append((done, rss_mb()))
+    return time.perf_counter() - start, samples
+
+def print_samples(label, seconds, samples):
+    charts = samples[-1][0]
+    print(f"\n{label}: {charts:,} charts in {seconds:.1f}s ({charts / seconds:.1f} charts/s), "
+          f"RSS {samples[0][1]:.0f} -> {samples[-1][1]:.0f} MB")
+    print("  " + "  ".join(f"{done}:{mb:.0f}" for done, mb in samples))
+
+def main():
+    parser = argparse.ArgumentParser(description='Benchmark the burndown renderer')
+    parser.add_argument('--charts', type=int, default=1000)
+    parser.add_argument('--old-charts', type=int, default=200)
+    parser.add_argument('--rows', type=int, default=1000000)
+    args = parser.parse_args()
+    rng = random.Random(1)
+
+    with tempfile.TemporaryDirectory() as tmp:
+        inputs = [os.path.join(tmp, f'sprint{i}.csv') for i in range(args.charts)]
+        for path in inputs:
+            write_sprint_csv(path, rng)
+
+        # Warm up imports and font caches so the RSS samples show growth, not start-up
+        make_burndown.make_chart(inputs[0], os.path.join(tmp, 'warmup.png'))
+
+        outputs = [os.path.join(tmp, f'chart{i}.png') for i in range(args.charts)]
+        seconds, samples = render_many(make_burndown.make_chart, inputs, outputs)
+        print_samples('make_chart (Agg OO API, figure cleared)', seconds, samples)
+
+        start = time.perf_counter()
+        drawn = sum(make_burndown.make_chart(path, output) for path, output in zip(inputs, outputs))
+        skipped = time.perf_counter() - start
+        print(f"\nmake_chart again on unchanged inputs: {args.charts - drawn:,} skipped in "
+              f"{skipped * 1000:.0f} ms ({skipped * 1e6 / args.charts:.0f} µs/chart)")
+
+        old_outputs = [os.path.join(tmp, f'old{i}.png') for i in range(args.old_charts)]
+        seconds, samples = render_many(old_make_chart, inputs[:args.old_charts], old_outputs)
+        print_samples('old make_chart (pyplot, never closed)', seconds, samples)
+
+        large = os.path.join(tmp, 'large.csv')
+        write_large_csv(large, args.rows)
+        print(f"\nread_series on {args.rows:,} rows ({os.path.getsize(large) / 1e6:.0f} MB):")
+        for chunk_rows in (10000, 100000, 1000000):
+            start = time.perf_counter()
+            series = make_burndown.read_series(large, chunk_rows)
+            seconds = time.perf_counter() - start
+            # A second, traced read: tracemalloc slows pandas down several times
+            tracemalloc.start()
+            series = make_burndown.read_series(large, chunk_rows)
+            kept, peak = tracemalloc.get_traced_memory()
+            tracemalloc.stop()
+            points = sum(len(days) for days, _ in series.values())
+            print(f"  chunk_rows={chunk_rows:>9,}: {seconds:.2f}s, {len(series)} series, {points:,} points, "
+                  f"{kept / 1e6:.1f} MB kept, {peak / 1e6:.1f} MB peak")
+
+if __name__ == '__main__':
+    main()
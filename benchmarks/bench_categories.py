@@ -0,0 +1,165 @@
+#!/usr/bin/env python3
+"""
+Benchmark: category names vs. integer category ids
+Personal Finance Tracker - My Paldea
+
+Builds a generated database (categories referenced by id), copies it and
+rewrites the copy back to the old layout with TEXT category names in
+transactions, budgets and the rollup. Then compares:
+- pages used by each table and its indexes (dbstat, after VACUUM)
+- the progress query for random users (names joined from categories vs.
+  the old query keyed on the name)
+- loading the category list per request vs. reading the CategoryCache
+
+Run from the repository root:
+    python -m benchmarks.bench_categories [--users 2000] [--transactions 1000000]
+"""
+
+import argparse
+import os
+import random
+import shutil
+import sqlite3
+import tempfile
+
+import db
+from benchmarks.common import percentiles, time_call
+from budget_engine import PROGRESS_SQL
+from categories import CategoryCache, load_categories
+from generate_data import generate_database, recent_months
+
+CATEGORIES = 30
+MONTHS = 12
+LOOKUPS = 2000
+
+# The layout before normalize_category_ids, filled from the id layout
+TEXT_LAYOUT_SQL = '''
+    CREATE TABLE transactions_text (
+        id INTEGER PRIMARY KEY AUTOINCREMENT, user_id INTEGER NOT NULL, amount_cents INTEGER NOT NULL,
+        category TEXT NOT NULL, description TEXT, date DATE NOT NULL, type TEXT NOT NULL,
+        created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP);
+    INSERT INTO transactions_text
+    SELECT t.id, t.user_id, t.amount_cents, c.name, t.description, t.date, t.type, t.created_at
+    FROM transactions t JOIN categories c ON c.id = t.category_id;
+    DROP TABLE transactions;
+    ALTER TABLE transactions_text RENAME TO transactions;
+    CREATE INDEX idx_transactions_date ON transactions (date);
+    CREATE INDEX idx_transactions_covering ON transactions (user_id, type, category, date, amount_cents);
+
+    CREATE TABLE budgets_text (
+        id INTEGER PRIMARY KEY AUTOINCREMENT, user_id INTEGER NOT NULL, category TEXT NOT NULL,
+        amount_cents INTEGER NOT NULL, month TEXT NOT NULL,
+        created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP, updated_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
+        UNIQUE(user_id, category, month));
+    INSERT INTO budgets_text
+    SELECT b.id, b.user_id, c.name, b.amount_cents, b.month, b.created_at, b.updated_at
+    FROM budgets b JOIN categories c ON c.id = b.category_id;
+    DROP TABLE budgets;
+    ALTER TABLE budgets_text RENAME TO budgets;
+    CREATE INDEX idx_budget_user_month ON budgets (user_id, month);
+
+    CREATE TABLE rollup_text (
+        user_id INTEGER NOT NULL, month TEXT NOT NULL, category TEXT NOT NULL, type TEXT NOT NULL,
+        total_cents INTEGER NOT NULL DEFAULT 0, count INTEGER NOT NULL DEFAULT 0,
+        PRIMARY KEY (user_id, month, category, type));
+    INSERT INTO rollup_text
+    SELECT m.user_id, m.month, c.name, m.type, m.total_cents, m.count
+    FROM monthly_category_spend m JOIN categories c ON c.id = m.category_id;
+    DROP TABLE monthly_category_spend;
+    ALTER TABLE rollup_text RENAME TO monthly_category_spend;
+'''
+
+# PROGRESS_SQL as it was before category ids
+TEXT_PROGRESS_SQL = '''
+    SELECT
+        b.category,
+        b.amount_cents as budget_cents,
+        COALESCE(m.total_cents, 0) as spent_cents
+    FROM budgets b
+    LEFT JOIN monthly_category_spend m ON
+        m.user_id = b.user_id AND
+        m.month = b.month AND
+        m.category = b.category AND
+        m.type = 'expense'
+    WHERE b.user_id = ? AND b.month = ?
+    ORDER BY b.category
+'''
+
+TABLES = ('transactions', 'budgets', 'monthly_category_spend')
+
+def table_bytes(conn):
+    """{table: bytes of the table and its indexes}"""
+    return {table: conn.execute('''
+        SELECT SUM(pgsize) FROM dbstat
+        WHERE name IN (SELECT name FROM sqlite_master WHERE tbl_name = ?)
+    ''', (table,)).fetchone()[0] for table in TABLES}
+
+def progress_ms(database, sql, users, month):
+    """p50 ms for LOOKUPS progress queries for random users"""
+    conn = sqlite3.connect(database)
+    rng = random.Random(1)
+    query = sql.format(category_filter='')
+
+    def lookups():
+        for _ in range(LOOKUPS):
+            conn.execute(query, (rng.randrange(1, users + 1), month)).fetchall()
+
+    lookups()  # warm the page cache
+    result = percentiles(time_call(lookups, 5))['p50']
+    conn.close()
+    return result
+
+def main():
+    parser = argparse.ArgumentParser(description='Benchmark category names vs. category ids')
+    parser.add_argument('--users', type=int, default=2000)
+    parser.add_argument('--transactions', type=int, default=1000000)
+    args = parser.parse_args()
+    month = recent_months(MONTHS)[-1]
+
+    with tempfile.TemporaryDirectory() as tmp:
+        ids = os.path.join(tmp, 'ids.db')
+        names = os.path.join(tmp, 'names.db')
+        generate_database(ids, users=args.users, categories=CATEGORIES, months=MONTHS,
+                          transactions=args.transactions, report=lambda message: None)
+        db.close_all_pools()
+        shutil.copy(ids, names)
+
+        sizes = {}
+        for path in (ids, names):
+            conn = sqlite3.connect(path)
+            if path == names:
+                conn.executescript(TEXT_LAYOUT_SQL)
+            conn.execute('VACUUM')
+            sizes[path] = table_bytes(conn)
+            conn.close()
+
+        progress = {
+            'names': progress_ms(names, TEXT_PROGRESS_SQL, args.users, month),
+            'ids': progress_ms(ids, PROGRESS_SQL, args.users, month),
+        }
+
+        conn = sqlite3.connect(ids)
+        cache = CategoryCache()
+        lists = {
+            'names': percentiles(time_call(lambda: [load_categories(conn) for _ in range(LOOKUPS)], 5))['p50'],
+            'ids': percentiles(time_call(lambda: [cache.all(conn) for _ in range(LOOKUPS)], 5))['p50'],
+        }
+        conn.close()
+
+    print(f"{args.transactions:,} transactions, {args.users:,} users, {CATEGORIES} categories, "
+          f"{MONTHS} months\n")
+    print(f"{'object (with indexes)':<24} | {'names MB':>8} | {'ids MB':>8} | {'saved':>6}")
+    print("-" * 56)
+    for table in TABLES:
+        before, after = sizes[names][table], sizes[ids][table]
+        print(f"{table:<24} | {before / 1e6:>8.1f} | {after / 1e6:>8.1f} | {1 - after / before:>6.1%}")
+
+    print(f"\n{'workload':<36} | {'names ms':>8} | {'ids ms':>8} | {'speedup':>7}")
+    print("-" * 68)
+    for label, results in [(f'{LOOKUPS} progress queries', progress),
+                           (f'{LOOKUPS} category lists (query/cache)', lists)]:
+        print(f"{label:<36} | {results['names']:>8.1f} | {results['ids']:>8.1f} | "
+              f"{results['names'] / results['ids']:>6.2f}x")
+
+if __name__ == '__main__':
+    main()
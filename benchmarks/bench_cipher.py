@@ -0,0 +1,112 @@
+#!/usr/bin/env python3
+"""
+Benchmark: pe3 Caesar cipher throughput
+Personal Finance Tracker - My Paldea
+
+Encodes generated text with the old per-character pe3.encode (kept here
+as legacy_encode) and every path of the table-driven codec:
+- encode() on ASCII text, on text with accented Latin-1 letters and
+  on text with Cyrillic words
+- encode_bytes() and encode_array() on a bytes buffer
+- encode_file() on a text file, chunk by chunk
+checks every result against legacy_encode, and prints MB/s (best of
+--repeats).
+
+Run from the repository root:
+    python -m benchmarks.bench_cipher [--mb 16] [--repeats 3]
+"""
+
+import argparse
+import os
+import random
+import string
+import tempfile
+import time
+
+import pe3
+
+SHIFT = 7
+
+def legacy_encode(input_text, shift):
+    """pe3.encode before the translation tables: one function call per character"""
+    alphabet_list = list(string.ascii_lowercase)
+    encoded_chars = [pe3._shift_char_lower(c, shift) for c in input_text]
+    return (alphabet_list, ''.join(encoded_chars))
+
+def make_text(size, rng, extra=''):
+    """Pseudo-English text of about `size` characters"""
+    words = ['budget', 'Spending', 'the', 'MONTH', 'rent', 'food', 'a', 'Paldea', '42.50', 'over,', extra]
+    return ' '.join(rng.choice(words) for _ in range(size // 6))[:size]
+
+def best_of(func, repeats):
+    """Return (best seconds, last result)"""
+    best = float('inf')
+    for _ in range(repeats):
+        start = time.perf_counter()
+        result = func()
+        best = min(best, time.perf_counter() - start)
+    return best, result
+
+def main():
+    parser = argparse.ArgumentParser(description='Benchmark pe3 cipher throughput')
+    parser.add_argument('--mb', type=float, default=16, help='Characters to encode, in millions')
+    parser.add_argument('--repeats', type=int, default=3)
+    args = parser.parse_args()
+    size = int(args.mb * 1_000_000)
+    rng = random.Random(1)
+    ascii_text = make_text(size, rng)
+    accented_text = make_text(size, rng, extra='café Größe')
+    cyrillic_text = make_text(size, rng, extra='бюджет')
+    data = ascii_text.encode('ascii')
+
+    # The per-character version is hundreds of times slower, so it gets a 1/16 sample
+    sample = ascii_text[:size // 16]
+    seconds, (_, legacy) = best_of(lambda: legacy_encode(sample, SHIFT), args.repeats)
+    rows = [('legacy per-character encode()', len(sample), seconds)]
+    expected = legacy_encode(ascii_text, SHIFT)[1]
+    expected_accented = legacy_encode(accented_text, SHIFT)[1]
+
+    seconds, (_, encoded) = best_of(lambda: pe3.encode(ascii_text, SHIFT), args.repeats)
+    assert encoded == expected and expected.startswith(legacy)
+    rows.append(('encode(), ASCII text', size, seconds))
+
+    seconds, (_, encoded) = best_of(lambda: pe3.encode(accented_text, SHIFT), args.repeats)
+    assert encoded == expected_accented
+    rows.append(('encode(), Latin-1 letters', size, seconds))
+
+    seconds, (_, encoded) = best_of(lambda: pe3.encode(cyrillic_text, SHIFT), args.repeats)
+    assert encoded == legacy_encode(cyrillic_text, SHIFT)[1]
+    rows.append(('encode(), Cyrillic letters', size, seconds))
+
+    seconds, encoded = best_of(lambda: pe3.encode_bytes(data, SHIFT), args.repeats)
+    assert encoded == expected.encode('ascii')
+    rows.append(('encode_bytes()', size, seconds))
+
+    try:
+        import numpy as np
+        array = np.frombuffer(data, dtype=np.uint8)
+        seconds, encoded = best_of(lambda: pe3.encode_array(array, SHIFT), args.repeats)
+        assert encoded.tobytes() == expected.encode('ascii')
+        rows.append(('encode_array() (NumPy LUT)', size, seconds))
+    except ImportError:
+        print("⚠️  numpy not installed, skipping encode_array()")
+
+    with tempfile.TemporaryDirectory() as tmp:
+        src, dst = os.path.join(tmp, 'plain.txt'), os.path.join(tmp, 'cipher.txt')
+        with open(src, 'w', encoding='utf-8', newline='') as f:
+            f.write(accented_text)
+        seconds, _ = best_of(lambda: pe3.encode_file(src, dst, SHIFT), args.repeats)
+        with open(dst, encoding='utf-8', newline='') as f:
+            assert f.read() == expected_accented
+        rows.append(('encode_file(), 1M-char chunks', size, seconds))
+
+    print(f"{size / 1e6:.0f}M characters, shift {SHIFT}, best of {args.repeats}\n")
+    print(f"{'path':<32} | {'seconds':>8} | {'MB/s':>8} | {'speedup':>8}")
+    print("-" * 66)
+    base = rows[0][1] / rows[0][2]
+    for name, chars, seconds in rows:
+        print(f"{name:<32} | {seconds:>8.3f} | {chars / seconds / 1e6:>8.1f} | "
+              f"{chars / seconds / base:>7.0f}x")
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,113 @@
+#!/usr/bin/env python3
+"""
+Benchmark: cracking Caesar-shifted messages
+Personal Finance Tracker - My Paldea
+
+Encodes --messages short English messages (20-200 characters, random
+shifts) with pe3.encode, then:
+- cracks a sample the old way, 26 pe3.decode calls plus a Python
+  chi-squared per message, and extrapolates to the whole batch
+- cracks every message with crack_many on 1, 2, 4 ... workers (up to the
+  CPU count, or --workers), with and without decoding the plaintexts
+- cracks one --long-mb million-character text with crack()
+and prints messages/s and the share of shifts recovered.
+
+Run from the repository root:
+    python -m benchmarks.bench_cipher_crack [--messages 100000] [--workers 1 2 4] [--long-mb 64]
+"""
+
+import argparse
+import collections
+import os
+import random
+import time
+
+import pe3
+from cipher_crack import ENGLISH_FREQUENCIES, crack, crack_many
+
+NAIVE_SAMPLE = 2000
+
+CORPUS = '''
+Every month the household sets a budget for rent, food, transport and fun,
+and every evening somebody forgets to write down what they spent. By the
+third week the grocery line is over, the coffee habit has quietly doubled
+and the savings goal looks further away than it did on the first day. The
+tracker exists so that nobody has to guess: each purchase is entered once,
+the totals are added up for them, and a warning arrives while there is
+still time to change course. Good habits are boring, which is exactly why
+they work when the numbers are honest and the reports are easy to read.
+'''.split()
+
+def make_messages(count, rng):
+    """Return (ciphertexts, shifts, plaintexts) of random English snippets"""
+    plaintexts, shifts = [], []
+    for _ in range(count):
+        start = rng.randrange(len(CORPUS))
+        words = []
+        target = rng.randint(20, 200)
+        while sum(map(len, words)) + len(words) < target:
+            words.append(CORPUS[(start + len(words)) % len(CORPUS)])
+        plaintexts.append(' '.join(words))
+        shifts.append(rng.randrange(26))
+    return [pe3.encode(text, shift)[1] for text, shift in zip(plaintexts, shifts)], shifts, plaintexts
+
+def naive_crack(message):
+    """Decode all 26 shifts one by one and score each with Counter"""
+    best_shift, best_score = 0, None
+    for shift in range(26):
+        counts = collections.Counter(c for c in pe3.decode(message, shift) if 'a' <= c <= 'z')
+        total = sum(counts.values()) or 1
+        score = sum((counts[chr(97 + j)] - total * f) ** 2 / (total * f) for j, f in enumerate(ENGLISH_FREQUENCIES))
+        if best_score is None or score < best_score:
+            best_shift, best_score = shift, score
+    return best_shift
+
+def main():
+    parser = argparse.ArgumentParser(description='Benchmark Caesar cipher cracking')
+    parser.add_argument('--messages', type=int, default=100_000)
+    parser.add_argument('--workers', type=int, nargs='+')
+    parser.add_argument('--long-mb', type=float, default=64, help='Long text size, in millions of characters')
+    args = parser.parse_args()
+    cpus = os.cpu_count() or 1
+    worker_counts = args.workers or sorted({1, *[2 ** i for i in range(1, 6) if 2 ** i <= cpus], cpus})
+    rng = random.Random(1)
+    messages, shifts, plaintexts = make_messages(args.messages, rng)
+    rows = []
+
+    sample = messages[:NAIVE_SAMPLE]
+    start = time.perf_counter()
+    naive = [naive_crack(message) for message in sample]
+    seconds = (time.perf_counter() - start) * len(messages) / len(sample)
+    correct = sum(a == b for a, b in zip(naive, shifts)) / len(sample)
+    rows.append((f'26x pe3.decode loop (est. from {len(sample):,})', seconds, correct))
+
+    for workers in worker_counts:
+        for plaintext in (False, True):
+            start = time.perf_counter()
+            results = crack_many(messages, workers=workers, plaintext=plaintext)
+            seconds = time.perf_counter() - start
+            correct = sum(r['shift'] == shift for r, shift in zip(results, shifts)) / len(messages)
+            if plaintext:
+                assert all(r['plaintext'] == text.lower() for r, text, shift in zip(results, plaintexts, shifts)
+                           if r['shift'] == shift)
+            rows.append((f"crack_many, {workers} worker(s){', + plaintext' if plaintext else ''}",
+                         seconds, correct))
+
+    print(f"{len(messages):,} messages of 20-200 characters, {cpus} CPUs\n")
+    print(f"{'run':<44} | {'seconds':>8} | {'messages/s':>11} | {'correct':>7}")
+    print("-" * 80)
+    for name, seconds, correct in rows:
+        print(f"{name:<44} | {seconds:>8.2f} | {len(messages) / seconds:>11,.0f} | {correct:>7.1%}")
+
+    size = int(args.long_mb * 1_000_000)
+    long_text = pe3.encode((' '.join(CORPUS) + ' ') * (size // 600 + 1), 11)[1][:size]
+    print(f"\none {size / 1e6:.0f}M-character text:")
+    for workers in worker_counts:
+        start = time.perf_counter()
+        result = crack(long_text, workers=workers)
+        seconds = time.perf_counter() - start
+        assert result['shift'] == 11
+        print(f"  crack, {workers} worker(s): {seconds:.2f}s ({size / seconds / 1e6:,.0f} MB/s)")
+
+if __name__ == '__main__':
+    main()
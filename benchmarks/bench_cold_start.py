@@ -0,0 +1,92 @@
+#!/usr/bin/env python3
+"""
+Benchmark: worker cold start
+Personal Finance Tracker - My Paldea
+
+Starts fresh Python processes and measures:
+- how long `import app` takes (create_app runs at import time)
+- what importing pandas + matplotlib would add if they were still loaded
+  eagerly (make_burndown now imports them inside make_chart)
+- first- and second-request latency against a brand-new database (schema
+  created) and an up-to-date one (only PRAGMA user_version is checked)
+
+Run from the repository root:
+    python -m benchmarks.bench_cold_start [--runs 5]
+"""
+
+import argparse
+import json
+import os
+import statistics
+import subprocess
+import sys
+import tempfile
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+IMPORT_APP = '''
+import json, time
+start = time.perf_counter()
+import app, make_burndown
+print(json.dumps({'ms': (time.perf_counter() - start) * 1000}))
+'''
+
+IMPORT_HEAVY = '''
+import json, time
+start = time.perf_counter()
+import pandas, matplotlib.pyplot
+print(json.dumps({'ms': (time.perf_counter() - start) * 1000}))
+'''
+
+FIRST_REQUESTS = '''
+import json, sys, time
+from app import create_app
+app = create_app({'DATABASE': sys.argv[1], 'TESTING': True})
+client = app.test_client()
+with client.session_transaction() as session:
+    session['_user_id'] = '1'
+timings = []
+for _ in range(2):
+    start = time.perf_counter()
+    response = client.get('/budget/api/cache/stats')
+    timings.append(((time.perf_counter() - start) * 1000, int(response.headers['X-DB-Queries'])))
+print(json.dumps(timings))
+'''
+
+def run_python(code, *args):
+    """Run code in a new interpreter from the repo root and return its JSON output"""
+    output = subprocess.run([sys.executable, '-c', code, *args], cwd=ROOT, check=True,
+                            capture_output=True, text=True).stdout
+    return json.loads(output)
+
+def main():
+    parser = argparse.ArgumentParser(description='Benchmark import time and first-request latency')
+    parser.add_argument('--runs', type=int, default=5)
+    args = parser.parse_args()
+
+    import_app = statistics.median(run_python(IMPORT_APP)['ms'] for _ in range(args.runs))
+    try:
+        import_heavy = statistics.median(run_python(IMPORT_HEAVY)['ms'] for _ in range(args.runs))
+    except subprocess.CalledProcessError:
+        import_heavy = None
+
+    fresh, current = [], []
+    with tempfile.TemporaryDirectory() as tmp:
+        for run in range(args.runs):
+            database = os.path.join(tmp, f'cold{run}.db')
+            fresh.append(run_python(FIRST_REQUESTS, database))    # creates the schema
+            current.append(run_python(FIRST_REQUESTS, database))  # schema already current
+
+    print(f"import app + make_burndown:        {import_app:7.1f} ms")
+    if import_heavy is not None:
+        print(f"pandas + matplotlib (now deferred): {import_heavy:7.1f} ms")
+
+    print(f"\n{'database':<16} | {'1st request ms':>14} | {'queries':>7} | {'2nd request ms':>14} | {'queries':>7}")
+    print("-" * 70)
+    for name, runs in (('new', fresh), ('schema current', current)):
+        first = statistics.median(r[0][0] for r in runs)
+        second = statistics.median(r[1][0] for r in runs)
+        print(f"{name:<16} | {first:>14.2f} | {runs[0][0][1]:>7} | {second:>14.2f} | {runs[0][1][1]:>7}")
+
+if __name__ == '__main__':
+    main()
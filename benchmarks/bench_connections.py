@@ -0,0 +1,88 @@
+#!/usr/bin/env python3
+"""
+Benchmark: pooled connections vs. connect-per-request
+Personal Finance Tracker - My Paldea
+
+Simulates budget progress requests from several worker threads. Each
+"request" gets a connection, runs the progress query and gives the
+connection back, either by closing a fresh sqlite3 connection (the old
+get_db_connection) or by returning a pooled one (db.get_pool).
+
+Run from the repository root:
+    python -m benchmarks.bench_connections
+"""
+
+import os
+import sqlite3
+import tempfile
+import threading
+import time
+
+import db
+from budget_engine import get_progress
+from categories import ensure_category_ids
+from migrations import migrate
+
+MONTH = '2025-10'
+USERS = 50
+CATEGORIES = 12
+REQUESTS_PER_THREAD = 500
+THREAD_COUNTS = [1, 4, 8]
+
+def build_database(path):
+    """Create a database with budgets and spending for several users"""
+    conn = sqlite3.connect(path)
+    migrate(conn, report=None)
+    ids = ensure_category_ids(conn, [f'Category {i}' for i in range(CATEGORIES)])
+    conn.executemany('INSERT INTO budgets (user_id, category_id, amount_cents, month) VALUES (?, ?, 40000, ?)',
+                     [(user_id, ids[f'Category {i}'], MONTH)
+                      for user_id in range(1, USERS + 1) for i in range(CATEGORIES)])
+    conn.executemany('INSERT INTO transactions (user_id, category_id, amount_cents, date, type) VALUES (?, ?, 1250, ?, ?)',
+                     [(user_id, ids[f'Category {i}'], f'{MONTH}-{day:02d}', 'expense')
+                      for user_id in range(1, USERS + 1)
+                      for i in range(CATEGORIES)
+                      for day in range(1, 29)])
+    conn.commit()
+    conn.close()
+
+def connect_per_request(path):
+    """The old get_db_connection: a fresh connection every time"""
+    conn = sqlite3.connect(path)
+    conn.row_factory = sqlite3.Row
+    return conn
+
+def run(get_connection, threads):
+    """Return requests per second across all threads"""
+    def worker(offset):
+        for i in range(REQUESTS_PER_THREAD):
+            conn = get_connection()
+            get_progress(conn, (offset + i) % USERS + 1, MONTH)
+            conn.close()
+
+    workers = [threading.Thread(target=worker, args=(n * 7,)) for n in range(threads)]
+    start = time.perf_counter()
+    for thread in workers:
+        thread.start()
+    for thread in workers:
+        thread.join()
+    elapsed = time.perf_counter() - start
+    return threads * REQUESTS_PER_THREAD / elapsed
+
+def main():
+    with tempfile.TemporaryDirectory() as tmp:
+        path = os.path.join(tmp, 'finance.db')
+        build_database(path)
+        pool = db.get_pool(path)
+
+        print(f"{'threads':>8} | {'connect/request req/s':>22} | {'pooled req/s':>13} | {'speedup':>7}")
+        print("-" * 62)
+        for threads in THREAD_COUNTS:
+            fresh = run(lambda: connect_per_request(path), threads)
+            pooled = run(pool.acquire, threads)
+            print(f"{threads:>8} | {fresh:>22.0f} | {pooled:>13.0f} | {pooled / fresh:>6.2f}x")
+
+        print(f"\nPooled connections opened: {pool.opened}")
+        db.close_all_pools()
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,85 @@
+#!/usr/bin/env python3
+"""
+Benchmark: streaming bulk import vs. one INSERT per row
+Personal Finance Tracker - My Paldea
+
+Writes a synthetic bank export, then imports it with importer.import_file
+(executemany, one transaction per chunk) and with one execute() and
+commit per row (first 20,000 rows only). Peak memory is reported to show it stays flat as
+the file grows.
+
+Run from the repository root:
+    python -m benchmarks.bench_import [--rows 500000]
+"""
+
+import argparse
+import os
+import resource
+import sqlite3
+import tempfile
+import time
+
+import db
+from budget_routes import init_budget_tables
+from importer import import_file, read_records, validate_record, INSERT_SQL
+
+CATEGORIES = ['Food', 'Transportation', 'Entertainment', 'Shopping', 'Utilities', 'Healthcare']
+
+def write_export(path, rows):
+    """Stream a CSV export with `rows` rows to disk"""
+    with open(path, 'w') as f:
+        f.write('date,amount,category,type,description\n')
+        for i in range(rows):
+            f.write(f'2025-{i % 12 + 1:02d}-{i % 28 + 1:02d},{(i % 9000) / 100 + 1:.2f},'
+                    f'{CATEGORIES[i % len(CATEGORIES)]},expense,Card purchase {i}\n')
+
+def row_by_row(database, path, limit):
+    """One execute() and commit per row, as a per-transaction write path would do"""
+    conn = sqlite3.connect(database)
+    start = time.perf_counter()
+    with open(path, newline='') as stream:
+        for count, record in enumerate(read_records(stream, 'csv'), start=1):
+            conn.execute(INSERT_SQL, validate_record(record, 1))
+            conn.commit()
+            if count == limit:
+                break
+    elapsed = time.perf_counter() - start
+    conn.close()
+    return elapsed
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument('--rows', type=int, default=500000)
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as tmp:
+        export = os.path.join(tmp, 'export.csv')
+        write_export(export, args.rows)
+        print(f"📄 {args.rows:,} rows, {os.path.getsize(export) / 1e6:.1f} MB")
+
+        cwd = os.getcwd()
+        os.chdir(tmp)
+        try:
+            init_budget_tables()
+            # mmap off so RSS reflects the importer, not mapped database pages
+            pool = db.ConnectionPool('finance.db', dict(db.DEFAULT_PRAGMAS, mmap_size=0))
+            conn = pool.acquire()
+            result = import_file(conn, export, user_id=1, create_categories=True)
+            conn.close()
+            pool.close_all()
+            rss_mb = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss / 1024
+            print(f"✅ importer:   {result.imported:,} rows in {result.seconds:.2f}s "
+                  f"({result.rows_per_second:,.0f} rows/s), peak RSS {rss_mb:.0f} MB")
+
+            db.close_all_pools()
+            os.remove('finance.db')
+            init_budget_tables()
+            db.close_all_pools()
+            limit = min(args.rows, 20000)
+            elapsed = row_by_row('finance.db', export, limit)
+            print(f"🐢 row by row: {limit:,} rows in {elapsed:.2f}s ({limit / elapsed:,.0f} rows/s)")
+        finally:
+            os.chdir(cwd)
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,123 @@
+#!/usr/bin/env python3
+"""
+Benchmark: batched rollup migration vs. one big transaction
+Personal Finance Tracker - My Paldea
+
+Builds a generated database, drops the rollup, then adds it back two ways:
+- rebuild_rollup: one transaction over the whole transactions table
+- the rollup migration (normalize_category_ids): one short transaction per user batch
+
+While each runs, a writer thread keeps inserting transactions and records
+how long its longest wait for the write lock was.
+
+Run from the repository root:
+    python -m benchmarks.bench_migrations [--users 2000] [--transactions 1000000]
+"""
+
+import argparse
+import os
+import sqlite3
+import tempfile
+import threading
+import time
+
+import db
+from generate_data import generate_database
+from migrations import migrate, version_of, add_archive_state, BATCH_PAUSE
+from rollups import init_rollup_tables, rebuild_rollup, verify_rollup
+
+def drop_rollup(database):
+    """Remove the rollup and mark the database as needing the rollup migration"""
+    conn = sqlite3.connect(database)
+    conn.executescript('''
+        DROP TRIGGER IF EXISTS trg_transactions_rollup_insert;
+        DROP TRIGGER IF EXISTS trg_transactions_rollup_delete;
+        DROP TRIGGER IF EXISTS trg_transactions_rollup_update;
+        DROP TABLE IF EXISTS monthly_category_spend;
+    ''')
+    conn.execute(f'PRAGMA user_version = {version_of(add_archive_state)}')
+    conn.commit()
+    conn.close()
+
+def with_writer(database, func):
+    """Run func while another connection writes; return (func seconds, longest writer wait)"""
+    stop = threading.Event()
+    waits = []
+
+    def writer():
+        conn = sqlite3.connect(database, timeout=600)
+        while not stop.is_set():
+            start = time.perf_counter()
+            with conn:
+                conn.execute('''
+                    INSERT INTO transactions (user_id, amount_cents, category_id, date, type)
+                    VALUES (1, 100, 1, '2025-01-01', 'expense')
+                ''')
+            waits.append(time.perf_counter() - start)
+            time.sleep(0.005)
+        conn.close()
+
+    thread = threading.Thread(target=writer)
+    thread.start()
+    time.sleep(0.05)
+    start = time.perf_counter()
+    func()
+    elapsed = time.perf_counter() - start
+    stop.set()
+    thread.join()
+    return elapsed, max(waits)
+
+def main():
+    parser = argparse.ArgumentParser(description='Benchmark batched schema migrations')
+    parser.add_argument('--users', type=int, default=2000)
+    parser.add_argument('--transactions', type=int, default=1000000)
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as tmp:
+        database = os.path.join(tmp, 'finance.db')
+        generate_database(database, users=args.users, categories=10, months=12,
+                          transactions=args.transactions, report=lambda message: None)
+        db.close_all_pools()
+        conn = sqlite3.connect(database)
+        conn.execute('PRAGMA journal_mode = WAL')
+        conn.close()
+
+        def one_transaction():
+            conn = sqlite3.connect(database)
+            init_rollup_tables(conn, backfill=False)
+            conn.commit()
+            rebuild_rollup(conn)
+            conn.close()
+
+        batch_times = []
+
+        def batched():
+            conn = sqlite3.connect(database)
+            last = [time.perf_counter()]
+
+            def report(message):
+                now = time.perf_counter()
+                batch_times.append(now - last[0])
+                last[0] = now
+            migrate(conn, report=report)
+            conn.close()
+
+        drop_rollup(database)
+        single = with_writer(database, one_transaction)
+        drop_rollup(database)
+        batch = with_writer(database, batched)
+
+        conn = sqlite3.connect(database)
+        drift = len(verify_rollup(conn))
+        conn.close()
+
+    print(f"{args.transactions:,} transactions, {args.users:,} users\n")
+    print(f"{'rollup build':<24} | {'total s':>8} | {'longest writer wait ms':>22}")
+    print("-" * 61)
+    print(f"{'one transaction':<24} | {single[0]:>8.2f} | {single[1] * 1000:>22.1f}")
+    print(f"{'batched migration':<24} | {batch[0]:>8.2f} | {batch[1] * 1000:>22.1f}")
+    print(f"\nLongest time between batch commits (including the pause, at most {BATCH_PAUSE * 1000:.0f} ms): "
+          f"{max(batch_times) * 1000:.1f} ms; rollup drift after run: {drift} rows")
+
+if __name__ == '__main__':
+    main()
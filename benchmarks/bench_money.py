@@ -0,0 +1,141 @@
+#!/usr/bin/env python3
+"""
+Benchmark: REAL dollar amounts vs. INTEGER cents
+Personal Finance Tracker - My Paldea
+
+Builds a database in the old layout (REAL `amount` columns, dollar rollup),
+copies it and migrates the copy with store_amounts_in_cents, then compares:
+- SUM throughput: one full-table SUM, a GROUP BY user/month/category, and
+  many per-user month sums through the covering index
+- exactness: each SUM against the exact Decimal total
+- on-disk size of the transactions table and covering index (dbstat)
+
+Run from the repository root:
+    python -m benchmarks.bench_money [--users 1000] [--transactions 1000000]
+"""
+
+import argparse
+import os
+import random
+import shutil
+import sqlite3
+import tempfile
+import time
+from decimal import Decimal
+
+from benchmarks.common import percentiles, time_call
+from migrations import migrate, version_of, drop_duplicate_indexes, store_amounts_in_cents
+
+LEGACY_SCHEMA = '''
+    CREATE TABLE users (id INTEGER PRIMARY KEY AUTOINCREMENT, username TEXT UNIQUE NOT NULL,
+                        email TEXT UNIQUE, password_hash TEXT NOT NULL,
+                        created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP);
+    CREATE TABLE transactions (id INTEGER PRIMARY KEY AUTOINCREMENT, user_id INTEGER NOT NULL,
+                               amount DECIMAL(10, 2) NOT NULL, category TEXT NOT NULL, description TEXT,
+                               date DATE NOT NULL, type TEXT NOT NULL CHECK (type IN ('income', 'expense')),
+                               created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP);
+    CREATE TABLE budgets (id INTEGER PRIMARY KEY AUTOINCREMENT, user_id INTEGER NOT NULL,
+                          category TEXT NOT NULL, amount DECIMAL(10, 2) NOT NULL, month TEXT NOT NULL,
+                          created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
+                          updated_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
+                          UNIQUE(user_id, category, month));
+    CREATE INDEX idx_budget_user_month ON budgets (user_id, month);
+    CREATE INDEX idx_transactions_date ON transactions (date);
+    CREATE INDEX idx_transactions_covering ON transactions (user_id, type, category, date, amount);
+'''
+CATEGORIES = ['Food', 'Transportation', 'Entertainment', 'Shopping', 'Utilities',
+              'Healthcare', 'Education', 'Other']
+MONTHS = [f'2025-{month:02d}' for month in range(1, 13)]
+LOOKUPS = 2000
+
+def build_legacy(database, users, rows):
+    """Old layout with REAL amounts; returns the exact total as a Decimal"""
+    rng = random.Random(303)
+    amounts = [f'{rng.randrange(100, 12000) / 100:.2f}' for _ in range(rows)]
+    conn = sqlite3.connect(database)
+    conn.executescript(LEGACY_SCHEMA)
+    conn.execute(f'PRAGMA user_version = {version_of(drop_duplicate_indexes)}')
+    conn.executemany('''
+        INSERT INTO transactions (user_id, amount, category, date, type)
+        VALUES (?, ?, ?, ?, 'expense')
+    ''', ((rng.randrange(1, users + 1), float(amount), CATEGORIES[i % len(CATEGORIES)],
+           f'{MONTHS[i % len(MONTHS)]}-{i % 28 + 1:02d}') for i, amount in enumerate(amounts)))
+    conn.commit()
+    conn.execute('VACUUM')
+    conn.close()
+    return sum(Decimal(amount) for amount in amounts)
+
+def object_bytes(conn, name):
+    return conn.execute('SELECT SUM(pgsize) FROM dbstat WHERE name = ?', (name,)).fetchone()[0]
+
+def measure(database, column, users):
+    """Time the three SUM shapes; return ({name: ms}, full total, sizes)"""
+    conn = sqlite3.connect(database)
+    rng = random.Random(1)
+    full_sql = f"SELECT SUM({column}) FROM transactions WHERE type = 'expense'"
+    grouped_sql = f'''
+        SELECT user_id, substr(date, 1, 7), category, SUM({column})
+        FROM transactions GROUP BY user_id, substr(date, 1, 7), category
+    '''
+    lookup_sql = f'''
+        SELECT SUM({column}) FROM transactions
+        WHERE user_id = ? AND type = 'expense' AND category = ? AND date >= ? AND date < ?
+    '''
+
+    def lookups():
+        for _ in range(LOOKUPS):
+            month = rng.randrange(1, 12)
+            conn.execute(lookup_sql, (rng.randrange(1, users + 1), CATEGORIES[rng.randrange(len(CATEGORIES))],
+                                      f'2025-{month:02d}-01', f'2025-{month + 1:02d}-01')).fetchone()
+
+    total = conn.execute(full_sql).fetchone()[0]
+    timings = {
+        'full-table SUM': percentiles(time_call(lambda: conn.execute(full_sql).fetchone(), 5))['p50'],
+        'GROUP BY SUM': percentiles(time_call(lambda: conn.execute(grouped_sql).fetchall(), 3))['p50'],
+        f'{LOOKUPS} indexed SUMs': percentiles(time_call(lookups, 3))['p50'],
+    }
+    sizes = {name: object_bytes(conn, name) for name in ('transactions', 'idx_transactions_covering')}
+    conn.close()
+    return timings, total, sizes
+
+def main():
+    parser = argparse.ArgumentParser(description='Benchmark REAL dollars vs INTEGER cents')
+    parser.add_argument('--users', type=int, default=1000)
+    parser.add_argument('--transactions', type=int, default=1000000)
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as tmp:
+        legacy = os.path.join(tmp, 'legacy.db')
+        cents = os.path.join(tmp, 'cents.db')
+        exact = build_legacy(legacy, args.users, args.transactions)
+        shutil.copy(legacy, cents)
+
+        conn = sqlite3.connect(cents)
+        start = time.perf_counter()
+        migrate(conn, target=version_of(store_amounts_in_cents), report=None)
+        migrate_seconds = time.perf_counter() - start
+        conn.execute('VACUUM')
+        conn.close()
+
+        before, real_total, real_sizes = measure(legacy, 'amount', args.users)
+        after, cents_total, cents_sizes = measure(cents, 'amount_cents', args.users)
+
+    print(f"{args.transactions:,} transactions, {args.users:,} users "
+          f"(migration to cents took {migrate_seconds:.1f}s)\n")
+    print(f"{'query':<22} | {'REAL ms':>9} | {'cents ms':>9} | {'speedup':>7}")
+    print("-" * 57)
+    for name in before:
+        print(f"{name:<22} | {before[name]:>9.1f} | {after[name]:>9.1f} | {before[name] / after[name]:>6.2f}x")
+
+    print(f"\n{'object':<26} | {'REAL MB':>8} | {'cents MB':>8} | {'saved':>6}")
+    print("-" * 57)
+    for name in real_sizes:
+        saved = 1 - cents_sizes[name] / real_sizes[name]
+        print(f"{name:<26} | {real_sizes[name] / 1e6:>8.1f} | {cents_sizes[name] / 1e6:>8.1f} | {saved:>6.1%}")
+
+    print(f"\nExact total:      {exact}")
+    print(f"REAL SUM:         {real_total!r} (off by {Decimal(real_total) - exact:.2E})")
+    print(f"cents SUM / 100:  {Decimal(cents_total) / 100} (off by {Decimal(cents_total) / 100 - exact})")
+
+if __name__ == '__main__':
+    main()
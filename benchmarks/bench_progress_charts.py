@@ -0,0 +1,67 @@
+#!/usr/bin/env python3
+"""
+Benchmark: budget progress chart endpoint
+Personal Finance Tracker - My Paldea
+
+Seeds one user with --categories budgets and spending and times
+/budget/progress.png and .svg through the Flask test client:
+- render: chart cache disabled, every request draws the chart
+- cache hit: the chart is served from the in-memory chart cache
+- 304: the client sends the ETag it already has
+printing p50/p95 latency and body size for each.
+
+Run from the repository root:
+    python -m benchmarks.bench_progress_charts [--categories 12] [--requests 100]
+"""
+
+import argparse
+import os
+import tempfile
+
+import db
+from benchmarks.common import create_bench_app, percentiles, recent_months, seed_user, time_call
+
+def bench_format(cached_app, uncached_app, fmt, month, requests):
+    """Return {case: (stats, bytes)} for one image format"""
+    headers = {'X-Bench-User': '1'}
+    path = f'/budget/progress.{fmt}?month={month}'
+    first = cached_app.test_client().get(path, headers=headers)
+    assert first.status_code == 200
+    etag = first.headers['ETag']
+
+    def fetch(app, extra=None, status=200):
+        client = app.test_client()
+        def call():
+            assert client.get(path, headers={**headers, **(extra or {})}).status_code == status
+        return call
+
+    return {'render': (percentiles(time_call(fetch(uncached_app), requests)), len(first.data)),
+            'cache hit': (percentiles(time_call(fetch(cached_app), requests)), len(first.data)),
+            '304': (percentiles(time_call(fetch(cached_app, {'If-None-Match': etag}, 304), requests)), 0)}
+
+def main():
+    parser = argparse.ArgumentParser(description='Benchmark the progress chart endpoint')
+    parser.add_argument('--categories', type=int, default=12)
+    parser.add_argument('--requests', type=int, default=100)
+    args = parser.parse_args()
+    month = recent_months(1)[0]
+
+    with tempfile.TemporaryDirectory() as tmp:
+        database = os.path.join(tmp, 'charts.db')
+        cached_app = create_bench_app(database)
+        uncached_app = create_bench_app(database, BUDGET_CHART_CACHE_TTL=0)  # every request renders
+        seed_user(database, 1, [f'Category {i}' for i in range(args.categories)], [month])
+        results = {fmt: bench_format(cached_app, uncached_app, fmt, month, args.requests)
+                   for fmt in ('png', 'svg')}
+        db.close_all_pools()
+
+    print(f"{args.categories} categories, {args.requests} requests per case\n")
+    print(f"{'case':<16} | {'p50 ms':>8} | {'p95 ms':>8} | {'body KB':>8}")
+    print("-" * 50)
+    for fmt, cases in results.items():
+        for case in ('render', 'cache hit', '304'):
+            stats, size = cases[case]
+            print(f"{f'{fmt} {case}':<16} | {stats['p50']:>8.2f} | {stats['p95']:>8.2f} | {size / 1024:>8.1f}")
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,135 @@
+#!/usr/bin/env python3
+"""
+Benchmark: queries per progress page as the number of categories grows
+Personal Finance Tracker - My Paldea
+
+Compares the old per-category SUM loop from budget_progress with the
+shared progress engine (budget_engine.get_progress).
+
+Run from the repository root:
+    python -m benchmarks.bench_progress_queries
+"""
+
+import sqlite3
+import time
+
+from budget_engine import get_progress, month_bounds
+from categories import ensure_category_ids
+from migrations import migrate
+
+MONTH = '2025-10'
+CATEGORY_COUNTS = [5, 10, 20, 40, 80]
+TRANSACTIONS_PER_CATEGORY = 50
+REPEATS = 200
+
+def build_database(num_categories):
+    """Create an in-memory database with one user's budgets and spending"""
+    conn = sqlite3.connect(':memory:')
+    migrate(conn, report=None)
+    categories = list(ensure_category_ids(conn, [f'Category {i:03d}' for i in range(num_categories)]).values())
+    conn.executemany('INSERT INTO budgets (user_id, category_id, amount_cents, month) VALUES (1, ?, 50000, ?)',
+                     [(category, MONTH) for category in categories])
+    conn.executemany('INSERT INTO transactions (user_id, category_id, amount_cents, date, type) VALUES (1, ?, ?, ?, ?)',
+                     [(category, 999, f'{MONTH}-{day % 28 + 1:02d}', 'expense')
+                      for category in categories
+                      for day in range(TRANSACTIONS_PER_CATEGORY)])
+    conn.commit()
+    return conn
+
+def legacy_progress(conn, user_id, month):
+    """The original budget_progress loop: one SUM query per category"""
+    budgets = conn.execute('''
+        SELECT category_id, amount_cents FROM budgets
+        WHERE user_id = ? AND month = ?
+        ORDER BY category_id
+    ''', (user_id, month)).fetchall()
+    result = []
+    for category, amount in budgets:
+        spent = conn.execute('''
+            SELECT COALESCE(SUM(amount_cents), 0) as total
+            FROM transactions
+            WHERE user_id = ?
+            AND category_id = ?
+            AND strftime('%Y-%m', date) = ?
+            AND type = 'expense'
+        ''', (user_id, category, month)).fetchone()[0]
+        result.append((category, amount, spent))
+    return result
+
+def strftime_progress(conn, user_id, month):
+    """The engine's grouped query with the old strftime month filter"""
+    return conn.execute('''
+        SELECT b.category_id, b.amount_cents, COALESCE(SUM(t.amount_cents), 0)
+        FROM budgets b
+        LEFT JOIN transactions t ON
+            t.user_id = b.user_id AND
+            t.category_id = b.category_id AND
+            strftime('%Y-%m', t.date) = b.month AND
+            t.type = 'expense'
+        WHERE b.user_id = ? AND b.month = ?
+        GROUP BY b.category_id, b.amount_cents
+    ''', (user_id, month)).fetchall()
+
+def range_progress(conn, user_id, month):
+    """The grouped query re-summing transactions over a half-open date range"""
+    return conn.execute('''
+        SELECT b.category_id, b.amount_cents, COALESCE(SUM(t.amount_cents), 0)
+        FROM budgets b
+        LEFT JOIN transactions t ON
+            t.user_id = b.user_id AND
+            t.type = 'expense' AND
+            t.category_id = b.category_id AND
+            t.date >= ? AND t.date < ?
+        WHERE b.user_id = ? AND b.month = ?
+        GROUP BY b.category_id, b.amount_cents
+    ''', (*month_bounds(month), user_id, month)).fetchall()
+
+def add_history(conn, years):
+    """Add earlier months of spending so the month filter has rows to skip"""
+    categories = [row[0] for row in conn.execute('SELECT category_id FROM budgets')]
+    conn.executemany('INSERT INTO transactions (user_id, category_id, amount_cents, date, type) VALUES (1, ?, ?, ?, ?)',
+                     [(category, 999, f'{2025 - year}-{month:02d}-{day % 28 + 1:02d}', 'expense')
+                      for year in range(1, years + 1)
+                      for month in range(1, 13)
+                      for category in categories
+                      for day in range(TRANSACTIONS_PER_CATEGORY)])
+    conn.commit()
+
+def measure(conn, func):
+    """Return (queries per call, milliseconds per call)"""
+    statements = []
+    conn.set_trace_callback(statements.append)
+    func(conn, 1, MONTH)
+    conn.set_trace_callback(None)
+
+    start = time.perf_counter()
+    for _ in range(REPEATS):
+        func(conn, 1, MONTH)
+    elapsed_ms = (time.perf_counter() - start) * 1000 / REPEATS
+    return len(statements), elapsed_ms
+
+def main():
+    print(f"{'categories':>10} | {'legacy queries':>14} {'legacy ms':>10} | {'engine queries':>14} {'engine ms':>10}")
+    print("-" * 68)
+    for num_categories in CATEGORY_COUNTS:
+        conn = build_database(num_categories)
+        legacy_queries, legacy_ms = measure(conn, legacy_progress)
+        engine_queries, engine_ms = measure(conn, get_progress)
+        conn.close()
+        print(f"{num_categories:>10} | {legacy_queries:>14} {legacy_ms:>10.3f} | {engine_queries:>14} {engine_ms:>10.3f}")
+
+    print()
+    print("Month filter with 20 categories and growing history:")
+    print(f"{'years':>10} | {'strftime ms':>12} | {'date range ms':>14} | {'rollup ms':>10}")
+    print("-" * 57)
+    for years in [0, 1, 5]:
+        conn = build_database(20)
+        add_history(conn, years)
+        _, strftime_ms = measure(conn, strftime_progress)
+        _, range_ms = measure(conn, range_progress)
+        _, rollup_ms = measure(conn, get_progress)
+        conn.close()
+        print(f"{years:>10} | {strftime_ms:>12.3f} | {range_ms:>14.3f} | {rollup_ms:>10.3f}")
+
+if __name__ == '__main__':
+    main()
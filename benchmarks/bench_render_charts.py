@@ -0,0 +1,79 @@
+#!/usr/bin/env python3
+"""
+Benchmark: batch chart rendering on a process pool
+Personal Finance Tracker - My Paldea
+
+Builds a generated database and a manifest with one spending chart per
+user plus --burndowns burndown CSVs, then:
+- times one worker's warm-up (Matplotlib/pandas import and first chart)
+- renders the whole manifest with 1, 2, 4 ... workers (up to the CPU
+  count, or --workers), forcing every chart to be drawn
+- renders it again unchanged (every chart skipped by its input hash)
+and prints charts/s for each.
+
+Run from the repository root:
+    python -m benchmarks.bench_render_charts [--users 400] [--burndowns 200] [--workers 1 2 4]
+"""
+
+import argparse
+import os
+import random
+import sqlite3
+import tempfile
+import time
+
+import db
+from benchmarks.bench_burndown import write_sprint_csv
+from generate_data import generate_database, recent_months
+from render_charts import ChartWorker, render_all, spending_manifest
+
+MONTHS = 12
+
+def main():
+    parser = argparse.ArgumentParser(description='Benchmark batch chart rendering')
+    parser.add_argument('--users', type=int, default=400)
+    parser.add_argument('--burndowns', type=int, default=200)
+    parser.add_argument('--workers', type=int, nargs='+')
+    args = parser.parse_args()
+    cpus = os.cpu_count() or 1
+    worker_counts = args.workers or sorted({1, *[2 ** i for i in range(1, 6) if 2 ** i <= cpus], cpus})
+    months = recent_months(MONTHS)
+
+    with tempfile.TemporaryDirectory() as tmp:
+        database = os.path.join(tmp, 'charts.db')
+        generate_database(database, users=args.users, categories=10, months=MONTHS,
+                          transactions=args.users * 200, report=lambda message: None)
+        db.close_all_pools()
+
+        conn = sqlite3.connect(database)
+        jobs = spending_manifest(conn, months[0], months[-1], os.path.join(tmp, 'charts'))
+        conn.close()
+        rng = random.Random(1)
+        for i in range(args.burndowns):
+            csv_path = os.path.join(tmp, f'team{i}.csv')
+            write_sprint_csv(csv_path, rng)
+            jobs.append({'type': 'burndown', 'csv': csv_path, 'output': os.path.join(tmp, 'charts', f'team{i}.png'),
+                         'title': f'Team {i}'})
+
+        start = time.perf_counter()
+        ChartWorker(database).warm_up()
+        warm_up = time.perf_counter() - start
+
+        results = {workers: render_all(jobs, database, workers, force=True) for workers in worker_counts}
+        unchanged = render_all(jobs, database, worker_counts[-1])
+
+    print(f"{len(jobs):,} charts ({args.users:,} spending, {args.burndowns:,} burndown), {cpus} CPUs\n")
+    print(f"worker warm-up (imports + first charts): {warm_up * 1000:.0f} ms\n")
+    print(f"{'run':<28} | {'rendered':>8} | {'skipped':>7} | {'seconds':>7} | {'charts/s':>8} | {'speedup':>7}")
+    print("-" * 80)
+    base = results[worker_counts[0]]['seconds']
+    for workers, summary in results.items():
+        print(f"{f'{workers} worker(s), forced':<28} | {summary['rendered']:>8,} | {summary['skipped']:>7,} | "
+              f"{summary['seconds']:>7.1f} | {summary['charts_per_second']:>8.1f} | "
+              f"{base / summary['seconds']:>6.2f}x")
+    print(f"{f'{worker_counts[-1]} worker(s), unchanged':<28} | {unchanged['rendered']:>8,} | "
+          f"{unchanged['skipped']:>7,} | {unchanged['seconds']:>7.1f} | "
+          f"{len(jobs) / unchanged['seconds']:>8.1f} | {'':>7}")
+
+if __name__ == '__main__':
+    main()
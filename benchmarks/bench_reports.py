@@ -0,0 +1,89 @@
+#!/usr/bin/env python3
+"""
+Benchmark: month-end reports for every user
+Personal Finance Tracker - My Paldea
+
+Builds a generated database and writes one month's report for every user:
+- the way display_summary does it for one user, looped over all users
+  (get_progress + summarize_progress + build_alerts, one query per user)
+- reports.generate_report with 1, 2, 4 ... worker processes (up to the
+  CPU count, or --workers)
+and prints users/s (best of --repeats runs) and the speedup of each
+worker count over one worker.
+
+Run from the repository root:
+    python -m benchmarks.bench_reports [--users 50000] [--transactions 2000000] [--workers 1 2 4] [--repeats 3]
+"""
+
+import argparse
+import json
+import os
+import sqlite3
+import tempfile
+import time
+
+import db
+import reports
+from budget_engine import get_progress, summarize_progress, build_alerts
+from generate_data import generate_database, recent_months
+
+CATEGORIES = 10
+MONTHS = 2
+
+def per_user_loop(database, month, output):
+    """Seconds to write the JSONL report one get_progress query per user"""
+    start = time.perf_counter()
+    conn = sqlite3.connect(database)
+    users = [row[0] for row in conn.execute('SELECT DISTINCT user_id FROM budgets WHERE month = ? ORDER BY 1',
+                                            (month,))]
+    with open(output, 'w') as f:
+        for user_id in users:
+            progress_data = get_progress(conn, user_id, month)
+            f.write(json.dumps({'user_id': user_id, 'month': month, 'stats': summarize_progress(progress_data),
+                                'progress': progress_data, 'alerts': build_alerts(progress_data)}) + '\n')
+    conn.close()
+    return time.perf_counter() - start
+
+def main():
+    parser = argparse.ArgumentParser(description='Benchmark all-user month-end reports')
+    parser.add_argument('--users', type=int, default=50000)
+    parser.add_argument('--transactions', type=int, default=2000000)
+    parser.add_argument('--workers', type=int, nargs='+')
+    parser.add_argument('--repeats', type=int, default=3)
+    args = parser.parse_args()
+    cpus = os.cpu_count() or 1
+    worker_counts = args.workers or sorted({1, *[2 ** i for i in range(1, 6) if 2 ** i <= cpus], cpus})
+    month = recent_months(MONTHS)[-1]
+
+    with tempfile.TemporaryDirectory() as tmp:
+        database = os.path.join(tmp, 'reports.db')
+        generate_database(database, users=args.users, categories=CATEGORIES, months=MONTHS,
+                          transactions=args.transactions, report=lambda message: None)
+        db.close_all_pools()
+
+        loop = min(per_user_loop(database, month, os.path.join(tmp, 'loop.jsonl'))
+                   for _ in range(args.repeats))
+        results = {}
+        for workers in worker_counts:
+            for extension in ('jsonl', 'csv'):
+                samples = []
+                for _ in range(args.repeats):
+                    start = time.perf_counter()
+                    counts = reports.generate_report(database, month, os.path.join(tmp, f'report.{extension}'),
+                                                     workers=workers)
+                    samples.append(time.perf_counter() - start)
+                results[workers, extension] = min(samples)
+        db.close_all_pools()
+
+    print(f"{counts['users']:,} users x {CATEGORIES} categories, {args.transactions:,} transactions, "
+          f"report for {month} ({cpus} CPUs)\n")
+    print(f"{'writer':<28} | {'format':>6} | {'seconds':>8} | {'users/s':>9} | {'vs 1 worker':>11}")
+    print("-" * 74)
+    print(f"{'per-user loop':<28} | {'jsonl':>6} | {loop:>8.2f} | {counts['users'] / loop:>9,.0f} | "
+          f"{results[worker_counts[0], 'jsonl'] / loop:>10.2f}x")
+    for (workers, extension), seconds in results.items():
+        print(f"{f'generate_report, {workers} worker(s)':<28} | {extension:>6} | {seconds:>8.2f} | "
+              f"{counts['users'] / seconds:>9,.0f} | {results[worker_counts[0], extension] / seconds:>10.2f}x")
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,114 @@
+#!/usr/bin/env python3
+"""
+Benchmark suite: budget routes at production scale
+Personal Finance Tracker - My Paldea
+
+Drives budget_dashboard, budget_progress, budget_alerts,
+api_budget_progress and get_budget_summary through the Flask test client
+against a generated database, recording p50/p95/p99 latency and SQL
+statements per request. Save results with --json and compare runs to
+catch regressions.
+
+Run from the repository root:
+    python generate_data.py --database big.db --users 10000 --transactions 50000000
+    python -m benchmarks.bench_routes --database big.db --json bench_routes.json
+
+Without --database a small dataset is generated in a temp directory.
+"""
+
+import argparse
+import json
+import os
+import random
+import sqlite3
+import tempfile
+import threading
+
+import db
+from benchmarks.common import create_bench_app, percentiles, time_call
+from budget_routes import get_budget_summary
+from generate_data import generate_database
+
+_counter = threading.local()
+
+def count_statement(statement):
+    """sqlite3 trace callback: count statements run on this thread"""
+    _counter.statements = getattr(_counter, 'statements', 0) + 1
+
+def run_suite(database, requests, use_cache=False, seed=1):
+    """Return {case: stats} for every route"""
+    config = {} if use_cache else {'BUDGET_CACHE_TTL': 0}
+    app = create_bench_app(database, **config)
+    with app.app_context():
+        db.get_pool().on_connect.append(lambda conn: conn.set_trace_callback(count_statement))
+    db.get_pool(database).close_all()  # reopen connections with the trace hook
+
+    conn = sqlite3.connect(database)
+    users = conn.execute('SELECT MAX(user_id) FROM budgets').fetchone()[0] or 1
+    category = conn.execute('''
+        SELECT c.name FROM budgets b JOIN categories c ON c.id = b.category_id LIMIT 1
+    ''').fetchone()[0]
+    conn.close()
+
+    rng = random.Random(seed)
+    client = app.test_client()
+
+    def route(path):
+        def call():
+            headers = {'X-Bench-User': str(rng.randrange(1, users + 1))}
+            assert client.get(path, headers=headers).status_code == 200
+        return call
+
+    def summary():
+        with app.app_context():
+            get_budget_summary(rng.randrange(1, users + 1))
+
+    cases = {
+        'budget_dashboard': route('/budget/'),
+        'budget_progress': route('/budget/progress'),
+        'budget_alerts': route('/budget/alerts'),
+        'api_budget_progress': route(f'/budget/api/progress/{category}'),
+        'get_budget_summary': summary,
+    }
+
+    results = {}
+    for name, func in cases.items():
+        func()  # warm up
+        _counter.statements = 0
+        samples = time_call(func, requests)
+        stats = percentiles(samples)
+        stats['queries_per_request'] = _counter.statements / requests
+        results[name] = stats
+    return results
+
+def main():
+    parser = argparse.ArgumentParser(description='Benchmark the budget routes')
+    parser.add_argument('--database', help='Generated database to use (default: build a small one)')
+    parser.add_argument('--requests', type=int, default=500)
+    parser.add_argument('--cache', action='store_true', help='Leave the progress cache on')
+    parser.add_argument('--json', help='Write results to this JSON file')
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as tmp:
+        database = args.database
+        if database is None:
+            database = os.path.join(tmp, 'finance.db')
+            generate_database(database, users=200, categories=10, months=12,
+                              transactions=200000, report=lambda message: None)
+
+        results = run_suite(database, args.requests, args.cache)
+        db.close_all_pools()
+
+    print(f"{'route':<22} | {'p50 ms':>7} | {'p95 ms':>7} | {'p99 ms':>7} | {'queries/req':>11}")
+    print("-" * 67)
+    for name, stats in results.items():
+        print(f"{name:<22} | {stats['p50']:>7.2f} | {stats['p95']:>7.2f} | {stats['p99']:>7.2f} | "
+              f"{stats['queries_per_request']:>11.1f}")
+
+    if args.json:
+        with open(args.json, 'w') as f:
+            json.dump(results, f, indent=2)
+        print(f"\n📄 Results written to {args.json}")
+
+if __name__ == '__main__':
+    main()
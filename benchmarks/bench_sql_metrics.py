@@ -0,0 +1,55 @@
+#!/usr/bin/env python3
+"""
+Benchmark: cost of per-request SQL instrumentation
+Personal Finance Tracker - My Paldea
+
+Times the budget routes with SQL_INSTRUMENTATION on and off (progress
+cache off, so every request hits SQLite) and shows what the X-DB-* headers
+report for each route.
+
+Run from the repository root:
+    python -m benchmarks.bench_sql_metrics
+"""
+
+import os
+import tempfile
+
+import db
+from benchmarks.common import create_bench_app, percentiles, recent_months, seed_user, time_call
+
+REQUESTS = 2000
+CATEGORIES = [f'Category {i}' for i in range(12)]
+ROUTES = ['/budget/', '/budget/progress', '/budget/alerts', '/budget/api/progress/Category 0']
+
+ROUNDS = 5
+
+def route_p50(client, path):
+    """p50 of one round of requests, in ms"""
+    headers = {'X-Bench-User': '1'}
+    return percentiles(time_call(lambda: client.get(path, headers=headers), REQUESTS // ROUNDS))['p50']
+
+def main():
+    with tempfile.TemporaryDirectory() as tmp:
+        database = os.path.join(tmp, 'finance.db')
+        create_bench_app(database)
+        seed_user(database, 1, CATEGORIES, recent_months(12))
+
+        plain = create_bench_app(database, BUDGET_CACHE_TTL=0, SQL_INSTRUMENTATION=False).test_client()
+        instrumented = create_bench_app(database, BUDGET_CACHE_TTL=0).test_client()
+
+        print(f"{'route':<32} | {'off p50 ms':>10} | {'on p50 ms':>9} | {'overhead':>8} | "
+              f"{'X-DB-Queries':>12} | {'X-DB-Time-ms':>12}")
+        print("-" * 99)
+        for path in ROUTES:
+            # Alternate the two apps so warm-up and noise hit both equally
+            off, on = [], []
+            for _ in range(ROUNDS):
+                off.append(route_p50(plain, path))
+                on.append(route_p50(instrumented, path))
+            response = instrumented.get(path, headers={'X-Bench-User': '1'})
+            print(f"{path:<32} | {min(off):>10.3f} | {min(on):>9.3f} | {(min(on) - min(off)) * 1000:>6.1f}us | "
+                  f"{response.headers['X-DB-Queries']:>12} | {response.headers['X-DB-Time-ms']:>12}")
+        db.close_all_pools()
+
+if __name__ == '__main__':
+    main()
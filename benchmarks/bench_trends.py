@@ -0,0 +1,108 @@
+#!/usr/bin/env python3
+"""
+Benchmark: vectorized spending trends
+Personal Finance Tracker - My Paldea
+
+Times budget_analytics.compute_trends for one user with 5 years of history
+(100,000 expense transactions by default) and compares it with the same
+monthly spend / rolling average / forecast computed by a per-row Python
+loop over the raw transactions.
+
+Run from the repository root:
+    python -m benchmarks.bench_trends [--rows 100000] [--months 60]
+"""
+
+import argparse
+import os
+import random
+import tempfile
+from datetime import date
+
+import db
+from benchmarks.common import create_bench_app, percentiles, time_call
+from budget_analytics import compute_trends, recent_month_list
+from budget_engine import month_bounds, progress_status
+from categories import ensure_category_ids
+from generate_data import category_names
+
+REPEATS = 20
+
+def seed_history(database, months, rows, categories):
+    """Give user 1 budgets for every category x month and `rows` expenses"""
+    rng = random.Random(10)
+    conn = db.get_pool(database).acquire()
+    with conn:
+        ids = ensure_category_ids(conn, categories)
+        category_ids = [ids[category] for category in categories]
+        conn.executemany('INSERT INTO budgets (user_id, category_id, amount_cents, month) VALUES (1, ?, 80000, ?)',
+                         [(category_id, month) for category_id in category_ids for month in months])
+        conn.executemany('''
+            INSERT INTO transactions (user_id, category_id, amount_cents, date, type)
+            VALUES (1, ?, ?, ?, 'expense')
+        ''', [(category_ids[rng.randrange(len(category_ids))], round(rng.uniform(1, 60) * 100),
+               f'{months[rng.randrange(len(months))]}-{rng.randrange(1, 29):02d}')
+              for _ in range(rows)])
+    conn.close()
+
+def python_loop_trends(conn, user_id, months, window, today):
+    """Reference implementation: one Python pass per row and per cell"""
+    start, _ = month_bounds(months[0])
+    _, end = month_bounds(months[-1])
+    spend = {}
+    for row in conn.execute('''
+        SELECT c.name as category, t.date, t.amount_cents FROM transactions t
+        JOIN categories c ON c.id = t.category_id
+        WHERE t.user_id = ? AND t.type = 'expense' AND t.date >= ? AND t.date < ?
+    ''', (user_id, start, end)):
+        key = (row['category'], row['date'][:7])
+        spend[key] = spend.get(key, 0) + row['amount_cents'] / 100
+
+    budgets = {(row['category'], row['month']): row['amount_cents'] / 100 for row in conn.execute(
+        'SELECT c.name as category, b.month, b.amount_cents FROM budgets b '
+        'JOIN categories c ON c.id = b.category_id WHERE b.user_id = ? AND b.month >= ? AND b.month <= ?',
+        (user_id, months[0], months[-1]))}
+    categories = sorted({category for category, _ in spend} | {category for category, _ in budgets})
+
+    result = {}
+    for category in categories:
+        series = [spend.get((category, month), 0) for month in months]
+        rolling = [sum(series[max(0, i + 1 - window):i + 1]) / min(i + 1, window) for i in range(len(series))]
+        budget = budgets.get((category, months[-1]))
+        projected = series[-1] / today.day * 31 if today.day else 0
+        status = progress_status(projected / budget * 100)[1] if budget else None
+        result[category] = (series, rolling, projected, status)
+    return result
+
+def main():
+    parser = argparse.ArgumentParser(description='Benchmark budget_analytics.compute_trends')
+    parser.add_argument('--rows', type=int, default=100000)
+    parser.add_argument('--months', type=int, default=60)
+    args = parser.parse_args()
+
+    end_month = date.today().strftime('%Y-%m')
+    months = recent_month_list(end_month, args.months)
+    categories = category_names(12)
+
+    with tempfile.TemporaryDirectory() as tmp:
+        database = os.path.join(tmp, 'finance.db')
+        create_bench_app(database)
+        seed_history(database, months, args.rows, categories)
+
+        conn = db.get_pool(database).acquire()
+        today = date.today()
+        vectorized = percentiles(time_call(
+            lambda: compute_trends(conn, 1, end_month, args.months, 3, today), REPEATS))
+        loop = percentiles(time_call(
+            lambda: python_loop_trends(conn, 1, months, 3, today), REPEATS))
+        conn.close()
+        db.close_all_pools()
+
+    print(f"{args.rows:,} transactions over {args.months} months, {len(categories)} categories\n")
+    print(f"{'implementation':<22} | {'p50 ms':>8} | {'p95 ms':>8}")
+    print("-" * 44)
+    print(f"{'python loop':<22} | {loop['p50']:>8.1f} | {loop['p95']:>8.1f}")
+    print(f"{'compute_trends':<22} | {vectorized['p50']:>8.1f} | {vectorized['p95']:>8.1f}")
+    print(f"\nSpeedup: {loop['p50'] / vectorized['p50']:.1f}x (target: under 50 ms)")
+
+if __name__ == '__main__':
+    main()
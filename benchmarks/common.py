@@ -0,0 +1,71 @@
+"""
+Shared helpers for the benchmark scripts
+Personal Finance Tracker - My Paldea
+"""
+
+import sqlite3
+import statistics
+import time
+
+from jinja2 import DictLoader
+from flask_login import UserMixin
+
+from app import create_app
+from budget_routes import init_budget_tables
+from categories import ensure_category_ids
+from generate_data import recent_months  # noqa: F401 (re-exported for benchmarks)
+
+class BenchUser(UserMixin):
+    """User loaded from the X-Bench-User header"""
+    def __init__(self, user_id):
+        self.id = user_id
+
+# Minimal stand-ins for the HTML templates so page routes render
+BENCH_TEMPLATES = {
+    'budget/dashboard.html': '{% for b in budgets %}{{ b.category }} {{ b.amount_cents | money }}\n{% endfor %}{{ total_budget | money }}',
+    'budget/progress.html': '{% for p in progress_data %}{{ p.category }} {{ p.percentage }} {{ p.status }}\n'
+                            '{% endfor %}{{ stats.total_spent }}',
+}
+
+def create_bench_app(database, **config):
+    """Create an app with the budget blueprint that logs in via a header"""
+    app = create_app({'SECRET_KEY': 'bench', 'TESTING': True, 'DATABASE': database, **config})
+    app.jinja_loader = DictLoader(BENCH_TEMPLATES)
+
+    app.login_manager.request_loader(
+        lambda request: BenchUser(int(request.headers['X-Bench-User']))
+        if 'X-Bench-User' in request.headers else None)
+
+    with app.app_context():
+        init_budget_tables()
+    return app
+
+def seed_user(database, user_id, categories, months, per_month=20):
+    """Give one user a budget and spending for every category x month"""
+    conn = sqlite3.connect(database)
+    ids = ensure_category_ids(conn, categories)
+    conn.executemany('INSERT INTO budgets (user_id, category_id, amount_cents, month) VALUES (?, ?, 50000, ?)',
+                     [(user_id, ids[category], month) for category in categories for month in months])
+    conn.executemany('''
+        INSERT INTO transactions (user_id, category_id, amount_cents, date, type)
+        VALUES (?, ?, 1999, ?, 'expense')
+    ''', [(user_id, ids[category], f'{month}-{day % 28 + 1:02d}')
+          for category in categories for month in months for day in range(per_month)])
+    conn.commit()
+    conn.close()
+
+def percentiles(samples_ms):
+    """Return p50/p95/p99 of a list of millisecond samples"""
+    ordered = sorted(samples_ms)
+    def pick(p):
+        return ordered[min(len(ordered) - 1, int(round(p / 100 * (len(ordered) - 1))))]
+    return {'p50': pick(50), 'p95': pick(95), 'p99': pick(99), 'mean': statistics.fmean(ordered)}
+
+def time_call(func, repeats):
+    """Run func `repeats` times and return per-call milliseconds"""
+    samples = []
+    for _ in range(repeats):
+        start = time.perf_counter()
+        func()
+        samples.append((time.perf_counter() - start) * 1000)
+    return samples
@@ -0,0 +1,223 @@
+# budget_analytics.py - Multi-Month Spending Trends and Forecast
+# Personal Finance Tracker - My Paldea
+# Course: IST 303 Fall 2025
+#
+# Reads a user's monthly spend for N months from the monthly_category_spend
+# rollup in one query (a few hundred rows even for 5 years, however many
+# transactions there are), plus the current month's spend to date from
+# transactions, turns them into NumPy columns and computes everything with
+# array operations:
+# - per-category monthly spend (category x month matrix)
+# - rolling average of monthly spend
+# - month-to-date pace against budget for the last month
+# - projected end-of-month spend and its status
+#
+# Status thresholds come from budget_engine.STATUS_THRESHOLDS, so the trends
+# view agrees with the progress page. NumPy is only needed for this module;
+# budget_routes imports it when /budget/trends is first requested.
+
+import calendar
+from datetime import date, timedelta
+
+import numpy as np
+
+from archive import transactions_source
+from budget_engine import STATUS_THRESHOLDS, OVER_BUDGET_STATUS, month_bounds, month_range
+from money import cents_to_float
+
+DEFAULT_WINDOW = 3
+
+MONTHLY_SPEND_SQL = '''
+    SELECT c.name, m.month, m.total_cents
+    FROM monthly_category_spend m
+    JOIN categories c ON c.id = m.category_id
+    WHERE m.user_id = ? AND m.type = 'expense' AND m.month >= ? AND m.month <= ?
+'''
+
+# Spend so far in the forecast month (uses idx_transactions_covering); an
+# archived month also reads the archive (see archive.transactions_source).
+# Names are joined after grouping, so the scan stays on the index.
+SPEND_TO_DATE_SQL = '''
+    SELECT c.name, spend.total_cents
+    FROM (
+        SELECT category_id, SUM(amount_cents) as total_cents
+        FROM {source}
+        WHERE user_id = ? AND type = 'expense' AND date >= ? AND date < ?
+        GROUP BY category_id
+    ) spend
+    JOIN categories c ON c.id = spend.category_id
+'''
+
+BUDGETS_SQL = '''
+    SELECT c.name, b.month, b.amount_cents
+    FROM budgets b
+    JOIN categories c ON c.id = b.category_id
+    WHERE b.user_id = ? AND b.month >= ? AND b.month <= ?
+'''
+
+STATUS_BOUNDS = np.array([bound for bound, _, _ in STATUS_THRESHOLDS], dtype=float)
+STATUS_COLORS = np.array([color for _, color, _ in STATUS_THRESHOLDS] + [OVER_BUDGET_STATUS[0]], dtype=object)
+STATUS_LABELS = np.array([status for _, _, status in STATUS_THRESHOLDS] + [OVER_BUDGET_STATUS[1]], dtype=object)
+
+def month_number(month):
+    """'YYYY-MM' -> months since year 0"""
+    year, month_of_year = month.split('-')
+    return int(year) * 12 + int(month_of_year) - 1
+
+def recent_month_list(end_month, count):
+    """Return `count` months ending with end_month"""
+    first = month_number(end_month) - (count - 1)
+    return month_range(f'{first // 12:04d}-{first % 12 + 1:02d}', end_month)
+
+def load_monthly_spend(conn, user_id, months):
+    """Load rollup rows for the months as (categories, month index, dollars) columns"""
+    rows = conn.execute(MONTHLY_SPEND_SQL, (user_id, months[0], months[-1])).fetchall()
+    if not rows:
+        return [], np.zeros(0, dtype=np.int64), np.zeros(0)
+
+    month_index = {month: i for i, month in enumerate(months)}
+    category, month, total = zip(*rows)
+    return (list(category),
+            np.fromiter((month_index[m] for m in month), dtype=np.int64, count=len(month)),
+            np.array(total, dtype=float) / 100)
+
+def load_spend_to_date(conn, user_id, month, elapsed):
+    """Return {category: dollars spent} for the first `elapsed` days of month"""
+    if not elapsed:
+        return {}
+    start, _ = month_bounds(month)
+    cutoff = date.fromisoformat(start) + timedelta(days=elapsed)
+    sql = SPEND_TO_DATE_SQL.format(source=transactions_source(conn, month))
+    return {category: cents_to_float(cents) for category, cents in
+            conn.execute(sql, (user_id, start, cutoff.isoformat())).fetchall()}
+
+def load_budget_matrix(conn, user_id, months, categories):
+    """Return a category x month budget matrix in dollars (NaN where no budget is set) and the categories"""
+    rows = conn.execute(BUDGETS_SQL, (user_id, months[0], months[-1])).fetchall()
+    categories = sorted(set(categories).union(row[0] for row in rows))
+    index = {category: i for i, category in enumerate(categories)}
+    month_index = {month: i for i, month in enumerate(months)}
+
+    budgets = np.full((len(categories), len(months)), np.nan)
+    for category, month, amount_cents in rows:
+        budgets[index[category], month_index[month]] = cents_to_float(amount_cents)
+    return budgets, categories
+
+def rolling_mean(matrix, window):
+    """Trailing mean along months; the first months average what is available"""
+    cumulative = np.zeros((matrix.shape[0], matrix.shape[1] + 1))
+    np.cumsum(matrix, axis=1, out=cumulative[:, 1:])
+    ends = np.arange(1, matrix.shape[1] + 1)
+    starts = np.maximum(ends - window, 0)
+    return (cumulative[:, ends] - cumulative[:, starts]) / (ends - starts)
+
+def vectorized_status(percentages):
+    """Return (colors, statuses) arrays for an array of percentages"""
+    index = np.searchsorted(STATUS_BOUNDS, np.nan_to_num(percentages), side='left')
+    return STATUS_COLORS[index], STATUS_LABELS[index]
+
+def elapsed_days(month, today):
+    """Days of `month` that have passed as of `today` (whole month if past, 0 if future)"""
+    days_in_month = calendar.monthrange(*(int(part) for part in month.split('-')))[1]
+    current = today.strftime('%Y-%m')
+    if month < current:
+        return days_in_month, days_in_month
+    if month > current:
+        return 0, days_in_month
+    return today.day, days_in_month
+
+def compute_trends(conn, user_id, end_month, months=12, window=DEFAULT_WINDOW, today=None):
+    """
+    Spending trends for the `months` months ending with end_month.
+    Returns NumPy arrays indexed [category, month] plus a month-to-date
+    forecast for end_month (arrays indexed by category).
+    """
+    today = today or date.today()
+    month_list = recent_month_list(end_month, months)
+
+    row_categories, month_index, total = load_monthly_spend(conn, user_id, month_list)
+    elapsed, days_in_month = elapsed_days(end_month, today)
+    to_date = load_spend_to_date(conn, user_id, end_month, elapsed)
+    budgets, categories = load_budget_matrix(conn, user_id, month_list,
+                                             set(row_categories).union(to_date))
+
+    # Category x month spend matrix from the rollup columns
+    position = {category: i for i, category in enumerate(categories)}
+    codes = np.fromiter((position[c] for c in row_categories), dtype=np.int64, count=len(row_categories))
+    shape = (len(categories), len(month_list))
+    spend = np.bincount(codes * shape[1] + month_index, weights=total,
+                        minlength=shape[0] * shape[1]).reshape(shape)
+    rolling = rolling_mean(spend, window)
+
+    # Month-to-date pace for the last month
+    spent_to_date = np.array([to_date.get(category, 0.0) for category in categories], dtype=float)
+    budget = budgets[:, -1]
+
+    with np.errstate(divide='ignore', invalid='ignore'):
+        expected_to_date = budget * elapsed / days_in_month
+        pace = spent_to_date / expected_to_date
+
+        # Daily run rate blended with the previous months' average: early in
+        # the month history dominates, by month end the actual spend does
+        history_rate = rolling[:, -2] / days_in_month if shape[1] > 1 else np.zeros(shape[0])
+        current_rate = spent_to_date / elapsed if elapsed else history_rate
+        weight = elapsed / days_in_month
+        rate = weight * current_rate + (1 - weight) * history_rate
+        projected = spent_to_date + rate * (days_in_month - elapsed)
+
+        percentage = spent_to_date / budget * 100
+        projected_percentage = projected / budget * 100
+
+    color, status = vectorized_status(percentage)
+    projected_color, projected_status = vectorized_status(projected_percentage)
+
+    return {
+        'months': month_list,
+        'categories': categories,
+        'window': window,
+        'spend': spend,
+        'budget': budgets,
+        'rolling_average': rolling,
+        'month': end_month,
+        'elapsed_days': elapsed,
+        'days_in_month': days_in_month,
+        'spent_to_date': spent_to_date,
+        'expected_to_date': expected_to_date,
+        'pace': pace,
+        'percentage': percentage,
+        'color': color,
+        'status': status,
+        'projected': projected,
+        'projected_percentage': projected_percentage,
+        'projected_color': projected_color,
+        'projected_status': projected_status,
+    }
+
+def to_json_values(array, digits=2):
+    """Round an array and turn NaN/inf into None for JSON"""
+    values = np.round(np.asarray(array, dtype=float), digits)
+    return np.where(np.isfinite(values), values, None).tolist()
+
+def trends_as_json(trends):
+    """Serialize compute_trends output for the /budget/trends endpoint"""
+    has_budget = ~np.isnan(trends['budget'][:, -1])
+    return {
+        'months': trends['months'],
+        'categories': trends['categories'],
+        'window': trends['window'],
+        'spend': to_json_values(trends['spend']),
+        'budget': to_json_values(trends['budget']),
+        'rolling_average': to_json_values(trends['rolling_average']),
+        'forecast': {
+            'month': trends['month'],
+            'elapsed_days': trends['elapsed_days'],
+            'days_in_month': trends['days_in_month'],
+            'spent_to_date': to_json_values(trends['spent_to_date']),
+            'expected_to_date': to_json_values(trends['expected_to_date']),
+            'pace': to_json_values(trends['pace'], 3),
+            'projected': to_json_values(trends['projected']),
+            'projected_percentage': to_json_values(trends['projected_percentage'], 1),
+            'status': np.where(has_budget, trends['status'], None).tolist(),
+            'projected_status': np.where(has_budget, trends['projected_status'], None).tolist(),
+        }
+    }
@@ -0,0 +1,197 @@
+# budget_async.py - Async Read Path for Budget Dashboards
+# Personal Finance Tracker - My Paldea
+# Course: IST 303 Fall 2025
+#
+# A small ASGI app that answers the dashboard's polling endpoints without
+# tying up a worker thread per request:
+#
+#   GET /budget/async/progress                  progress rows + stats (JSON)
+#   GET /budget/async/alerts                    same as /budget/alerts
+#   GET /budget/async/api/progress/<category>   same as /budget/api/progress/<category>
+#
+# Requests wait on the event loop; only the SQLite work runs on a bounded
+# thread pool, each thread using a read-only (query_only) pooled connection.
+# Results go through the Flask app's progress cache, so budget writes made
+# through the normal routes invalidate them. Every other path is passed to
+# the Flask app (wrapped with asgiref's WsgiToAsgi).
+#
+# Users are resolved by the Flask app's own session handling and Flask-Login
+# user loader, so a user the loader no longer returns (deleted or disabled)
+# loses access here too. The schema is migrated at lifespan startup, since
+# the read-only readers cannot do it.
+#
+# Run with:
+#     uvicorn --factory budget_async:create_asgi_app --port 8000
+
+import asyncio
+import calendar
+import json
+from concurrent.futures import ThreadPoolExecutor
+from datetime import datetime
+
+import flask_login
+
+import db
+from budget_engine import get_progress, summarize_progress, build_alerts, progress_api_row
+
+ASYNC_PREFIX = '/budget/async'
+DEFAULT_READERS = 8
+
+class ReaderPool:
+    """Bounded thread pool whose threads run queries on read-only connections"""
+
+    def __init__(self, database, size=DEFAULT_READERS):
+        self.connections = db.ConnectionPool(database, db.READER_PRAGMAS, size)
+        self.executor = ThreadPoolExecutor(max_workers=size, thread_name_prefix='budget-reader')
+
+    def _call(self, func, args):
+        conn = self.connections.acquire()
+        try:
+            return func(conn, *args)
+        finally:
+            conn.close()
+
+    async def run(self, func, *args):
+        """Run func(conn, *args) on a reader thread and await the result"""
+        loop = asyncio.get_running_loop()
+        return await loop.run_in_executor(self.executor, self._call, func, args)
+
+    def close(self):
+        self.executor.shutdown(wait=True)
+        self.connections.close_all()
+
+class AsyncBudgetApp:
+    """ASGI app for the async budget read endpoints, falling back to the Flask app"""
+
+    def __init__(self, flask_app, readers=None, fallback=None):
+        self.flask_app = flask_app
+        self.readers = readers or ReaderPool(
+            flask_app.config.get('DATABASE', db.DEFAULT_DATABASE),
+            flask_app.config.get('BUDGET_ASYNC_READERS', DEFAULT_READERS))
+        self.cache = flask_app.extensions['budget_progress_cache']
+        self.fallback = fallback
+        self.routes = {
+            'progress': self.progress,
+            'alerts': self.alerts,
+        }
+
+    def get_fallback(self):
+        """ASGI wrapper around the Flask app, created on first use"""
+        if self.fallback is None:
+            from asgiref.wsgi import WsgiToAsgi
+            self.fallback = WsgiToAsgi(self.flask_app)
+        return self.fallback
+
+    async def __call__(self, scope, receive, send):
+        if scope['type'] == 'lifespan':
+            await self.lifespan(receive, send)
+        elif scope['type'] == 'http' and scope['path'].startswith(ASYNC_PREFIX + '/'):
+            await self.handle(scope, send)
+        else:
+            await self.get_fallback()(scope, receive, send)
+
+    async def lifespan(self, receive, send):
+        while True:
+            message = await receive()
+            if message['type'] == 'lifespan.startup':
+                await asyncio.get_running_loop().run_in_executor(None, self.ensure_schema)
+                await send({'type': 'lifespan.startup.complete'})
+            elif message['type'] == 'lifespan.shutdown':
+                self.readers.close()
+                await send({'type': 'lifespan.shutdown.complete'})
+                return
+
+    def ensure_schema(self):
+        """Apply pending migrations, as the Flask app does on its first request"""
+        from budget_routes import ensure_schema
+        with self.flask_app.app_context():
+            ensure_schema()
+
+    def load_user_id(self, scope):
+        """
+        Id of the logged-in, active user for the request's cookies, or None.
+        Runs the Flask app's session interface and Flask-Login user loader.
+        """
+        cookie = '; '.join(value.decode('latin-1') for name, value in scope.get('headers', [])
+                           if name == b'cookie')
+        with self.flask_app.test_request_context(scope['path'], headers={'Cookie': cookie} if cookie else {}):
+            user = flask_login.current_user
+            if not (user.is_authenticated and user.is_active):
+                return None
+            return int(user.get_id())
+
+    async def current_user_id(self, scope):
+        """load_user_id on a reader thread (the user loader may query the database)"""
+        loop = asyncio.get_running_loop()
+        return await loop.run_in_executor(self.readers.executor, self.load_user_id, scope)
+
+    async def handle(self, scope, send):
+        path = scope['path'][len(ASYNC_PREFIX) + 1:]
+        if scope['method'] != 'GET':
+            return await respond(send, 405, {'error': 'Method not allowed'})
+
+        user_id = await self.current_user_id(scope)
+        if user_id is None:
+            return await respond(send, 401, {'error': 'Login required'})
+
+        # scope['path'] is already percent-decoded ('50%25 off' arrives as '50% off')
+        if path.startswith('api/progress/'):
+            return await self.api_progress(send, user_id, path[len('api/progress/'):])
+
+        route = self.routes.get(path)
+        if route is None:
+            return await respond(send, 404, {'error': 'Not found'})
+        await route(send, user_id)
+
+    async def cached_progress(self, user_id, month):
+        """Progress rows for a user-month, computed on a reader thread on a cache miss"""
+        progress_data = self.cache.get((user_id, month))
+        if progress_data is None:
+            # Not stored if a write invalidates the user-month while we compute
+            generation = self.cache.generation((user_id, month))
+            progress_data = await self.readers.run(get_progress, user_id, month)
+            self.cache.set((user_id, month), progress_data, generation)
+        return list(progress_data)
+
+    async def progress(self, send, user_id):
+        """Async counterpart of budget_progress"""
+        now = datetime.now()
+        progress_data = await self.cached_progress(user_id, now.strftime('%Y-%m'))
+        progress_data.sort(key=lambda x: x['actual_percentage'], reverse=True)
+        await respond(send, 200, {
+            'month': now.strftime('%Y-%m'),
+            'month_name': calendar.month_name[now.month],
+            'progress': progress_data,
+            'stats': summarize_progress(progress_data)
+        })
+
+    async def alerts(self, send, user_id):
+        """Async counterpart of budget_alerts"""
+        progress_data = await self.cached_progress(user_id, datetime.now().strftime('%Y-%m'))
+        await respond(send, 200, build_alerts(progress_data))
+
+    async def api_progress(self, send, user_id, category):
+        """Async counterpart of api_budget_progress"""
+        progress_data = [p for p in await self.cached_progress(user_id, datetime.now().strftime('%Y-%m'))
+                         if p['category'] == category]
+        if not progress_data:
+            return await respond(send, 404, {'error': 'Budget not found'})
+        await respond(send, 200, progress_api_row(progress_data[0]))
+
+async def respond(send, status, data):
+    """Send a JSON response"""
+    body = json.dumps(data).encode()
+    await send({
+        'type': 'http.response.start',
+        'status': status,
+        'headers': [(b'content-type', b'application/json'),
+                    (b'content-length', str(len(body)).encode())],
+    })
+    await send({'type': 'http.response.body', 'body': body})
+
+def create_asgi_app(flask_app=None, **config):
+    """Build the ASGI app around a Flask app (create_app(config) by default)"""
+    if flask_app is None:
+        from app import create_app
+        flask_app = create_app(config)
+    return AsyncBudgetApp(flask_app)
@@ -0,0 +1,232 @@
+# budget_engine.py - Shared Budget Progress Engine
+# Developer: Qiao Huang
+# Tasks: 9 (Progress Bar Visualization)
+# Course: IST 303 Fall 2025
+#
+# One place that turns budgets + transactions into progress, status and
+# alert data. Used by budget_routes (HTML page, JSON API, alerts), by
+# init_db.display_summary and by the all-user reports (reports.py) so every
+# view agrees on the numbers and thresholds.
+#
+# Amounts are integer cents throughout; rows also carry dollar values
+# (budget_amount, spent, remaining) for JSON and display.
+
+import re
+
+from money import cents_to_float, format_money
+
+# Months are stored and queried as exactly 'YYYY-MM'; strptime alone would
+# also accept '2025-1', which no stored month matches
+MONTH_PATTERN = re.compile(r'\d{4}-(0[1-9]|1[0-2])')
+
+# Spending for every budgeted category in one query (replaces the
+# per-category SUM loop). Spending comes from the monthly_category_spend
+# rollup maintained by triggers on transactions (see rollups.py), so the
+# cost does not grow with transaction history. Budgets and the rollup are
+# joined on the integer category_id; names come from categories.
+PROGRESS_SQL = '''
+    SELECT
+        c.name as category,
+        b.amount_cents as budget_cents,
+        COALESCE(m.total_cents, 0) as spent_cents
+    FROM budgets b
+    JOIN categories c ON c.id = b.category_id
+    LEFT JOIN monthly_category_spend m ON
+        m.user_id = b.user_id AND
+        m.month = b.month AND
+        m.category_id = b.category_id AND
+        m.type = 'expense'
+    WHERE b.user_id = ? AND b.month = ? {category_filter}
+    ORDER BY c.name
+'''
+
+def month_bounds(month):
+    """Return the half-open date range ('YYYY-MM-01', next month's first day) for 'YYYY-MM'"""
+    year, month_number = (int(part) for part in month.split('-'))
+    if month_number == 12:
+        year, month_number = year + 1, 1
+    else:
+        month_number += 1
+    return f'{month}-01', f'{year:04d}-{month_number:02d}-01'
+
+# (upper percentage bound, color, status); anything above the last bound is over budget
+STATUS_THRESHOLDS = [
+    (50, 'success', 'On Track'),  # Green
+    (80, 'warning', 'Caution'),  # Yellow
+    (100, 'danger-orange', 'Warning'),  # Orange
+]
+OVER_BUDGET_STATUS = ('danger', 'Over Budget!')  # Red
+
+def progress_status(percentage):
+    """Return (color, status) for a spending percentage"""
+    for bound, color, status in STATUS_THRESHOLDS:
+        if percentage <= bound:
+            return color, status
+    return OVER_BUDGET_STATUS
+
+def build_progress_row(category, budget_cents, spent_cents):
+    """Build the progress dict for one category"""
+    # Calculate percentage and determine status
+    percentage = (spent_cents / budget_cents * 100) if budget_cents > 0 else 0
+    color, status = progress_status(percentage)
+
+    return {
+        'category': category,
+        'budget_cents': budget_cents,
+        'spent_cents': spent_cents,
+        'remaining_cents': budget_cents - spent_cents,
+        'budget_amount': cents_to_float(budget_cents),
+        'spent': cents_to_float(spent_cents),
+        'remaining': cents_to_float(budget_cents - spent_cents),
+        'percentage': min(percentage, 100),  # Cap at 100% for display
+        'actual_percentage': percentage,  # Actual percentage for data
+        'color': color,
+        'status': status,
+        'is_over': spent_cents > budget_cents
+    }
+
+def progress_api_row(progress):
+    """JSON shape of one category's progress for the progress API"""
+    return {
+        'category': progress['category'],
+        'budget': progress['budget_amount'],
+        'spent': progress['spent'],
+        'remaining': progress['remaining'],
+        'percentage': progress['actual_percentage'],
+        'status': 'over' if progress['is_over'] else 'ok'
+    }
+
+def get_progress(conn, user_id, month, category=None):
+    """Get progress rows for every budgeted category in a month (one query)"""
+    params = [user_id, month]
+    category_filter = ''
+    if category is not None:
+        category_filter = 'AND c.name = ?'
+        params.append(category)
+
+    rows = conn.execute(PROGRESS_SQL.format(category_filter=category_filter),
+                        params).fetchall()
+
+    return [build_progress_row(category, budget_cents, spent_cents)
+            for category, budget_cents, spent_cents in rows]
+
+# Budget and spending for many categories x months in one set-based query
+PROGRESS_MATRIX_SQL = '''
+    SELECT
+        b.month,
+        c.name as category,
+        b.amount_cents as budget_cents,
+        COALESCE(m.total_cents, 0) as spent_cents
+    FROM budgets b
+    JOIN categories c ON c.id = b.category_id
+    LEFT JOIN monthly_category_spend m ON
+        m.user_id = b.user_id AND
+        m.month = b.month AND
+        m.category_id = b.category_id AND
+        m.type = 'expense'
+    WHERE b.user_id = ? AND b.month IN ({month_placeholders}) {category_filter}
+    ORDER BY c.name, b.month
+'''
+
+def check_month(month):
+    """Return month if it is a canonical 'YYYY-MM', or raise ValueError"""
+    if not isinstance(month, str) or not MONTH_PATTERN.fullmatch(month):
+        raise ValueError('month must be YYYY-MM')
+    return month
+
+def month_range(first, last):
+    """Return every 'YYYY-MM' from first to last inclusive"""
+    year, month_number = (int(part) for part in first.split('-'))
+    last_year, last_month = (int(part) for part in last.split('-'))
+    months = []
+    while (year, month_number) <= (last_year, last_month):
+        months.append(f'{year:04d}-{month_number:02d}')
+        year, month_number = (year + 1, 1) if month_number == 12 else (year, month_number + 1)
+    return months
+
+def get_progress_matrix(conn, user_id, months, categories=None):
+    """Get {(category, month): progress row} for budgeted cells (one query)"""
+    params = [user_id, *months]
+    category_filter = ''
+    if categories:
+        category_filter = f"AND c.name IN ({', '.join('?' * len(categories))})"
+        params.extend(categories)
+
+    sql = PROGRESS_MATRIX_SQL.format(month_placeholders=', '.join('?' * len(months)),
+                                     category_filter=category_filter)
+    return {(category, month): build_progress_row(category, budget_cents, spent_cents)
+            for month, category, budget_cents, spent_cents in conn.execute(sql, params)}
+
+# Progress rows of every user in a user-id range for one month, for the
+# all-user reports (reports.py); rows come back grouped by user
+PROGRESS_USERS_SQL = '''
+    SELECT
+        b.user_id,
+        c.name as category,
+        b.amount_cents as budget_cents,
+        COALESCE(m.total_cents, 0) as spent_cents
+    FROM budgets b
+    JOIN categories c ON c.id = b.category_id
+    LEFT JOIN monthly_category_spend m ON
+        m.user_id = b.user_id AND
+        m.month = b.month AND
+        m.category_id = b.category_id AND
+        m.type = 'expense'
+    WHERE b.user_id BETWEEN ? AND ? AND b.month = ?
+    ORDER BY b.user_id, c.name
+'''
+
+def get_progress_for_users(conn, first_user, last_user, month):
+    """Yield (user_id, progress rows) for users first_user..last_user with budgets in a month (one query)"""
+    user_id, progress_data = None, []
+    for row_user, category, budget_cents, spent_cents in conn.execute(
+            PROGRESS_USERS_SQL, (first_user, last_user, month)):
+        if row_user != user_id:
+            if progress_data:
+                yield user_id, progress_data
+            user_id, progress_data = row_user, []
+        progress_data.append(build_progress_row(category, budget_cents, spent_cents))
+    if progress_data:
+        yield user_id, progress_data
+
+def summarize_progress(progress_data):
+    """Calculate overall statistics for a list of progress rows"""
+    total_budget = sum(p['budget_cents'] for p in progress_data)
+    total_spent = sum(p['spent_cents'] for p in progress_data)
+    overall_percentage = (total_spent / total_budget * 100) if total_budget > 0 else 0
+
+    return {
+        'total_budget': cents_to_float(total_budget),
+        'total_spent': cents_to_float(total_spent),
+        'total_remaining': cents_to_float(total_budget - total_spent),
+        'overall_percentage': overall_percentage,
+        'categories_over_budget': sum(1 for p in progress_data if p['is_over']),
+        'categories_on_track': sum(1 for p in progress_data if p['percentage'] <= 50)
+    }
+
+def build_alerts(progress_data):
+    """Get alerts for categories above 80% of their budget, highest first"""
+    alert_list = []
+    for p in sorted(progress_data, key=lambda x: x['actual_percentage'], reverse=True):
+        percentage = p['actual_percentage']
+        if percentage <= 80:
+            continue
+
+        if percentage > 100:
+            level = 'danger'
+            message = f"Over budget by {format_money(p['spent_cents'] - p['budget_cents'])}"
+        elif percentage > 90:
+            level = 'warning'
+            message = f"Only {format_money(p['remaining_cents'])} remaining"
+        else:
+            level = 'info'
+            message = f"{percentage:.0f}% of budget used"
+
+        alert_list.append({
+            'category': p['category'],
+            'level': level,
+            'message': message,
+            'percentage': percentage
+        })
+
+    return alert_list
@@ -3,48 +3,132 @@
 # Tasks: 8 (Monthly Budget Setting) & 9 (Progress Bar Visualization)
 # Course: IST 303 Fall 2025
 
-from flask import Blueprint, render_template, request, redirect, url_for, flash, jsonify
+from flask import (Blueprint, render_template, request, redirect, url_for, flash, jsonify,
+                   current_app, Response)
 from flask_login import login_required, current_user
-import sqlite3
+import click
 from datetime import datetime
 import calendar
+import threading
+import time
+from budget_engine import (get_progress, get_progress_matrix, month_range, check_month,
+                           summarize_progress, build_alerts, progress_api_row)
+from migrations import migrate, get_version, SCHEMA_VERSION
+from importer import import_upload
+from budget_sheets import (validate_budget_row, upsert_budgets, copy_budgets,
+                           UPSERT_BUDGET_SQL, MAX_SHEET_ROWS)
+import db
+import sql_metrics
+import money
+from money import to_cents
+from db import get_db_connection
+from progress_cache import ProgressCache, DEFAULT_MAX_ENTRIES, DEFAULT_TTL
+from categories import CategoryCache, ensure_category_ids, DEFAULT_TTL as DEFAULT_CATEGORY_TTL
+from budget_summaries import load_budget_summaries, summary_dict
+from alert_stream import AlertBroker, DEFAULT_KEEPALIVE, DEFAULT_MAX_STREAM_SECONDS, format_event
+from progress_charts import CHART_FORMATS, data_version, render_progress_chart
+
+# Charts are ~20-60 KB; entries are keyed by data version, so the TTL only
+# bounds how long an unused chart holds memory
+DEFAULT_CHART_CACHE_SIZE = 256
+DEFAULT_CHART_CACHE_TTL = 3600.0  # seconds
 
 # Create blueprint for budget routes
 budget_bp = Blueprint('budget', __name__, url_prefix='/budget')
 
-def get_db_connection():
-    """Create database connection"""
-    conn = sqlite3.connect('finance.db')
-    conn.row_factory = sqlite3.Row
-    return conn
+# Return pooled connections to the pool when each app context ends
+budget_bp.record_once(lambda state: db.init_app(state.app))
 
-def init_budget_tables():
-    """Initialize budget-related database tables"""
-    conn = get_db_connection()
-    c = conn.cursor()
-    
-    # Create budgets table if not exists
-    c.execute('''
-        CREATE TABLE IF NOT EXISTS budgets (
-            id INTEGER PRIMARY KEY AUTOINCREMENT,
-            user_id INTEGER NOT NULL,
-            category TEXT NOT NULL,
-            amount DECIMAL(10, 2) NOT NULL,
-            month TEXT NOT NULL,
-            created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
-            updated_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
-            FOREIGN KEY (user_id) REFERENCES users (id),
-            UNIQUE(user_id, category, month)
-        )
-    ''')
-    
-    # Create index for faster queries
-    c.execute('''
-        CREATE INDEX IF NOT EXISTS idx_budget_user_month 
-        ON budgets (user_id, month)
-    ''')
+# X-DB-Queries / X-DB-Time-ms headers and the slow-query log
+budget_bp.record_once(lambda state: sql_metrics.init_app(state.app))
+
+# The `money` template filter for amounts stored in cents
+budget_bp.record_once(lambda state: money.init_app(state.app))
+
+@budget_bp.record_once
+def init_progress_cache(state):
+    """Give each app its own progress cache, sized from the app config"""
+    state.app.extensions['budget_progress_cache'] = ProgressCache(
+        max_entries=state.app.config.get('BUDGET_CACHE_SIZE', DEFAULT_MAX_ENTRIES),
+        ttl=state.app.config.get('BUDGET_CACHE_TTL', DEFAULT_TTL))
+
+@budget_bp.record_once
+def init_chart_cache(state):
+    """Rendered progress charts, keyed by data version so they never go stale"""
+    state.app.extensions['budget_chart_cache'] = ProgressCache(
+        max_entries=state.app.config.get('BUDGET_CHART_CACHE_SIZE', DEFAULT_CHART_CACHE_SIZE),
+        ttl=state.app.config.get('BUDGET_CHART_CACHE_TTL', DEFAULT_CHART_CACHE_TTL))
+
+@budget_bp.record_once
+def init_alert_broker(state):
+    """One alert broker per app for the /alerts/stream subscribers"""
+    state.app.extensions['budget_alert_broker'] = AlertBroker()
+
+@budget_bp.record_once
+def init_category_cache(state):
+    """One category cache per app (names, ids, icons, colors)"""
+    state.app.extensions['budget_category_cache'] = CategoryCache(
+        ttl=state.app.config.get('BUDGET_CATEGORY_TTL', DEFAULT_CATEGORY_TTL))
+
+def get_category_cache():
+    """Get the current app's category cache"""
+    return current_app.extensions['budget_category_cache']
+
+def get_alert_broker():
+    """Get the current app's alert broker"""
+    return current_app.extensions['budget_alert_broker']
+
+def get_progress_cache():
+    """Get the current app's progress cache"""
+    return current_app.extensions['budget_progress_cache']
+
+def get_chart_cache():
+    """Get the current app's progress chart cache"""
+    return current_app.extensions['budget_chart_cache']
+
+def get_cached_progress(user_id, month):
+    """Get progress rows for a user-month, computing them on a cache miss"""
+    cache = get_progress_cache()
+    progress_data = cache.get((user_id, month))
+    if progress_data is None:
+        # Not stored if a write invalidates the user-month while we compute
+        generation = cache.generation((user_id, month))
+        progress_data = get_progress(get_db_connection(), user_id, month)
+        cache.set((user_id, month), progress_data, generation)
+    
+    # Callers sort the list, so hand out a copy
+    return list(progress_data)
+
+def invalidate_progress(user_id, month):
+    """Drop cached progress for one user-month after a budget or transaction write"""
+    get_progress_cache().invalidate((user_id, month))
     
-    conn.commit()
+    # Push new alerts to open streams if the write crossed a threshold
+    get_alert_broker().notify(
+        user_id, month, lambda: build_alerts(get_cached_progress(user_id, month)))
+
+_checked_databases = set()
+_checked_lock = threading.Lock()
+
+@budget_bp.before_request
+def ensure_schema():
+    """Migrate the schema once per process per database (skipped if user_version matches)"""
+    database = db.get_pool().database
+    if database in _checked_databases:
+        return
+    
+    with _checked_lock:
+        if database in _checked_databases:
+            return
+        conn = get_db_connection()
+        if get_version(conn) < SCHEMA_VERSION:
+            migrate(conn, report=None)
+        _checked_databases.add(database)
+
+def init_budget_tables(database=None):
+    """Initialize budget-related database tables (applies pending migrations)"""
+    conn = db.get_pool(database).acquire() if database else get_db_connection()
+    migrate(conn, report=None)
     conn.close()
 
 # TASK 8: Monthly Budget Setting
@@ -59,15 +143,16 @@ def budget_dashboard():
     
     # Get user's budgets for current month
     budgets = c.execute('''
-        SELECT id, category, amount, month
-        FROM budgets 
-        WHERE user_id = ? AND month = ?
-        ORDER BY category
+        SELECT b.id, c.name as category, b.amount_cents, b.month
+        FROM budgets b
+        JOIN categories c ON c.id = b.category_id
+        WHERE b.user_id = ? AND b.month = ?
+        ORDER BY c.name
     ''', (current_user.id, current_month)).fetchall()
     
-    # Get total budget amount
+    # Get total budget amount (cents; templates format it with |money)
     total_budget = c.execute('''
-        SELECT COALESCE(SUM(amount), 0) as total
+        SELECT COALESCE(SUM(amount_cents), 0) as total
         FROM budgets 
         WHERE user_id = ? AND month = ?
     ''', (current_user.id, current_month)).fetchone()['total']
@@ -80,46 +165,45 @@ def budget_dashboard():
                          total_budget=total_budget,
                          month_name=calendar.month_name[datetime.now().month])
 
+def parse_budget_amount(value):
+    """Budget amount in cents, or None after flashing why it is not valid"""
+    try:
+        amount_cents = to_cents(value)
+    except ValueError as e:
+        flash(f'Invalid budget amount: {e}', 'error')
+        return None
+    if amount_cents <= 0:
+        flash('Budget amount must be greater than 0', 'error')
+        return None
+    return amount_cents
+
 @budget_bp.route('/set', methods=['GET', 'POST'])
 @login_required
 def set_budget():
     """Set or update monthly budget for a category"""
     if request.method == 'POST':
         category = request.form.get('category')
-        amount = float(request.form.get('amount', 0))
         month = request.form.get('month', datetime.now().strftime('%Y-%m'))
-        
-        if amount <= 0:
-            flash('Budget amount must be greater than 0', 'error')
+        amount_cents = parse_budget_amount(request.form.get('amount', 0))
+        if amount_cents is None:
             return redirect(url_for('budget.set_budget'))
         
         conn = get_db_connection()
-        c = conn.cursor()
+        
+        # Budgets are set on existing categories only
+        category_id = get_category_cache().ids_for(conn, [category]).get(category)
+        if category_id is None:
+            conn.close()
+            flash(f'Unknown category: {category}', 'error')
+            return redirect(url_for('budget.set_budget'))
         
         try:
-            # Check if budget exists for this category and month
-            existing = c.execute('''
-                SELECT id FROM budgets 
-                WHERE user_id = ? AND category = ? AND month = ?
-            ''', (current_user.id, category, month)).fetchone()
-            
-            if existing:
-                # Update existing budget
-                c.execute('''
-                    UPDATE budgets 
-                    SET amount = ?, updated_at = CURRENT_TIMESTAMP
-                    WHERE id = ?
-                ''', (amount, existing['id']))
-                flash(f'Budget for {category} updated successfully!', 'success')
-            else:
-                # Insert new budget
-                c.execute('''
-                    INSERT INTO budgets (user_id, category, amount, month)
-                    VALUES (?, ?, ?, ?)
-                ''', (current_user.id, category, amount, month))
-                flash(f'Budget for {category} set successfully!', 'success')
+            # One statement: inserts, or updates on UNIQUE(user_id, category_id, month)
+            conn.execute(UPSERT_BUDGET_SQL, (current_user.id, category_id, amount_cents, month))
+            flash(f'Budget for {category} saved successfully!', 'success')
             
             conn.commit()
+            invalidate_progress(current_user.id, month)
         except Exception as e:
             conn.rollback()
             flash(f'Error setting budget: {str(e)}', 'error')
@@ -128,9 +212,9 @@ def set_budget():
         
         return redirect(url_for('budget.budget_dashboard'))
     
-    # GET request - show form
-    categories = ['Food', 'Transportation', 'Entertainment', 'Shopping', 
-                 'Utilities', 'Healthcare', 'Education', 'Other']
+    # GET request - show form (expense categories from the cache)
+    categories = [category['name'] for category in
+                  get_category_cache().all(get_db_connection(), 'expense')]
     
     return render_template('budget/set_budget.html', categories=categories)
 
@@ -143,8 +227,9 @@ def edit_budget(budget_id):
     
     # Get budget details
     budget = c.execute('''
-        SELECT * FROM budgets 
-        WHERE id = ? AND user_id = ?
+        SELECT b.*, c.name as category FROM budgets b
+        JOIN categories c ON c.id = b.category_id
+        WHERE b.id = ? AND b.user_id = ?
     ''', (budget_id, current_user.id)).fetchone()
     
     if not budget:
@@ -152,17 +237,15 @@ def edit_budget(budget_id):
         return redirect(url_for('budget.budget_dashboard'))
     
     if request.method == 'POST':
-        amount = float(request.form.get('amount', 0))
-        
-        if amount <= 0:
-            flash('Budget amount must be greater than 0', 'error')
-        else:
+        amount_cents = parse_budget_amount(request.form.get('amount', 0))
+        if amount_cents is not None:
             c.execute('''
                 UPDATE budgets 
-                SET amount = ?, updated_at = CURRENT_TIMESTAMP
+                SET amount_cents = ?, updated_at = CURRENT_TIMESTAMP
                 WHERE id = ?
-            ''', (amount, budget_id))
+            ''', (amount_cents, budget_id))
             conn.commit()
+            invalidate_progress(current_user.id, budget['month'])
             flash('Budget updated successfully!', 'success')
             return redirect(url_for('budget.budget_dashboard'))
     
@@ -176,6 +259,11 @@ def delete_budget(budget_id):
     conn = get_db_connection()
     c = conn.cursor()
     
+    budget = c.execute('''
+        SELECT month FROM budgets 
+        WHERE id = ? AND user_id = ?
+    ''', (budget_id, current_user.id)).fetchone()
+    
     c.execute('''
         DELETE FROM budgets 
         WHERE id = ? AND user_id = ?
@@ -184,6 +272,9 @@ def delete_budget(budget_id):
     conn.commit()
     conn.close()
     
+    if budget:
+        invalidate_progress(current_user.id, budget['month'])
+    
     flash('Budget deleted successfully!', 'success')
     return redirect(url_for('budget.budget_dashboard'))
 
@@ -192,86 +283,16 @@ def delete_budget(budget_id):
 @login_required
 def budget_progress():
     """Display budget progress with visual bars"""
-    conn = get_db_connection()
-    c = conn.cursor()
-    
     current_month = datetime.now().strftime('%Y-%m')
     
-    # Get budgets for current month
-    budgets = c.execute('''
-        SELECT category, amount
-        FROM budgets 
-        WHERE user_id = ? AND month = ?
-        ORDER BY category
-    ''', (current_user.id, current_month)).fetchall()
-    
-    progress_data = []
-    total_budget = 0
-    total_spent = 0
-    
-    for budget in budgets:
-        category = budget['category']
-        budget_amount = budget['amount']
-        total_budget += budget_amount
-        
-        # Calculate spending for this category
-        spent = c.execute('''
-            SELECT COALESCE(SUM(amount), 0) as total
-            FROM transactions 
-            WHERE user_id = ? 
-            AND category = ? 
-            AND strftime('%Y-%m', date) = ?
-            AND type = 'expense'
-        ''', (current_user.id, category, current_month)).fetchone()['total']
-        
-        total_spent += spent
-        
-        # Calculate percentage and determine status
-        percentage = (spent / budget_amount * 100) if budget_amount > 0 else 0
-        remaining = budget_amount - spent
-        
-        # Determine color and status based on percentage
-        if percentage <= 50:
-            color = 'success'  # Green
-            status = 'On Track'
-        elif percentage <= 80:
-            color = 'warning'  # Yellow
-            status = 'Caution'
-        elif percentage <= 100:
-            color = 'danger-orange'  # Orange
-            status = 'Warning'
-        else:
-            color = 'danger'  # Red
-            status = 'Over Budget!'
-        
-        progress_data.append({
-            'category': category,
-            'budget_amount': budget_amount,
-            'spent': spent,
-            'remaining': remaining,
-            'percentage': min(percentage, 100),  # Cap at 100% for display
-            'actual_percentage': percentage,  # Actual percentage for data
-            'color': color,
-            'status': status,
-            'is_over': spent > budget_amount
-        })
+    # Spending for every category (cached per user-month)
+    progress_data = get_cached_progress(current_user.id, current_month)
     
     # Sort by percentage (highest first)
     progress_data.sort(key=lambda x: x['actual_percentage'], reverse=True)
     
     # Calculate overall statistics
-    overall_percentage = (total_spent / total_budget * 100) if total_budget > 0 else 0
-    
-    stats = {
-        'total_budget': total_budget,
-        'total_spent': total_spent,
-        'total_remaining': total_budget - total_spent,
-        'overall_percentage': overall_percentage,
-        'categories_over_budget': sum(1 for p in progress_data if p['is_over']),
-        'categories_on_track': sum(1 for p in progress_data if p['percentage'] <= 50)
-    }
-    
-    conn.close()
+    stats = summarize_progress(progress_data)
     
     return render_template('budget/progress.html', 
                          progress_data=progress_data,
@@ -279,118 +300,303 @@ def budget_progress():
                          current_month=current_month,
                          month_name=calendar.month_name[datetime.now().month])
 
+@budget_bp.route('/progress.<any(png, svg):fmt>')
+@login_required
+def budget_progress_chart(fmt):
+    """Budget progress bars as a PNG or SVG image (ETag / If-None-Match aware)"""
+    month = request.args.get('month') or datetime.now().strftime('%Y-%m')
+    try:
+        datetime.strptime(month, '%Y-%m')
+    except ValueError:
+        return jsonify({'error': 'month must be YYYY-MM'}), 400
+    
+    progress_data = get_cached_progress(current_user.id, month)
+    version = data_version(progress_data, month)
+    etag = f'{fmt}-{version}'
+    
+    # Unchanged since the client's copy: no lookup, no render, no body
+    if etag in request.if_none_match:
+        response = Response(status=304)
+    else:
+        cache = get_chart_cache()
+        key = (current_user.id, month, fmt, version)
+        chart = cache.get(key)
+        if chart is None:
+            try:
+                # Matplotlib is imported on the first render
+                chart = render_progress_chart(progress_data, fmt, f'Budget Progress {month}')
+            except ImportError:
+                return jsonify({'error': 'Charts require matplotlib to be installed'}), 503
+            cache.set(key, chart)
+        response = Response(chart, mimetype=CHART_FORMATS[fmt])
+    
+    response.set_etag(etag)
+    # Clients may keep the image but must revalidate it (a cheap 304) before reuse
+    response.headers['Cache-Control'] = 'private, no-cache'
+    return response
+
 @budget_bp.route('/api/progress/<category>')
 @login_required
 def api_budget_progress(category):
     """API endpoint for getting budget progress for a specific category"""
-    conn = get_db_connection()
-    c = conn.cursor()
-    
     current_month = datetime.now().strftime('%Y-%m')
     
-    # Get budget for category
-    budget = c.execute('''
-        SELECT amount FROM budgets 
-        WHERE user_id = ? AND category = ? AND month = ?
-    ''', (current_user.id, category, current_month)).fetchone()
+    # Get budget and spending for category
+    progress_data = [p for p in get_cached_progress(current_user.id, current_month)
+                     if p['category'] == category]
     
-    if not budget:
+    if not progress_data:
         return jsonify({'error': 'Budget not found'}), 404
     
-    budget_amount = budget['amount']
+    return jsonify(progress_api_row(progress_data[0]))
+
+# Largest month span the batch API will answer in one call
+MAX_BATCH_MONTHS = 36
+
+def parse_months(value):
+    """Parse 'YYYY-MM..YYYY-MM' or 'YYYY-MM,YYYY-MM' into a list of months"""
+    if not value:
+        return [datetime.now().strftime('%Y-%m')]
+    
+    # check_month, not strptime: '2025-1' would match no stored month
+    if '..' in value:
+        first, last = (check_month(month.strip()) for month in value.split('..', 1))
+        return month_range(first, last)
+    
+    months = [check_month(month.strip()) for month in value.split(',') if month.strip()]
+    return sorted(set(months))
+
+@budget_bp.route('/api/progress')
+@login_required
+def api_batch_progress():
+    """API endpoint for progress of many categories x months in one call"""
+    try:
+        months = parse_months(request.args.get('months'))
+    except ValueError:
+        return jsonify({'error': 'months must look like 2025-01..2025-12 or 2025-01,2025-02'}), 400
     
-    # Get spending
-    spent = c.execute('''
-        SELECT COALESCE(SUM(amount), 0) as total
-        FROM transactions 
-        WHERE user_id = ? AND category = ? 
-        AND strftime('%Y-%m', date) = ? AND type = 'expense'
-    ''', (current_user.id, category, current_month)).fetchone()['total']
+    if not months or len(months) > MAX_BATCH_MONTHS:
+        return jsonify({'error': f'Request between 1 and {MAX_BATCH_MONTHS} months'}), 400
     
-    conn.close()
+    categories = [category.strip() for category in request.args.get('categories', '').split(',')
+                  if category.strip()]
+    
+    cells = get_progress_matrix(get_db_connection(), current_user.id, months, categories)
+    
+    if not categories:
+        categories = sorted({category for category, _ in cells})
     
-    percentage = (spent / budget_amount * 100) if budget_amount > 0 else 0
+    # One row per category, one column per month; null where no budget is set
+    def matrix(field):
+        return [[cells[(category, month)][field] if (category, month) in cells else None
+                 for month in months]
+                for category in categories]
     
     return jsonify({
-        'category': category,
-        'budget': budget_amount,
-        'spent': spent,
-        'remaining': budget_amount - spent,
-        'percentage': percentage,
-        'status': 'over' if spent > budget_amount else 'ok'
+        'months': months,
+        'categories': categories,
+        'budget': matrix('budget_amount'),
+        'spent': matrix('spent'),
+        'remaining': matrix('remaining'),
+        'percentage': matrix('actual_percentage'),
+        'status': [[('over' if cells[(category, month)]['is_over'] else 'ok')
+                    if (category, month) in cells else None
+                    for month in months]
+                   for category in categories]
     })
 
+MAX_TREND_MONTHS = 60
+
+@budget_bp.route('/trends')
+@login_required
+def budget_trends():
+    """API endpoint for multi-month spending trends and an end-of-month forecast"""
+    try:
+        # NumPy is only needed here, so import it on first use
+        from budget_analytics import compute_trends, trends_as_json, DEFAULT_WINDOW
+    except ImportError:
+        return jsonify({'error': 'Trends require numpy to be installed'}), 503
+    
+    end_month = request.args.get('month') or datetime.now().strftime('%Y-%m')
+    try:
+        datetime.strptime(end_month, '%Y-%m')
+        months = int(request.args.get('months', 12))
+        window = int(request.args.get('window', DEFAULT_WINDOW))
+    except ValueError:
+        return jsonify({'error': 'month must be YYYY-MM; months and window must be integers'}), 400
+    
+    if not 1 <= months <= MAX_TREND_MONTHS or not 1 <= window <= months:
+        return jsonify({'error': f'months must be 1-{MAX_TREND_MONTHS} and window 1-months'}), 400
+    
+    trends = compute_trends(get_db_connection(), current_user.id, end_month, months, window)
+    return jsonify(trends_as_json(trends))
+
 @budget_bp.route('/alerts')
 @login_required
 def budget_alerts():
     """Get budget alerts for categories approaching or exceeding limits"""
-    conn = get_db_connection()
-    c = conn.cursor()
-    
     current_month = datetime.now().strftime('%Y-%m')
     
     # Get all budgets with spending > 80%
-    alerts = c.execute('''
-        SELECT 
-            b.category,
-            b.amount as budget_amount,
-            COALESCE(SUM(t.amount), 0) as spent,
-            (COALESCE(SUM(t.amount), 0) / b.amount * 100) as percentage
-        FROM budgets b
-        LEFT JOIN transactions t ON 
-            t.user_id = b.user_id AND 
-            t.category = b.category AND 
-            strftime('%Y-%m', t.date) = b.month AND
-            t.type = 'expense'
-        WHERE b.user_id = ? AND b.month = ?
-        GROUP BY b.category, b.amount
-        HAVING percentage > 80
-        ORDER BY percentage DESC
-    ''', (current_user.id, current_month)).fetchall()
+    alert_list = build_alerts(get_cached_progress(current_user.id, current_month))
     
-    conn.close()
+    return jsonify(alert_list)
+
+@budget_bp.route('/alerts/stream')
+@login_required
+def budget_alerts_stream():
+    """
+    Server-sent events: the current alerts, then new ones whenever a
+    threshold is crossed. The stream closes after ALERT_STREAM_MAX_SECONDS
+    so it does not hold a worker thread forever; EventSource reconnects.
+    """
+    current_month = datetime.now().strftime('%Y-%m')
+    user_id = current_user.id
+    broker = get_alert_broker()
+    keepalive = current_app.config.get('ALERT_STREAM_KEEPALIVE', DEFAULT_KEEPALIVE)
+    deadline = time.monotonic() + current_app.config.get('ALERT_STREAM_MAX_SECONDS',
+                                                         DEFAULT_MAX_STREAM_SECONDS)
+    
+    alert_list = build_alerts(get_cached_progress(user_id, current_month))
+    subscription = broker.subscribe(user_id, current_month, alert_list)
+    event_id = broker.current_event_id(user_id)
+    
+    def events():
+        yield f"retry: {int(keepalive * 1000)}\n" + format_event(alert_list, event_id)
+        while (remaining := deadline - time.monotonic()) > 0:
+            item = subscription.get(timeout=min(keepalive, remaining))
+            if item is None:
+                yield ": keep-alive\n\n"
+            else:
+                yield format_event(item[1], item[0])
     
-    alert_list = []
-    for alert in alerts:
-        if alert['percentage'] > 100:
-            level = 'danger'
-            message = f"Over budget by ${alert['spent'] - alert['budget_amount']:.2f}"
-        elif alert['percentage'] > 90:
-            level = 'warning'
-            message = f"Only ${alert['budget_amount'] - alert['spent']:.2f} remaining"
-        else:
-            level = 'info'
-            message = f"{alert['percentage']:.0f}% of budget used"
-        
-        alert_list.append({
-            'category': alert['category'],
-            'level': level,
-            'message': message,
-            'percentage': alert['percentage']
-        })
+    response = Response(events(), mimetype='text/event-stream',
+                        headers={'Cache-Control': 'no-cache', 'X-Accel-Buffering': 'no'})
+    # Runs when the client disconnects, even before the first event was sent
+    response.call_on_close(lambda: broker.unsubscribe(subscription))
+    return response
+
+@budget_bp.route('/import', methods=['POST'])
+@login_required
+def import_transactions():
+    """Bulk import the logged-in user's transactions from an uploaded CSV/JSONL file"""
+    upload = request.files.get('file')
+    if not upload:
+        return jsonify({'error': 'Upload a CSV or JSONL file in the "file" field'}), 400
     
-    return jsonify(alert_list)
+    try:
+        result = import_upload(get_db_connection(), upload, current_user.id)
+    except ValueError as e:
+        return jsonify({'error': str(e)}), 400
+    
+    for user_id, month in result.user_months:
+        invalidate_progress(user_id, month)
+    
+    return jsonify(result.as_dict())
+
+@budget_bp.route('/api/budgets', methods=['POST'])
+@login_required
+def api_upsert_budgets():
+    """Bulk set budgets from a JSON sheet of {category, month, amount} rows in one transaction"""
+    data = request.get_json(silent=True)
+    if not isinstance(data, dict):
+        return jsonify({'error': 'Send a JSON object like {"budgets": [...]}'}), 400
+    sheet = data.get('budgets')
+    if not isinstance(sheet, list) or not 1 <= len(sheet) <= MAX_SHEET_ROWS:
+        return jsonify({'error': f'budgets must be a list of 1-{MAX_SHEET_ROWS} rows'}), 400
+    
+    # All or nothing: report every bad row and write none
+    rows, errors = [], []
+    for position, row in enumerate(sheet):
+        try:
+            rows.append(validate_budget_row(row))
+        except ValueError as e:
+            errors.append({'row': position, 'error': str(e)})
+    if errors:
+        return jsonify({'error': 'Invalid budget rows', 'errors': errors}), 400
+    
+    # Budgets are set on existing categories only
+    conn = get_db_connection()
+    category_ids = get_category_cache().ids_for(conn, {row[0] for row in rows})
+    errors = [{'row': position, 'error': f'unknown category: {row[0]}'}
+              for position, row in enumerate(rows) if row[0] not in category_ids]
+    if errors:
+        return jsonify({'error': 'Invalid budget rows', 'errors': errors}), 400
+    months = upsert_budgets(conn, current_user.id, rows, category_ids)
+    for month in months:
+        invalidate_progress(current_user.id, month)
+    
+    return jsonify({'written': len(rows), 'months': months})
+
+@budget_bp.route('/api/budgets/copy', methods=['POST'])
+@login_required
+def api_copy_budgets():
+    """Copy one month's budgets to a range of months (existing budgets kept unless overwrite)"""
+    data = request.get_json(silent=True)
+    if not isinstance(data, dict):
+        return jsonify({'error': 'Send a JSON object like {"from": "2025-01", "to": "2025-02..2025-12"}'}), 400
+    source_month = data.get('from')
+    try:
+        check_month(source_month)
+        months = parse_months(data.get('to'))
+    except (AttributeError, TypeError, ValueError):
+        return jsonify({'error': 'from must be YYYY-MM and to like 2025-02..2025-12 or 2025-02,2025-03'}), 400
+    
+    if not data.get('to') or len(months) > MAX_BATCH_MONTHS:
+        return jsonify({'error': f'Copy to between 1 and {MAX_BATCH_MONTHS} months'}), 400
+    
+    copied = copy_budgets(get_db_connection(), current_user.id, source_month, months,
+                          overwrite=bool(data.get('overwrite')))
+    for month in months:
+        invalidate_progress(current_user.id, month)
+    
+    return jsonify({'copied': copied, 'months': months})
+
+@budget_bp.route('/api/categories')
+@login_required
+def api_categories():
+    """API endpoint for category ids, names, icons and colors (from the cache)"""
+    type_ = request.args.get('type')
+    if type_ not in (None, 'income', 'expense'):
+        return jsonify({'error': 'type must be income or expense'}), 400
+    
+    return jsonify({'categories': get_category_cache().all(get_db_connection(), type_)})
+
+@budget_bp.cli.command('add-category')
+@click.argument('names', nargs=-1, required=True)
+@click.option('--type', 'type_', type=click.Choice(['income', 'expense', 'both']), default='expense')
+def add_category_command(names, type_):
+    """Create categories (users can only pick existing ones)"""
+    conn = get_db_connection()
+    with conn:
+        ids = ensure_category_ids(conn, names, type_)
+    conn.close()
+    for name in names:
+        click.echo(f"✅ {name} (id {ids[name]})")
+
+@budget_bp.route('/api/cache/stats')
+@login_required
+def api_cache_stats():
+    """API endpoint for progress cache hit/miss/eviction counters"""
+    return jsonify(get_progress_cache().stats())
 
 # Helper function for other modules
 def get_budget_summary(user_id, month=None):
     """Get budget summary for a user"""
     if month is None:
         month = datetime.now().strftime('%Y-%m')
-    
+
+    summaries = get_budget_summaries([month], [user_id])
+    return summaries.get((user_id, month), summary_dict(0, None, None, None))
+
+def get_budget_summaries(months, user_ids=None):
+    """
+    Get budget summaries for many users and months in one query, as
+    {(user_id, month): summary}. Reports over all users should call this
+    once instead of get_budget_summary per user.
+    """
     conn = get_db_connection()
-    c = conn.cursor()
-    
-    summary = c.execute('''
-        SELECT 
-            COUNT(*) as total_categories,
-            SUM(amount) as total_budget,
-            MIN(amount) as min_budget,
-            MAX(amount) as max_budget,
-            AVG(amount) as avg_budget
-        FROM budgets 
-        WHERE user_id = ? AND month = ?
-    ''', (user_id, month)).fetchone()
-    
-    conn.close()
-    
-    return dict(summary) if summary else None
+    try:
+        return load_budget_summaries(conn, months, user_ids)
+    finally:
+        conn.close()
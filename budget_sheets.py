@@ -0,0 +1,93 @@
+# budget_sheets.py - Bulk Budget Writes
+# Personal Finance Tracker - My Paldea
+# Course: IST 303 Fall 2025
+#
+# Budgets are written with one INSERT ... ON CONFLICT DO UPDATE per row on
+# the UNIQUE(user_id, category_id, month) constraint, so there is no
+# SELECT-then-INSERT race between concurrent submits. A whole sheet (a
+# month or a year of categories) is validated first and written with
+# executemany in one transaction; copying a month's budgets forward is a
+# single INSERT ... SELECT.
+
+from budget_engine import check_month
+from categories import lookup_category_ids
+from money import to_cents
+
+# Largest sheet accepted in one request (e.g. 5 years x 80 categories)
+MAX_SHEET_ROWS = 5000
+
+UPSERT_BUDGET_SQL = '''
+    INSERT INTO budgets (user_id, category_id, amount_cents, month)
+    VALUES (?, ?, ?, ?)
+    ON CONFLICT (user_id, category_id, month) DO UPDATE SET
+        amount_cents = excluded.amount_cents,
+        updated_at = CURRENT_TIMESTAMP
+'''
+
+# Copy one month's budgets to every target month in one statement. The
+# WHERE clause is required: without it SQLite would read ON CONFLICT as a
+# join constraint.
+COPY_BUDGETS_SQL = '''
+    INSERT INTO budgets (user_id, category_id, amount_cents, month)
+    SELECT b.user_id, b.category_id, b.amount_cents, targets.column1
+    FROM budgets b CROSS JOIN (VALUES {month_placeholders}) AS targets
+    WHERE b.user_id = ? AND b.month = ?
+    ON CONFLICT (user_id, category_id, month) DO {on_conflict}
+'''
+
+KEEP_EXISTING = 'NOTHING'
+OVERWRITE_EXISTING = '''UPDATE SET
+        amount_cents = excluded.amount_cents,
+        updated_at = CURRENT_TIMESTAMP'''
+
+def validate_budget_row(row):
+    """Return (category, month, amount_cents) for one sheet row, or raise ValueError"""
+    if not isinstance(row, dict):
+        raise ValueError('row is not an object')
+
+    category = str(row.get('category') or '').strip()
+    if not category:
+        raise ValueError('category is required')
+
+    month = check_month(str(row.get('month') or '').strip())
+
+    # to_cents says whether the amount is not a number or out of range
+    amount_cents = to_cents(row.get('amount'))
+    if amount_cents <= 0:
+        raise ValueError('amount must be greater than 0')
+
+    return category, month, amount_cents
+
+def upsert_budgets(conn, user_id, rows, category_ids=None):
+    """
+    Insert or update (category, month, amount_cents) rows for a user in one
+    transaction (category_ids may map names already resolved, e.g. by a
+    CategoryCache). Returns the months written. Raises ValueError, writing
+    nothing, if a category does not exist.
+    """
+    category_ids = dict(category_ids or {})
+    with conn:
+        category_ids.update(lookup_category_ids(
+            conn, {category for category, _, _ in rows if category not in category_ids}))
+        unknown = sorted({category for category, _, _ in rows if category not in category_ids})
+        if unknown:
+            raise ValueError(f"unknown categories: {', '.join(unknown)}")
+        conn.executemany(UPSERT_BUDGET_SQL, ((user_id, category_ids[category], amount_cents, month)
+                                             for category, month, amount_cents in rows))
+    return sorted({month for _, month, _ in rows})
+
+def copy_budgets(conn, user_id, source_month, target_months, overwrite=False):
+    """
+    Copy a user's budgets for source_month to each target month (one
+    statement). Existing budgets are kept unless overwrite is set.
+    Returns the number of budget rows written.
+    """
+    target_months = [month for month in target_months if month != source_month]
+    if not target_months:
+        return 0
+
+    sql = COPY_BUDGETS_SQL.format(month_placeholders=', '.join(['(?)'] * len(target_months)),
+                                  on_conflict=OVERWRITE_EXISTING if overwrite else KEEP_EXISTING)
+    with conn:
+        cursor = conn.execute(sql, (*target_months, user_id, source_month))
+    return cursor.rowcount
@@ -0,0 +1,193 @@
+#!/usr/bin/env python3
+"""
+Budget Summary Snapshots
+Personal Finance Tracker - My Paldea
+Course: IST 303 Fall 2025
+
+budget_month_summary keeps one row per (month, user) with the count, total,
+smallest and largest of that user's budgets (in cents). Triggers on budgets
+recompute the row from the user-month's budgets (a few dozen rows on
+idx_budget_user_month) whenever one is inserted, updated or deleted, so
+summaries for any number of users are a keyed read of the snapshot instead
+of an aggregate over budgets per user.
+
+load_budget_summaries() returns summaries for many users and months in one
+query, from the snapshot or (from_snapshot=False) straight from budgets.
+
+Usage:
+    python budget_summaries.py verify  [--database finance.db]   # report drift
+    python budget_summaries.py rebuild [--database finance.db]   # recompute from scratch
+"""
+
+import argparse
+import json
+import os
+import sqlite3
+import sys
+
+from money import cents_to_float
+
+# (month, user_id) first: one month for every user is a range scan, and one
+# user-month is a point lookup
+SUMMARY_TABLE_SQL = '''
+    CREATE TABLE IF NOT EXISTS budget_month_summary (
+        month TEXT NOT NULL,
+        user_id INTEGER NOT NULL,
+        budget_count INTEGER NOT NULL,
+        total_cents INTEGER NOT NULL,
+        min_cents INTEGER NOT NULL,
+        max_cents INTEGER NOT NULL,
+        PRIMARY KEY (month, user_id)
+    )
+'''
+
+# Aggregate of budgets, optionally for one user-month or user range
+AGGREGATE_SQL = '''
+    SELECT month, user_id, COUNT(*), SUM(amount_cents), MIN(amount_cents), MAX(amount_cents)
+    FROM budgets
+    {where}
+    GROUP BY user_id, month
+'''
+
+# Replace one user-month's row; no budgets left means no row
+def _refresh_row(ref):
+    return f'''
+        DELETE FROM budget_month_summary WHERE month = {ref}.month AND user_id = {ref}.user_id;
+        INSERT INTO budget_month_summary (month, user_id, budget_count, total_cents, min_cents, max_cents)
+        {AGGREGATE_SQL.format(where=f'WHERE user_id = {ref}.user_id AND month = {ref}.month')};
+'''
+
+# One statement each, so they can be created inside a migration's transaction
+SUMMARY_TRIGGERS = [
+    f'''
+    CREATE TRIGGER IF NOT EXISTS trg_budgets_summary_insert
+    AFTER INSERT ON budgets
+    BEGIN{_refresh_row('NEW')}
+    END
+    ''',
+    f'''
+    CREATE TRIGGER IF NOT EXISTS trg_budgets_summary_delete
+    AFTER DELETE ON budgets
+    BEGIN{_refresh_row('OLD')}
+    END
+    ''',
+    f'''
+    CREATE TRIGGER IF NOT EXISTS trg_budgets_summary_update
+    AFTER UPDATE OF user_id, month, amount_cents ON budgets
+    BEGIN{_refresh_row('OLD')}{_refresh_row('NEW')}
+    END
+    ''',
+]
+
+SNAPSHOT_SQL = '''
+    SELECT month, user_id, budget_count, total_cents, min_cents, max_cents
+    FROM budget_month_summary
+    WHERE month IN (SELECT value FROM json_each(?)) {user_filter}
+'''
+
+# Users and months are passed as one JSON array each, so a nightly report
+# over 100k users is not limited by SQLite's bound-parameter cap
+USER_FILTER = 'AND user_id IN (SELECT value FROM json_each(?))'
+
+def init_summary_tables(conn, backfill=True):
+    """Create the snapshot table and its triggers, backfilling on first creation"""
+    exists = conn.execute('''
+        SELECT 1 FROM sqlite_master
+        WHERE type = 'table' AND name = 'budget_month_summary'
+    ''').fetchone()
+
+    conn.execute(SUMMARY_TABLE_SQL)
+    for trigger in SUMMARY_TRIGGERS:
+        conn.execute(trigger)
+
+    if backfill and not exists:
+        rebuild_summaries(conn)
+
+def rebuild_summary_users(conn, first_user, last_user):
+    """Recompute the snapshot rows of users first_user..last_user (no commit)"""
+    conn.execute('DELETE FROM budget_month_summary WHERE user_id BETWEEN ? AND ?',
+                 (first_user, last_user))
+    conn.execute(f'''
+        INSERT INTO budget_month_summary (month, user_id, budget_count, total_cents, min_cents, max_cents)
+        {AGGREGATE_SQL.format(where='WHERE user_id BETWEEN ? AND ?')}
+    ''', (first_user, last_user))
+
+def rebuild_summaries(conn):
+    """Recompute the whole snapshot from budgets in one transaction"""
+    with conn:
+        conn.execute('DELETE FROM budget_month_summary')
+        conn.execute(f'''
+            INSERT INTO budget_month_summary (month, user_id, budget_count, total_cents, min_cents, max_cents)
+            {AGGREGATE_SQL.format(where='')}
+        ''')
+
+def summary_dict(budget_count, total_cents, min_cents, max_cents):
+    """The get_budget_summary shape (dollars) for one user-month"""
+    if not budget_count:
+        return {'total_categories': 0, 'total_budget': None, 'min_budget': None,
+                'max_budget': None, 'avg_budget': None}
+    return {
+        'total_categories': budget_count,
+        'total_budget': cents_to_float(total_cents),
+        'min_budget': cents_to_float(min_cents),
+        'max_budget': cents_to_float(max_cents),
+        'avg_budget': cents_to_float(total_cents / budget_count)
+    }
+
+def load_budget_summaries(conn, months, user_ids=None, from_snapshot=True):
+    """
+    Return {(user_id, month): summary} for every user (or only user_ids)
+    with budgets in the months, in one query. User-months without budgets
+    are left out.
+    """
+    params = [json.dumps(list(months))]
+    user_filter = ''
+    if user_ids is not None:
+        user_filter = USER_FILTER
+        params.append(json.dumps(list(user_ids)))
+
+    if from_snapshot:
+        sql = SNAPSHOT_SQL.format(user_filter=user_filter)
+    else:
+        sql = AGGREGATE_SQL.format(where=f'WHERE month IN (SELECT value FROM json_each(?)) {user_filter}')
+    return {(user_id, month): summary_dict(*totals)
+            for month, user_id, *totals in conn.execute(sql, params)}
+
+def verify_summaries(conn):
+    """Compare the snapshot with a fresh aggregate and return the drifted (month, user_id) keys"""
+    expected = {tuple(row[:2]): tuple(row[2:]) for row in conn.execute(AGGREGATE_SQL.format(where=''))}
+    stored = {tuple(row[:2]): tuple(row[2:]) for row in conn.execute('''
+        SELECT month, user_id, budget_count, total_cents, min_cents, max_cents FROM budget_month_summary
+    ''')}
+    return sorted(key for key in set(expected) | set(stored) if expected.get(key) != stored.get(key))
+
+def main(argv=None):
+    """Command-line entry point for verify / rebuild"""
+    parser = argparse.ArgumentParser(description='Verify or rebuild budget summary snapshots')
+    parser.add_argument('command', choices=['verify', 'rebuild'])
+    parser.add_argument('--database', default='finance.db')
+    args = parser.parse_args(argv)
+
+    if not os.path.exists(args.database):
+        print(f"❌ Database not found: {args.database}")
+        return 1
+
+    conn = sqlite3.connect(args.database)
+    init_summary_tables(conn)
+
+    drift = verify_summaries(conn)
+    for month, user_id in drift:
+        print(f"❌ user {user_id} {month}: snapshot does not match budgets")
+    print(f"📊 {len(drift)} drifted summary rows")
+
+    if args.command == 'rebuild':
+        rebuild_summaries(conn)
+        print("✅ Summaries rebuilt from budgets")
+        conn.close()
+        return 0
+
+    conn.close()
+    return 1 if drift else 0
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -0,0 +1,133 @@
+# categories.py - Category IDs and Metadata Cache
+# Personal Finance Tracker - My Paldea
+# Course: IST 303 Fall 2025
+#
+# budgets, transactions and the monthly rollup reference categories.id as
+# an INTEGER foreign key. Names are resolved to ids only at the edges
+# (forms, sheets, imports); queries join on the integer id.
+#
+# Names that come from users must already exist: forms, sheets and uploads
+# reject unknown categories. Only the seed and admin paths create them
+# (init_db.py, generate_data.py, `flask budget add-category`, and
+# importer.py --create-categories), through ensure_category_ids.
+#
+# The app keeps the categories table (names, icons, colors, types) in a
+# CategoryCache. Triggers bump category_version on every change to
+# categories (migration add_category_version), and each lookup reads that
+# one row: the table is reloaded only when it moved, whichever process
+# changed it, after invalidate(), or after the TTL. A name that is not in
+# a current copy does not exist, so misses never reload.
+
+import threading
+import time
+
+DEFAULT_TTL = 300.0  # seconds
+
+VERSION_SQL = 'SELECT version FROM category_version WHERE id = 1'
+
+CATEGORIES_SQL = '''
+    SELECT id, name, icon, color, type
+    FROM categories
+    ORDER BY name
+'''
+
+def load_categories(conn):
+    """Return every category as a dict (id, name, icon, color, type), by name"""
+    return [{'id': row[0], 'name': row[1], 'icon': row[2], 'color': row[3], 'type': row[4]}
+            for row in conn.execute(CATEGORIES_SQL)]
+
+def lookup_category_ids(conn, names):
+    """Return {name: id} for the names that are existing categories"""
+    names = sorted(set(names))
+    if not names:
+        return {}
+    placeholders = ', '.join('?' * len(names))
+    return dict(conn.execute(f'SELECT name, id FROM categories WHERE name IN ({placeholders})',
+                             names).fetchall())
+
+def ensure_category_ids(conn, names, type_='expense'):
+    """
+    Return {name: id} for the names, creating categories that do not
+    exist yet (no commit, so it joins the caller's transaction). For seed
+    and admin paths only; app caches see the new categories once the
+    caller commits.
+    """
+    names = sorted(set(names))
+    if not names:
+        return {}
+    conn.executemany('INSERT OR IGNORE INTO categories (name, type) VALUES (?, ?)',
+                     [(name, type_) for name in names])
+    placeholders = ', '.join('?' * len(names))
+    return dict(conn.execute(f'SELECT name, id FROM categories WHERE name IN ({placeholders})',
+                             names).fetchall())
+
+class CategoryCache:
+    """Thread-safe in-process copy of the categories table"""
+
+    def __init__(self, ttl=DEFAULT_TTL, clock=time.monotonic):
+        self.ttl = ttl
+        self._clock = clock
+        self._lock = threading.Lock()
+        self._categories = None
+        self._by_name = {}
+        self._by_id = {}
+        self._expires_at = 0.0
+        self._version = None
+        self.loads = 0
+
+    def _load(self, conn, version):
+        # version is read before the table, so a change made in between
+        # only costs one more reload
+        categories = load_categories(conn)
+        self._categories = categories
+        self._by_name = {category['name']: category for category in categories}
+        self._by_id = {category['id']: category for category in categories}
+        self._expires_at = self._clock() + self.ttl
+        self._version = version
+        self.loads += 1
+
+    def _current(self, conn):
+        version = conn.execute(VERSION_SQL).fetchone()[0]
+        if self._categories is None or version != self._version or self._clock() >= self._expires_at:
+            self._load(conn, version)
+
+    def invalidate(self):
+        """Reload on the next lookup"""
+        with self._lock:
+            self._categories = None
+
+    def all(self, conn, type_=None):
+        """Every category (optionally only those usable for 'income' or 'expense'), by name"""
+        with self._lock:
+            self._current(conn)
+            categories = self._categories
+        if type_ is None:
+            return list(categories)
+        return [category for category in categories if category['type'] in (type_, 'both')]
+
+    def get(self, conn, category_id):
+        """The category with this id, or None"""
+        with self._lock:
+            self._current(conn)
+            return self._by_id.get(category_id)
+
+    def ids_for(self, conn, names, create=False, type_='expense'):
+        """
+        Return {name: id}. Unknown names are left out, or created when
+        `create` is set (admin paths only; no commit, the next lookup
+        after the caller's commit reloads).
+        """
+        names = set(names)
+        with self._lock:
+            self._current(conn)
+            ids = {name: self._by_name[name]['id'] for name in names if name in self._by_name}
+
+        missing = names - ids.keys()
+        if missing and create:
+            ids.update(ensure_category_ids(conn, missing, type_))
+        return ids
+
+    def stats(self):
+        """Cache size and how often it was loaded"""
+        with self._lock:
+            return {'categories': len(self._by_id), 'loads': self.loads, 'ttl': self.ttl}
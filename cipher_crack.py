@@ -0,0 +1,129 @@
+# cipher_crack.py - Caesar Cipher Cracking
+# Personal Finance Tracker - My Paldea
+# Course: IST 303 Fall 2025
+#
+# Recovers the shift of text encoded with pe3.encode by scoring all 26
+# candidate shifts against English letter frequencies (chi-squared) and
+# decoding with the best one through pe3.decode.
+#
+# No candidate is decoded to be scored. Decoding with shift s only rotates
+# the a-z counts, so each message's letters are counted once (one
+# pe3.decode(text, 0) for pe3's lowercasing, then np.bincount over the
+# whole batch) and the 26 scores of every message in a batch come out of a
+# single (messages x 26) @ (26 x 26) matrix product:
+#
+#     chi2[s] = sum_j (c[j + s] - N f[j])^2 / (N f[j])
+#             = (1 / N) sum_i c[i]^2 / f[i - s]  -  N
+#
+# crack_many() splits large batches into blocks for a ProcessPoolExecutor;
+# crack() counts one very long text in chunks across the same kind of pool.
+
+import os
+from concurrent.futures import ProcessPoolExecutor
+
+import numpy as np
+
+import pe3
+
+# Percentage of each letter a-z in English text
+_PERCENTAGES = np.array([
+    8.167, 1.492, 2.782, 4.253, 12.702, 2.228, 2.015, 6.094, 6.966, 0.153, 0.772, 4.025, 2.406,
+    6.749, 7.507, 1.929, 0.095, 5.987, 6.327, 9.056, 2.758, 0.978, 2.360, 0.150, 1.974, 0.074,
+])
+# Normalized to sum to exactly 1, which the expanded chi-squared formula relies on
+ENGLISH_FREQUENCIES = _PERCENTAGES / _PERCENTAGES.sum()
+
+# _INVERSE_FREQUENCY[i, s]: 1 / the frequency of the letter ciphertext letter i decodes to under shift s
+_INVERSE_FREQUENCY = 1 / ENGLISH_FREQUENCIES[(np.arange(26)[:, None] - np.arange(26)[None, :]) % 26]
+
+# Messages per block handed to a worker by crack_many
+DEFAULT_BATCH_MESSAGES = 10_000
+
+# crack() counts a text this many characters at a time (chunks are spread over
+# the pool); cache-sized chunks make np.bincount about twice as fast
+DEFAULT_CHUNK_CHARS = 1_000_000
+
+def all_shifts(text):
+    """Return the 26 candidate plaintexts, decode(text, 0) ... decode(text, 25)"""
+    return [pe3.decode(text, shift) for shift in range(26)]
+
+def _letter_codes(text):
+    """uint8 array of text after pe3's lowercasing: one byte per character, a-z as 97-122"""
+    # Non-ASCII characters left by decode (never letters) become '?', keeping one byte per character
+    return np.frombuffer(pe3.decode(text, 0).encode('ascii', 'replace'), dtype=np.uint8)
+
+def letter_counts(messages):
+    """Return a (len(messages), 26) array of each message's a-z counts"""
+    lengths = np.fromiter(map(len, messages), dtype=np.int64, count=len(messages))
+    codes = _letter_codes(''.join(messages))
+    letters = (codes >= 97) & (codes <= 122)
+    message_ids = np.repeat(np.arange(len(messages)), lengths)
+    flat = message_ids[letters] * 26 + (codes[letters] - 97)
+    return np.bincount(flat, minlength=len(messages) * 26).reshape(len(messages), 26)
+
+def text_letter_counts(text):
+    """Return the a-z counts of one text as a length-26 array"""
+    return np.bincount(_letter_codes(text), minlength=256)[97:123]
+
+def chi_squared(counts):
+    """
+    Return the chi-squared score of every shift for every row of counts
+    ((messages, 26) -> (messages, 26)); lower is more English-like.
+    Messages without letters score 0 for every shift.
+    """
+    counts = np.atleast_2d(counts).astype(np.float64)
+    totals = counts.sum(axis=1, keepdims=True)
+    with np.errstate(divide='ignore', invalid='ignore'):
+        scores = (counts ** 2 @ _INVERSE_FREQUENCY) / totals - totals
+    return np.where(totals > 0, scores, 0.0)
+
+def rank_shifts(text):
+    """Return [(shift, score)] for all 26 shifts, most likely first"""
+    scores = chi_squared(text_letter_counts(text))[0]
+    return [(int(shift), float(scores[shift])) for shift in np.argsort(scores, kind='stable')]
+
+def crack_batch(messages, plaintext=True):
+    """
+    Crack a list of messages in this process; returns one
+    {'shift', 'score', 'plaintext'} dict per message ('plaintext' only if asked).
+    """
+    if not messages:
+        return []
+    scores = chi_squared(letter_counts(messages))
+    shifts = scores.argmin(axis=1)
+    best = scores[np.arange(len(messages)), shifts]
+    results = [{'shift': int(shift), 'score': float(score)} for shift, score in zip(shifts, best)]
+    if plaintext:
+        for result, message in zip(results, messages):
+            result['plaintext'] = pe3.decode(message, result['shift'])
+    return results
+
+def _pool_map(func, items, workers):
+    """map() over items on a process pool, or in this process for one worker or item"""
+    if workers == 1 or len(items) <= 1:
+        return [func(*item) for item in items]
+    with ProcessPoolExecutor(max_workers=min(workers, len(items))) as executor:
+        return list(executor.map(func, *zip(*items)))
+
+def crack_many(messages, workers=None, batch_messages=DEFAULT_BATCH_MESSAGES, plaintext=True):
+    """
+    Crack every message, in blocks of batch_messages spread over a process
+    pool (workers defaults to one per CPU; a single block runs in this
+    process). Returns crack_batch's dicts in message order.
+    """
+    workers = workers or os.cpu_count() or 1
+    messages = list(messages)
+    blocks = [(messages[i:i + batch_messages], plaintext) for i in range(0, len(messages), batch_messages)]
+    return [result for block in _pool_map(crack_batch, blocks, workers) for result in block]
+
+def crack(text, workers=None, chunk_chars=DEFAULT_CHUNK_CHARS):
+    """
+    Return {'shift', 'score', 'plaintext'} for one text. Texts longer than
+    chunk_chars are counted chunk by chunk across a process pool.
+    """
+    workers = workers or os.cpu_count() or 1
+    chunks = [(text[i:i + chunk_chars],) for i in range(0, len(text), chunk_chars)]
+    counts = sum(_pool_map(text_letter_counts, chunks, workers), np.zeros(26, dtype=np.int64))
+    scores = chi_squared(counts)[0]
+    shift = int(scores.argmin())
+    return {'shift': shift, 'score': float(scores[shift]), 'plaintext': pe3.decode(text, shift)}
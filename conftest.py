@@ -0,0 +1,52 @@
+# conftest.py - Shared Test Fixtures and Helpers
+# Course: IST 303 Fall 2025
+
+import sqlite3
+
+import pytest
+
+# Tests build their apps with the application factory
+from app import create_app
+from budget_routes import init_budget_tables
+from categories import ensure_category_ids
+from db import close_all_pools
+
+def create_test_app(**config):
+    """Create Flask app for testing"""
+    app = create_app({'SECRET_KEY': 'test-secret-key', 'TESTING': True, **config})
+
+    # Unauthenticated requests redirect to a stub login page
+    app.login_manager.login_view = 'login'
+    app.add_url_rule('/login', 'login', lambda: 'Login page')
+    return app
+
+def category_id(conn, name):
+    """Id of a category, created if needed (budgets and transactions store ids)"""
+    return ensure_category_ids(conn, [name])[name]
+
+def seed_progress_data(conn, categories, month='2025-10'):
+    """Insert a $100.00 budget and $75.00 of spending per category"""
+    c = conn.cursor()
+    for category in categories:
+        c.execute('''
+            INSERT INTO budgets (user_id, category_id, amount_cents, month)
+            VALUES (1, ?, 10000, ?)
+        ''', (category_id(conn, category), month))
+        c.execute('''
+            INSERT INTO transactions (user_id, category_id, amount_cents, date, type)
+            VALUES (1, ?, 7500, ?, 'expense')
+        ''', (category_id(conn, category), month + '-15'))
+    conn.commit()
+
+@pytest.fixture
+def conn(tmp_path, monkeypatch):
+    """Migrated finance.db in a temporary directory; Rent is added to the default categories"""
+    monkeypatch.chdir(tmp_path)
+    init_budget_tables()
+    close_all_pools()
+    conn = sqlite3.connect('finance.db')
+    with conn:
+        ensure_category_ids(conn, ['Food', 'Rent'])
+    yield conn
+    conn.close()
+    close_all_pools()
@@ -0,0 +1,177 @@
+# db.py - Pooled SQLite Connections
+# Personal Finance Tracker - My Paldea
+# Course: IST 303 Fall 2025
+#
+# Connections are opened once, configured with the startup PRAGMAs once,
+# and then reused. Inside a Flask app context get_db_connection() hands out
+# one connection per context and the app-context teardown returns it to the
+# pool. Outside an app context (scripts, helpers, tests) the caller gets a
+# connection whose close() returns it to the pool.
+#
+# Pooled connections use sql_metrics.InstrumentedCursor, so every statement
+# is counted and timed for the per-request X-DB-* headers.
+
+import os
+import queue
+import sqlite3
+import threading
+
+from flask import current_app, g, has_app_context
+
+from sql_metrics import InstrumentedCursor
+
+DEFAULT_DATABASE = 'finance.db'
+
+# Applied once when a pooled connection is opened
+DEFAULT_PRAGMAS = {
+    'journal_mode': 'WAL',
+    'synchronous': 'NORMAL',
+    'cache_size': -16000,       # negative = KiB, so ~16 MB of page cache
+    'mmap_size': 134217728,     # 128 MB
+    'temp_store': 'MEMORY',
+    'busy_timeout': 5000,       # ms to wait on a locked database
+}
+
+# Connections that serve read-only request paths (see budget_async.py)
+READER_PRAGMAS = dict(DEFAULT_PRAGMAS, query_only='ON')
+
+DEFAULT_POOL_SIZE = 8
+
+class PooledConnection(sqlite3.Connection):
+    """sqlite3 connection whose close() hands it back to its pool"""
+
+    pool = None
+    checked_out = False
+    lease = 0
+
+    def cursor(self, factory=InstrumentedCursor):
+        return super().cursor(factory)
+
+    # Connection.execute() does not go through cursor(), so route it explicitly
+    def execute(self, sql, parameters=()):
+        return self.cursor().execute(sql, parameters)
+
+    def executemany(self, sql, seq_of_parameters):
+        return self.cursor().executemany(sql, seq_of_parameters)
+
+    def close(self):
+        """Return the connection to its pool (or really close it if unpooled)"""
+        if self.pool is None:
+            super().close()
+        else:
+            self.pool.release(self)
+
+    def discard(self):
+        """Close the underlying connection for good"""
+        self.pool = None
+        super().close()
+
+class ConnectionPool:
+    """Bounded pool of configured connections to one database file"""
+
+    def __init__(self, database, pragmas=None, size=DEFAULT_POOL_SIZE):
+        self.database = database
+        self.pragmas = dict(DEFAULT_PRAGMAS if pragmas is None else pragmas)
+        self._idle = queue.LifoQueue(maxsize=size)
+        self._lock = threading.Lock()
+        self.opened = 0
+        self.on_connect = []  # callables run on every newly opened connection
+
+    def _connect(self):
+        """Open a new connection and apply the startup PRAGMAs"""
+        conn = sqlite3.connect(self.database, factory=PooledConnection,
+                               check_same_thread=False)
+        conn.row_factory = sqlite3.Row
+        for name, value in self.pragmas.items():
+            conn.execute(f'PRAGMA {name} = {value}')
+        for hook in self.on_connect:
+            hook(conn)
+        conn.pool = self
+        self.opened += 1
+        return conn
+
+    def acquire(self):
+        """Take an idle connection, or open a new one if none are idle"""
+        try:
+            conn = self._idle.get_nowait()
+        except queue.Empty:
+            conn = self._connect()
+        with self._lock:
+            conn.checked_out = True
+            conn.lease += 1
+        return conn
+
+    def release(self, conn, lease=None):
+        """Put a checked-out connection back in the pool"""
+        with self._lock:
+            # Ignore double releases and stale leases from an earlier checkout
+            if not conn.checked_out or (lease is not None and lease != conn.lease):
+                return
+            conn.checked_out = False
+
+        if conn.in_transaction:
+            conn.rollback()
+        try:
+            self._idle.put_nowait(conn)
+        except queue.Full:
+            conn.discard()
+
+    def close_all(self):
+        """Close every idle connection"""
+        while True:
+            try:
+                self._idle.get_nowait().discard()
+            except queue.Empty:
+                break
+
+_pools = {}
+_pools_lock = threading.Lock()
+
+def get_pool(database=None):
+    """Get the pool for a database path (the app's DATABASE setting by default)"""
+    pragmas = None
+    size = DEFAULT_POOL_SIZE
+    if has_app_context():
+        database = database or current_app.config.get('DATABASE', DEFAULT_DATABASE)
+        pragmas = current_app.config.get('SQLITE_PRAGMAS')
+        size = current_app.config.get('SQLITE_POOL_SIZE', DEFAULT_POOL_SIZE)
+    database = database or DEFAULT_DATABASE
+
+    # Key by absolute path so a relative 'finance.db' follows the working directory
+    key = database if database == ':memory:' else os.path.abspath(database)
+    with _pools_lock:
+        pool = _pools.get(key)
+        if pool is None:
+            pool = _pools[key] = ConnectionPool(key, pragmas, size)
+    return pool
+
+def get_db_connection():
+    """Get a pooled database connection (one per Flask app context)"""
+    if not has_app_context():
+        return get_pool().acquire()
+
+    conn = g.get('_db_conn')
+    if conn is None or not conn.checked_out or conn.lease != g._db_lease:
+        conn = get_pool().acquire()
+        g._db_conn = conn
+        g._db_lease = conn.lease
+    return conn
+
+def release_db_connection(exception=None):
+    """App-context teardown: return this context's connection to the pool"""
+    conn = g.pop('_db_conn', None)
+    lease = g.pop('_db_lease', None)
+    if conn is not None and conn.pool is not None:
+        conn.pool.release(conn, lease)
+
+def init_app(app):
+    """Register the pool teardown on a Flask app"""
+    app.teardown_appcontext(release_db_connection)
+
+def close_all_pools():
+    """Close every idle pooled connection (used by tests and shutdown)"""
+    with _pools_lock:
+        pools = list(_pools.values())
+        _pools.clear()
+    for pool in pools:
+        pool.close_all()
@@ -0,0 +1,189 @@
+#!/usr/bin/env python3
+"""
+Synthetic Large-Dataset Generator
+Personal Finance Tracker - My Paldea
+Course: IST 303 Fall 2025
+
+Builds a finance.db with many users, categories, months and transactions
+so the budget routes can be measured at production scale. Rows are
+produced by generators and written with executemany in large chunks, with
+the transactions indexes and the rollup and summary triggers dropped during
+the load and rebuilt once at the end (much faster than maintaining them row
+by row).
+
+Usage:
+    python generate_data.py --users 10000 --transactions 50000000 --database big.db
+    python generate_data.py --users 200 --months 12 --transactions 500000
+"""
+
+import argparse
+import os
+import random
+import sqlite3
+import sys
+import time
+from datetime import datetime
+
+from budget_engine import month_range
+from budget_routes import init_budget_tables
+from migrations import migrate, version_of, add_archive_state
+from categories import ensure_category_ids
+import db
+
+EXPENSE_CATEGORIES = ['Food', 'Transportation', 'Entertainment', 'Shopping', 'Utilities',
+                      'Healthcare', 'Education', 'Housing', 'Insurance', 'Other']
+INCOME_CATEGORIES = ['Salary', 'Freelance', 'Investment']
+
+CHUNK_SIZE = 100000
+
+# Dropped during the load; migrations after create_core_tables recreate them
+LOAD_DROPS = [
+    'DROP INDEX IF EXISTS idx_transactions_covering',
+    'DROP TRIGGER IF EXISTS trg_transactions_rollup_insert',
+    'DROP TRIGGER IF EXISTS trg_transactions_rollup_delete',
+    'DROP TRIGGER IF EXISTS trg_transactions_rollup_update',
+    'DROP TRIGGER IF EXISTS trg_budgets_summary_insert',
+    'DROP TRIGGER IF EXISTS trg_budgets_summary_delete',
+    'DROP TRIGGER IF EXISTS trg_budgets_summary_update',
+]
+
+def category_names(count):
+    """Return `count` expense category names, numbering extras past the defaults"""
+    names = EXPENSE_CATEGORIES[:count]
+    names += [f'Category {i:03d}' for i in range(len(names), count)]
+    return names
+
+def recent_months(count):
+    """Return the last `count` months, ending with the current one"""
+    now = datetime.now()
+    year, month = now.year, now.month - (count - 1)
+    while month < 1:
+        year, month = year - 1, month + 12
+    return month_range(f'{year:04d}-{month:02d}', now.strftime('%Y-%m'))
+
+def chunks(rows, size=CHUNK_SIZE):
+    """Group a row generator into lists of at most `size` rows"""
+    chunk = []
+    for row in rows:
+        chunk.append(row)
+        if len(chunk) >= size:
+            yield chunk
+            chunk = []
+    if chunk:
+        yield chunk
+
+def generate_users(users):
+    """Yield user rows"""
+    for user_id in range(1, users + 1):
+        yield (user_id, f'user{user_id}', f'user{user_id}@example.com', 'not-a-real-hash')
+
+def generate_budgets(rng, users, categories, months):
+    """Yield one budget (in cents) per user x category id x month"""
+    for user_id in range(1, users + 1):
+        for category_id in categories:
+            base = rng.randrange(100, 1000, 25)
+            for month in months:
+                yield (user_id, category_id, base * 100, month)
+
+def generate_transactions(rng, users, categories, months, count, income_categories):
+    """Yield `count` transactions (in cents) spread over users, category ids and months"""
+    income_share = 0.05
+    for _ in range(count):
+        month = months[rng.randrange(len(months))]
+        date = f'{month}-{rng.randrange(1, 29):02d}'
+        if rng.random() < income_share:
+            category_id = income_categories[rng.randrange(len(income_categories))]
+            yield (rng.randrange(1, users + 1), round(rng.uniform(200, 4000) * 100),
+                   category_id, None, date, 'income')
+        else:
+            yield (rng.randrange(1, users + 1), round(rng.uniform(1, 120) * 100),
+                   categories[rng.randrange(len(categories))], None, date, 'expense')
+
+def generate_database(database, users, categories, months, transactions, seed=303, report=print):
+    """Build (or extend) a database with synthetic data and return row counts"""
+    rng = random.Random(seed)
+    category_list = category_names(categories)
+    month_list = recent_months(months)
+
+    init_budget_tables(database)
+    db.close_all_pools()
+
+    conn = sqlite3.connect(database)
+    conn.execute('PRAGMA journal_mode = OFF')
+    conn.execute('PRAGMA synchronous = OFF')
+    conn.execute('PRAGMA cache_size = -262144')  # 256 MB while loading
+    conn.execute('''
+        CREATE TABLE IF NOT EXISTS users (
+            id INTEGER PRIMARY KEY AUTOINCREMENT,
+            username TEXT UNIQUE NOT NULL,
+            email TEXT UNIQUE,
+            password_hash TEXT NOT NULL,
+            created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP
+        )
+    ''')
+    for statement in LOAD_DROPS:
+        conn.execute(statement)
+
+    start = time.perf_counter()
+    with conn:
+        conn.executemany('INSERT OR IGNORE INTO users (id, username, email, password_hash) VALUES (?, ?, ?, ?)',
+                         generate_users(users))
+        expense_ids = ensure_category_ids(conn, category_list, 'expense')
+        income_ids = ensure_category_ids(conn, INCOME_CATEGORIES, 'income')
+    expense_ids = [expense_ids[name] for name in category_list]
+    income_ids = [income_ids[name] for name in INCOME_CATEGORIES]
+    for chunk in chunks(generate_budgets(rng, users, expense_ids, month_list)):
+        with conn:
+            conn.executemany('INSERT OR REPLACE INTO budgets (user_id, category_id, amount_cents, month) VALUES (?, ?, ?, ?)',
+                             chunk)
+    report(f"✅ {users:,} users and {users * len(category_list) * len(month_list):,} budgets "
+           f"in {time.perf_counter() - start:.1f}s")
+
+    start = time.perf_counter()
+    written = 0
+    for chunk in chunks(generate_transactions(rng, users, expense_ids, month_list, transactions, income_ids)):
+        with conn:
+            conn.executemany('''
+                INSERT INTO transactions (user_id, amount_cents, category_id, description, date, type)
+                VALUES (?, ?, ?, ?, ?, ?)
+            ''', chunk)
+        written += len(chunk)
+        if written % 1000000 < CHUNK_SIZE or written == transactions:
+            elapsed = time.perf_counter() - start
+            report(f"  ... {written:,} transactions ({written / elapsed:,.0f} rows/s)")
+
+    # Re-run normalize_category_ids and add_budget_summaries: the tables already
+    # use category ids, so they just recreate the indexes and triggers and
+    # backfill the rollup and budget summaries in user batches
+    start = time.perf_counter()
+    conn.execute(f'PRAGMA user_version = {version_of(add_archive_state)}')
+    conn.commit()
+    migrate(conn, report=None)
+    conn.execute('ANALYZE')
+    conn.close()
+    report(f"✅ Indexes, rollup and statistics rebuilt in {time.perf_counter() - start:.1f}s")
+
+    return {'users': users, 'categories': len(category_list), 'months': len(month_list),
+            'transactions': written}
+
+def main(argv=None):
+    """Command-line entry point"""
+    parser = argparse.ArgumentParser(description='Generate a large synthetic finance.db')
+    parser.add_argument('--database', default='finance.db')
+    parser.add_argument('--users', type=int, default=1000)
+    parser.add_argument('--categories', type=int, default=10)
+    parser.add_argument('--months', type=int, default=24)
+    parser.add_argument('--transactions', type=int, default=1000000)
+    parser.add_argument('--seed', type=int, default=303)
+    args = parser.parse_args(argv)
+
+    if os.path.exists(args.database):
+        print(f"ℹ️  Adding to existing database {args.database}")
+
+    print(f"🧪 Generating {args.transactions:,} transactions for {args.users:,} users...")
+    generate_database(args.database, args.users, args.categories, args.months,
+                      args.transactions, args.seed)
+    return 0
+
+if __name__ == '__main__':
+    sys.exit(main())
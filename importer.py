@@ -0,0 +1,302 @@
+#!/usr/bin/env python3
+"""
+Bulk Transaction Importer
+Personal Finance Tracker - My Paldea
+Course: IST 303 Fall 2025
+
+Streams a CSV or JSONL bank export into the transactions table:
+- rows are read with a generator, so memory stays flat for any file size
+- each row is validated (including the income/expense CHECK constraint)
+- valid rows are written with executemany, one transaction per chunk;
+  category names become category ids per chunk, and rows with an unknown
+  category are rejected (--create-categories creates them instead)
+- the number of source rows done is checkpointed in the same transaction,
+  so an interrupted import resumes exactly where it stopped
+
+Expected columns: date, amount, category, type, description (optional),
+user_id (optional when --user is given).
+
+Usage:
+    python importer.py export.csv --user 1 [--database finance.db] [--chunk-size 10000]
+                       [--create-categories]
+"""
+
+import argparse
+import codecs
+import csv
+import io
+import json
+import os
+import sys
+import time
+from datetime import date as Date
+
+import db
+from categories import ensure_category_ids, lookup_category_ids
+from migrations import migrate
+from money import to_cents
+
+TRANSACTION_TYPES = ('income', 'expense')
+DEFAULT_CHUNK_SIZE = 10000
+
+INSERT_SQL = '''
+    INSERT INTO transactions (user_id, amount_cents, category_id, description, date, type)
+    VALUES (?, ?, ?, ?, ?, ?)
+'''
+
+class ImportResult:
+    """Counters for one import run"""
+
+    def __init__(self):
+        self.read = 0
+        self.skipped = 0      # already imported before a resume
+        self.imported = 0
+        self.rejected = 0
+        self.errors = []      # first few (row number, message) pairs
+        self.user_months = set()
+        self.seconds = 0.0
+
+    @property
+    def rows_per_second(self):
+        return self.imported / self.seconds if self.seconds else 0.0
+
+    def as_dict(self):
+        return {
+            'read': self.read,
+            'skipped': self.skipped,
+            'imported': self.imported,
+            'rejected': self.rejected,
+            'errors': [{'row': row, 'error': message} for row, message in self.errors],
+            'seconds': round(self.seconds, 3),
+            'rows_per_second': round(self.rows_per_second)
+        }
+
+MAX_REPORTED_ERRORS = 20
+
+# UTF-8, skipping the byte order mark Excel's "CSV UTF-8" starts files with
+# (it would otherwise become part of the first header, '\ufeffdate')
+ENCODING = 'utf-8-sig'
+
+# Bytes decoded at a time when checking that an upload is UTF-8
+DECODE_CHECK_BYTES = 1 << 20
+
+def detect_format(filename):
+    """Guess 'csv' or 'jsonl' from a file name"""
+    return 'jsonl' if filename.lower().endswith(('.jsonl', '.ndjson', '.json')) else 'csv'
+
+def read_records(stream, fmt):
+    """Yield one dict per source record from a text stream"""
+    if fmt == 'csv':
+        yield from csv.DictReader(stream)
+    elif fmt == 'jsonl':
+        for line in stream:
+            if line.strip():
+                try:
+                    yield json.loads(line)
+                except ValueError:
+                    yield None  # rejected by validate_record
+    else:
+        raise ValueError(f'Unknown format: {fmt}')
+
+def validate_record(record, user_id=None):
+    """Return the INSERT parameters for a record, or raise ValueError"""
+    if not isinstance(record, dict):
+        raise ValueError('row is not a JSON object')
+
+    if user_id is None:
+        try:
+            user_id = int(record.get('user_id'))
+        except (TypeError, ValueError):
+            raise ValueError('user_id is missing or not an integer')
+
+    type_ = str(record.get('type') or '').strip().lower()
+    if type_ not in TRANSACTION_TYPES:
+        raise ValueError(f"type must be one of {', '.join(TRANSACTION_TYPES)}")
+
+    category = str(record.get('category') or '').strip()
+    if not category:
+        raise ValueError('category is required')
+
+    # to_cents says whether the amount is not a number or out of range
+    amount_cents = to_cents(record.get('amount'))
+    if amount_cents <= 0:
+        raise ValueError('amount must be greater than 0')
+
+    date = str(record.get('date') or '').strip()[:10]
+    try:
+        # fromisoformat is much faster than strptime on large files
+        if len(date) != 10:
+            raise ValueError
+        Date.fromisoformat(date)
+    except ValueError:
+        raise ValueError('date must be YYYY-MM-DD')
+
+    description = record.get('description') or None
+    if not isinstance(description, (str, int, float, type(None))):
+        raise ValueError('description must be text')
+    return (user_id, amount_cents, category, description, date, type_)
+
+def import_transactions(conn, records, user_id=None, chunk_size=DEFAULT_CHUNK_SIZE,
+                        source=None, on_chunk=None, create_categories=False):
+    """
+    Import an iterable of records in chunked transactions.
+    With a `source` key, progress is checkpointed and a rerun resumes.
+    `on_chunk(result)` is called after every committed chunk. Rows with an
+    unknown category are rejected unless create_categories is set.
+    """
+    result = ImportResult()
+    start = time.perf_counter()
+
+    # import_checkpoints is created by the add_import_checkpoints migration
+    rows_done = 0
+    if source is not None:
+        row = conn.execute('SELECT rows_done FROM import_checkpoints WHERE source = ?',
+                           (source,)).fetchone()
+        rows_done = row[0] if row else 0
+
+    category_ids = {}
+
+    def reject(position, message):
+        result.rejected += 1
+        if len(result.errors) < MAX_REPORTED_ERRORS:
+            result.errors.append((position, message))
+
+    def resolve_categories(chunk):
+        """
+        Swap category names for ids (inside the chunk's transaction),
+        rejecting rows whose category does not exist or creating it
+        """
+        for type_ in TRANSACTION_TYPES:
+            names = {params[2] for _, params in chunk if params[5] == type_ and params[2] not in category_ids}
+            if create_categories:
+                category_ids.update(ensure_category_ids(conn, names, type_))
+            else:
+                category_ids.update(lookup_category_ids(conn, names))
+        rows = []
+        for position, (user_id, amount_cents, category, description, date, type_) in chunk:
+            if category not in category_ids:
+                reject(position, f'unknown category: {category}')
+                continue
+            rows.append((user_id, amount_cents, category_ids[category], description, date, type_))
+            result.user_months.add((user_id, date[:7]))
+        return rows
+
+    def commit(chunk, position):
+        with conn:
+            rows = resolve_categories(chunk)
+            conn.executemany(INSERT_SQL, rows)
+            if source is not None:
+                conn.execute('''
+                    INSERT INTO import_checkpoints (source, rows_done) VALUES (?, ?)
+                    ON CONFLICT (source) DO UPDATE SET
+                        rows_done = excluded.rows_done,
+                        updated_at = CURRENT_TIMESTAMP
+                ''', (source, position))
+        result.imported += len(rows)
+        result.seconds = time.perf_counter() - start
+        if on_chunk:
+            on_chunk(result)
+
+    chunk = []
+    for position, record in enumerate(records, start=1):
+        result.read += 1
+        if position <= rows_done:
+            result.skipped += 1
+            continue
+
+        try:
+            params = validate_record(record, user_id)
+        except ValueError as e:
+            reject(position, str(e))
+            continue
+
+        chunk.append((position, params))
+        if len(chunk) >= chunk_size:
+            commit(chunk, position)
+            chunk = []
+
+    if chunk or (source is not None and result.read > rows_done):
+        commit(chunk, result.read)
+
+    result.seconds = time.perf_counter() - start
+    return result
+
+def import_file(conn, path, user_id=None, fmt=None, chunk_size=DEFAULT_CHUNK_SIZE,
+                resume=True, on_chunk=None, create_categories=False):
+    """Import a CSV/JSONL file, resuming from its checkpoint if there is one"""
+    fmt = fmt or detect_format(path)
+    source = os.path.abspath(path) if resume else None
+    with open(path, newline='', encoding=ENCODING) as stream:
+        return import_transactions(conn, read_records(stream, fmt), user_id,
+                                   chunk_size, source, on_chunk, create_categories)
+
+def check_utf8(stream):
+    """
+    Raise ValueError unless a seekable binary stream is UTF-8 text, then
+    rewind it. Decoded a block at a time, so nothing is imported from a
+    file that turns out to be in another encoding.
+    """
+    decoder = codecs.getincrementaldecoder(ENCODING)()
+    offset = 0
+    block = b''
+    try:
+        while block := stream.read(DECODE_CHECK_BYTES):
+            decoder.decode(block)
+            offset += len(block)
+        decoder.decode(b'', final=True)
+    except UnicodeDecodeError as e:
+        # Positions in the first block are counted after the byte order mark
+        if offset == 0 and block.startswith(codecs.BOM_UTF8):
+            offset = len(codecs.BOM_UTF8)
+        raise ValueError(f'file is not UTF-8 text (invalid byte at offset {offset + e.start})')
+    stream.seek(0)
+
+def import_upload(conn, file_storage, user_id, chunk_size=DEFAULT_CHUNK_SIZE):
+    """
+    Import an uploaded file (werkzeug FileStorage) for one user.
+    Raises ValueError if the file is not UTF-8 text.
+    """
+    fmt = detect_format(file_storage.filename or '')
+    check_utf8(file_storage.stream)
+    stream = io.TextIOWrapper(file_storage.stream, encoding=ENCODING, newline='')
+    return import_transactions(conn, read_records(stream, fmt), user_id, chunk_size)
+
+def main(argv=None):
+    """Command-line entry point"""
+    parser = argparse.ArgumentParser(description='Bulk import transactions from CSV or JSONL')
+    parser.add_argument('path')
+    parser.add_argument('--user', type=int, help='Import every row for this user id')
+    parser.add_argument('--format', choices=['csv', 'jsonl'])
+    parser.add_argument('--database', default='finance.db')
+    parser.add_argument('--chunk-size', type=int, default=DEFAULT_CHUNK_SIZE)
+    parser.add_argument('--no-resume', action='store_true', help='Ignore any saved checkpoint')
+    parser.add_argument('--create-categories', action='store_true',
+                        help='Create unknown categories instead of rejecting their rows')
+    args = parser.parse_args(argv)
+
+    if not os.path.exists(args.database):
+        print(f"❌ Database not found: {args.database} (run init_db.py first)")
+        return 1
+
+    conn = db.get_pool(args.database).acquire()
+    migrate(conn, report=None)
+
+    def report(result):
+        print(f"  ... {result.imported:,} rows imported ({result.rows_per_second:,.0f} rows/s)")
+
+    print(f"📥 Importing {args.path}...")
+    result = import_file(conn, args.path, args.user, args.format, args.chunk_size,
+                         resume=not args.no_resume, on_chunk=report,
+                         create_categories=args.create_categories)
+    conn.close()
+
+    if result.skipped:
+        print(f"ℹ️  Resumed after {result.skipped:,} rows from a previous run")
+    for row, message in result.errors:
+        print(f"❌ Row {row}: {message}")
+    print(f"✅ Imported {result.imported:,} rows, rejected {result.rejected:,} "
+          f"in {result.seconds:.2f}s ({result.rows_per_second:,.0f} rows/s)")
+    return 0
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -7,87 +7,24 @@ Course: IST 303 Fall 2025
 """
 
 import sqlite3
-import os
 from datetime import datetime, timedelta
-import random
+from budget_engine import get_progress
+from migrations import migrate, get_version, SCHEMA_VERSION, DEFAULT_CATEGORIES
+from money import to_cents, format_money
 
 def create_database():
-    """Create and initialize the database with all required tables"""
-    
-    # Remove existing database for fresh start (optional)
-    if os.path.exists('finance.db'):
-        print("⚠️  Existing database found. Backing up...")
-        os.rename('finance.db', f'finance_backup_{datetime.now().strftime("%Y%m%d_%H%M%S")}.db')
-    
-    # Create new database connection
+    """Create the database or migrate an existing one in place"""
     conn = sqlite3.connect('finance.db')
-    c = conn.cursor()
-    
-    print("📊 Creating database tables...")
-    
-    # Create users table
-    c.execute('''
-        CREATE TABLE IF NOT EXISTS users (
-            id INTEGER PRIMARY KEY AUTOINCREMENT,
-            username TEXT UNIQUE NOT NULL,
-            email TEXT UNIQUE,
-            password_hash TEXT NOT NULL,
-            created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP
-        )
-    ''')
-    print("✅ Users table created")
-    
-    # Create transactions table
-    c.execute('''
-        CREATE TABLE IF NOT EXISTS transactions (
-            id INTEGER PRIMARY KEY AUTOINCREMENT,
-            user_id INTEGER NOT NULL,
-            amount DECIMAL(10, 2) NOT NULL,
-            category TEXT NOT NULL,
-            description TEXT,
-            date DATE NOT NULL,
-            type TEXT NOT NULL CHECK (type IN ('income', 'expense')),
-            created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
-            FOREIGN KEY (user_id) REFERENCES users (id)
-        )
-    ''')
-    print("✅ Transactions table created")
-    
-    # Create budgets table (Task 8)
-    c.execute('''
-        CREATE TABLE IF NOT EXISTS budgets (
-            id INTEGER PRIMARY KEY AUTOINCREMENT,
-            user_id INTEGER NOT NULL,
-            category TEXT NOT NULL,
-            amount DECIMAL(10, 2) NOT NULL,
-            month TEXT NOT NULL,
-            created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
-            updated_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
-            FOREIGN KEY (user_id) REFERENCES users (id),
-            UNIQUE(user_id, category, month)
-        )
-    ''')
-    print("✅ Budgets table created (Task 8)")
     
-    # Create categories table
-    c.execute('''
-        CREATE TABLE IF NOT EXISTS categories (
-            id INTEGER PRIMARY KEY AUTOINCREMENT,
-            name TEXT UNIQUE NOT NULL,
-            icon TEXT,
-            color TEXT,
-            type TEXT CHECK (type IN ('income', 'expense', 'both'))
-        )
-    ''')
-    print("✅ Categories table created")
+    version = get_version(conn)
+    if version == SCHEMA_VERSION:
+        print(f"✅ Database schema is up to date (version {version})")
+    else:
+        if version:
+            print(f"⚠️  Existing database at schema version {version}. Migrating in place...")
+        print("📊 Applying schema migrations...")
+        migrate(conn)
     
-    # Create indexes for better performance
-    c.execute('CREATE INDEX IF NOT EXISTS idx_transactions_user ON transactions (user_id)')
-    c.execute('CREATE INDEX IF NOT EXISTS idx_transactions_date ON transactions (date)')
-    c.execute('CREATE INDEX IF NOT EXISTS idx_budgets_user_month ON budgets (user_id, month)')
-    print("✅ Database indexes created")
-    
-    conn.commit()
     conn.close()
     print("✅ Database structure complete!")
 
@@ -98,28 +35,8 @@ def add_default_categories():
     
     print("\n📁 Adding default categories...")
     
-    categories = [
-        # Expense categories
-        ('Food', '🍔', '#FF6B6B', 'expense'),
-        ('Transportation', '🚗', '#4ECDC4', 'expense'),
-        ('Entertainment', '🎬', '#45B7D1', 'expense'),
-        ('Shopping', '🛍️', '#F7B801', 'expense'),
-        ('Utilities', '💡', '#95E77E', 'expense'),
-        ('Healthcare', '🏥', '#FF6B9D', 'expense'),
-        ('Education', '📚', '#C44569', 'expense'),
-        ('Housing', '🏠', '#7B68EE', 'expense'),
-        ('Insurance', '🛡️', '#00B894', 'expense'),
-        ('Other', '📌', '#636E72', 'expense'),
-        
-        # Income categories
-        ('Salary', '💰', '#00D2D3', 'income'),
-        ('Freelance', '💻', '#54A0FF', 'income'),
-        ('Investment', '📈', '#48DBFB', 'income'),
-        ('Business', '🏢', '#0ABDE3', 'income'),
-        ('Other Income', '💵', '#006BA6', 'income')
-    ]
-    
-    for name, icon, color, cat_type in categories:
+    # The same list the add_default_categories migration seeds
+    for name, icon, color, cat_type in DEFAULT_CATEGORIES:
         try:
             c.execute('''
                 INSERT OR IGNORE INTO categories (name, icon, color, type)
@@ -170,9 +87,9 @@ def add_demo_data():
     print("📊 Adding demo budgets...")
     for category, amount in demo_budgets:
         c.execute('''
-            INSERT OR REPLACE INTO budgets (user_id, category, amount, month)
-            VALUES (?, ?, ?, ?)
-        ''', (user_id, category, amount, current_month))
+            INSERT OR REPLACE INTO budgets (user_id, category_id, amount_cents, month)
+            VALUES (?, (SELECT id FROM categories WHERE name = ?), ?, ?)
+        ''', (user_id, category, to_cents(amount), current_month))
     
     # Add demo transactions for progress visualization (Task 9)
     print("💰 Adding demo transactions...")
@@ -212,9 +129,9 @@ def add_demo_data():
     
     for category, amount, date, trans_type, description in transactions:
         c.execute('''
-            INSERT INTO transactions (user_id, category, amount, date, type, description)
-            VALUES (?, ?, ?, ?, ?, ?)
-        ''', (user_id, category, amount, date.strftime('%Y-%m-%d'), trans_type, description))
+            INSERT INTO transactions (user_id, category_id, amount_cents, date, type, description)
+            VALUES (?, (SELECT id FROM categories WHERE name = ?), ?, ?, ?, ?)
+        ''', (user_id, category, to_cents(amount), date.strftime('%Y-%m-%d'), trans_type, description))
     
     conn.commit()
     conn.close()
@@ -236,39 +153,23 @@ def display_summary():
     
     # Show budget progress for demo user
     current_month = datetime.now().strftime('%Y-%m')
-    budgets = c.execute('''
-        SELECT b.category, b.amount,
-               COALESCE(SUM(t.amount), 0) as spent
-        FROM budgets b
-        LEFT JOIN transactions t ON 
-            t.user_id = b.user_id AND 
-            t.category = b.category AND 
-            strftime('%Y-%m', t.date) = b.month AND
-            t.type = 'expense'
-        WHERE b.user_id = 1 AND b.month = ?
-        GROUP BY b.category, b.amount
-    ''', (current_month,)).fetchall()
+    progress_data = get_progress(conn, 1, current_month)
     
-    if budgets:
+    if progress_data:
         print("\n📈 Demo User Budget Progress (Current Month):")
         print("-" * 50)
-        for category, budget, spent in budgets:
-            percentage = (spent / budget * 100) if budget > 0 else 0
-            remaining = budget - spent
-            
-            # Determine status emoji
-            if percentage <= 50:
-                status = "✅"
-            elif percentage <= 80:
-                status = "⚠️"
-            elif percentage <= 100:
-                status = "🔶"
-            else:
-                status = "🔴"
+        status_emoji = {
+            'success': "✅",
+            'warning': "⚠️",
+            'danger-orange': "🔶",
+            'danger': "🔴"
+        }
+        for p in progress_data:
+            status = status_emoji[p['color']]
             
-            print(f"  {status} {category}:")
-            print(f"     Budget: ${budget:.2f} | Spent: ${spent:.2f}")
-            print(f"     Progress: {percentage:.0f}% | Remaining: ${remaining:.2f}")
+            print(f"  {status} {p['category']}:")
+            print(f"     Budget: {format_money(p['budget_cents'])} | Spent: {format_money(p['spent_cents'])}")
+            print(f"     Progress: {p['actual_percentage']:.0f}% | Remaining: {format_money(p['remaining_cents'])}")
     
     conn.close()
     print("=" * 50)
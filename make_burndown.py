@@ -1,13 +1,201 @@
-import matplotlib.pyplot as plt
-import pandas as pd
+# make_burndown.py - Burndown Chart Renderer
+# Personal Finance Tracker - My Paldea
+# Course: IST 303 Fall 2025
+#
+# Reads a burndown CSV (a Day column plus one or more series columns, and
+# optionally a Sprint column that splits every series per sprint) and draws
+# it with Matplotlib's Agg canvas through the object-oriented API: no
+# pyplot, no global current figure, and every figure is cleared as soon as
+# it is saved, so a process can render thousands of charts without growing.
+#
+# Large CSVs are read CHUNK_ROWS rows at a time, and a series longer than
+# MAX_POINTS is thinned to every n-th point as it is read, so memory depends
+# on the number of series, not on the number of rows. A chart is only redrawn
+# when the SHA-256 of its input and render settings differs from the one
+# stored next to the image (<output>.sha256), and is written to a temporary
+# file that is renamed into place. render_charts.py renders batches of
+# charts (burndowns and per-user spending) on a process pool.
+#
+# Usage:
+#     python make_burndown.py [burndown_sample.csv] [--output burndown_generated.png] [--force]
 
-def make_chart():
-    df = pd.read_csv('docs/burndown/burndown_sample.csv')
-    plt.plot(df['Day'], df['Tasks Remaining'], marker='o')
-    plt.title('Burndown Chart')
-    plt.xlabel('Day')
-    plt.ylabel('Tasks Remaining')
-    plt.savefig('docs/burndown/burndown_generated.png')
+import argparse
+import hashlib
+import os
+import sys
+import tempfile
+from contextlib import contextmanager
+
+DEFAULT_CSV = 'burndown_sample.csv'
+DEFAULT_OUTPUT = 'burndown_generated.png'
+DEFAULT_TITLE = 'Burndown Chart'
+
+CHUNK_ROWS = 100000
+HASH_BLOCK = 1 << 20
+
+FIGSIZE = (8, 5)  # inches
+DPI = 100
+
+# Series longer than this are drawn without point markers
+MARKER_POINTS = 60
+
+# Points kept per series; more than the chart is pixels wide
+MAX_POINTS = 2000
+
+# Bump when the drawing code changes, so cached charts are redrawn
+RENDER_VERSION = 2
+
+def input_hash(csv_path, **settings):
+    """SHA-256 of the CSV (read in blocks) plus the render settings"""
+    digest = hashlib.sha256(f'{RENDER_VERSION}:{sorted(settings.items())}'.encode())
+    with open(csv_path, 'rb') as f:
+        for block in iter(lambda: f.read(HASH_BLOCK), b''):
+            digest.update(block)
+    return digest.hexdigest()
+
+class _Series:
+    """
+    Points of one series, kept to at most max_points: every stride-th point
+    read (stride doubles whenever the list fills up) plus the last one
+    """
+
+    def __init__(self, max_points):
+        self.max_points = max_points
+        self.days, self.values = [], []
+        self.stride = 1
+        self.read = 0
+        self.last = None
+
+    def extend(self, days, values):
+        """Add a chunk's points (pandas Series), slicing out the ones to keep"""
+        start = -self.read % self.stride
+        self.days.extend(days.iloc[start::self.stride].tolist())
+        self.values.extend(values.iloc[start::self.stride].tolist())
+        self.read += len(days)
+        self.last = (days.iloc[-1:].tolist(), values.iloc[-1:].tolist())
+        while len(self.days) > self.max_points:
+            self.days, self.values = self.days[::2], self.values[::2]
+            self.stride *= 2
+
+    def points(self):
+        """(days, values), ending with the last point read"""
+        if (self.read - 1) % self.stride == 0:
+            return self.days, self.values
+        return self.days + self.last[0], self.values + self.last[1]
+
+def read_series(csv_path, chunk_rows=CHUNK_ROWS, max_points=MAX_POINTS):
+    """
+    Return {label: (days, values)} from a burndown CSV, read chunk_rows
+    rows at a time. Labels are the series columns, prefixed with the
+    sprint when there is a Sprint column. A series longer than max_points
+    is thinned to evenly spaced points plus its last one.
+    """
+    # pandas takes ~1 s to import, so only load it when reading a chart
+    import pandas as pd
+
+    series = {}
+    for chunk in pd.read_csv(csv_path, chunksize=chunk_rows):
+        columns = [column for column in chunk.columns if column not in ('Day', 'Sprint')]
+        groups = chunk.groupby('Sprint', sort=False) if 'Sprint' in chunk else [(None, chunk)]
+        for sprint, rows in groups:
+            for column in columns:
+                if sprint is None:
+                    label = column
+                elif len(columns) == 1:
+                    label = str(sprint)
+                else:
+                    label = f'{sprint} {column}'
+                series.setdefault(label, _Series(max_points)).extend(rows['Day'], rows[column])
+    return {label: points.points() for label, points in series.items()}
+
+@contextmanager
+def agg_figure(figsize=FIGSIZE, dpi=DPI):
+    """A Figure on its own Agg canvas, cleared when the block exits"""
+    # Matplotlib takes ~1 s to import, so only load it when drawing
+    from matplotlib.backends.backend_agg import FigureCanvasAgg
+    from matplotlib.figure import Figure
+
+    fig = Figure(figsize=figsize, dpi=dpi)
+    FigureCanvasAgg(fig)
+    try:
+        yield fig
+    finally:
+        # Drop the artists now rather than waiting for the garbage collector
+        fig.clear()
+
+def render_chart(series, output, title=DEFAULT_TITLE, figsize=FIGSIZE, dpi=DPI):
+    """Draw {label: (days, values)} to an image file (or file object) with the Agg canvas"""
+    with agg_figure(figsize, dpi) as fig:
+        ax = fig.add_subplot()
+        for label, (days, values) in series.items():
+            ax.plot(days, values, marker='o' if len(days) <= MARKER_POINTS else None, label=label)
+        ax.set_title(title)
+        ax.set_xlabel('Day')
+        ax.set_ylabel('Tasks Remaining')
+        if len(series) > 1:
+            ax.legend(loc='upper right', fontsize='small')
+        fig.savefig(output)
+
+def chart_is_current(output, digest):
+    """True if output exists and was drawn from input with this hash"""
+    hash_path = f'{output}.sha256'
+    if not (os.path.exists(output) and os.path.exists(hash_path)):
+        return False
+    with open(hash_path) as f:
+        return f.read().strip() == digest
+
+def save_chart(output, draw, digest):
+    """
+    Call draw(path) on a temporary file next to output, then rename it into
+    place and record the input hash, so readers never see a half-written
+    image and an interrupted render is simply redone.
+    """
+    directory, name = os.path.split(os.path.abspath(output))
+    os.makedirs(directory, exist_ok=True)
+    fd, tmp_path = tempfile.mkstemp(dir=directory, prefix=f'.{name}.', suffix=os.path.splitext(name)[1])
+    os.close(fd)
+    try:
+        draw(tmp_path)
+        os.chmod(tmp_path, 0o644)  # mkstemp creates files readable only by the owner
+        os.replace(tmp_path, output)
+    except BaseException:
+        os.unlink(tmp_path)
+        raise
+
+    fd, tmp_path = tempfile.mkstemp(dir=directory, prefix=f'.{name}.sha256.')
+    with os.fdopen(fd, 'w') as f:
+        f.write(digest + '\n')
+    os.replace(tmp_path, f'{output}.sha256')
+
+def make_chart(csv_path=DEFAULT_CSV, output=DEFAULT_OUTPUT, title=DEFAULT_TITLE, force=False,
+               chunk_rows=CHUNK_ROWS):
+    """Render csv_path to output unless it is unchanged since the last render; returns True if drawn"""
+    digest = input_hash(csv_path, title=title, figsize=FIGSIZE, dpi=DPI)
+    if not force and chart_is_current(output, digest):
+        return False
+
+    series = read_series(csv_path, chunk_rows)
+    save_chart(output, lambda path: render_chart(series, path, title), digest)
+    return True
+
+def main(argv=None):
+    """Command-line entry point"""
+    parser = argparse.ArgumentParser(description='Render a burndown chart from a CSV')
+    parser.add_argument('csv', nargs='?', default=DEFAULT_CSV)
+    parser.add_argument('--output', default=DEFAULT_OUTPUT)
+    parser.add_argument('--title', default=DEFAULT_TITLE)
+    parser.add_argument('--force', action='store_true', help='Redraw even if the input is unchanged')
+    args = parser.parse_args(argv)
+
+    if not os.path.exists(args.csv):
+        print(f"❌ CSV not found: {args.csv}")
+        return 1
+
+    if make_chart(args.csv, args.output, args.title, args.force):
+        print(f"✅ Burndown chart written to {args.output}")
+    else:
+        print(f"⏭️  {args.output} is up to date")
+    return 0
 
 if __name__ == "__main__":
-    make_chart()
+    sys.exit(main())
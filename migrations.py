@@ -0,0 +1,584 @@
+#!/usr/bin/env python3
+"""
+Schema Migrations
+Personal Finance Tracker - My Paldea
+Course: IST 303 Fall 2025
+
+The one place the database schema is defined. PRAGMA user_version records
+the last migration applied; migrate() runs the newer ones in order, each in
+its own transaction, and bumps user_version in that same transaction.
+
+Migrations that rewrite large tables are generators: every `yield` ends a
+batch, and the runner commits there so other connections can write between
+batches instead of waiting minutes on one long transaction. Batched
+migrations are idempotent, so an interrupted run simply starts the
+migration again.
+
+Usage:
+    python migrations.py [--database finance.db]          # migrate to latest
+    python migrations.py --status [--database finance.db] # show version and duplicate indexes
+"""
+
+import argparse
+import inspect
+import os
+import sqlite3
+import sys
+import time
+
+from budget_summaries import init_summary_tables, rebuild_summary_users
+from rollups import init_rollup_tables, rebuild_rollup_users
+
+ROLLUP_BATCH_USERS = 100
+
+# Pause after a batch (as long as the batch took, up to this) so writers
+# blocked in SQLite's busy handler, which backs off to retrying every
+# 100 ms, get the lock before the next batch
+BATCH_PAUSE = 0.1
+
+def create_core_tables(conn):
+    """Users, transactions, budgets and categories"""
+    conn.execute('''
+        CREATE TABLE IF NOT EXISTS users (
+            id INTEGER PRIMARY KEY AUTOINCREMENT,
+            username TEXT UNIQUE NOT NULL,
+            email TEXT UNIQUE,
+            password_hash TEXT NOT NULL,
+            created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP
+        )
+    ''')
+    conn.execute('''
+        CREATE TABLE IF NOT EXISTS transactions (
+            id INTEGER PRIMARY KEY AUTOINCREMENT,
+            user_id INTEGER NOT NULL,
+            amount DECIMAL(10, 2) NOT NULL,
+            category TEXT NOT NULL,
+            description TEXT,
+            date DATE NOT NULL,
+            type TEXT NOT NULL CHECK (type IN ('income', 'expense')),
+            created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
+            FOREIGN KEY (user_id) REFERENCES users (id)
+        )
+    ''')
+    conn.execute('''
+        CREATE TABLE IF NOT EXISTS budgets (
+            id INTEGER PRIMARY KEY AUTOINCREMENT,
+            user_id INTEGER NOT NULL,
+            category TEXT NOT NULL,
+            amount DECIMAL(10, 2) NOT NULL,
+            month TEXT NOT NULL,
+            created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
+            updated_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
+            FOREIGN KEY (user_id) REFERENCES users (id),
+            UNIQUE(user_id, category, month)
+        )
+    ''')
+    conn.execute('''
+        CREATE TABLE IF NOT EXISTS categories (
+            id INTEGER PRIMARY KEY AUTOINCREMENT,
+            name TEXT UNIQUE NOT NULL,
+            icon TEXT,
+            color TEXT,
+            type TEXT CHECK (type IN ('income', 'expense', 'both'))
+        )
+    ''')
+    conn.execute('CREATE INDEX IF NOT EXISTS idx_budget_user_month ON budgets (user_id, month)')
+    conn.execute('CREATE INDEX IF NOT EXISTS idx_transactions_date ON transactions (date)')
+
+def add_covering_index(conn):
+    """Covering index for month-range spending queries"""
+    # SQLite builds an index in one statement. In WAL mode readers carry on
+    # while it runs; only other writers wait.
+    conn.execute('''
+        CREATE INDEX IF NOT EXISTS idx_transactions_covering
+        ON transactions (user_id, type, category, date, amount)
+    ''')
+
+# The rollup as each older migration released it (rollups.py holds the
+# current one, built by normalize_category_ids). Migrations keep a copy of
+# the SQL they shipped with, so they do the same thing on every database
+# whatever rollups.py looks like today.
+def _released_rollup(amount, total, total_type, delete_when=''):
+    """(table, triggers, backfill) SQL of a rollup keyed by category name"""
+    add_row = f'''
+        INSERT INTO monthly_category_spend (user_id, month, category, type, {total}, count)
+        VALUES (NEW.user_id, substr(NEW.date, 1, 7), NEW.category, NEW.type, NEW.{amount}, 1)
+        ON CONFLICT (user_id, month, category, type) DO UPDATE SET
+            {total} = {total} + excluded.{total},
+            count = count + 1;
+    '''
+    remove_row = f'''
+        UPDATE monthly_category_spend
+        SET {total} = {total} - OLD.{amount}, count = count - 1
+        WHERE user_id = OLD.user_id AND month = substr(OLD.date, 1, 7)
+        AND category = OLD.category AND type = OLD.type;
+        DELETE FROM monthly_category_spend
+        WHERE user_id = OLD.user_id AND month = substr(OLD.date, 1, 7)
+        AND category = OLD.category AND type = OLD.type AND count <= 0;
+    '''
+    table = f'''
+        CREATE TABLE IF NOT EXISTS monthly_category_spend (
+            user_id INTEGER NOT NULL,
+            month TEXT NOT NULL,
+            category TEXT NOT NULL,
+            type TEXT NOT NULL,
+            {total} {total_type} NOT NULL DEFAULT 0,
+            count INTEGER NOT NULL DEFAULT 0,
+            PRIMARY KEY (user_id, month, category, type)
+        )
+    '''
+    triggers = [
+        f'''CREATE TRIGGER IF NOT EXISTS trg_transactions_rollup_insert
+        AFTER INSERT ON transactions BEGIN{add_row}END''',
+        f'''CREATE TRIGGER IF NOT EXISTS trg_transactions_rollup_delete
+        AFTER DELETE ON transactions {delete_when} BEGIN{remove_row}END''',
+        f'''CREATE TRIGGER IF NOT EXISTS trg_transactions_rollup_update
+        AFTER UPDATE OF user_id, {amount}, category, date, type ON transactions
+        BEGIN{remove_row}{add_row}END''',
+    ]
+    backfill = f'''
+        INSERT INTO monthly_category_spend (user_id, month, category, type, {total}, count)
+        SELECT user_id, substr(date, 1, 7), category, type, SUM({amount}), COUNT(*)
+        FROM transactions
+        WHERE user_id BETWEEN ? AND ?
+        GROUP BY user_id, substr(date, 1, 7), category, type
+    '''
+    return table, triggers, backfill
+
+# add_monthly_rollup: REAL dollar totals
+DOLLAR_ROLLUP = _released_rollup('amount', 'total', 'DECIMAL(10, 2)')
+# store_amounts_in_cents: INTEGER cent totals
+CENTS_ROLLUP = _released_rollup('amount_cents', 'total_cents', 'INTEGER')
+# add_archive_state: deletes made by archive moves leave the rollup alone
+ARCHIVE_CENTS_ROLLUP = _released_rollup('amount_cents', 'total_cents', 'INTEGER',
+                                        'WHEN NOT EXISTS (SELECT 1 FROM archive_state WHERE deleting = 1)')
+
+def _create_released_rollup(conn, released):
+    """Create a released rollup's table and triggers (if missing)"""
+    table, triggers, _ = released
+    conn.execute(table)
+    for trigger in triggers:
+        conn.execute(trigger)
+
+def _rebuild_released_rollup_users(released):
+    """rebuild_rollup_users for a released rollup"""
+    def rebuild(conn, first_user, last_user):
+        conn.execute('DELETE FROM monthly_category_spend WHERE user_id BETWEEN ? AND ?',
+                     (first_user, last_user))
+        conn.execute(released[2], (first_user, last_user))
+    return rebuild
+
+def add_monthly_rollup(conn):
+    """Monthly spend rollup, backfilled a batch of users at a time"""
+    yield from _build_rollup(conn, DOLLAR_ROLLUP)
+
+def _build_rollup(conn, released=None):
+    """
+    Create the rollup and backfill it a batch of users at a time: the
+    current one from rollups.py, or a released one
+    """
+    # Triggers go in first, so writes during the backfill are not lost
+    if released is None:
+        init_rollup_tables(conn, backfill=False)
+        rebuild_users = rebuild_rollup_users
+    else:
+        _create_released_rollup(conn, released)
+        rebuild_users = _rebuild_released_rollup_users(released)
+    yield 'rollup table and triggers created'
+
+    first, last = conn.execute('''
+        SELECT MIN(user_id), MAX(user_id) FROM (
+            SELECT user_id FROM transactions
+            UNION ALL SELECT user_id FROM monthly_category_spend
+        )
+    ''').fetchone()
+    if first is None:
+        return
+
+    for start in range(first, last + 1, ROLLUP_BATCH_USERS):
+        end = min(start + ROLLUP_BATCH_USERS - 1, last)
+        rebuild_users(conn, start, end)
+        yield f'rollup backfilled for users {start}-{end} of {last}'
+
+def drop_duplicate_indexes(conn):
+    """Drop indexes made redundant by another index on the same columns"""
+    for redundant, _ in find_duplicate_indexes(conn):
+        conn.execute(f'DROP INDEX IF EXISTS "{redundant}"')
+
+# Tables whose REAL dollar `amount` column becomes INTEGER `amount_cents`
+CENTS_TABLES = {
+    'transactions': '''
+        CREATE TABLE transactions (
+            id INTEGER PRIMARY KEY AUTOINCREMENT,
+            user_id INTEGER NOT NULL,
+            amount_cents INTEGER NOT NULL,
+            category TEXT NOT NULL,
+            description TEXT,
+            date DATE NOT NULL,
+            type TEXT NOT NULL CHECK (type IN ('income', 'expense')),
+            created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
+            FOREIGN KEY (user_id) REFERENCES users (id)
+        )
+    ''',
+    'budgets': '''
+        CREATE TABLE budgets (
+            id INTEGER PRIMARY KEY AUTOINCREMENT,
+            user_id INTEGER NOT NULL,
+            category TEXT NOT NULL,
+            amount_cents INTEGER NOT NULL,
+            month TEXT NOT NULL,
+            created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
+            updated_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
+            FOREIGN KEY (user_id) REFERENCES users (id),
+            UNIQUE(user_id, category, month)
+        )
+    ''',
+}
+
+def _rebuild_table(conn, table, create_sql, old_column, new_column, expression):
+    """
+    Copy a table into a new layout where new_column (computed by
+    `expression`) replaces old_column, keeping its other columns and the
+    indexes that do not use old_column
+    """
+    old_columns = table_columns(conn, table)
+    indexes = [sql for (sql,) in conn.execute(
+        "SELECT sql FROM sqlite_master WHERE type = 'index' AND tbl_name = ? AND sql IS NOT NULL",
+        (table,)) if old_column not in sql]
+
+    conn.execute(f'DROP TABLE IF EXISTS {table}_new')
+    conn.execute(create_sql.replace(f'CREATE TABLE {table}', f'CREATE TABLE {table}_new', 1))
+    columns = [column for column in table_columns(conn, f'{table}_new')
+               if column in old_columns or column == new_column]
+    values = [expression if column == new_column else column for column in columns]
+    conn.execute(f"INSERT INTO {table}_new ({', '.join(columns)}) "
+                 f"SELECT {', '.join(values)} FROM {table}")
+    conn.execute(f'DROP TABLE {table}')
+    conn.execute(f'ALTER TABLE {table}_new RENAME TO {table}')
+    for sql in indexes:
+        conn.execute(sql)
+
+def _drop_rollup(conn):
+    """Drop the rollup table and its triggers (rebuilt by _build_rollup)"""
+    for trigger in ('insert', 'delete', 'update'):
+        conn.execute(f'DROP TRIGGER IF EXISTS trg_transactions_rollup_{trigger}')
+    conn.execute('DROP TABLE IF EXISTS monthly_category_spend')
+
+def store_amounts_in_cents(conn):
+    """Store amounts as INTEGER cents and rebuild the rollup in cents"""
+    # A table copy cannot be split into batches without losing writes made
+    # between them, so both tables are copied in this first transaction. The
+    # rollup is then rebuilt batch by batch, as in add_monthly_rollup.
+    _drop_rollup(conn)
+
+    for table in CENTS_TABLES:
+        if 'amount' in table_columns(conn, table):
+            _rebuild_table(conn, table, CENTS_TABLES[table], 'amount', 'amount_cents',
+                           'CAST(ROUND(amount * 100) AS INTEGER)')
+    conn.execute('CREATE INDEX IF NOT EXISTS idx_budget_user_month ON budgets (user_id, month)')
+    conn.execute('CREATE INDEX IF NOT EXISTS idx_transactions_date ON transactions (date)')
+    conn.execute('''
+        CREATE INDEX IF NOT EXISTS idx_transactions_covering
+        ON transactions (user_id, type, category, date, amount_cents)
+    ''')
+    yield 'amounts converted to cents'
+
+    yield from _build_rollup(conn, CENTS_ROLLUP)
+
+def add_archive_state(conn):
+    """Archive boundary for moving closed months out of transactions"""
+    # One row: months before archived_before live in the archive database;
+    # moving_before is set while archive.py is moving rows up to that month,
+    # and deleting only inside the transaction that deletes the moved rows
+    conn.execute('''
+        CREATE TABLE IF NOT EXISTS archive_state (
+            id INTEGER PRIMARY KEY CHECK (id = 1),
+            archive_path TEXT,
+            archived_before TEXT,
+            moving_before TEXT,
+            deleting INTEGER NOT NULL DEFAULT 0,
+            updated_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP
+        )
+    ''')
+    conn.execute('INSERT OR IGNORE INTO archive_state (id) VALUES (1)')
+
+    # The rollup delete trigger now skips archive moves
+    conn.execute('DROP TRIGGER IF EXISTS trg_transactions_rollup_delete')
+    _create_released_rollup(conn, ARCHIVE_CENTS_ROLLUP)
+
+# Tables whose TEXT `category` column becomes INTEGER `category_id`
+CATEGORY_ID_TABLES = {
+    'transactions': '''
+        CREATE TABLE transactions (
+            id INTEGER PRIMARY KEY AUTOINCREMENT,
+            user_id INTEGER NOT NULL,
+            amount_cents INTEGER NOT NULL,
+            category_id INTEGER NOT NULL,
+            description TEXT,
+            date DATE NOT NULL,
+            type TEXT NOT NULL CHECK (type IN ('income', 'expense')),
+            created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
+            FOREIGN KEY (user_id) REFERENCES users (id),
+            FOREIGN KEY (category_id) REFERENCES categories (id)
+        )
+    ''',
+    'budgets': '''
+        CREATE TABLE budgets (
+            id INTEGER PRIMARY KEY AUTOINCREMENT,
+            user_id INTEGER NOT NULL,
+            category_id INTEGER NOT NULL,
+            amount_cents INTEGER NOT NULL,
+            month TEXT NOT NULL,
+            created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
+            updated_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
+            FOREIGN KEY (user_id) REFERENCES users (id),
+            FOREIGN KEY (category_id) REFERENCES categories (id),
+            UNIQUE(user_id, category_id, month)
+        )
+    ''',
+}
+
+# Category type from how a name is used: income, expense, or both
+CATEGORY_TYPE_SQL = '''
+    INSERT OR IGNORE INTO categories (name, type)
+    SELECT category, CASE WHEN MIN(type) = MAX(type) THEN MIN(type) ELSE 'both' END
+    FROM ({names}) AS used
+    GROUP BY category
+'''
+
+def normalize_category_ids(conn):
+    """Reference categories by id from budgets, transactions and the rollup"""
+    # Like store_amounts_in_cents: both tables are copied in the first
+    # transaction, then the rollup is rebuilt batch by batch.
+    _drop_rollup(conn)
+
+    tables = [table for table in CATEGORY_ID_TABLES if 'category' in table_columns(conn, table)]
+    if tables:
+        names = ' UNION ALL '.join(
+            f"SELECT category, {'type' if table == 'transactions' else repr('expense')} AS type FROM {table}"
+            for table in tables)
+        conn.execute(CATEGORY_TYPE_SQL.format(names=names))
+    for table in tables:
+        _rebuild_table(conn, table, CATEGORY_ID_TABLES[table], 'category', 'category_id',
+                       '(SELECT c.id FROM categories c WHERE c.name = category)')
+
+    conn.execute('CREATE INDEX IF NOT EXISTS idx_budget_user_month ON budgets (user_id, month)')
+    conn.execute('CREATE INDEX IF NOT EXISTS idx_transactions_date ON transactions (date)')
+    conn.execute('''
+        CREATE INDEX IF NOT EXISTS idx_transactions_covering
+        ON transactions (user_id, type, category_id, date, amount_cents)
+    ''')
+    yield 'category names replaced by category ids'
+
+    yield from _build_rollup(conn)
+
+def add_budget_summaries(conn):
+    """Per-user monthly budget summaries, kept current by triggers on budgets"""
+    # Same pattern as _build_rollup; the triggers recompute a whole
+    # user-month, so a backfill racing them can only write the same row
+    init_summary_tables(conn, backfill=False)
+    yield 'budget summary table and triggers created'
+
+    first, last = conn.execute('SELECT MIN(user_id), MAX(user_id) FROM budgets').fetchone()
+    if first is None:
+        return
+
+    for start in range(first, last + 1, ROLLUP_BATCH_USERS):
+        end = min(start + ROLLUP_BATCH_USERS - 1, last)
+        rebuild_summary_users(conn, start, end)
+        yield f'budget summaries backfilled for users {start}-{end} of {last}'
+
+def add_import_checkpoints(conn):
+    """Checkpoints that let an interrupted import resume"""
+    # IF NOT EXISTS: importer.py used to create this table itself
+    conn.execute('''
+        CREATE TABLE IF NOT EXISTS import_checkpoints (
+            source TEXT PRIMARY KEY,
+            rows_done INTEGER NOT NULL,
+            updated_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP
+        )
+    ''')
+
+# The categories a new database starts with (users can only pick existing
+# ones), as (name, icon, color, type)
+DEFAULT_CATEGORIES = [
+    ('Food', '🍔', '#FF6B6B', 'expense'),
+    ('Transportation', '🚗', '#4ECDC4', 'expense'),
+    ('Entertainment', '🎬', '#45B7D1', 'expense'),
+    ('Shopping', '🛍️', '#F7B801', 'expense'),
+    ('Utilities', '💡', '#95E77E', 'expense'),
+    ('Healthcare', '🏥', '#FF6B9D', 'expense'),
+    ('Education', '📚', '#C44569', 'expense'),
+    ('Housing', '🏠', '#7B68EE', 'expense'),
+    ('Insurance', '🛡️', '#00B894', 'expense'),
+    ('Other', '📌', '#636E72', 'expense'),
+    ('Salary', '💰', '#00D2D3', 'income'),
+    ('Freelance', '💻', '#54A0FF', 'income'),
+    ('Investment', '📈', '#48DBFB', 'income'),
+    ('Business', '🏢', '#0ABDE3', 'income'),
+    ('Other Income', '💵', '#006BA6', 'income'),
+]
+
+def add_default_categories(conn):
+    """Seed the default categories (existing ones, by name, are left alone)"""
+    conn.executemany('INSERT OR IGNORE INTO categories (name, icon, color, type) VALUES (?, ?, ?, ?)',
+                     DEFAULT_CATEGORIES)
+
+def add_category_version(conn):
+    """
+    Count changes to categories, so every process's CategoryCache can tell
+    its copy is stale with a one-row read
+    """
+    conn.execute('''
+        CREATE TABLE IF NOT EXISTS category_version (
+            id INTEGER PRIMARY KEY CHECK (id = 1),
+            version INTEGER NOT NULL
+        )
+    ''')
+    conn.execute('INSERT OR IGNORE INTO category_version (id, version) VALUES (1, 0)')
+    for event in ('INSERT', 'UPDATE', 'DELETE'):
+        conn.execute(f'''
+            CREATE TRIGGER IF NOT EXISTS trg_categories_version_{event.lower()}
+            AFTER {event} ON categories
+            BEGIN UPDATE category_version SET version = version + 1 WHERE id = 1; END
+        ''')
+
+# Applied in order; user_version = position in this list (1-based).
+# Never edit or reorder a released migration - append a new one.
+MIGRATIONS = [
+    create_core_tables,
+    add_covering_index,
+    add_monthly_rollup,
+    drop_duplicate_indexes,
+    store_amounts_in_cents,
+    add_archive_state,
+    normalize_category_ids,
+    add_budget_summaries,
+    add_import_checkpoints,
+    add_default_categories,
+    add_category_version,
+]
+
+SCHEMA_VERSION = len(MIGRATIONS)
+
+# Names the code refers to; kept when an identical index exists under another name
+CANONICAL_INDEXES = {'idx_budget_user_month', 'idx_transactions_date', 'idx_transactions_covering'}
+
+def version_of(migration):
+    """user_version right after `migration` has been applied"""
+    return MIGRATIONS.index(migration) + 1
+
+def get_version(conn):
+    """Current schema version of a database"""
+    return conn.execute('PRAGMA user_version').fetchone()[0]
+
+def table_columns(conn, table):
+    """Column names of a table (empty if it does not exist)"""
+    return [row[1] for row in conn.execute(f'PRAGMA table_info("{table}")')]
+
+def index_definitions(conn):
+    """Return {table: [(name, key columns, unique, origin)]} for every non-partial index"""
+    tables = [row[0] for row in conn.execute(
+        "SELECT name FROM sqlite_master WHERE type = 'table' AND name NOT LIKE 'sqlite_%'")]
+
+    definitions = {}
+    for table in tables:
+        for _, name, unique, origin, partial in conn.execute(f'PRAGMA index_list("{table}")').fetchall():
+            if partial:
+                continue
+            # (column, descending, collation) for the key columns, in order
+            columns = tuple((row[2], row[3], row[4])
+                            for row in conn.execute(f'PRAGMA index_xinfo("{name}")').fetchall()
+                            if row[5])
+            definitions.setdefault(table, []).append((name, columns, bool(unique), origin))
+    return definitions
+
+def _preference(index):
+    """Which of two identical indexes to keep: constraint/unique first, then canonical names"""
+    name, _, unique, origin = index
+    return (unique or origin != 'c', name in CANONICAL_INDEXES)
+
+def find_duplicate_indexes(conn):
+    """
+    Return [(redundant index, index that makes it redundant)].
+    An index is redundant when another index on the same table has the same
+    key columns, or starts with them. Unique and constraint indexes are
+    never dropped.
+    """
+    duplicates = []
+    for indexes in index_definitions(conn).values():
+        for index in indexes:
+            name, columns, unique, origin = index
+            if unique or origin != 'c':
+                continue
+            for other in indexes:
+                other_name, other_columns = other[0], other[1]
+                if other_name == name or other_columns[:len(columns)] != columns:
+                    continue
+                longer = len(other_columns) > len(columns)
+                preferred = (_preference(other), name) > (_preference(index), other_name)
+                if longer or preferred:
+                    duplicates.append((name, other_name))
+                    break
+    return duplicates
+
+def migrate(conn, target=SCHEMA_VERSION, report=print):
+    """Apply pending migrations up to `target` and return the new version"""
+    report = report or (lambda message: None)
+    version = get_version(conn)
+    if conn.in_transaction:
+        conn.commit()
+
+    for number, migration in enumerate(MIGRATIONS[version:target], start=version + 1):
+        conn.execute('BEGIN IMMEDIATE')
+        try:
+            if inspect.isgeneratorfunction(migration):
+                batch_start = time.perf_counter()
+                for message in migration(conn):
+                    # End of a batch: let other writers in before the next one
+                    conn.commit()
+                    report(f"   ... {message}")
+                    time.sleep(min(BATCH_PAUSE, time.perf_counter() - batch_start))
+                    conn.execute('BEGIN IMMEDIATE')
+                    batch_start = time.perf_counter()
+            else:
+                migration(conn)
+            conn.execute(f'PRAGMA user_version = {number}')
+            conn.commit()
+        except Exception:
+            conn.rollback()
+            raise
+        report(f"✅ Migration {number}: {migration.__doc__}")
+        version = number
+
+    return version
+
+def main(argv=None):
+    """Command-line entry point"""
+    parser = argparse.ArgumentParser(description='Migrate the finance database schema')
+    parser.add_argument('--database', default='finance.db')
+    parser.add_argument('--status', action='store_true', help='Only report the schema version')
+    args = parser.parse_args(argv)
+
+    if args.status and not os.path.exists(args.database):
+        print(f"❌ Database not found: {args.database}")
+        return 1
+
+    conn = sqlite3.connect(args.database)
+    version = get_version(conn)
+    print(f"📊 Schema version {version} of {SCHEMA_VERSION}")
+
+    if args.status:
+        for redundant, kept in find_duplicate_indexes(conn):
+            print(f"⚠️  {redundant} is redundant with {kept}")
+    elif version < SCHEMA_VERSION:
+        migrate(conn)
+        print(f"✅ Schema is now at version {SCHEMA_VERSION}")
+    else:
+        print("✅ Schema is up to date")
+
+    conn.close()
+    return 0
+
+if __name__ == '__main__':
+    sys.exit(main())
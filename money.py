@@ -0,0 +1,57 @@
+# money.py - Money Conversion Layer
+# Personal Finance Tracker - My Paldea
+# Course: IST 303 Fall 2025
+#
+# Amounts are stored as INTEGER cents (transactions.amount_cents,
+# budgets.amount_cents, monthly_category_spend.total_cents), so every SUM
+# is an exact integer sum. Conversion happens only at the edges:
+# - input (forms, imports, demo data) is parsed with Decimal, never float
+# - JSON responses carry dollars as numbers (cents / 100)
+# - templates format cents with the `money` filter
+
+import math
+from decimal import Decimal, InvalidOperation, ROUND_HALF_UP
+
+CENT = Decimal('0.01')
+
+# Largest amount that fits a SQLite INTEGER column
+MAX_CENTS = 2 ** 63 - 1
+
+def to_cents(value):
+    """Parse a dollar amount (str, int, float or Decimal) into integer cents, rounding half up"""
+    if isinstance(value, float):
+        if not math.isfinite(value):
+            raise ValueError('amount is not a finite number')
+        # repr gives the shortest string that round-trips, so 0.1 stays 0.1
+        value = repr(value)
+    try:
+        dollars = Decimal(str(value).strip())
+    except InvalidOperation:
+        raise ValueError('amount is not a number')
+    if not dollars.is_finite():
+        raise ValueError('amount is not a finite number')
+    try:
+        # quantize raises InvalidOperation once the result needs more than 28 digits
+        cents = int(dollars.quantize(CENT, rounding=ROUND_HALF_UP) * 100)
+    except InvalidOperation:
+        raise ValueError('amount is out of range')
+    if abs(cents) > MAX_CENTS:
+        raise ValueError('amount is out of range')
+    return cents
+
+def to_dollars(cents):
+    """Exact Decimal dollars for integer cents"""
+    return Decimal(cents) / 100
+
+def cents_to_float(cents):
+    """Dollars as a float, for JSON responses and NumPy"""
+    return cents / 100
+
+def format_money(cents):
+    """Jinja `money` filter: 123456 -> '$1,234.56', -500 -> '-$5.00'"""
+    sign = '-' if cents < 0 else ''
+    return f'{sign}${to_dollars(abs(cents)):,.2f}'
+
+def init_app(app):
+    """Register the `money` template filter"""
+    app.add_template_filter(format_money, 'money')
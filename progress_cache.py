@@ -0,0 +1,117 @@
+# progress_cache.py - Short-TTL Progress Cache
+# Personal Finance Tracker - My Paldea
+# Course: IST 303 Fall 2025
+#
+# Dashboard widgets poll progress and alerts constantly. Results are cached
+# per (user_id, month) in a bounded LRU with a short TTL; budget and
+# transaction writes invalidate exactly the affected user-month, and the TTL
+# bounds staleness for writes made by other processes.
+#
+# A reader computes a missing value and then stores it. A write that lands
+# in between would be undone by that store, so readers take a generation()
+# before computing and set() skips the store if the key was invalidated
+# since.
+
+import threading
+import time
+from collections import OrderedDict
+
+DEFAULT_MAX_ENTRIES = 1024
+DEFAULT_TTL = 30.0  # seconds
+
+class ProgressCache:
+    """Thread-safe LRU cache with a per-entry time-to-live"""
+
+    def __init__(self, max_entries=DEFAULT_MAX_ENTRIES, ttl=DEFAULT_TTL, clock=time.monotonic):
+        self.max_entries = max_entries
+        self.ttl = ttl
+        self._clock = clock
+        self._entries = OrderedDict()  # key -> (expires_at, value)
+        self._lock = threading.Lock()
+        # key -> invalidation count; the epoch changes whenever the counts are
+        # forgotten, so older generations never match again
+        self._generations = {}
+        self._epoch = 0
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self.expirations = 0
+        self.invalidations = 0
+        self.stale_sets = 0
+
+    def get(self, key):
+        """Return the cached value, or None if missing or expired"""
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None:
+                self.misses += 1
+                return None
+
+            expires_at, value = entry
+            if expires_at <= self._clock():
+                del self._entries[key]
+                self.expirations += 1
+                self.misses += 1
+                return None
+
+            self._entries.move_to_end(key)
+            self.hits += 1
+            return value
+
+    def generation(self, key):
+        """Token to pass to set(); it changes whenever the key is invalidated"""
+        with self._lock:
+            return self._epoch, self._generations.get(key, 0)
+
+    def set(self, key, value, generation=None):
+        """
+        Store a value, evicting the least recently used entries if full.
+        With a `generation` from before the value was computed, the store is
+        skipped (returns False) if the key was invalidated in the meantime.
+        """
+        with self._lock:
+            if generation is not None and generation != (self._epoch, self._generations.get(key, 0)):
+                self.stale_sets += 1
+                return False
+
+            self._entries[key] = (self._clock() + self.ttl, value)
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+                self.evictions += 1
+            return True
+
+    def invalidate(self, key):
+        """Drop one key (no-op if it is not cached) and bump its generation"""
+        with self._lock:
+            if key not in self._generations and len(self._generations) >= self.max_entries:
+                # Keep the counters bounded; the new epoch fails every older token
+                self._generations.clear()
+                self._epoch += 1
+            self._generations[key] = self._generations.get(key, 0) + 1
+            if self._entries.pop(key, None) is not None:
+                self.invalidations += 1
+
+    def clear(self):
+        """Drop every entry"""
+        with self._lock:
+            self._entries.clear()
+            self._generations.clear()
+            self._epoch += 1
+
+    def stats(self):
+        """Return counters for sizing the cache"""
+        with self._lock:
+            lookups = self.hits + self.misses
+            return {
+                'entries': len(self._entries),
+                'max_entries': self.max_entries,
+                'ttl_seconds': self.ttl,
+                'hits': self.hits,
+                'misses': self.misses,
+                'hit_rate': (self.hits / lookups) if lookups else 0,
+                'evictions': self.evictions,
+                'expirations': self.expirations,
+                'invalidations': self.invalidations,
+                'stale_sets': self.stale_sets
+            }
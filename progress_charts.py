@@ -0,0 +1,78 @@
+# progress_charts.py - Budget Progress Charts (PNG / SVG)
+# Personal Finance Tracker - My Paldea
+# Course: IST 303 Fall 2025
+#
+# Draws the /budget/progress bars as an image for email digests and mobile
+# clients: one horizontal bar per category, filled to its spending
+# percentage in the same status colors as the HTML page, against a 100%
+# budget line. Charts are drawn on the Agg canvas into a BytesIO (no pyplot,
+# no temporary files).
+#
+# data_version() hashes exactly what the chart shows, so the route can use
+# it both as the ETag and as part of the chart cache key: an unchanged
+# user-month is answered with 304 or from memory, and any budget or
+# transaction write that changes the numbers changes the version.
+
+import hashlib
+import io
+import json
+
+# Bump when the drawing code changes, so cached charts and ETags change too
+CHART_VERSION = 2
+
+CHART_FORMATS = {'png': 'image/png', 'svg': 'image/svg+xml'}
+
+# Bootstrap colors of the progress page's status classes
+STATUS_COLORS = {
+    'success': '#28a745',
+    'warning': '#ffc107',
+    'danger-orange': '#fd7e14',
+    'danger': '#dc3545',
+}
+
+WIDTH = 8  # inches
+DPI = 100
+
+def data_version(progress_data, month):
+    """Short hash of the month and each category's budget and spending"""
+    shown = [CHART_VERSION, month] + sorted(
+        (p['category'], p['budget_cents'], p['spent_cents']) for p in progress_data)
+    return hashlib.sha256(json.dumps(shown).encode()).hexdigest()[:20]
+
+def render_progress_chart(progress_data, fmt='png', title='Budget Progress'):
+    """Return the progress bars as PNG or SVG bytes"""
+    # Matplotlib is only needed for charts, so import it on first use
+    import matplotlib
+    from make_burndown import agg_figure
+
+    rows = sorted(progress_data, key=lambda p: p['category'], reverse=True)  # A at the top
+    height = max(2.5, 0.45 * len(rows) + 1.2)
+    buffer = io.BytesIO()
+    with agg_figure((WIDTH, height), DPI) as fig:
+        ax = fig.add_subplot()
+        if rows:
+            positions = range(len(rows))
+            # Bars stop at 120% so one blown budget does not squash the rest; the label has the real figure
+            ax.barh(positions, [min(p['actual_percentage'], 120) for p in rows],
+                    color=[STATUS_COLORS.get(p['color'], '#6c757d') for p in rows])
+            # Category names are user text: parse_math=False keeps a '$' in them from being read as
+            # math text (which can fail to parse and make savefig raise)
+            ax.set_yticks(list(positions), [p['category'] for p in rows], parse_math=False)
+            for position, p in zip(positions, rows):
+                ax.text(min(p['actual_percentage'], 120) + 1, position,
+                        f"{p['actual_percentage']:.0f}%  ${p['spent']:,.2f} / ${p['budget_amount']:,.2f}",
+                        va='center', fontsize='small', parse_math=False)
+            ax.axvline(100, color='#343a40', linestyle='--', linewidth=1)
+            ax.set_xlim(0, 175)
+            ax.set_xlabel('% of budget spent')
+        else:
+            ax.text(0.5, 0.5, 'No budgets set for this month', ha='center', va='center',
+                    transform=ax.transAxes)
+            ax.set_axis_off()
+        ax.set_title(title)
+        # Fixed margins in inches (tight_layout() adds ~50% to the draw)
+        fig.subplots_adjust(left=0.22, right=0.97, bottom=0.6 / height, top=1 - 0.4 / height)
+        # No creation date and fixed element ids in the SVG, so the same data gives the same bytes
+        with matplotlib.rc_context({'svg.hashsalt': f'progress-{CHART_VERSION}'}):
+            fig.savefig(buffer, format=fmt, metadata={'Date': None} if fmt == 'svg' else None)
+    return buffer.getvalue()
@@ -0,0 +1,241 @@
+#!/usr/bin/env python3
+"""
+Batch Chart Rendering
+Personal Finance Tracker - My Paldea
+Course: IST 303 Fall 2025
+
+Renders a manifest of chart jobs (JSON lines) on a ProcessPoolExecutor:
+
+    {"type": "burndown", "csv": "team-a.csv", "output": "charts/team-a.png", "title": "Team A"}
+    {"type": "spending", "user_id": 7, "first_month": "2025-01", "last_month": "2025-12",
+     "output": "charts/user-7.png"}
+
+Burndown jobs draw a CSV with make_burndown. Spending jobs draw a user's
+monthly expense totals (from the monthly_category_spend rollup) against
+their total budget (from budget_month_summary), read on a read-only
+connection per worker.
+
+Matplotlib rendering is CPU-bound, so jobs are spread over one worker
+process per CPU. Each worker imports Matplotlib and pandas and draws a
+throwaway chart once when it starts (fonts, text layout and PNG caches),
+so no job pays for that. Every chart is written to a temporary file and
+renamed into place, and skipped when its input hash is unchanged (see
+make_burndown.save_chart). A failing job is reported and does not stop the
+batch.
+
+Usage:
+    python render_charts.py render jobs.jsonl [--workers 4] [--database finance.db] [--force]
+    python render_charts.py spending-manifest jobs.jsonl --months 2025-01 2025-12 --output-dir charts
+"""
+
+import argparse
+import hashlib
+import io
+import json
+import os
+import sys
+import time
+from concurrent.futures import ProcessPoolExecutor
+
+import make_burndown
+from budget_engine import month_range
+from make_burndown import FIGSIZE, DPI, agg_figure, chart_is_current, save_chart
+from money import cents_to_float
+from reports import open_reader
+
+# Jobs handed to a worker at a time; charts take ~100 ms, so this only
+# trims the per-task IPC
+JOBS_PER_TASK = 8
+
+SPENDING_SQL = '''
+    SELECT month, SUM(total_cents)
+    FROM monthly_category_spend
+    WHERE user_id = ? AND type = 'expense' AND month BETWEEN ? AND ?
+    GROUP BY month
+'''
+
+BUDGET_TOTALS_SQL = '''
+    SELECT month, total_cents
+    FROM budget_month_summary
+    WHERE user_id = ? AND month BETWEEN ? AND ?
+'''
+
+# Every user with spending or budgets in a month range
+MANIFEST_USERS_SQL = '''
+    SELECT user_id FROM monthly_category_spend WHERE type = 'expense' AND month BETWEEN ? AND ?
+    UNION
+    SELECT user_id FROM budget_month_summary WHERE month BETWEEN ? AND ?
+    ORDER BY user_id
+'''
+
+def monthly_spending(conn, user_id, first_month, last_month):
+    """Return (months, spent cents, budget cents) for every month in the range"""
+    spent = dict(conn.execute(SPENDING_SQL, (user_id, first_month, last_month)))
+    budgets = dict(conn.execute(BUDGET_TOTALS_SQL, (user_id, first_month, last_month)))
+    months = month_range(first_month, last_month)
+    return months, [spent.get(month, 0) for month in months], [budgets.get(month, 0) for month in months]
+
+def render_spending_chart(months, spent_cents, budget_cents, output, title, figsize=FIGSIZE, dpi=DPI):
+    """Draw monthly spending bars against the budget line with the Agg canvas"""
+    with agg_figure(figsize, dpi) as fig:
+        ax = fig.add_subplot()
+        positions = range(len(months))
+        ax.bar(positions, [cents_to_float(cents) for cents in spent_cents], label='Spent')
+        ax.plot(positions, [cents_to_float(cents) for cents in budget_cents],
+                color='tab:red', marker='o', label='Budget')
+        ax.set_xticks(list(positions), months, rotation=45, ha='right', fontsize='small')
+        ax.set_title(title)
+        ax.set_ylabel('Dollars')
+        ax.legend(loc='upper left', fontsize='small')
+        fig.subplots_adjust(bottom=0.2)  # room for the rotated months; tight_layout() adds ~50% to the draw
+        fig.savefig(output)
+
+def run_burndown_job(job, force):
+    """Render one burndown job; returns True if drawn"""
+    return make_burndown.make_chart(job['csv'], job['output'], job.get('title', make_burndown.DEFAULT_TITLE),
+                                    force=force)
+
+def run_spending_job(conn, job, force):
+    """Render one user's spending chart; returns True if drawn"""
+    data = monthly_spending(conn, job['user_id'], job['first_month'], job['last_month'])
+    title = job.get('title') or f"User {job['user_id']} spending"
+    digest = hashlib.sha256(json.dumps(
+        [make_burndown.RENDER_VERSION, title, FIGSIZE, DPI, *data]).encode()).hexdigest()
+    if not force and chart_is_current(job['output'], digest):
+        return False
+
+    save_chart(job['output'], lambda path: render_spending_chart(*data, path, title), digest)
+    return True
+
+class ChartWorker:
+    """Runs jobs in one process, with one reader connection per database"""
+
+    def __init__(self, database, force=False):
+        self.database = database
+        self.force = force
+        self._connections = {}
+
+    def warm_up(self):
+        """Import Matplotlib and pandas and draw one chart into memory"""
+        import pandas  # noqa: F401 (burndown CSVs are read with pandas)
+        make_burndown.render_chart({'warm-up': ([1, 2], [2, 1])}, io.BytesIO(), 'warm-up')
+        render_spending_chart(['2025-01', '2025-02'], [100, 200], [150, 150], io.BytesIO(), 'warm-up')
+
+    def connection(self, database):
+        """This worker's reader connection to a database, opened on first use"""
+        if database not in self._connections:
+            self._connections[database] = open_reader(database)
+        return self._connections[database]
+
+    def run(self, job):
+        """Return (output, 'rendered' | 'skipped' | 'failed', error message)"""
+        try:
+            if job['type'] == 'burndown':
+                drawn = run_burndown_job(job, self.force)
+            elif job['type'] == 'spending':
+                drawn = run_spending_job(self.connection(job.get('database', self.database)), job, self.force)
+            else:
+                raise ValueError(f"unknown job type '{job['type']}'")
+        except Exception as e:
+            return job.get('output'), 'failed', f'{type(e).__name__}: {e}'
+        return job['output'], 'rendered' if drawn else 'skipped', None
+
+    def close(self):
+        for conn in self._connections.values():
+            conn.close()
+
+# The worker of each pool process, created once by the initializer
+_worker = None
+
+def _init_worker(database, force):
+    global _worker
+    _worker = ChartWorker(database, force)
+    _worker.warm_up()
+
+def _run_in_worker(job):
+    return _worker.run(job)
+
+def read_manifest(path):
+    """Return the jobs of a JSON-lines manifest (blank lines ignored)"""
+    with open(path, encoding='utf-8') as f:
+        return [json.loads(line) for line in f if line.strip()]
+
+def render_all(jobs, database='finance.db', workers=None, force=False):
+    """
+    Render every job and return {'rendered', 'skipped', 'failed', 'seconds',
+    'charts_per_second', 'errors': [(output, message)]}. workers defaults
+    to one per CPU; workers=1 renders in this process.
+    """
+    workers = workers or os.cpu_count() or 1
+    start = time.perf_counter()
+    if workers == 1:
+        worker = ChartWorker(database, force)
+        worker.warm_up()
+        try:
+            results = [worker.run(job) for job in jobs]
+        finally:
+            worker.close()
+    else:
+        with ProcessPoolExecutor(max_workers=workers, initializer=_init_worker,
+                                 initargs=(database, force)) as executor:
+            results = list(executor.map(_run_in_worker, jobs, chunksize=JOBS_PER_TASK))
+    seconds = time.perf_counter() - start
+
+    summary = {'rendered': 0, 'skipped': 0, 'failed': 0, 'errors': []}
+    for output, status, error in results:
+        summary[status] += 1
+        if error:
+            summary['errors'].append((output, error))
+    summary['seconds'] = seconds
+    summary['charts_per_second'] = summary['rendered'] / seconds if seconds else 0.0
+    return summary
+
+def spending_manifest(conn, first_month, last_month, output_dir):
+    """Return a spending job for every user with budgets or spending in the month range"""
+    return [{'type': 'spending', 'user_id': user_id, 'first_month': first_month, 'last_month': last_month,
+             'output': os.path.join(output_dir, f'user-{user_id}.png')}
+            for user_id, in conn.execute(MANIFEST_USERS_SQL, (first_month, last_month) * 2)]
+
+def main(argv=None):
+    """Command-line entry point"""
+    parser = argparse.ArgumentParser(description='Render batches of charts on a process pool')
+    parser.add_argument('--database', default='finance.db')
+    commands = parser.add_subparsers(dest='command', required=True)
+
+    render = commands.add_parser('render', help='Render every job in a manifest')
+    render.add_argument('manifest')
+    render.add_argument('--workers', type=int, help='Worker processes (default: one per CPU)')
+    render.add_argument('--force', action='store_true', help='Redraw charts whose input is unchanged')
+
+    manifest = commands.add_parser('spending-manifest', help='Write a spending job for every user')
+    manifest.add_argument('manifest')
+    manifest.add_argument('--months', nargs=2, required=True, metavar=('FIRST', 'LAST'))
+    manifest.add_argument('--output-dir', default='charts')
+    args = parser.parse_args(argv)
+
+    if args.command == 'spending-manifest':
+        if not os.path.exists(args.database):
+            print(f"❌ Database not found: {args.database}")
+            return 1
+        conn = open_reader(args.database)
+        jobs = spending_manifest(conn, *args.months, args.output_dir)
+        conn.close()
+        with open(args.manifest, 'w', encoding='utf-8') as f:
+            f.writelines(json.dumps(job) + '\n' for job in jobs)
+        print(f"✅ {len(jobs):,} spending jobs written to {args.manifest}")
+        return 0
+
+    if not os.path.exists(args.manifest):
+        print(f"❌ Manifest not found: {args.manifest}")
+        return 1
+
+    summary = render_all(read_manifest(args.manifest), args.database, args.workers, args.force)
+    for output, error in summary['errors']:
+        print(f"❌ {output}: {error}")
+    print(f"📊 {summary['rendered']:,} rendered, {summary['skipped']:,} up to date, "
+          f"{summary['failed']:,} failed in {summary['seconds']:.1f}s "
+          f"({summary['charts_per_second']:.1f} charts/s)")
+    return 1 if summary['failed'] else 0
+
+if __name__ == '__main__':
+    sys.exit(main())
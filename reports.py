@@ -0,0 +1,274 @@
+#!/usr/bin/env python3
+"""
+Month-End Budget Reports for Every User
+Personal Finance Tracker - My Paldea
+Course: IST 303 Fall 2025
+
+Computes every user's budget progress, overall stats and alerts for a month
+(the same budget_engine rows and thresholds as /budget/progress and
+/budget/alerts) and streams them to a JSONL, CSV or Parquet file.
+
+Users are split into shards of consecutive ids. Each shard is one set-based
+query over budgets and the monthly rollup, run by a ProcessPoolExecutor
+worker on its own read-only (query_only) connection; the worker also
+encodes the shard's output, so shards use every core and never contend for
+the GIL or a shared connection. The parent only appends: chunks are written
+in user order as shards finish, with at most a few shards per worker in
+flight, so memory stays flat however many users there are.
+
+Output formats (chosen by the output file's extension):
+    .jsonl    one object per user: stats, progress rows and alerts
+    .csv      one row per (user, category) with its status and alert level
+    .parquet  the CSV rows, written a row group per shard (needs pandas and pyarrow)
+
+Usage:
+    python reports.py --month 2025-10 --output reports/2025-10.jsonl [--workers 4] [--database finance.db]
+"""
+
+import argparse
+import csv
+import io
+import json
+import os
+import sqlite3
+import sys
+import time
+from collections import deque
+from concurrent.futures import ProcessPoolExecutor
+from datetime import datetime
+
+import db
+from budget_engine import get_progress_for_users, summarize_progress, build_alerts
+
+DEFAULT_SHARD_USERS = 1000
+
+# Shards queued per worker: enough to keep workers busy, few enough that
+# finished shards waiting for an earlier one do not pile up in memory
+PENDING_PER_WORKER = 2
+
+# Columns of the flat (CSV / Parquet) report, one row per user and category
+FLAT_COLUMNS = ['user_id', 'month', 'category', 'budget_cents', 'spent_cents', 'remaining_cents',
+                'percentage', 'color', 'status', 'is_over', 'alert_level']
+
+def open_reader(database):
+    """
+    A read-only connection with the reader pool's PRAGMAs. A plain sqlite3
+    connection: the pool's per-statement instrumentation is for requests
+    and costs more than the query itself on a shard's 10,000 rows.
+    """
+    conn = sqlite3.connect(database)
+    for name, value in db.READER_PRAGMAS.items():
+        conn.execute(f'PRAGMA {name} = {value}')
+    return conn
+
+def report_shard(conn, first_user, last_user, month):
+    """Return the report records of users first_user..last_user with budgets in the month"""
+    records = []
+    for user_id, progress_data in get_progress_for_users(conn, first_user, last_user, month):
+        records.append({
+            'user_id': user_id,
+            'month': month,
+            'stats': summarize_progress(progress_data),
+            'progress': progress_data,
+            'alerts': build_alerts(progress_data)
+        })
+    return records
+
+def flat_rows(record):
+    """The (user, category) rows of one user's report record"""
+    alert_levels = {alert['category']: alert['level'] for alert in record['alerts']}
+    return [[record['user_id'], record['month'], p['category'], p['budget_cents'], p['spent_cents'],
+             p['remaining_cents'], p['actual_percentage'], p['color'], p['status'], p['is_over'],
+             alert_levels.get(p['category'], '')]
+            for p in record['progress']]
+
+# Writers split into encode(), which runs in the worker that computed the
+# shard (so JSON/CSV formatting is parallel too, and only a string crosses
+# the process boundary), and write(), which appends it in the parent.
+
+class JsonlWriter:
+    """One JSON object per user"""
+
+    def __init__(self, path):
+        self._file = open(path, 'w', encoding='utf-8')
+
+    @staticmethod
+    def encode(records):
+        return ''.join(json.dumps(record) + '\n' for record in records)
+
+    def write(self, chunk):
+        self._file.write(chunk)
+
+    def close(self):
+        self._file.close()
+
+class CsvWriter:
+    """One row per user and category, with a header"""
+
+    def __init__(self, path):
+        self._file = open(path, 'w', newline='', encoding='utf-8')
+        csv.writer(self._file).writerow(FLAT_COLUMNS)
+
+    @staticmethod
+    def encode(records):
+        buffer = io.StringIO()
+        writer = csv.writer(buffer)
+        for record in records:
+            writer.writerows(flat_rows(record))
+        return buffer.getvalue()
+
+    def write(self, chunk):
+        self._file.write(chunk)
+
+    def close(self):
+        self._file.close()
+
+class ParquetWriter:
+    """The CSV rows as Parquet, one row group per shard"""
+
+    def __init__(self, path):
+        # Only Parquet output needs pandas/pyarrow, so import them on first use
+        import pandas as pd
+        import pyarrow as pa
+        import pyarrow.parquet as pq
+        self._pd, self._pa, self._pq = pd, pa, pq
+        self._path = path
+        self._writer = None
+
+    @staticmethod
+    def encode(records):
+        return [row for record in records for row in flat_rows(record)]
+
+    def write(self, chunk):
+        if not chunk:
+            return
+        table = self._pa.Table.from_pandas(self._pd.DataFrame(chunk, columns=FLAT_COLUMNS),
+                                           preserve_index=False)
+        if self._writer is None:
+            self._writer = self._pq.ParquetWriter(self._path, table.schema)
+        self._writer.write_table(table)
+
+    def close(self):
+        if self._writer is not None:
+            self._writer.close()
+
+WRITERS = {'.jsonl': JsonlWriter, '.csv': CsvWriter, '.parquet': ParquetWriter}
+
+def writer_class(path):
+    """The writer for the output file's extension"""
+    extension = os.path.splitext(path)[1].lower()
+    if extension not in WRITERS:
+        raise ValueError(f"Unsupported report format '{extension}' (use {', '.join(WRITERS)})")
+    return WRITERS[extension]
+
+def encode_shard(conn, first_user, last_user, month, writer):
+    """Return (encoded chunk, users, rows, alerts) for one shard"""
+    records = report_shard(conn, first_user, last_user, month)
+    return (writer.encode(records), len(records),
+            sum(len(record['progress']) for record in records),
+            sum(len(record['alerts']) for record in records))
+
+# Each worker process keeps one reader connection for all of its shards
+_worker_conn = None
+
+def _init_worker(database):
+    global _worker_conn
+    _worker_conn = open_reader(database)
+
+def _encode_shard_in_worker(first_user, last_user, month, writer):
+    return encode_shard(_worker_conn, first_user, last_user, month, writer)
+
+def user_shards(conn, month, shard_users=DEFAULT_SHARD_USERS):
+    """Return (first_user, last_user) ranges covering every user with budgets in the month"""
+    # budget_month_summary is keyed (month, user_id), so this is two index seeks
+    first, last = conn.execute('SELECT MIN(user_id), MAX(user_id) FROM budget_month_summary WHERE month = ?',
+                               (month,)).fetchone()
+    if first is None:
+        return []
+    return [(start, min(start + shard_users - 1, last))
+            for start in range(first, last + 1, shard_users)]
+
+def _shard_results(database, shards, month, writer, workers):
+    """Yield each shard's encode_shard result in shard order"""
+    if workers == 1:
+        conn = open_reader(database)
+        try:
+            for first, last in shards:
+                yield encode_shard(conn, first, last, month, writer)
+        finally:
+            conn.close()
+        return
+
+    with ProcessPoolExecutor(max_workers=workers, initializer=_init_worker,
+                             initargs=(database,)) as executor:
+        pending = deque()
+        for first, last in shards:
+            pending.append(executor.submit(_encode_shard_in_worker, first, last, month, writer))
+            if len(pending) >= workers * PENDING_PER_WORKER:
+                yield pending.popleft().result()
+        while pending:
+            yield pending.popleft().result()
+
+def generate_report(database, month, output, workers=None, shard_users=DEFAULT_SHARD_USERS):
+    """
+    Write every user's report for the month to `output` and return counts
+    (users, rows, alerts, shards). workers defaults to one per CPU;
+    workers=1 runs in this process.
+    """
+    writer_cls = writer_class(output)
+    workers = workers or os.cpu_count() or 1
+    conn = open_reader(database)
+    try:
+        shards = user_shards(conn, month, shard_users)
+    finally:
+        conn.close()
+
+    os.makedirs(os.path.dirname(output) or '.', exist_ok=True)
+    writer = writer_cls(output)
+    counts = {'users': 0, 'rows': 0, 'alerts': 0, 'shards': len(shards)}
+    try:
+        for chunk, users, rows, alerts in _shard_results(database, shards, month, writer_cls, workers):
+            writer.write(chunk)
+            counts['users'] += users
+            counts['rows'] += rows
+            counts['alerts'] += alerts
+    finally:
+        writer.close()
+    return counts
+
+def main(argv=None):
+    """Command-line entry point"""
+    parser = argparse.ArgumentParser(description='Write month-end budget reports for every user')
+    parser.add_argument('--month', default=datetime.now().strftime('%Y-%m'), help='YYYY-MM (default: this month)')
+    parser.add_argument('--output', required=True, help='Report file (.jsonl, .csv or .parquet)')
+    parser.add_argument('--database', default='finance.db')
+    parser.add_argument('--workers', type=int, help='Worker processes (default: one per CPU)')
+    parser.add_argument('--shard-users', type=int, default=DEFAULT_SHARD_USERS)
+    args = parser.parse_args(argv)
+
+    if not os.path.exists(args.database):
+        print(f"❌ Database not found: {args.database}")
+        return 1
+    try:
+        datetime.strptime(args.month, '%Y-%m')
+    except ValueError:
+        print(f"❌ Month must be YYYY-MM: {args.month}")
+        return 1
+
+    start = time.perf_counter()
+    try:
+        counts = generate_report(args.database, args.month, args.output, args.workers, args.shard_users)
+    except ValueError as e:
+        print(f"❌ {e}")
+        return 1
+    except ImportError:
+        print("❌ Parquet reports require pandas and pyarrow to be installed")
+        return 1
+
+    elapsed = time.perf_counter() - start
+    print(f"✅ {counts['users']:,} users ({counts['rows']:,} categories, {counts['alerts']:,} alerts) "
+          f"written to {args.output} in {elapsed:.1f}s ({counts['users'] / elapsed:,.0f} users/s)")
+    return 0
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -0,0 +1,211 @@
+#!/usr/bin/env python3
+"""
+Monthly Spend Rollups
+Personal Finance Tracker - My Paldea
+Course: IST 303 Fall 2025
+
+monthly_category_spend keeps one row per (user, month, category id, type) with
+the running total (in cents) and count of its transactions. Triggers on
+transactions keep it current on INSERT, UPDATE and DELETE, so progress,
+alerts and the progress API read a handful of rollup rows instead of
+re-summing history. Verify and rebuild recompute from the archive too for
+months archive.py has moved out of transactions.
+
+Usage:
+    python rollups.py verify  [--database finance.db]   # report drift
+    python rollups.py rebuild [--database finance.db]   # recompute from scratch
+"""
+
+import argparse
+import os
+import sqlite3
+import sys
+
+from archive import transactions_source
+from budget_engine import month_bounds
+from money import format_money
+
+ROLLUP_TABLE_SQL = '''
+    CREATE TABLE IF NOT EXISTS monthly_category_spend (
+        user_id INTEGER NOT NULL,
+        month TEXT NOT NULL,
+        category_id INTEGER NOT NULL,
+        type TEXT NOT NULL,
+        total_cents INTEGER NOT NULL DEFAULT 0,
+        count INTEGER NOT NULL DEFAULT 0,
+        PRIMARY KEY (user_id, month, category_id, type)
+    )
+'''
+
+# Add a transaction's amount to its rollup row
+_ADD_ROW = '''
+        INSERT INTO monthly_category_spend (user_id, month, category_id, type, total_cents, count)
+        VALUES (NEW.user_id, substr(NEW.date, 1, 7), NEW.category_id, NEW.type, NEW.amount_cents, 1)
+        ON CONFLICT (user_id, month, category_id, type) DO UPDATE SET
+            total_cents = total_cents + excluded.total_cents,
+            count = count + 1;
+'''
+
+# Take a transaction's amount back out, dropping rows that become empty
+_REMOVE_ROW = '''
+        UPDATE monthly_category_spend
+        SET total_cents = total_cents - OLD.amount_cents, count = count - 1
+        WHERE user_id = OLD.user_id AND month = substr(OLD.date, 1, 7)
+        AND category_id = OLD.category_id AND type = OLD.type;
+        DELETE FROM monthly_category_spend
+        WHERE user_id = OLD.user_id AND month = substr(OLD.date, 1, 7)
+        AND category_id = OLD.category_id AND type = OLD.type AND count <= 0;
+'''
+
+# One statement each, so they can be created inside a migration's transaction
+# (executescript would commit first). Deletes made by archive.py, which moves
+# rows to the archive database, leave the rollup alone.
+ROLLUP_TRIGGERS = [
+    f'''
+    CREATE TRIGGER IF NOT EXISTS trg_transactions_rollup_insert
+    AFTER INSERT ON transactions
+    BEGIN{_ADD_ROW}
+    END
+    ''',
+    f'''
+    CREATE TRIGGER IF NOT EXISTS trg_transactions_rollup_delete
+    AFTER DELETE ON transactions
+    WHEN NOT EXISTS (SELECT 1 FROM archive_state WHERE deleting = 1)
+    BEGIN{_REMOVE_ROW}
+    END
+    ''',
+    f'''
+    CREATE TRIGGER IF NOT EXISTS trg_transactions_rollup_update
+    AFTER UPDATE OF user_id, amount_cents, category_id, date, type ON transactions
+    BEGIN{_REMOVE_ROW}{_ADD_ROW}
+    END
+    ''',
+]
+
+# Recompute rollup rows from transactions (optionally for one month or user
+# range); {source} also reaches into the archive (see archive.py)
+RECOMPUTE_SQL = '''
+    SELECT user_id, substr(date, 1, 7) as month, category_id, type,
+           SUM(amount_cents) as total_cents, COUNT(*) as count
+    FROM {source}
+    {where}
+    GROUP BY user_id, substr(date, 1, 7), category_id, type
+'''
+
+def init_rollup_tables(conn, backfill=True):
+    """Create the rollup table and its triggers, backfilling on first creation"""
+    exists = conn.execute('''
+        SELECT 1 FROM sqlite_master
+        WHERE type = 'table' AND name = 'monthly_category_spend'
+    ''').fetchone()
+
+    conn.execute(ROLLUP_TABLE_SQL)
+    for trigger in ROLLUP_TRIGGERS:
+        conn.execute(trigger)
+
+    if backfill and not exists:
+        rebuild_rollup(conn)
+
+def rebuild_rollup_users(conn, first_user, last_user):
+    """
+    Recompute the rollup rows of users first_user..last_user (no commit).
+    Correct even while the triggers are live: writes before the recompute
+    are replaced by it, writes after it are applied on top by the triggers.
+    """
+    conn.execute('DELETE FROM monthly_category_spend WHERE user_id BETWEEN ? AND ?',
+                 (first_user, last_user))
+    source = transactions_source(conn)
+    conn.execute(f'''
+        INSERT INTO monthly_category_spend (user_id, month, category_id, type, total_cents, count)
+        {RECOMPUTE_SQL.format(source=source, where='WHERE user_id BETWEEN ? AND ?')}
+    ''', (first_user, last_user))
+
+def _recompute(conn, month=None):
+    """Return {(user_id, month, category_id, type): (total cents, count)} from transactions"""
+    where, params = '', []
+    if month is not None:
+        where = 'WHERE date >= ? AND date < ?'
+        params = list(month_bounds(month))
+
+    source = transactions_source(conn, month)
+    rows = conn.execute(RECOMPUTE_SQL.format(source=source, where=where), params)
+    return {tuple(row[:4]): (row[4], row[5]) for row in rows}
+
+def _stored(conn, month=None):
+    """Return {(user_id, month, category_id, type): (total cents, count)} from the rollup"""
+    where, params = '', []
+    if month is not None:
+        where, params = 'WHERE month = ?', [month]
+
+    rows = conn.execute(f'''
+        SELECT user_id, month, category_id, type, total_cents, count
+        FROM monthly_category_spend {where}
+    ''', params)
+    return {tuple(row[:4]): (row[4], row[5]) for row in rows}
+
+def verify_rollup(conn, month=None):
+    """Compare the rollup with a fresh recompute and return the drifted rows"""
+    expected = _recompute(conn, month)
+    stored = _stored(conn, month)
+
+    drift = []
+    for key in sorted(set(expected) | set(stored)):
+        want_total, want_count = expected.get(key, (0, 0))
+        have_total, have_count = stored.get(key, (0, 0))
+        if (want_count, want_total) != (have_count, have_total):
+            user_id, row_month, category_id, type_ = key
+            drift.append({
+                'user_id': user_id,
+                'month': row_month,
+                'category_id': category_id,
+                'type': type_,
+                'expected_total_cents': want_total,
+                'expected_count': want_count,
+                'stored_total_cents': have_total,
+                'stored_count': have_count
+            })
+    return drift
+
+def rebuild_rollup(conn):
+    """Recompute the whole rollup from transactions in one transaction"""
+    source = transactions_source(conn)
+    with conn:
+        conn.execute('DELETE FROM monthly_category_spend')
+        conn.execute(f'''
+            INSERT INTO monthly_category_spend (user_id, month, category_id, type, total_cents, count)
+            {RECOMPUTE_SQL.format(source=source, where='')}
+        ''')
+
+def main(argv=None):
+    """Command-line entry point for verify / rebuild"""
+    parser = argparse.ArgumentParser(description='Verify or rebuild monthly spend rollups')
+    parser.add_argument('command', choices=['verify', 'rebuild'])
+    parser.add_argument('--database', default='finance.db')
+    parser.add_argument('--month', help='Only check one month (YYYY-MM)')
+    args = parser.parse_args(argv)
+
+    if not os.path.exists(args.database):
+        print(f"❌ Database not found: {args.database}")
+        return 1
+
+    conn = sqlite3.connect(args.database)
+    init_rollup_tables(conn)
+
+    drift = verify_rollup(conn, args.month)
+    for row in drift:
+        print(f"❌ user {row['user_id']} {row['month']} category {row['category_id']} ({row['type']}): "
+              f"stored {format_money(row['stored_total_cents'])} / {row['stored_count']} rows, "
+              f"expected {format_money(row['expected_total_cents'])} / {row['expected_count']} rows")
+    print(f"📊 {len(drift)} drifted rollup rows")
+
+    if args.command == 'rebuild':
+        rebuild_rollup(conn)
+        print("✅ Rollup rebuilt from transactions")
+        conn.close()
+        return 0
+
+    conn.close()
+    return 1 if drift else 0
+
+if __name__ == '__main__':
+    sys.exit(main())
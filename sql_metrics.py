@@ -0,0 +1,160 @@
+# sql_metrics.py - Per-Request SQL Instrumentation
+# Personal Finance Tracker - My Paldea
+# Course: IST 303 Fall 2025
+#
+# Pooled connections hand out InstrumentedCursor, which times every
+# execute/fetch and records the statement text, parameter shape, wall time
+# and rows returned. Inside a request the records are collected in `g`;
+# after the request the totals are sent back as X-DB-Queries / X-DB-Time-ms
+# headers and statements slower than SLOW_QUERY_MS go to the slow-query log.
+#
+# The overhead is a couple of perf_counter() calls and one list append per
+# statement, so it can stay on in production (SQL_INSTRUMENTATION = False
+# turns recording off).
+
+import logging
+import sqlite3
+from time import perf_counter
+
+from flask import current_app, g, has_app_context
+
+slow_query_log = logging.getLogger('paldea.slow_sql')
+
+DEFAULT_SLOW_QUERY_MS = 100
+MAX_RECORDED_STATEMENTS = 200  # per request; totals keep counting past this
+
+def parameter_shape(parameters):
+    """Describe parameters without their values, e.g. 'int, str' or ':month, :user_id'"""
+    if isinstance(parameters, dict):
+        return ', '.join(f':{name}' for name in sorted(parameters))
+    return ', '.join(type(value).__name__ for value in parameters)
+
+class QueryStats:
+    """Statements run during one request (or app context)"""
+
+    def __init__(self):
+        self.count = 0
+        self.seconds = 0.0
+        self.statements = []
+
+    @property
+    def time_ms(self):
+        return self.seconds * 1000
+
+    def add(self, sql, shape, seconds, rows):
+        """Record one statement and return its record (updated by later fetches)"""
+        self.count += 1
+        self.seconds += seconds
+        record = {'sql': ' '.join(sql.split()), 'params': shape, 'seconds': seconds, 'rows': rows}
+        if len(self.statements) < MAX_RECORDED_STATEMENTS:
+            self.statements.append(record)
+        return record
+
+    def add_fetch(self, record, seconds, rows):
+        """Charge fetch time and rows to the statement that produced them"""
+        self.seconds += seconds
+        record['seconds'] += seconds
+        record['rows'] += rows
+
+def current_stats():
+    """Get the QueryStats for the current app context, or None outside one"""
+    if not has_app_context() or not current_app.config.get('SQL_INSTRUMENTATION', True):
+        return None
+    stats = g.get('_sql_stats')
+    if stats is None:
+        stats = g._sql_stats = QueryStats()
+    return stats
+
+def slow_query_ms():
+    """Threshold for the slow-query log in milliseconds"""
+    if has_app_context():
+        return current_app.config.get('SLOW_QUERY_MS', DEFAULT_SLOW_QUERY_MS)
+    return DEFAULT_SLOW_QUERY_MS
+
+def log_slow(record):
+    """Write one statement record to the slow-query log"""
+    slow_query_log.warning('%.1f ms | %d rows | %s | params: %s',
+                           record['seconds'] * 1000, record['rows'], record['sql'], record['params'])
+
+class InstrumentedCursor(sqlite3.Cursor):
+    """Cursor that records each statement's text, parameter shape, time and rows"""
+
+    _stats = None
+    _record = None
+
+    def _start(self, sql, shape, seconds, rows=0):
+        self._stats = current_stats()
+        if self._stats is not None:
+            self._record = self._stats.add(sql, shape, seconds, rows)
+        elif seconds * 1000 >= slow_query_ms():
+            # No request to report to: log slow statements straight away
+            log_slow({'sql': ' '.join(sql.split()), 'params': shape, 'seconds': seconds, 'rows': rows})
+
+    def _fetched(self, seconds, rows):
+        if self._record is not None:
+            self._stats.add_fetch(self._record, seconds, rows)
+
+    def execute(self, sql, parameters=()):
+        start = perf_counter()
+        try:
+            return super().execute(sql, parameters)
+        finally:
+            self._start(sql, parameter_shape(parameters), perf_counter() - start)
+
+    def executemany(self, sql, seq_of_parameters):
+        start = perf_counter()
+        try:
+            return super().executemany(sql, seq_of_parameters)
+        finally:
+            self._start(sql, 'many', perf_counter() - start, max(self.rowcount, 0))
+
+    def fetchone(self):
+        start = perf_counter()
+        row = super().fetchone()
+        self._fetched(perf_counter() - start, 0 if row is None else 1)
+        return row
+
+    def fetchmany(self, size=None):
+        start = perf_counter()
+        rows = super().fetchmany(self.arraysize if size is None else size)
+        self._fetched(perf_counter() - start, len(rows))
+        return rows
+
+    def fetchall(self):
+        start = perf_counter()
+        rows = super().fetchall()
+        self._fetched(perf_counter() - start, len(rows))
+        return rows
+
+    def __next__(self):
+        start = perf_counter()
+        row = super().__next__()
+        self._fetched(perf_counter() - start, 1)
+        return row
+
+def add_query_headers(response):
+    """after_request: report this request's SQL totals and log slow statements"""
+    stats = g.get('_sql_stats')
+    if stats is None:
+        response.headers['X-DB-Queries'] = '0'
+        response.headers['X-DB-Time-ms'] = '0.00'
+        return response
+
+    response.headers['X-DB-Queries'] = str(stats.count)
+    response.headers['X-DB-Time-ms'] = f'{stats.time_ms:.2f}'
+
+    threshold = slow_query_ms() / 1000
+    for record in stats.statements:
+        if record['seconds'] >= threshold:
+            log_slow(record)
+    return response
+
+def init_app(app):
+    """Register the response headers and optional slow-query log file"""
+    app.after_request(add_query_headers)
+
+    log_path = app.config.get('SLOW_QUERY_LOG')
+    if log_path and not any(getattr(h, 'baseFilename', None) == log_path for h in slow_query_log.handlers):
+        handler = logging.FileHandler(log_path)
+        handler.setFormatter(logging.Formatter('%(asctime)s %(message)s'))
+        slow_query_log.addHandler(handler)
@@ -0,0 +1,133 @@
+# test_alert_stream.py - Tests for live budget alerts over SSE
+# Course: IST 303 Fall 2025
+
+import json
+import sqlite3
+from datetime import datetime
+
+import pytest
+
+from alert_stream import AlertBroker, alert_signature
+from categories import ensure_category_ids
+from db import close_all_pools
+from conftest import create_test_app
+
+def alert(category, level):
+    return {'category': category, 'level': level, 'message': '', 'percentage': 0}
+
+def parse_event(chunk):
+    """(event id, alerts) from one SSE chunk"""
+    fields = dict(line.split(': ', 1) for line in chunk.decode().strip().splitlines()
+                  if not line.startswith(':'))
+    return int(fields['id']), json.loads(fields['data'])
+
+def test_broker_fans_out_one_computation_on_threshold_change():
+    """Test one computation per write, pushed to every subscriber only when a band changes"""
+    broker = AlertBroker()
+    calls = []
+
+    def compute(alerts):
+        def run():
+            calls.append(1)
+            return alerts
+        return run
+
+    # Nobody watching: nothing is computed
+    assert not broker.notify(1, '2025-10', compute([]))
+    assert calls == []
+
+    subscriptions = [broker.subscribe(1, '2025-10', []) for _ in range(3)]
+    assert broker.subscriber_count(1) == 3
+
+    assert broker.notify(1, '2025-10', compute([alert('Food', 'info')]))
+    assert len(calls) == 1
+    for subscription in subscriptions:
+        assert subscription.get(timeout=0) == (1, [alert('Food', 'info')])
+
+    # Same bands (percentages moved within 80-90%): no event
+    assert not broker.notify(1, '2025-10', compute([alert('Food', 'info')]))
+    assert subscriptions[0].get(timeout=0) is None
+
+    # Another month or user is ignored without computing
+    assert not broker.notify(1, '2025-09', compute([]))
+    assert not broker.notify(2, '2025-10', compute([]))
+    assert len(calls) == 2
+
+    for subscription in subscriptions:
+        broker.unsubscribe(subscription)
+    assert broker.stats()['subscribers'] == 0
+    assert alert_signature([alert('b', 'danger'), alert('a', 'info')]) == (('a', 'info'), ('b', 'danger'))
+
+@pytest.fixture
+def auth_client(tmp_path, monkeypatch):
+    """Logged-in client with a 100.00 Food budget and 75.00 spent this month"""
+    monkeypatch.chdir(tmp_path)
+    app = create_test_app(ALERT_STREAM_KEEPALIVE=0.05)
+    client = app.test_client()
+    client.get('/budget/')  # first request creates the schema
+    month = datetime.now().strftime('%Y-%m')
+    conn = sqlite3.connect('finance.db')
+    food = ensure_category_ids(conn, ['Food'])['Food']
+    conn.execute("INSERT INTO budgets (user_id, category_id, amount_cents, month) VALUES (1, ?, 10000, ?)", (food, month))
+    conn.execute("INSERT INTO transactions (user_id, category_id, amount_cents, date, type) VALUES (1, ?, 7500, ?, 'expense')",
+                 (food, month + '-01'))
+    conn.commit()
+    conn.close()
+    with client.session_transaction() as session:
+        session['_user_id'] = '1'
+    yield client
+    close_all_pools()
+
+def test_alert_stream_pushes_threshold_crossings(auth_client):
+    """Test the SSE endpoint sends current alerts, then only threshold changes"""
+    month = datetime.now().strftime('%Y-%m')
+    broker = auth_client.application.extensions['budget_alert_broker']
+    response = auth_client.get('/budget/alerts/stream', buffered=False)
+    assert response.mimetype == 'text/event-stream'
+    stream = response.iter_encoded()
+
+    assert parse_event(next(stream)) == (0, [])
+    assert broker.subscriber_count(1) == 1
+
+    # 75 of 90 = 83%: crosses 80
+    auth_client.post('/budget/set', data={'category': 'Food', 'amount': '90', 'month': month})
+    event_id, alerts = parse_event(next(stream))
+    assert event_id == 1
+    assert [(a['category'], a['level']) for a in alerts] == [('Food', 'info')]
+
+    # 75 of 85 = 88%: still in the same band, so only a keep-alive
+    auth_client.post('/budget/set', data={'category': 'Food', 'amount': '85', 'month': month})
+    assert next(stream) == b': keep-alive\n\n'
+
+    # 75 of 70 = 107%: over budget
+    auth_client.post('/budget/set', data={'category': 'Food', 'amount': '70', 'month': month})
+    event_id, alerts = parse_event(next(stream))
+    assert event_id == 2
+    assert alerts[0]['level'] == 'danger'
+
+    response.close()
+    assert broker.subscriber_count(1) == 0
+
+def test_alert_stream_requires_login(tmp_path, monkeypatch):
+    """Test anonymous stream requests redirect to login"""
+    monkeypatch.chdir(tmp_path)
+    app = create_test_app()
+    assert app.test_client().get('/budget/alerts/stream').status_code == 302
+    close_all_pools()
+
+def test_alert_stream_closes_after_max_seconds(tmp_path, monkeypatch):
+    """Test a stream ends on its own, releasing its thread and subscription, so the browser reconnects"""
+    monkeypatch.chdir(tmp_path)
+    app = create_test_app(ALERT_STREAM_KEEPALIVE=0.05, ALERT_STREAM_MAX_SECONDS=0.2)
+    client = app.test_client()
+    with client.session_transaction() as session:
+        session['_user_id'] = '1'
+    broker = app.extensions['budget_alert_broker']
+
+    response = client.get('/budget/alerts/stream', buffered=False)
+    chunks = list(response.iter_encoded())
+    assert chunks[0].startswith(b'retry: 50\n') and parse_event(chunks[0]) == (0, [])
+    assert set(chunks[1:]) == {b': keep-alive\n\n'} and len(chunks) <= 6
+    response.close()
+    assert broker.subscriber_count(1) == 0
+    close_all_pools()
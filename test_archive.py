@@ -0,0 +1,132 @@
+# test_archive.py - Tests for archiving closed months of transactions
+# Course: IST 303 Fall 2025
+
+import os
+import sqlite3
+from datetime import date
+
+import pytest
+
+import archive
+from archive import (run_archive, start_archive_job, transactions_source, archive_boundary,
+                     cutoff_month, get_state, UNION_SOURCE)
+from budget_analytics import load_spend_to_date
+from rollups import verify_rollup
+
+TODAY = date(2025, 10, 15)
+MONTHS = ['2025-05', '2025-06', '2025-07', '2025-08', '2025-09', '2025-10']
+
+@pytest.fixture
+def conn(conn, monkeypatch):
+    """finance.db with 4 transactions a month for two users, May to October 2025"""
+    monkeypatch.setattr(archive, 'BATCH_PAUSE', 0)
+    ids = dict(conn.execute('SELECT name, id FROM categories'))
+    conn.executemany("INSERT INTO transactions (user_id, category_id, amount_cents, date, type) VALUES (?, ?, ?, ?, 'expense')",
+                     [(user_id, ids[category], 1000 * user_id + day, f'{month}-{day:02d}')
+                      for month in MONTHS for user_id in (1, 2)
+                      for category, day in (('Food', 3), ('Rent', 1))])
+    conn.commit()
+    return conn
+
+def rollup(conn):
+    return conn.execute('SELECT * FROM monthly_category_spend ORDER BY 1, 2, 3, 4').fetchall()
+
+def test_cutoff_month():
+    """Test the first month kept hot for a number of closed months"""
+    assert cutoff_month(TODAY, 3) == '2025-07'
+    assert cutoff_month(date(2025, 2, 1), 2) == '2024-12'
+    assert cutoff_month(TODAY, 0) == '2025-10'
+
+def test_archive_closed_months_and_route_queries(conn):
+    """Test that closed months move to the archive without changing rollups or historical reads"""
+    before = rollup(conn)
+    may_spend = load_spend_to_date(conn, 1, '2025-05', 31)
+    assert transactions_source(conn, '2025-05') == 'transactions'
+
+    messages = []
+    assert run_archive(conn, keep_months=3, batch_size=3, today=TODAY, report=messages.append) == 8
+    assert len(messages) == 3  # batches of 3, 3, 2
+
+    # Only July onwards stays hot; May and June are in finance_archive.db
+    assert conn.execute('SELECT MIN(date), COUNT(*) FROM transactions').fetchone() == ('2025-07-01', 16)
+    assert os.path.exists('finance_archive.db')
+    assert get_state(conn) == ('finance_archive.db', '2025-07', None)
+    assert conn.execute('SELECT COUNT(*) FROM archive.transactions').fetchone()[0] == 8
+
+    # The rollup still covers every month, and agrees with transactions + archive
+    assert rollup(conn) == before
+    assert verify_rollup(conn) == []
+
+    # Queries from the boundary on stay on the hot table; earlier ones reach into the archive
+    reader = sqlite3.connect('finance.db')
+    reader.execute('PRAGMA query_only = ON')
+    assert transactions_source(reader, '2025-07') == 'transactions'
+    assert transactions_source(reader, '2025-05') == UNION_SOURCE
+    assert load_spend_to_date(reader, 1, '2025-05', 31) == may_spend
+    reader.close()
+
+    # Nothing more to do until another month closes
+    assert run_archive(conn, keep_months=3, today=TODAY, report=None) == 0
+    assert run_archive(conn, keep_months=3, today=date(2025, 11, 1), report=None) == 4
+    assert archive_boundary(conn) == '2025-08'
+
+def test_interrupted_archive_resumes(conn, monkeypatch):
+    """Test a crash between the copy and the delete loses nothing and double counts nothing"""
+    monkeypatch.setattr(archive, 'DELETE_BATCH_SQL', 'DELETE FROM main.transactions WHERE no_such_column')
+    with pytest.raises(sqlite3.OperationalError):
+        run_archive(conn, keep_months=3, batch_size=4, today=TODAY, report=None)
+    monkeypatch.undo()
+    monkeypatch.setattr(archive, 'BATCH_PAUSE', 0)
+
+    # The first batch is in both tables, but counted once
+    assert get_state(conn)[1:] == (None, '2025-07')
+    assert conn.execute('SELECT deleting FROM archive_state').fetchone() == (0,)
+    assert conn.execute('SELECT COUNT(*) FROM archive.transactions').fetchone()[0] == 4
+    assert conn.execute(f'SELECT COUNT(*) FROM {transactions_source(conn)}').fetchone()[0] == 24
+    assert verify_rollup(conn) == []
+
+    # The next run finishes the interrupted move, even when asked to keep more months
+    assert run_archive(conn, keep_months=4, today=TODAY, report=None) == 8
+    assert get_state(conn)[1:] == ('2025-07', None)
+    assert conn.execute(f'SELECT COUNT(*) FROM {transactions_source(conn)}').fetchone()[0] == 24
+    assert verify_rollup(conn) == []
+
+def test_archive_job_runs_in_background(conn):
+    """Test the background job archives on its own connection"""
+    before = rollup(conn)
+    start_archive_job('finance.db', keep_months=1, batch_size=5, today=TODAY).join(timeout=10)
+
+    assert archive_boundary(conn) == '2025-09'
+    assert conn.execute('SELECT COUNT(*) FROM transactions').fetchone()[0] == 8
+    assert rollup(conn) == before
+    assert verify_rollup(conn) == []
+
+def test_archive_keyed_by_category_name(conn):
+    """Test an archive written before category ids is read by name, then converted on the next run"""
+    before = rollup(conn)
+    run_archive(conn, keep_months=3, today=TODAY, report=None)
+
+    # Put the archive back in the old layout, with a category only it uses
+    old = sqlite3.connect('finance_archive.db')
+    old.executescript('''
+        CREATE TABLE old AS SELECT id, user_id, amount_cents,
+            CASE category_id WHEN 1 THEN 'Food' ELSE 'Rent' END AS category,
+            description, date, type, created_at FROM transactions;
+        DROP TABLE transactions;
+        ALTER TABLE old RENAME TO transactions;
+        INSERT INTO transactions VALUES (999, 1, 500, 'Gifts', NULL, '2025-05-20', 'expense', NULL);
+    ''')
+    old.close()
+
+    reader = sqlite3.connect('finance.db')
+    source = transactions_source(reader, '2025-05')
+    assert source == archive.LEGACY_UNION_SOURCE
+    assert reader.execute(f'SELECT COUNT(*) FROM {source} WHERE category_id IS NULL').fetchone() == (1,)
+    reader.close()
+
+    assert run_archive(conn, keep_months=3, today=TODAY, report=None) == 0
+    assert transactions_source(conn, '2025-05') == UNION_SOURCE
+    gifts = conn.execute("SELECT id FROM categories WHERE name = 'Gifts'").fetchone()[0]
+    assert conn.execute('SELECT category_id FROM archive.transactions WHERE id = 999').fetchone() == (gifts,)
+    assert conn.execute(f'SELECT COUNT(*) FROM {UNION_SOURCE}').fetchone()[0] == 25
+    assert rollup(conn) == before
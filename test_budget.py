@@ -7,23 +7,25 @@ import sqlite3
 import os
 from datetime import datetime
 from budget_routes import init_budget_tables, get_budget_summary
+from budget_engine import (get_progress, summarize_progress, build_alerts,
+                           get_progress_matrix, month_range,
+                           month_bounds, PROGRESS_SQL)
+import budget_routes
+from budget_routes import SCHEMA_VERSION
+from db import get_db_connection, get_pool, close_all_pools
+from rollups import verify_rollup, rebuild_rollup
+from budget_summaries import verify_summaries
+from progress_cache import ProgressCache
+from generate_data import generate_database
+from sql_metrics import current_stats
+from budget_analytics import compute_trends
+from categories import ensure_category_ids
+from conftest import create_test_app, category_id, seed_progress_data
 
-# Import your Flask app (adjust import based on your structure)
-# from app import app, init_db
-# OR
-# from my_paldea import create_app
-
-# For standalone testing, create a simple test app
-from flask import Flask
-from budget_routes import budget_bp
-
-def create_test_app():
-    """Create Flask app for testing"""
-    app = Flask(__name__)
-    app.config['SECRET_KEY'] = 'test-secret-key'
-    app.config['TESTING'] = True
-    app.register_blueprint(budget_bp)
-    return app
+@pytest.fixture(autouse=True)
+def isolated_db(tmp_path, monkeypatch):
+    """Run every test against its own finance.db in a temporary directory"""
+    monkeypatch.chdir(tmp_path)
 
 @pytest.fixture
 def app():
@@ -56,8 +58,8 @@ def app():
         CREATE TABLE IF NOT EXISTS transactions (
             id INTEGER PRIMARY KEY,
             user_id INTEGER,
-            amount DECIMAL,
-            category TEXT,
+            amount_cents INTEGER,
+            category_id INTEGER,
             date DATE,
             type TEXT
         )
@@ -69,6 +71,7 @@ def app():
     yield app
     
     # Cleanup after tests
+    close_all_pools()
     if os.path.exists('finance.db'):
         os.remove('finance.db')
 
@@ -77,6 +80,13 @@ def client(app):
     """Create test client"""
     return app.test_client()
 
+@pytest.fixture
+def auth_client(client):
+    """Create test client logged in as user 1"""
+    with client.session_transaction() as session:
+        session['_user_id'] = '1'
+    return client
+
 # TASK 8 TESTS: Monthly Budget Setting
 
 def test_budget_table_creation():
@@ -106,23 +116,24 @@ def test_add_new_budget():
     init_budget_tables()
     
     # Add a budget
+    food = category_id(conn, 'Food')
     c.execute('''
-        INSERT INTO budgets (user_id, category, amount, month)
-        VALUES (1, 'Food', 500.00, '2025-10')
-    ''')
+        INSERT INTO budgets (user_id, category_id, amount_cents, month)
+        VALUES (1, ?, 50000, '2025-10')
+    ''', (food,))
     conn.commit()
     
     # Verify budget was added
     budget = c.execute('''
         SELECT * FROM budgets 
-        WHERE user_id = 1 AND category = 'Food'
-    ''').fetchone()
+        WHERE user_id = 1 AND category_id = ?
+    ''', (food,)).fetchone()
     
     conn.close()
     
     assert budget is not None
-    assert budget[2] == 'Food'  # category
-    assert budget[3] == 500.00  # amount
+    assert budget[2] == food  # category_id
+    assert budget[3] == 50000  # amount in cents
 
 def test_update_existing_budget():
     """Test updating an existing budget"""
@@ -132,29 +143,30 @@ def test_update_existing_budget():
     init_budget_tables()
     
     # Add initial budget
+    food = category_id(conn, 'Food')
     c.execute('''
-        INSERT INTO budgets (user_id, category, amount, month)
-        VALUES (1, 'Food', 500.00, '2025-10')
-    ''')
+        INSERT INTO budgets (user_id, category_id, amount_cents, month)
+        VALUES (1, ?, 50000, '2025-10')
+    ''', (food,))
     conn.commit()
     
     # Update the budget
     c.execute('''
         UPDATE budgets 
-        SET amount = 600.00 
-        WHERE user_id = 1 AND category = 'Food' AND month = '2025-10'
-    ''')
+        SET amount_cents = 60000 
+        WHERE user_id = 1 AND category_id = ? AND month = '2025-10'
+    ''', (food,))
     conn.commit()
     
     # Verify update
     budget = c.execute('''
-        SELECT amount FROM budgets 
-        WHERE user_id = 1 AND category = 'Food'
-    ''').fetchone()
+        SELECT amount_cents FROM budgets 
+        WHERE user_id = 1 AND category_id = ?
+    ''', (food,)).fetchone()
     
     conn.close()
     
-    assert budget[0] == 600.00
+    assert budget[0] == 60000
 
 def test_delete_budget():
     """Test deleting a budget"""
@@ -164,24 +176,25 @@ def test_delete_budget():
     init_budget_tables()
     
     # Add budget
+    food = category_id(conn, 'Food')
     c.execute('''
-        INSERT INTO budgets (user_id, category, amount, month)
-        VALUES (1, 'Food', 500.00, '2025-10')
-    ''')
+        INSERT INTO budgets (user_id, category_id, amount_cents, month)
+        VALUES (1, ?, 50000, '2025-10')
+    ''', (food,))
     conn.commit()
     
     # Delete budget
     c.execute('''
         DELETE FROM budgets 
-        WHERE user_id = 1 AND category = 'Food'
-    ''')
+        WHERE user_id = 1 AND category_id = ?
+    ''', (food,))
     conn.commit()
     
     # Verify deletion
     budget = c.execute('''
         SELECT * FROM budgets 
-        WHERE user_id = 1 AND category = 'Food'
-    ''').fetchone()
+        WHERE user_id = 1 AND category_id = ?
+    ''', (food,)).fetchone()
     
     conn.close()
     
@@ -195,18 +208,19 @@ def test_budget_unique_constraint():
     init_budget_tables()
     
     # Add first budget
+    food = category_id(conn, 'Food')
     c.execute('''
-        INSERT INTO budgets (user_id, category, amount, month)
-        VALUES (1, 'Food', 500.00, '2025-10')
-    ''')
+        INSERT INTO budgets (user_id, category_id, amount_cents, month)
+        VALUES (1, ?, 50000, '2025-10')
+    ''', (food,))
     conn.commit()
     
     # Try to add duplicate (should fail or update)
     try:
         c.execute('''
-            INSERT INTO budgets (user_id, category, amount, month)
-            VALUES (1, 'Food', 600.00, '2025-10')
-        ''')
+            INSERT INTO budgets (user_id, category_id, amount_cents, month)
+            VALUES (1, ?, 60000, '2025-10')
+        ''', (food,))
         conn.commit()
         duplicate_allowed = True
     except sqlite3.IntegrityError:
@@ -278,39 +292,40 @@ def test_budget_progress_with_transactions():
     init_budget_tables()
     
     # Add budget
+    food = category_id(conn, 'Food')
     c.execute('''
-        INSERT INTO budgets (user_id, category, amount, month)
-        VALUES (1, 'Food', 500.00, '2025-10')
-    ''')
+        INSERT INTO budgets (user_id, category_id, amount_cents, month)
+        VALUES (1, ?, 50000, '2025-10')
+    ''', (food,))
     
     # Add transactions
     transactions = [
-        (1, 'Food', 120.00, '2025-10-01', 'expense'),
-        (1, 'Food', 80.00, '2025-10-05', 'expense'),
-        (1, 'Food', 50.00, '2025-10-10', 'expense')
+        (1, food, 12000, '2025-10-01', 'expense'),
+        (1, food, 8000, '2025-10-05', 'expense'),
+        (1, food, 5000, '2025-10-10', 'expense')
     ]
     
-    for user_id, category, amount, date, type_ in transactions:
+    for user_id, category, amount_cents, date, type_ in transactions:
         c.execute('''
-            INSERT INTO transactions (user_id, category, amount, date, type)
+            INSERT INTO transactions (user_id, category_id, amount_cents, date, type)
             VALUES (?, ?, ?, ?, ?)
-        ''', (user_id, category, amount, date, type_))
+        ''', (user_id, category, amount_cents, date, type_))
     
     conn.commit()
     
     # Calculate spending
     spent = c.execute('''
-        SELECT COALESCE(SUM(amount), 0) 
+        SELECT COALESCE(SUM(amount_cents), 0) 
         FROM transactions 
-        WHERE user_id = 1 AND category = 'Food' 
+        WHERE user_id = 1 AND category_id = ? 
         AND strftime('%Y-%m', date) = '2025-10'
         AND type = 'expense'
-    ''').fetchone()[0]
+    ''', (food,)).fetchone()[0]
     
     conn.close()
     
-    assert spent == 250.00
-    percentage = (spent / 500.00) * 100
+    assert spent == 25000
+    percentage = (spent / 50000) * 100
     assert percentage == 50.0
 
 def test_multiple_category_budgets():
@@ -322,24 +337,25 @@ def test_multiple_category_budgets():
     
     # Add multiple budgets
     budgets = [
-        ('Food', 500),
-        ('Transportation', 200),
-        ('Entertainment', 150)
+        ('Food', 50000),
+        ('Transportation', 20000),
+        ('Entertainment', 15000)
     ]
     
-    for category, amount in budgets:
+    for category, amount_cents in budgets:
         c.execute('''
-            INSERT INTO budgets (user_id, category, amount, month)
+            INSERT INTO budgets (user_id, category_id, amount_cents, month)
             VALUES (1, ?, ?, '2025-10')
-        ''', (category, amount))
+        ''', (category_id(conn, category), amount_cents))
     
     conn.commit()
     
     # Get all budgets
     all_budgets = c.execute('''
-        SELECT category, amount FROM budgets 
-        WHERE user_id = 1 AND month = '2025-10'
-        ORDER BY category
+        SELECT c.name, b.amount_cents FROM budgets b
+        JOIN categories c ON c.id = b.category_id
+        WHERE b.user_id = 1 AND b.month = '2025-10'
+        ORDER BY c.name
     ''').fetchall()
     
     conn.close()
@@ -357,34 +373,35 @@ def test_monthly_budget_isolation():
     init_budget_tables()
     
     # Add budgets for different months
+    food = category_id(conn, 'Food')
     c.execute('''
-        INSERT INTO budgets (user_id, category, amount, month)
-        VALUES (1, 'Food', 500.00, '2025-09')
-    ''')
+        INSERT INTO budgets (user_id, category_id, amount_cents, month)
+        VALUES (1, ?, 50000, '2025-09')
+    ''', (food,))
     
     c.execute('''
-        INSERT INTO budgets (user_id, category, amount, month)
-        VALUES (1, 'Food', 600.00, '2025-10')
-    ''')
+        INSERT INTO budgets (user_id, category_id, amount_cents, month)
+        VALUES (1, ?, 60000, '2025-10')
+    ''', (food,))
     
     conn.commit()
     
     # Get October budget
     oct_budget = c.execute('''
-        SELECT amount FROM budgets 
-        WHERE user_id = 1 AND category = 'Food' AND month = '2025-10'
-    ''').fetchone()
+        SELECT amount_cents FROM budgets 
+        WHERE user_id = 1 AND category_id = ? AND month = '2025-10'
+    ''', (food,)).fetchone()
     
     # Get September budget
     sep_budget = c.execute('''
-        SELECT amount FROM budgets 
-        WHERE user_id = 1 AND category = 'Food' AND month = '2025-09'
-    ''').fetchone()
+        SELECT amount_cents FROM budgets 
+        WHERE user_id = 1 AND category_id = ? AND month = '2025-09'
+    ''', (food,)).fetchone()
     
     conn.close()
     
-    assert oct_budget[0] == 600.00
-    assert sep_budget[0] == 500.00
+    assert oct_budget[0] == 60000
+    assert sep_budget[0] == 50000
 
 def test_budget_summary():
     """Test budget summary calculation"""
@@ -395,16 +412,16 @@ def test_budget_summary():
     
     # Add test budgets
     budgets = [
-        ('Food', 500),
-        ('Transportation', 200),
-        ('Entertainment', 300)
+        ('Food', 50000),
+        ('Transportation', 20000),
+        ('Entertainment', 30000)
     ]
     
-    for category, amount in budgets:
+    for category, amount_cents in budgets:
         c.execute('''
-            INSERT INTO budgets (user_id, category, amount, month)
+            INSERT INTO budgets (user_id, category_id, amount_cents, month)
             VALUES (1, ?, ?, '2025-10')
-        ''', (category, amount))
+        ''', (category_id(conn, category), amount_cents))
     
     conn.commit()
     conn.close()
@@ -417,6 +434,514 @@ def test_budget_summary():
     assert summary['min_budget'] == 200.00
     assert summary['max_budget'] == 500.00
 
+def test_progress_engine_values():
+    """Test spent, remaining, percentage and status from the progress engine"""
+    init_budget_tables()
+    conn = sqlite3.connect('finance.db')
+    seed_progress_data(conn, ['Food', 'Shopping'])
+    
+    # Push Shopping over budget and add noise that must be ignored
+    conn.executemany('''
+        INSERT INTO transactions (user_id, category_id, amount_cents, date, type)
+        VALUES (?, ?, ?, ?, ?)
+    ''', [(user_id, category_id(conn, 'Shopping'), amount_cents, date, type_)
+          for user_id, amount_cents, date, type_ in [(1, 5000, '2025-10-20', 'expense'),
+                                                     (1, 99900, '2025-10-20', 'income'),
+                                                     (1, 99900, '2025-09-20', 'expense'),
+                                                     (2, 99900, '2025-10-20', 'expense')]])
+    
+    progress = {p['category']: p for p in get_progress(conn, 1, '2025-10')}
+    conn.close()
+    
+    assert progress['Food']['spent'] == 75.00
+    assert progress['Food']['spent_cents'] == 7500
+    assert progress['Food']['remaining'] == 25.00
+    assert progress['Food']['color'] == 'warning'
+    assert progress['Shopping']['spent'] == 125.00
+    assert progress['Shopping']['percentage'] == 100
+    assert progress['Shopping']['actual_percentage'] == 125.0
+    assert progress['Shopping']['status'] == 'Over Budget!'
+    
+    stats = summarize_progress(list(progress.values()))
+    assert stats['total_spent'] == 200.00
+    assert stats['categories_over_budget'] == 1
+    
+    alerts = build_alerts(list(progress.values()))
+    assert [a['category'] for a in alerts] == ['Shopping']
+    assert alerts[0]['level'] == 'danger'
+    assert alerts[0]['message'] == 'Over budget by $25.00'
+
+def test_progress_query_count_is_flat():
+    """Test that progress uses the same number of queries for 3 or 30 categories"""
+    init_budget_tables()
+    conn = sqlite3.connect('finance.db')
+    seed_progress_data(conn, [f'Category {i}' for i in range(3)], '2025-09')
+    seed_progress_data(conn, [f'Category {i}' for i in range(30)], '2025-10')
+    
+    statements = []
+    conn.set_trace_callback(statements.append)
+    small = get_progress(conn, 1, '2025-09')
+    small_count = len(statements)
+    statements.clear()
+    large = get_progress(conn, 1, '2025-10')
+    large_count = len(statements)
+    conn.close()
+    
+    assert len(small) == 3 and len(large) == 30
+    assert small_count == large_count == 1
+
+def test_month_bounds():
+    """Test half-open date ranges, including the December rollover"""
+    assert month_bounds('2025-10') == ('2025-10-01', '2025-11-01')
+    assert month_bounds('2025-12') == ('2025-12-01', '2026-01-01')
+
+def test_progress_month_range_edges():
+    """Test that the date range includes the whole month and nothing after it"""
+    init_budget_tables()
+    conn = sqlite3.connect('finance.db')
+    food = category_id(conn, 'Food')
+    conn.execute("INSERT INTO budgets (user_id, category_id, amount_cents, month) VALUES (1, ?, 10000, '2025-12')", (food,))
+    conn.executemany(f'''
+        INSERT INTO transactions (user_id, category_id, amount_cents, date, type)
+        VALUES (1, {food}, ?, ?, 'expense')
+    ''', [(100, '2025-11-30'), (1000, '2025-12-01'), (2000, '2025-12-31 23:59:59'),
+          (4000, '2026-01-01')])
+    
+    progress = get_progress(conn, 1, '2025-12')
+    conn.close()
+    
+    assert progress[0]['spent'] == 30.00
+
+def explain_progress_query(category_filter=''):
+    """Return the EXPLAIN QUERY PLAN details for the progress query"""
+    init_budget_tables()
+    conn = sqlite3.connect('finance.db')
+    params = [1, '2025-10']
+    if category_filter:
+        params.append('Food')
+    plan = conn.execute('EXPLAIN QUERY PLAN ' + PROGRESS_SQL.format(category_filter=category_filter),
+                        params).fetchall()
+    conn.close()
+    return [row[3] for row in plan]
+
+def test_progress_query_uses_rollup_index():
+    """Test that progress spending is a keyed rollup lookup, never a scan"""
+    for category_filter in ['', 'AND c.name = ?']:
+        details = explain_progress_query(category_filter)
+        
+        rollup_steps = [d for d in details if ' m ' in f' {d} ']
+        assert len(rollup_steps) == 1
+        assert 'SEARCH m USING INDEX sqlite_autoindex_monthly_category_spend_1' in rollup_steps[0]
+        assert 'month=? AND category_id=? AND type=?' in rollup_steps[0]
+        assert not any('transactions' in d for d in details)
+        assert not any(d.startswith('SCAN') for d in details)
+
+# Rollup tests
+def rollup_rows(conn):
+    """Return the rollup as {(month, category, type): (total cents, count)} for user 1"""
+    return {(month, category, type_): (total, count) for month, category, type_, total, count
+            in conn.execute('''
+                SELECT m.month, c.name, m.type, m.total_cents, m.count
+                FROM monthly_category_spend m
+                JOIN categories c ON c.id = m.category_id
+                WHERE m.user_id = 1
+            ''')}
+
+def test_rollup_follows_transaction_writes():
+    """Test that triggers keep the rollup current on insert, update and delete"""
+    init_budget_tables()
+    conn = sqlite3.connect('finance.db')
+    food, travel = category_id(conn, 'Food'), category_id(conn, 'Travel')
+    conn.executemany('''
+        INSERT INTO transactions (user_id, category_id, amount_cents, date, type)
+        VALUES (1, ?, ?, ?, 'expense')
+    ''', [(food, 1000, '2025-10-01'), (food, 1500, '2025-10-09'), (travel, 4000, '2025-09-30')])
+    assert rollup_rows(conn) == {
+        ('2025-10', 'Food', 'expense'): (2500, 2),
+        ('2025-09', 'Travel', 'expense'): (4000, 1)
+    }
+    
+    # Moving a transaction to another month/category updates both rows
+    conn.execute("UPDATE transactions SET date = '2025-10-02', category_id = ? WHERE category_id = ?",
+                 (food, travel))
+    assert rollup_rows(conn) == {('2025-10', 'Food', 'expense'): (6500, 3)}
+    
+    conn.execute("UPDATE transactions SET amount_cents = 500 WHERE amount_cents = 1500")
+    conn.execute("DELETE FROM transactions WHERE amount_cents = 4000")
+    assert rollup_rows(conn) == {('2025-10', 'Food', 'expense'): (1500, 2)}
+    
+    conn.execute("DELETE FROM transactions")
+    assert rollup_rows(conn) == {}
+    conn.close()
+
+def test_rollup_verify_and_rebuild():
+    """Test that verify reports drift and rebuild repairs it"""
+    init_budget_tables()
+    conn = sqlite3.connect('finance.db')
+    food, ghost = category_id(conn, 'Food'), category_id(conn, 'Ghost')
+    conn.execute('''
+        INSERT INTO transactions (user_id, category_id, amount_cents, date, type)
+        VALUES (1, ?, 2000, '2025-10-03', 'expense')
+    ''', (food,))
+    conn.commit()
+    assert verify_rollup(conn) == []
+    
+    conn.execute("UPDATE monthly_category_spend SET total_cents = 9900")
+    conn.execute("INSERT INTO monthly_category_spend VALUES (1, '2025-01', ?, 'expense', 100, 1)", (ghost,))
+    conn.commit()
+    drift = verify_rollup(conn)
+    assert {(d['category_id'], d['stored_total_cents'], d['expected_total_cents']) for d in drift} == {
+        (food, 9900, 2000), (ghost, 100, 0)
+    }
+    assert [d['category_id'] for d in verify_rollup(conn, '2025-10')] == [food]
+    
+    rebuild_rollup(conn)
+    assert verify_rollup(conn) == []
+    assert rollup_rows(conn) == {('2025-10', 'Food', 'expense'): (2000, 1)}
+    conn.close()
+
+# Connection pool tests
+def test_pool_reuses_configured_connections():
+    """Test that closed connections go back to the pool with PRAGMAs applied"""
+    pool = get_pool('pooled.db')
+    conn = pool.acquire()
+    assert conn.execute('PRAGMA journal_mode').fetchone()[0] == 'wal'
+    assert conn.execute('PRAGMA synchronous').fetchone()[0] == 1  # NORMAL
+    assert conn.execute('PRAGMA temp_store').fetchone()[0] == 2  # MEMORY
+    conn.close()
+    conn.close()  # double close must not put it in the pool twice
+    
+    first, second = pool.acquire(), pool.acquire()
+    assert first is conn
+    assert second is not conn
+    assert pool.opened == 2
+    first.close()
+    second.close()
+    close_all_pools()
+
+def test_pool_follows_app_config_and_teardown():
+    """Test the DATABASE setting and that app-context teardown releases the connection"""
+    app = create_test_app()
+    app.config['DATABASE'] = 'configured.db'
+    
+    with app.app_context():
+        conn = get_db_connection()
+        assert get_db_connection() is conn  # one connection per app context
+        assert conn.pool.database == os.path.abspath('configured.db')
+        conn.execute('CREATE TABLE marker (id INTEGER)')
+    assert not conn.checked_out
+    
+    with app.app_context():
+        assert get_db_connection() is conn
+    close_all_pools()
+
+# Progress cache tests
+class FakeClock:
+    """Manually advanced clock for TTL tests"""
+    def __init__(self):
+        self.now = 0.0
+    
+    def __call__(self):
+        return self.now
+
+def test_progress_cache_lru_and_ttl():
+    """Test LRU eviction, TTL expiry and counters"""
+    clock = FakeClock()
+    cache = ProgressCache(max_entries=2, ttl=10, clock=clock)
+    
+    cache.set((1, '2025-10'), 'a')
+    cache.set((2, '2025-10'), 'b')
+    assert cache.get((1, '2025-10')) == 'a'  # (1, ...) is now most recent
+    cache.set((3, '2025-10'), 'c')  # evicts (2, ...)
+    assert cache.get((2, '2025-10')) is None
+    
+    clock.now = 11
+    assert cache.get((1, '2025-10')) is None
+    
+    stats = cache.stats()
+    assert stats['hits'] == 1
+    assert stats['misses'] == 2
+    assert stats['evictions'] == 1
+    assert stats['expirations'] == 1
+
+def test_progress_cache_skips_sets_raced_by_invalidate():
+    """Test a value computed before an invalidation is not stored"""
+    cache = ProgressCache(max_entries=2)
+    key = (1, '2025-10')
+    generation = cache.generation(key)
+    cache.invalidate(key)  # a write lands while the old value is computed
+    assert cache.set(key, 'stale', generation) is False
+    assert cache.get(key) is None
+
+    generation = cache.generation(key)
+    assert cache.set(key, 'fresh', generation) is True
+    assert cache.get(key) == 'fresh'
+    assert cache.set(key, 'plain') is True  # no generation, always stored
+
+    # Forgetting the counters still fails tokens taken before
+    generation = cache.generation(key)
+    cache.invalidate((2, '2025-10'))
+    cache.invalidate((3, '2025-10'))
+    assert cache.set(key, 'stale', generation) is False
+    assert cache.stats()['stale_sets'] == 2
+
+def test_cached_progress_not_stored_when_write_races(app, auth_client, monkeypatch):
+    """Test progress computed while a budget write invalidates it is not cached"""
+    month = datetime.now().strftime('%Y-%m')
+    compute = budget_routes.get_progress
+
+    def racing_get_progress(conn, user_id, month):
+        progress_data = compute(conn, user_id, month)
+        auth_client.post('/budget/set', data={'category': 'Food', 'amount': '42', 'month': month})
+        return progress_data
+
+    monkeypatch.setattr(budget_routes, 'get_progress', racing_get_progress)
+    with app.test_request_context():
+        assert budget_routes.get_cached_progress(1, month) == []
+    monkeypatch.setattr(budget_routes, 'get_progress', compute)
+    assert auth_client.get('/budget/api/progress/Food').get_json()['budget'] == 42.00
+    assert auth_client.get('/budget/api/cache/stats').get_json()['stale_sets'] == 1
+
+def test_progress_cache_invalidated_by_budget_writes(app, auth_client):
+    """Test that API reads are cached and budget writes invalidate the user-month"""
+    month = datetime.now().strftime('%Y-%m')
+    conn = sqlite3.connect('finance.db')
+    food = category_id(conn, 'Food')
+    conn.execute("INSERT INTO budgets (user_id, category_id, amount_cents, month) VALUES (1, ?, 10000, ?)", (food, month))
+    conn.execute("INSERT INTO transactions (user_id, category_id, amount_cents, date, type) VALUES (1, ?, 4000, ?, 'expense')",
+                 (food, month + '-01'))
+    conn.commit()
+    conn.close()
+    
+    assert auth_client.get('/budget/api/progress/Food').get_json()['spent'] == 40.00
+    assert auth_client.get('/budget/alerts').get_json() == []
+    stats = auth_client.get('/budget/api/cache/stats').get_json()
+    assert (stats['hits'], stats['misses']) == (1, 1)
+    
+    auth_client.post('/budget/set', data={'category': 'Food', 'amount': '42', 'month': month})
+    progress = auth_client.get('/budget/api/progress/Food').get_json()
+    assert progress['budget'] == 42.00
+    assert progress['status'] == 'ok'
+    assert auth_client.get('/budget/alerts').get_json()[0]['level'] == 'warning'
+    
+    stats = auth_client.get('/budget/api/cache/stats').get_json()
+    assert stats['invalidations'] == 1
+    assert stats['misses'] == 2
+
+def test_set_budget_rejects_out_of_range_amount(app, auth_client):
+    """Test a huge amount is flashed back to the form instead of failing the request"""
+    response = auth_client.post('/budget/set', data={'category': 'Food', 'amount': '1e30', 'month': '2025-10'})
+    assert response.status_code == 302 and response.location.endswith('/budget/set')
+    with auth_client.session_transaction() as session:
+        assert session['_flashes'] == [('error', 'Invalid budget amount: amount is out of range')]
+    
+    conn = sqlite3.connect('finance.db')
+    assert conn.execute('SELECT COUNT(*) FROM budgets').fetchone()[0] == 0
+    conn.close()
+
+# Batch progress API tests
+def test_month_range_and_matrix_query():
+    """Test month ranges across a year boundary and the one-query matrix"""
+    assert month_range('2025-11', '2026-02') == ['2025-11', '2025-12', '2026-01', '2026-02']
+    
+    init_budget_tables()
+    conn = sqlite3.connect('finance.db')
+    seed_progress_data(conn, ['Food', 'Travel'], '2025-09')
+    seed_progress_data(conn, ['Food'], '2025-10')
+    
+    statements = []
+    conn.set_trace_callback(statements.append)
+    cells = get_progress_matrix(conn, 1, ['2025-09', '2025-10'], ['Food'])
+    conn.close()
+    
+    assert len(statements) == 1
+    assert sorted(cells) == [('Food', '2025-09'), ('Food', '2025-10')]
+    assert cells[('Food', '2025-10')]['spent'] == 75.00
+
+def test_batch_progress_api(app, auth_client):
+    """Test the category x month matrix returned by /budget/api/progress"""
+    conn = sqlite3.connect('finance.db')
+    seed_progress_data(conn, ['Food', 'Travel'], '2025-01')
+    seed_progress_data(conn, ['Food'], '2025-03')
+    conn.close()
+    
+    data = auth_client.get('/budget/api/progress?months=2025-01..2025-03').get_json()
+    assert data['months'] == ['2025-01', '2025-02', '2025-03']
+    assert data['categories'] == ['Food', 'Travel']
+    assert data['budget'] == [[100.00, None, 100.00], [100.00, None, None]]
+    assert data['spent'][0] == [75.00, None, 75.00]
+    assert data['status'][1] == ['ok', None, None]
+    
+    data = auth_client.get('/budget/api/progress?months=2025-03,2025-01&categories=Travel,Gifts').get_json()
+    assert data['months'] == ['2025-01', '2025-03']
+    assert data['categories'] == ['Travel', 'Gifts']
+    assert data['percentage'] == [[75.0, None], [None, None]]
+
+def test_batch_progress_api_rejects_bad_months(app, auth_client):
+    """Test validation of the months parameter"""
+    assert auth_client.get('/budget/api/progress?months=2025-13').status_code == 400
+    assert auth_client.get('/budget/api/progress?months=2025-1').status_code == 400
+    assert auth_client.get('/budget/api/progress?months=2025-01,2025-2').status_code == 400
+    assert auth_client.get('/budget/api/progress?months=2025-1..2025-03').status_code == 400
+    assert auth_client.get('/budget/api/progress?months=2020-01..2025-12').status_code == 400
+
+# SQL instrumentation tests
+def test_instrumented_cursor_records_statements():
+    """Test statement text, parameter shape and rows recorded in an app context"""
+    app = create_test_app()
+    with app.app_context():
+        init_budget_tables()
+        conn = get_db_connection()
+        seed_progress_data(conn, ['Food', 'Travel'], '2025-10')
+        
+        stats = current_stats()
+        before = stats.count
+        rows = conn.execute('SELECT category_id FROM budgets WHERE user_id = ? AND month = ?',
+                            (1, '2025-10')).fetchall()
+        for row in conn.execute('SELECT * FROM budgets WHERE user_id = :user', {'user': 1}):
+            pass
+        
+        assert len(rows) == 2
+        assert stats.count == before + 2
+        first, second = stats.statements[-2:]
+        assert first['sql'] == 'SELECT category_id FROM budgets WHERE user_id = ? AND month = ?'
+        assert (first['params'], first['rows']) == ('int, str', 2)
+        assert (second['params'], second['rows']) == (':user', 2)
+        assert stats.time_ms > 0
+    close_all_pools()
+
+def test_sql_headers_and_slow_query_log(app, auth_client, caplog):
+    """Test X-DB-* response headers and that slow statements are logged"""
+    month = datetime.now().strftime('%Y-%m')
+    conn = sqlite3.connect('finance.db')
+    seed_progress_data(conn, ['Food'], month)
+    conn.close()
+    auth_client.get('/budget/api/cache/stats')  # first request checks the schema
+    
+    response = auth_client.get('/budget/api/progress/Food')
+    assert response.headers['X-DB-Queries'] == '1'
+    assert float(response.headers['X-DB-Time-ms']) > 0
+    assert not caplog.records  # below the default threshold
+    
+    response = auth_client.get('/budget/api/progress/Food')  # cache hit
+    assert response.headers['X-DB-Queries'] == '0'
+    
+    app.config['SLOW_QUERY_MS'] = 0
+    auth_client.post('/budget/set', data={'category': 'Food', 'amount': '50', 'month': month})
+    slow = [r.getMessage() for r in caplog.records if r.name == 'paldea.slow_sql']
+    assert any('INSERT INTO budgets' in message for message in slow)
+
+# Trend analytics tests
+def test_compute_trends_spend_rolling_and_forecast():
+    """Test the monthly spend matrix, rolling average and month-to-date forecast"""
+    init_budget_tables()
+    conn = sqlite3.connect('finance.db')
+    ensure_category_ids(conn, ['Food', 'Travel', 'Rent', 'Salary'])
+    conn.executemany("INSERT INTO budgets (user_id, category_id, amount_cents, month) "
+                     "VALUES (1, (SELECT id FROM categories WHERE name = ?), ?, '2025-10')",
+                     [('Food', 30000), ('Travel', 10000)])
+    conn.executemany("INSERT INTO transactions (user_id, category_id, amount_cents, date, type) "
+                     "VALUES (?, (SELECT id FROM categories WHERE name = ?), ?, ?, ?)", [
+        (1, 'Food', 9000, '2025-08-05', 'expense'),
+        (1, 'Food', 15000, '2025-09-05', 'expense'),
+        (1, 'Food', 10000, '2025-10-03', 'expense'),
+        (1, 'Food', 50000, '2025-10-20', 'expense'),  # after "today"
+        (1, 'Rent', 80000, '2025-09-01', 'expense'),
+        (1, 'Salary', 400000, '2025-10-01', 'income'),
+        (2, 'Food', 99900, '2025-10-01', 'expense'),
+    ])
+    conn.commit()
+    
+    trends = compute_trends(conn, 1, '2025-10', months=3, window=2,
+                            today=datetime(2025, 10, 10).date())
+    conn.close()
+    
+    assert trends['months'] == ['2025-08', '2025-09', '2025-10']
+    assert trends['categories'] == ['Food', 'Rent', 'Travel']
+    assert trends['spend'].tolist() == [[90.0, 150.0, 600.0], [0.0, 800.0, 0.0], [0.0, 0.0, 0.0]]
+    assert trends['rolling_average'][0].tolist() == [90.0, 120.0, 375.0]
+    
+    # 100 spent by day 10 of 31 against 300 * 10/31 expected
+    assert trends['spent_to_date'][0] == 100.0
+    assert round(trends['pace'][0], 3) == round(100 / (300 * 10 / 31), 3)
+    
+    # Blend of 10/31 * (100/10 per day) and 21/31 * (120/31 per day) over 21 more days
+    rate = 10 / 31 * 10 + 21 / 31 * (120 / 31)
+    assert round(trends['projected'][0], 6) == round(100 + rate * 21, 6)
+    assert trends['status'][0] == 'On Track'
+    assert trends['status'][2] == 'On Track'  # budget with no spending
+
+def test_trends_endpoint(app, auth_client):
+    """Test /budget/trends output and parameter validation"""
+    month = datetime.now().strftime('%Y-%m')
+    conn = sqlite3.connect('finance.db')
+    seed_progress_data(conn, ['Food'], month)
+    conn.execute("INSERT INTO transactions (user_id, category_id, amount_cents, date, type) VALUES (1, ?, 1000, ?, 'expense')",
+                 (category_id(conn, 'Gifts'), month + '-01'))
+    conn.commit()
+    conn.close()
+    
+    data = auth_client.get('/budget/trends?months=6').get_json()
+    assert len(data['months']) == 6 and data['months'][-1] == month
+    assert data['categories'] == ['Food', 'Gifts']
+    assert data['spend'][0][-1] == 75.00
+    assert data['budget'][1][-1] is None
+    assert data['forecast']['status'][1] is None  # no budget, no status
+    
+    assert auth_client.get('/budget/trends?months=0').status_code == 400
+    assert auth_client.get('/budget/trends?month=2025-13').status_code == 400
+    assert auth_client.get('/budget/trends?months=3&window=4').status_code == 400
+
+# Application factory tests
+def test_schema_checked_once_per_process():
+    """Test that the first request creates the schema and later requests skip the check"""
+    app = create_test_app(DATABASE='fresh.db')
+    client = app.test_client()
+    with client.session_transaction() as session:
+        session['_user_id'] = '1'
+    
+    first = client.get('/budget/api/cache/stats')
+    second = client.get('/budget/api/cache/stats')
+    assert int(first.headers['X-DB-Queries']) > 0
+    assert second.headers['X-DB-Queries'] == '0'
+    
+    conn = sqlite3.connect('fresh.db')
+    assert conn.execute('PRAGMA user_version').fetchone()[0] == SCHEMA_VERSION
+    assert conn.execute("SELECT COUNT(*) FROM sqlite_master WHERE name = 'budgets'").fetchone()[0] == 1
+    conn.close()
+    
+    # A current schema is only version-checked, not recreated
+    app = create_test_app(DATABASE='fresh.db')
+    close_all_pools()
+    budget_routes._checked_databases.clear()
+    with app.app_context():
+        get_db_connection()  # open the pooled connection (and its PRAGMAs) up front
+    client = app.test_client()
+    with client.session_transaction() as session:
+        session['_user_id'] = '1'
+    assert client.get('/budget/api/cache/stats').headers['X-DB-Queries'] == '1'
+    assert not os.path.exists('finance.db')  # the home page does not touch the database
+    client.get('/')
+    assert not os.path.exists('finance.db')
+    close_all_pools()
+
+# Data generator tests
+def test_generate_database_small():
+    """Test that generated data is complete and the rollup and summaries match it"""
+    counts = generate_database('generated.db', users=3, categories=4, months=2,
+                               transactions=500, report=lambda message: None)
+    close_all_pools()
+    
+    conn = sqlite3.connect('generated.db')
+    assert counts['transactions'] == 500
+    assert conn.execute('SELECT COUNT(*) FROM transactions').fetchone()[0] == 500
+    assert conn.execute('SELECT COUNT(*) FROM budgets').fetchone()[0] == 3 * 4 * 2
+    assert conn.execute("SELECT COUNT(*) FROM sqlite_master WHERE name = 'idx_transactions_covering'").fetchone()[0] == 1
+    assert conn.execute("SELECT COUNT(*) FROM sqlite_master WHERE type = 'trigger'").fetchone()[0] == 9  # rollup, summaries, category version
+    assert verify_rollup(conn) == []
+    assert verify_summaries(conn) == []
+    conn.close()
+
 # Integration tests
 def test_budget_page_loads(client):
     """Test that budget page loads successfully"""
@@ -0,0 +1,161 @@
+# test_budget_async.py - Tests for the async budget read path
+# Course: IST 303 Fall 2025
+
+import asyncio
+import json
+import sqlite3
+from datetime import datetime
+from urllib.parse import quote
+
+import pytest
+
+from budget_async import create_asgi_app
+from db import close_all_pools
+from migrations import SCHEMA_VERSION
+from conftest import create_test_app, seed_progress_data
+
+@pytest.fixture
+def flask_app(tmp_path, monkeypatch):
+    """Flask app with budgets and spending for user 1 this month"""
+    monkeypatch.chdir(tmp_path)
+    app = create_test_app()
+    app.test_client().get('/budget/')  # first request creates the schema
+    conn = sqlite3.connect('finance.db')
+    seed_progress_data(conn, ['Food', 'Travel'], datetime.now().strftime('%Y-%m'))
+    conn.close()
+    yield app
+    close_all_pools()
+
+@pytest.fixture
+def asgi_app(flask_app):
+    app = create_asgi_app(flask_app)
+    yield app
+    app.readers.close()
+
+def session_cookie(flask_app, user_id):
+    """Signed Flask session cookie for a logged-in user"""
+    serializer = flask_app.session_interface.get_signing_serializer(flask_app)
+    return f"{flask_app.config['SESSION_COOKIE_NAME']}={serializer.dumps({'_user_id': str(user_id)})}"
+
+def call(app, path, cookie=None, method='GET'):
+    """Send one request through the ASGI app and return (status, body); path is decoded, as servers pass it"""
+    headers = [(b'cookie', cookie.encode())] if cookie else []
+    scope = {'type': 'http', 'method': method, 'path': path, 'raw_path': quote(path).encode(),
+             'query_string': b'', 'headers': headers, 'http_version': '1.1',
+             'scheme': 'http', 'server': ('testserver', 80), 'client': ('127.0.0.1', 1234),
+             'root_path': ''}
+    messages = []
+
+    async def receive():
+        return {'type': 'http.request', 'body': b'', 'more_body': False}
+
+    async def send(message):
+        messages.append(message)
+
+    asyncio.run(app(scope, receive, send))
+    body = b''.join(m.get('body', b'') for m in messages if m['type'] == 'http.response.body')
+    return messages[0]['status'], body
+
+def test_async_endpoints_match_sync_routes(flask_app, asgi_app):
+    """Test that async progress, alerts and API answers match the sync views"""
+    cookie = session_cookie(flask_app, 1)
+    client = flask_app.test_client()
+    with client.session_transaction() as session:
+        session['_user_id'] = '1'
+
+    status, body = call(asgi_app, '/budget/async/api/progress/Food', cookie)
+    assert status == 200
+    assert json.loads(body) == client.get('/budget/api/progress/Food').get_json()
+
+    status, body = call(asgi_app, '/budget/async/alerts', cookie)
+    assert json.loads(body) == client.get('/budget/alerts').get_json()
+
+    status, body = call(asgi_app, '/budget/async/progress', cookie)
+    data = json.loads(body)
+    assert [p['category'] for p in data['progress']] == ['Food', 'Travel']
+    assert data['stats']['total_spent'] == 150.00
+
+    # Served from the shared progress cache after the first miss
+    assert flask_app.extensions['budget_progress_cache'].stats()['misses'] == 1
+
+def test_async_category_names_are_not_decoded_twice(flask_app, asgi_app):
+    """Test a category whose name looks percent-encoded is found as it is named"""
+    conn = sqlite3.connect('finance.db')
+    conn.execute("INSERT INTO categories (name, type) VALUES ('50%25 off', 'expense')")
+    conn.commit()
+    seed_progress_data(conn, ['50%25 off'], datetime.now().strftime('%Y-%m'))
+    conn.close()
+
+    status, body = call(asgi_app, '/budget/async/api/progress/50%25 off', session_cookie(flask_app, 1))
+    assert status == 200 and json.loads(body)['category'] == '50%25 off'
+    assert call(asgi_app, '/budget/async/api/progress/50% off', session_cookie(flask_app, 1))[0] == 404
+
+def test_async_progress_not_cached_when_write_races(flask_app, asgi_app, monkeypatch):
+    """Test progress computed while the user-month is invalidated is not stored"""
+    cache = flask_app.extensions['budget_progress_cache']
+    month = datetime.now().strftime('%Y-%m')
+    run = asgi_app.readers.run
+
+    async def racing_run(func, *args):
+        result = await run(func, *args)
+        cache.invalidate((1, month))  # a budget write lands meanwhile
+        return result
+
+    monkeypatch.setattr(asgi_app.readers, 'run', racing_run)
+    assert call(asgi_app, '/budget/async/progress', session_cookie(flask_app, 1))[0] == 200
+    assert cache.get((1, month)) is None
+    assert cache.stats()['stale_sets'] == 1
+
+def test_async_auth_errors_and_fallback(flask_app, asgi_app):
+    """Test login checks, unknown paths and that other paths reach Flask"""
+    cookie = session_cookie(flask_app, 1)
+    assert call(asgi_app, '/budget/async/alerts')[0] == 401
+    assert call(asgi_app, '/budget/async/alerts', 'session=forged')[0] == 401
+    assert call(asgi_app, '/budget/async/nope', cookie)[0] == 404
+    assert call(asgi_app, '/budget/async/api/progress/Gifts', cookie)[0] == 404
+    assert call(asgi_app, '/budget/async/alerts', cookie, method='POST')[0] == 405
+    assert call(asgi_app, '/') == (200, b'Hello, Team Paldea!')
+
+def test_reader_connections_are_read_only(asgi_app):
+    """Test that reader threads cannot write"""
+    async def write():
+        return await asgi_app.readers.run(
+            lambda conn: conn.execute("INSERT INTO budgets (user_id, category_id, amount_cents, month) "
+                                      "VALUES (2, 1, 1, '2025-01')"))
+
+    with pytest.raises(sqlite3.OperationalError):
+        asyncio.run(write())
+
+def test_async_users_come_from_the_flask_login_loader(flask_app, asgi_app):
+    """Test a user the app's user loader no longer returns (deleted or disabled) is refused"""
+    from app import User
+    disabled = {2}
+    flask_app.login_manager.user_loader(lambda user_id: None if int(user_id) in disabled else User(int(user_id)))
+
+    assert call(asgi_app, '/budget/async/alerts', session_cookie(flask_app, 1))[0] == 200
+    assert call(asgi_app, '/budget/async/alerts', session_cookie(flask_app, 2))[0] == 401
+    client = flask_app.test_client()
+    with client.session_transaction() as session:
+        session['_user_id'] = '2'
+    assert client.get('/budget/alerts').status_code == 302  # the WSGI app agrees
+
+def test_lifespan_startup_migrates_the_schema(tmp_path, monkeypatch):
+    """Test the schema is created at startup, before any request reaches Flask"""
+    monkeypatch.chdir(tmp_path)
+    app = create_asgi_app(create_test_app())
+    events = iter([{'type': 'lifespan.startup'}, {'type': 'lifespan.shutdown'}])
+    sent = []
+
+    async def receive():
+        return next(events)
+
+    async def send(message):
+        sent.append(message['type'])
+        if message['type'] == 'lifespan.startup.complete':
+            conn = sqlite3.connect('finance.db')
+            assert conn.execute('PRAGMA user_version').fetchone()[0] == SCHEMA_VERSION
+            conn.close()
+
+    asyncio.run(app({'type': 'lifespan'}, receive, send))
+    assert sent == ['lifespan.startup.complete', 'lifespan.shutdown.complete']
+    close_all_pools()
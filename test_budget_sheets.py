@@ -0,0 +1,109 @@
+# test_budget_sheets.py - Tests for bulk budget upserts and copy-forward
+# Course: IST 303 Fall 2025
+
+import sqlite3
+
+import pytest
+
+from budget_sheets import validate_budget_row, upsert_budgets, copy_budgets
+from categories import ensure_category_ids
+from conftest import create_test_app
+
+@pytest.fixture
+def auth_client(conn):
+    """Client logged in as user 1 against a fresh finance.db"""
+    client = create_test_app().test_client()
+    with conn:
+        ensure_category_ids(conn, [f'Category {c}' for c in range(30)])
+    with client.session_transaction() as session:
+        session['_user_id'] = '1'
+    return client
+
+def budgets(conn, user_id=1):
+    return conn.execute('''
+        SELECT c.name, b.month, b.amount_cents FROM budgets b
+        JOIN categories c ON c.id = b.category_id
+        WHERE b.user_id = ? ORDER BY b.month, c.name
+    ''', (user_id,)).fetchall()
+
+def test_validate_budget_row():
+    """Test sheet row validation"""
+    assert validate_budget_row({'category': ' Food ', 'month': '2025-01', 'amount': '300.005'}) == \
+        ('Food', '2025-01', 30001)
+    for row in [{'category': '', 'month': '2025-01', 'amount': 5},
+                {'category': 'Food', 'month': '2025-13', 'amount': 5},
+                {'category': 'Food', 'month': '2025-1', 'amount': 5},
+                {'category': 'Food', 'month': '25-01', 'amount': 5},
+                {'category': 'Food', 'month': '2025-01', 'amount': 'abc'},
+                {'category': 'Food', 'month': '2025-01', 'amount': '1e30'},
+                {'category': 'Food', 'month': '2025-01', 'amount': 0},
+                'Food']:
+        with pytest.raises(ValueError):
+            validate_budget_row(row)
+
+def test_upsert_and_copy_forward(conn):
+    """Test upserts replace amounts in place and copy-forward keeps or overwrites existing budgets"""
+    assert upsert_budgets(conn, 1, [('Food', '2025-01', 30000), ('Rent', '2025-01', 120000),
+                                    ('Food', '2025-03', 25000)]) == ['2025-01', '2025-03']
+    upsert_budgets(conn, 1, [('Food', '2025-01', 35000)])
+    upsert_budgets(conn, 2, [('Food', '2025-01', 100)])
+    assert budgets(conn)[:2] == [('Food', '2025-01', 35000), ('Rent', '2025-01', 120000)]
+    assert conn.execute('SELECT COUNT(*) FROM budgets').fetchone()[0] == 4
+
+    # March's Food budget is kept; only the missing cells are filled
+    assert copy_budgets(conn, 1, '2025-01', ['2025-01', '2025-02', '2025-03']) == 3
+    assert budgets(conn)[2:] == [('Food', '2025-02', 35000), ('Rent', '2025-02', 120000),
+                                 ('Food', '2025-03', 25000), ('Rent', '2025-03', 120000)]
+
+    assert copy_budgets(conn, 1, '2025-01', ['2025-03'], overwrite=True) == 2
+    assert budgets(conn)[4] == ('Food', '2025-03', 35000)
+    assert budgets(conn, 2) == [('Food', '2025-01', 100)]
+
+    # Unknown categories are not created; nothing in the sheet is written
+    with pytest.raises(ValueError, match='unknown categories: Travel'):
+        upsert_budgets(conn, 1, [('Food', '2025-04', 100), ('Travel', '2025-04', 100)])
+    assert conn.execute("SELECT COUNT(*) FROM budgets WHERE month = '2025-04'").fetchone()[0] == 0
+    assert conn.execute("SELECT COUNT(*) FROM categories WHERE name = 'Travel'").fetchone()[0] == 0
+
+def test_budget_sheet_endpoints(auth_client):
+    """Test the bulk sheet, copy-forward and single-form paths all upsert"""
+    sheet = [{'category': f'Category {c}', 'month': f'2025-{m:02d}', 'amount': 100 + c}
+             for m in range(1, 13) for c in range(30)]
+    response = auth_client.post('/budget/api/budgets', json={'budgets': sheet})
+    assert response.status_code == 200
+    assert response.get_json()['written'] == 360
+    assert len(response.get_json()['months']) == 12
+
+    # One bad row rejects the whole sheet
+    bad = auth_client.post('/budget/api/budgets', json={'budgets': [
+        {'category': 'Food', 'month': '2026-01', 'amount': 10},
+        {'category': 'Food', 'month': '2026-01', 'amount': -1}]})
+    assert bad.status_code == 400
+    assert bad.get_json()['errors'] == [{'row': 1, 'error': 'amount must be greater than 0'}]
+    assert auth_client.post('/budget/api/budgets', json={}).status_code == 400
+    for body in ([1, 2], 'budgets', 3):
+        response = auth_client.post('/budget/api/budgets', json=body)
+        assert response.status_code == 400 and 'error' in response.get_json()
+        response = auth_client.post('/budget/api/budgets/copy', json=body)
+        assert response.status_code == 400 and 'error' in response.get_json()
+    unknown = auth_client.post('/budget/api/budgets', json={'budgets': [
+        {'category': 'Food', 'month': '2026-01', 'amount': 10},
+        {'category': 'Nope', 'month': '2026-01', 'amount': 10}]})
+    assert unknown.status_code == 400
+    assert unknown.get_json()['errors'] == [{'row': 1, 'error': 'unknown category: Nope'}]
+
+    copied = auth_client.post('/budget/api/budgets/copy', json={'from': '2025-12', 'to': '2026-01..2026-06'})
+    assert copied.get_json() == {'copied': 180, 'months': [f'2026-{m:02d}' for m in range(1, 7)]}
+    assert auth_client.post('/budget/api/budgets/copy', json={'from': '2025-12'}).status_code == 400
+    assert auth_client.post('/budget/api/budgets/copy', json={'from': 'Dec', 'to': '2026-01'}).status_code == 400
+    assert auth_client.post('/budget/api/budgets/copy', json={'from': '2025-1', 'to': '2026-01'}).status_code == 400
+
+    # The form path updates in place too
+    auth_client.post('/budget/set', data={'category': 'Category 0', 'amount': '42', 'month': '2025-01'})
+    conn = sqlite3.connect('finance.db')
+    assert conn.execute('SELECT COUNT(*) FROM budgets').fetchone()[0] == 540
+    assert conn.execute("""
+        SELECT amount_cents FROM budgets b JOIN categories c ON c.id = b.category_id
+        WHERE c.name = 'Category 0' AND b.month = '2025-01'
+    """).fetchone() == (4200,)
+    conn.close()
@@ -0,0 +1,79 @@
+# test_budget_summaries.py - Tests for batch budget summaries and their snapshot table
+# Course: IST 303 Fall 2025
+
+import sqlite3
+
+import budget_summaries
+import migrations
+from budget_routes import get_budget_summary
+from budget_sheets import upsert_budgets, copy_budgets
+from budget_summaries import load_budget_summaries, verify_summaries
+from db import close_all_pools
+from migrations import migrate
+from test_migrations import LEGACY_SCHEMA
+
+def snapshot(conn):
+    return conn.execute('''
+        SELECT user_id, month, budget_count, total_cents, min_cents, max_cents
+        FROM budget_month_summary ORDER BY user_id, month
+    ''').fetchall()
+
+def test_triggers_keep_snapshot_current(conn):
+    """Test inserts, upserts, moves and deletes recompute the affected user-months"""
+    upsert_budgets(conn, 1, [('Food', '2025-10', 30000), ('Rent', '2025-10', 90000)])
+    upsert_budgets(conn, 2, [('Food', '2025-10', 10000)])
+    copy_budgets(conn, 1, '2025-10', ['2025-11'])
+    assert snapshot(conn) == [(1, '2025-10', 2, 120000, 30000, 90000),
+                              (1, '2025-11', 2, 120000, 30000, 90000),
+                              (2, '2025-10', 1, 10000, 10000, 10000)]
+
+    with conn:
+        upsert_budgets(conn, 1, [('Food', '2025-10', 50000)])
+        conn.execute("UPDATE budgets SET month = '2025-12' WHERE user_id = 2")
+        conn.execute("DELETE FROM budgets WHERE user_id = 1 AND month = '2025-11'")
+        conn.execute("INSERT OR REPLACE INTO budgets (user_id, category_id, amount_cents, month) "
+                     "VALUES (1, (SELECT id FROM categories WHERE name = 'Rent'), 1000, '2025-10')")
+    assert snapshot(conn) == [(1, '2025-10', 2, 51000, 1000, 50000),
+                              (2, '2025-12', 1, 10000, 10000, 10000)]
+    assert verify_summaries(conn) == []
+
+def test_batch_summaries_match_per_user_summary(conn):
+    """Test one batch query returns what get_budget_summary returns user by user"""
+    for user_id in range(1, 6):
+        upsert_budgets(conn, user_id, [('Food', month, 1000 * user_id + 1) for month in ('2025-10', '2025-11')]
+                       + [('Rent', '2025-10', 333)])
+
+    batch = load_budget_summaries(conn, ['2025-10', '2025-11'])
+    assert len(batch) == 10
+    assert batch == load_budget_summaries(conn, ['2025-10', '2025-11'], from_snapshot=False)
+    for (user_id, month), summary in batch.items():
+        assert summary == get_budget_summary(user_id, month)
+    assert batch[(2, '2025-10')] == {'total_categories': 2, 'total_budget': 23.34, 'min_budget': 3.33,
+                                     'max_budget': 20.01, 'avg_budget': 11.67}
+
+    assert list(load_budget_summaries(conn, ['2025-11'], [4, 5, 99])) == [(4, '2025-11'), (5, '2025-11')]
+    assert load_budget_summaries(conn, ['2025-12']) == {}
+    assert get_budget_summary(99, '2025-10') == {'total_categories': 0, 'total_budget': None,
+                                                 'min_budget': None, 'max_budget': None, 'avg_budget': None}
+    close_all_pools()
+
+def test_migration_backfills_and_cli_repairs_drift(tmp_path, monkeypatch, capsys):
+    """Test the migration summarizes existing budgets and rebuild fixes a drifted snapshot"""
+    monkeypatch.setattr(migrations, 'BATCH_PAUSE', 0)
+    monkeypatch.setattr(migrations, 'ROLLUP_BATCH_USERS', 2)
+    database = str(tmp_path / 'legacy.db')
+    conn = sqlite3.connect(database)
+    conn.executescript(LEGACY_SCHEMA)
+    conn.executemany("INSERT INTO budgets (user_id, category, amount, month) VALUES (?, ?, ?, '2025-10')",
+                     [(user_id, category, 10.5 * user_id) for user_id in range(1, 6) for category in ('Food', 'Rent')])
+    conn.commit()
+    migrate(conn, report=None)
+    assert [row[:4] for row in snapshot(conn)] == [(user_id, '2025-10', 2, 2100 * user_id) for user_id in range(1, 6)]
+
+    conn.execute('UPDATE budget_month_summary SET total_cents = 0 WHERE user_id = 3')
+    conn.commit()
+    assert budget_summaries.main(['verify', '--database', database]) == 1
+    assert budget_summaries.main(['rebuild', '--database', database]) == 0
+    assert verify_summaries(conn) == []
+    assert '❌ user 3 2025-10' in capsys.readouterr().out
+    conn.close()
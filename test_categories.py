@@ -0,0 +1,143 @@
+# test_categories.py - Tests for category ids and the category cache
+# Course: IST 303 Fall 2025
+
+import sqlite3
+
+import pytest
+
+import migrations
+from budget_routes import init_budget_tables
+from categories import CategoryCache, ensure_category_ids, load_categories
+from db import close_all_pools
+from migrations import migrate, version_of, add_archive_state, DEFAULT_CATEGORIES
+from conftest import create_test_app
+from test_migrations import LEGACY_SCHEMA
+
+@pytest.fixture
+def conn(conn):
+    # A known set of categories instead of the seeded defaults
+    conn.execute('DELETE FROM categories')
+    conn.execute("DELETE FROM sqlite_sequence WHERE name = 'categories'")
+    conn.execute("INSERT INTO categories (name, icon, type) VALUES ('Food', '🍔', 'expense'), "
+                 "('Salary', '💰', 'income'), ('Gifts', '🎁', 'both')")
+    conn.commit()
+    return conn
+
+class FakeClock:
+    def __init__(self):
+        self.now = 0.0
+
+    def __call__(self):
+        return self.now
+
+def test_ensure_category_ids(conn):
+    """Test existing names keep their id and new ones are created once"""
+    ids = ensure_category_ids(conn, ['Food', 'Travel', 'Travel'])
+    assert ids['Food'] == 1
+    assert ensure_category_ids(conn, ['Travel']) == {'Travel': ids['Travel']}
+    assert ensure_category_ids(conn, []) == {}
+    assert [c['name'] for c in load_categories(conn)] == ['Food', 'Gifts', 'Salary', 'Travel']
+
+def test_category_cache_reloads_on_version_invalidate_and_ttl(conn):
+    """Test the cache serves lookups from memory and reloads only when it has to"""
+    clock = FakeClock()
+    cache = CategoryCache(ttl=60, clock=clock)
+    assert [c['name'] for c in cache.all(conn, 'expense')] == ['Food', 'Gifts']
+    assert cache.get(conn, 2)['icon'] == '💰'
+    assert cache.ids_for(conn, ['Food', 'Salary']) == {'Food': 1, 'Salary': 2}
+    assert cache.stats()['loads'] == 1
+
+    # Unknown names and ids are answered from memory while the version stands
+    assert cache.ids_for(conn, ['Nope'], create=False) == {}
+    assert cache.ids_for(conn, ['Nope', 'Food'], create=False) == {'Food': 1}
+    assert cache.get(conn, 99) is None
+    assert cache.stats()['loads'] == 1
+
+    # Any writer's insert or edit bumps the version, which forces one reload
+    conn.execute("INSERT INTO categories (name, type) VALUES ('Rent', 'expense')")
+    conn.commit()
+    assert cache.ids_for(conn, ['Rent'], create=False) == {'Rent': 4}
+    conn.execute("UPDATE categories SET icon = '🥗' WHERE name = 'Food'")
+    conn.commit()
+    assert cache.get(conn, 1)['icon'] == '🥗'
+    assert cache.stats()['loads'] == 3
+
+    # invalidate() and the TTL also reload
+    cache.invalidate()
+    assert cache.get(conn, 1)['icon'] == '🥗'
+    clock.now = 61
+    assert cache.get(conn, 1)['icon'] == '🥗'
+    assert cache.stats() == {'categories': 4, 'loads': 5, 'ttl': 60}
+
+    # Unknown names are only created when asked, in the caller's transaction
+    assert cache.ids_for(conn, ['Travel']) == {}
+    new = cache.ids_for(conn, ['Travel'], create=True)['Travel']
+    conn.commit()
+    assert cache.get(conn, new)['name'] == 'Travel'
+
+def test_migration_infers_category_types(tmp_path, monkeypatch):
+    """Test names used for income and expenses become 'both' categories"""
+    monkeypatch.setattr(migrations, 'BATCH_PAUSE', 0)
+    conn = sqlite3.connect(tmp_path / 'legacy.db')
+    conn.executescript(LEGACY_SCHEMA)
+    conn.executemany("INSERT INTO transactions (user_id, amount, category, date, type) VALUES (1, 5, ?, '2025-10-01', ?)",
+                     [('Food', 'expense'), ('Salary', 'income'), ('Refunds', 'income'), ('Refunds', 'expense')])
+    conn.execute("INSERT INTO budgets (user_id, category, amount, month) VALUES (1, 'Rent', 900, '2025-10')")
+    conn.commit()
+    migrate(conn, report=None)
+
+    types = dict(conn.execute('SELECT name, type FROM categories'))
+    assert {name: types[name] for name in ('Food', 'Salary', 'Refunds', 'Rent')} == {
+        'Food': 'expense', 'Salary': 'income', 'Refunds': 'both', 'Rent': 'expense'}
+    # The defaults are added to the inferred ones
+    assert {name for name, _, _, _ in DEFAULT_CATEGORIES} <= types.keys()
+
+    # Re-running the migration on converted tables only rebuilds indexes and the rollup
+    conn.execute(f'PRAGMA user_version = {version_of(add_archive_state)}')
+    migrate(conn, report=None)
+    assert conn.execute('SELECT COUNT(*), SUM(count) FROM monthly_category_spend').fetchone() == (4, 4)
+    conn.close()
+
+def test_category_routes_use_cache(tmp_path, monkeypatch):
+    """Test budget writes and the category API resolve categories through the app's cache"""
+    monkeypatch.chdir(tmp_path)
+    app = create_test_app()
+    init_budget_tables()
+    client = app.test_client()
+    with client.session_transaction() as session:
+        session['_user_id'] = '1'
+
+    # A fresh database lists the default categories and budgets can use them
+    categories = client.get('/budget/api/categories').get_json()['categories']
+    assert {c['name'] for c in categories} == {name for name, _, _, _ in DEFAULT_CATEGORIES}
+    client.post('/budget/set', data={'category': 'Food', 'amount': '25', 'month': '2025-10'})
+    client.post('/budget/set', data={'category': 'Food', 'amount': '30', 'month': '2025-11'})
+    income = client.get('/budget/api/categories?type=income').get_json()['categories']
+    assert {c['name'] for c in income} == {'Salary', 'Freelance', 'Investment', 'Business', 'Other Income'}
+    assert client.get('/budget/api/categories?type=x').status_code == 400
+
+    # Budgets cannot create categories
+    response = client.post('/budget/set', data={'category': 'Travel', 'amount': '30', 'month': '2025-11'})
+    assert response.status_code == 302 and response.location.endswith('/budget/set')
+    with client.session_transaction() as session:
+        assert session['_flashes'][-1] == ('error', 'Unknown category: Travel')
+
+    # Categories added by the admin command show up straight away, not after the TTL
+    result = app.test_cli_runner().invoke(args=['budget', 'add-category', 'Travel'])
+    assert result.exit_code == 0 and 'Travel (id ' in result.output
+    categories = client.get('/budget/api/categories').get_json()['categories']
+    assert 'Travel' in {c['name'] for c in categories}
+    client.post('/budget/set', data={'category': 'Travel', 'amount': '30', 'month': '2025-11'})
+
+    # So do categories written by any other process
+    conn = sqlite3.connect('finance.db')
+    conn.execute("INSERT INTO categories (name, type) VALUES ('Pets', 'expense')")
+    conn.commit()
+    assert 'Pets' in {c['name'] for c in client.get('/budget/api/categories').get_json()['categories']}
+    assert conn.execute('SELECT COUNT(*) FROM categories').fetchone()[0] == len(DEFAULT_CATEGORIES) + 2
+    assert conn.execute('SELECT COUNT(*) FROM budgets').fetchone()[0] == 3
+    conn.close()
+
+    # The first load and one reload per change; the Travel miss was answered from memory
+    assert app.extensions['budget_category_cache'].stats()['loads'] == 3
+    close_all_pools()
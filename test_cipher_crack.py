@@ -0,0 +1,51 @@
+# test_cipher_crack.py - Tests for Caesar cipher cracking
+# Course: IST 303 Fall 2025
+
+import collections
+
+import pytest
+
+np = pytest.importorskip('numpy')
+
+import pe3
+from cipher_crack import (ENGLISH_FREQUENCIES, all_shifts, chi_squared, crack, crack_batch, crack_many,
+                          letter_counts, rank_shifts, text_letter_counts)
+
+PLAINTEXT = ('The budget for food and rent grows every month, and nobody tracks '
+             'the spending until the quick brown fox jumps over the lazy dog.')
+
+def naive_scores(message):
+    """Chi-squared of every shift by decoding each candidate with pe3.decode"""
+    scores = []
+    for decoded in all_shifts(message):
+        counts = collections.Counter(c for c in decoded if 'a' <= c <= 'z')
+        total = sum(counts.values())
+        scores.append(sum((counts[chr(97 + j)] - total * f) ** 2 / (total * f)
+                          for j, f in enumerate(ENGLISH_FREQUENCIES)) if total else 0.0)
+    return scores
+
+def test_vectorized_scores_match_decoding_every_shift():
+    """Test the count-rotation scores equal scoring all 26 pe3.decode candidates"""
+    messages = [pe3.encode(PLAINTEXT[i:], i)[1] + ' Жé😀' for i in range(0, 60, 7)] + ['', '42 !!']
+    expected = np.array([naive_scores(message) for message in messages])
+    assert np.allclose(chi_squared(letter_counts(messages)), expected)
+    assert (letter_counts(messages)[0] == text_letter_counts(messages[0])).all()
+    assert all_shifts('Abc')[:2] == ['abc', 'zab']
+
+def test_crack_recovers_every_shift():
+    """Test single texts, batches across workers and chunked long texts"""
+    for shift in range(26):
+        result = crack(pe3.encode(PLAINTEXT, shift)[1], workers=1)
+        assert (result['shift'], result['plaintext']) == (shift, PLAINTEXT.lower())
+    assert rank_shifts(pe3.encode(PLAINTEXT, 3)[1])[0][0] == 3
+
+    messages = [pe3.encode(PLAINTEXT, shift)[1] for shift in range(26)] + ['']
+    results = crack_batch(messages)
+    assert [r['shift'] for r in results] == list(range(26)) + [0]
+    assert results[-1] == {'shift': 0, 'score': 0.0, 'plaintext': ''}
+    assert crack_many(messages, workers=2, batch_messages=5) == results
+    assert 'plaintext' not in crack_many(messages, workers=1, plaintext=False)[0]
+
+    long_text = pe3.encode(PLAINTEXT * 200, 17)[1]
+    assert crack(long_text, workers=2, chunk_chars=5000) == crack(long_text, workers=1)
+    assert crack(long_text, workers=1)['shift'] == 17
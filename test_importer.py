@@ -0,0 +1,160 @@
+# test_importer.py - Tests for the bulk transaction importer
+# Course: IST 303 Fall 2025
+
+import io
+import json
+import sqlite3
+
+import pytest
+
+from db import get_pool
+from importer import import_file, validate_record
+from conftest import create_test_app
+
+@pytest.fixture(autouse=True)
+def isolated_db(conn):
+    """Run every test against its own finance.db in a temporary directory"""
+
+def write_csv(path, rows):
+    """Write an export file with a header and the given rows"""
+    with open(path, 'w') as f:
+        f.write('date,amount,category,type,description\n')
+        for row in rows:
+            f.write(','.join(row) + '\n')
+
+def test_validate_record():
+    """Test row validation, including the income/expense CHECK constraint"""
+    assert validate_record({'date': '2025-10-01', 'amount': '12.345', 'category': ' Food ',
+                            'type': 'Expense'}, user_id=1) == \
+        (1, 1235, 'Food', None, '2025-10-01', 'expense')
+    
+    bad_rows = [
+        {'date': '2025-10-01', 'amount': '5', 'category': 'Food', 'type': 'transfer'},
+        {'date': '2025-10-01', 'amount': '-5', 'category': 'Food', 'type': 'expense'},
+        {'date': '10/01/2025', 'amount': '5', 'category': 'Food', 'type': 'expense'},
+        {'date': '2025-10-01', 'amount': 'abc', 'category': 'Food', 'type': 'expense'},
+        {'date': '2025-10-01', 'amount': '1e30', 'category': 'Food', 'type': 'expense'},
+        {'date': '2025-10-01', 'amount': '5', 'category': '', 'type': 'expense'},
+        {'date': '2025-10-01', 'amount': '5', 'category': 'Food', 'type': 'expense', 'description': {'a': 1}},
+        {'date': '2025-10-01', 'amount': '5', 'category': 'Food', 'type': 'expense', 'description': ['a']},
+        None,
+    ]
+    for row in bad_rows:
+        with pytest.raises(ValueError):
+            validate_record(row, user_id=1)
+    
+    with pytest.raises(ValueError):
+        validate_record({'date': '2025-10-01', 'amount': '5', 'category': 'Food', 'type': 'expense'})
+
+def test_import_csv_in_chunks_and_resume():
+    """Test chunked import, rejects, and resuming after an interruption"""
+    rows = [('2025-10-%02d' % (i % 28 + 1), '10.00', 'Food', 'expense', f'row {i}') for i in range(25)]
+    rows.insert(5, ('2025-10-01', '10.00', 'Food', 'refund', 'bad type'))
+    rows.insert(15, ('2025-10-01', '1e30', 'Food', 'expense', 'too large'))
+    write_csv('export.csv', rows)
+    conn = get_pool('finance.db').acquire()
+    
+    class Interrupted(Exception):
+        pass
+    
+    def interrupt_after_first_chunk(result):
+        raise Interrupted()
+    
+    with pytest.raises(Interrupted):
+        import_file(conn, 'export.csv', user_id=1, chunk_size=10, on_chunk=interrupt_after_first_chunk)
+    assert conn.execute('SELECT COUNT(*) FROM transactions').fetchone()[0] == 10
+    
+    result = import_file(conn, 'export.csv', user_id=1, chunk_size=10)
+    assert result.skipped == 11  # 10 imported + 1 rejected before the checkpoint
+    assert result.imported == 15
+    assert result.rejected == 1
+    assert result.errors[0][1] == 'amount is out of range'
+    assert tuple(conn.execute('SELECT COUNT(*), SUM(amount_cents) FROM transactions').fetchone()) == (25, 25000)
+    
+    # Rollup stays in step with bulk inserts
+    assert tuple(conn.execute('SELECT total_cents, count FROM monthly_category_spend').fetchone()) == (25000, 25)
+    
+    # A finished file is not imported twice unless resume is disabled
+    assert import_file(conn, 'export.csv', user_id=1).imported == 0
+    assert import_file(conn, 'export.csv', user_id=1, resume=False).rejected == 2
+    conn.close()
+
+def test_import_csv_with_byte_order_mark():
+    """Test a CSV saved as Excel's "CSV UTF-8" (with a BOM) imports like one without"""
+    with open('export.csv', 'w', encoding='utf-8-sig') as f:
+        f.write('date,amount,category,type,description\n2025-10-01,5.00,Food,expense,Café\n')
+    conn = get_pool('finance.db').acquire()
+    result = import_file(conn, 'export.csv', user_id=1)
+    assert (result.imported, result.rejected) == (1, 0)
+    conn.close()
+
+def test_import_unknown_categories():
+    """Test rows with an unknown category are rejected unless categories may be created"""
+    write_csv('export.csv', [('2025-10-01', '5.00', 'Food', 'expense', ''),
+                             ('2025-10-02', '7.00', 'Travel', 'expense', ''),
+                             ('2025-10-03', '9.00', 'Bonus', 'income', '')])
+    conn = get_pool('finance.db').acquire()
+    result = import_file(conn, 'export.csv', user_id=1, resume=False)
+    assert (result.imported, result.rejected) == (1, 2)
+    assert result.errors == [(2, 'unknown category: Travel'), (3, 'unknown category: Bonus')]
+    assert result.user_months == {(1, '2025-10')}
+    assert conn.execute("SELECT COUNT(*) FROM categories WHERE name IN ('Travel', 'Bonus')").fetchone()[0] == 0
+
+    result = import_file(conn, 'export.csv', user_id=1, resume=False, create_categories=True)
+    assert (result.imported, result.rejected) == (3, 0)
+    assert dict(conn.execute("SELECT name, type FROM categories WHERE name IN ('Travel', 'Bonus')")) == \
+        {'Travel': 'expense', 'Bonus': 'income'}
+    conn.close()
+
+def test_import_route_jsonl_upload():
+    """Test the upload route imports for the logged-in user and invalidates progress"""
+    app = create_test_app()
+    client = app.test_client()
+    with client.session_transaction() as session:
+        session['_user_id'] = '7'
+    
+    lines = [json.dumps({'date': '2025-10-02', 'amount': 20, 'category': 'Food', 'type': 'expense',
+                         'user_id': 1}),
+             'not json',
+             json.dumps({'date': '2025-11-02', 'amount': 5, 'category': 'Food', 'type': 'income'})]
+    data = {'file': (io.BytesIO('\n'.join(lines).encode()), 'export.jsonl')}
+    response = client.post('/budget/import', data=data, content_type='multipart/form-data')
+    
+    body = response.get_json()
+    assert response.status_code == 200
+    assert (body['imported'], body['rejected']) == (2, 1)
+    assert body['errors'][0]['row'] == 2
+    
+    conn = sqlite3.connect('finance.db')
+    assert conn.execute('SELECT DISTINCT user_id FROM transactions').fetchall() == [(7,)]
+    conn.close()
+    
+    assert client.post('/budget/import').status_code == 400
+
+def test_import_route_rejects_non_utf8_upload(monkeypatch):
+    """Test an upload in another encoding gets a 400 and imports nothing"""
+    monkeypatch.setattr('importer.DECODE_CHECK_BYTES', 3)  # split multi-byte characters across blocks
+    client = create_test_app().test_client()
+    with client.session_transaction() as session:
+        session['_user_id'] = '1'
+    text = 'date,amount,category,type,description\n2025-10-01,5.00,Food,expense,Café crème\n'
+
+    def upload(encoding, prefix=b''):
+        data = {'file': (io.BytesIO(prefix + text.encode(encoding)), 'export.csv')}
+        return client.post('/budget/import', data=data, content_type='multipart/form-data')
+
+    response = upload('latin-1')
+    assert response.status_code == 400
+    assert response.get_json() == {'error': 'file is not UTF-8 text (invalid byte at offset 70)'}
+    conn = sqlite3.connect('finance.db')
+    assert conn.execute('SELECT COUNT(*) FROM transactions').fetchone()[0] == 0
+
+    response = upload('latin-1', prefix=b'\xef\xbb\xbf')
+    assert response.get_json() == {'error': 'file is not UTF-8 text (invalid byte at offset 73)'}
+
+    # With or without the byte order mark Excel's "CSV UTF-8" adds
+    for encoding in ('utf-8', 'utf-8-sig'):
+        response = upload(encoding)
+        assert response.status_code == 200 and response.get_json()['imported'] == 1
+    assert conn.execute('SELECT description FROM transactions').fetchall() == [('Café crème',)] * 2
+    conn.close()
@@ -0,0 +1,69 @@
+# test_make_burndown.py - Tests for the burndown chart renderer
+# Course: IST 303 Fall 2025
+
+import sys
+
+import pytest
+
+pytest.importorskip('pandas')
+pytest.importorskip('matplotlib')
+
+import make_burndown
+from make_burndown import make_chart, read_series
+
+SPRINTS_CSV = '''Sprint,Day,Tasks Remaining,Bugs Open
+S1,1,10,3
+S1,2,6,2
+S2,1,12,4
+S2,2,9,1
+S2,3,2,0
+'''
+
+def test_read_series_in_chunks(tmp_path):
+    """Test every sprint x column becomes a series, whatever the chunk size"""
+    path = tmp_path / 'sprints.csv'
+    path.write_text(SPRINTS_CSV)
+    series = read_series(path, chunk_rows=2)
+    assert series == read_series(path)
+    assert series == {
+        'S1 Tasks Remaining': ([1, 2], [10, 6]),
+        'S1 Bugs Open': ([1, 2], [3, 2]),
+        'S2 Tasks Remaining': ([1, 2, 3], [12, 9, 2]),
+        'S2 Bugs Open': ([1, 2, 3], [4, 1, 0]),
+    }
+
+    path.write_text('Sprint,Day,Tasks Remaining\nA,1,5\nB,1,7\n')
+    assert read_series(path) == {'A': ([1], [5]), 'B': ([1], [7])}
+
+def test_read_series_thins_long_series(tmp_path):
+    """Test long series keep at most max_points evenly spaced points plus the last, whatever the chunk size"""
+    path = tmp_path / 'long.csv'
+    path.write_text('Day,Tasks Remaining\n' + ''.join(f'{day},{10000 - day}\n' for day in range(10001)))
+    days, values = read_series(path, chunk_rows=777, max_points=100)['Tasks Remaining']
+    assert len(days) <= 101
+    assert days[:3] == [0, 128, 256] and days[-1] == 10000 and values[-1] == 0
+    assert all(value == 10000 - day for day, value in zip(days, values))
+    assert read_series(path, chunk_rows=100000, max_points=100) == {'Tasks Remaining': (days, values)}
+
+    # Short series are untouched
+    assert read_series(path, max_points=20000)['Tasks Remaining'][0] == list(range(10001))
+
+def test_make_chart_skips_unchanged_input(tmp_path, monkeypatch):
+    """Test a chart is drawn once per distinct input and no pyplot figures are left behind"""
+    csv_path = tmp_path / 'burndown.csv'
+    csv_path.write_text('Day,Tasks Remaining\n1,15\n2,13\n3,11\n')
+    output = str(tmp_path / 'chart.png')
+
+    assert make_chart(csv_path, output) is True
+    with open(output, 'rb') as f:
+        assert f.read(8) == b'\x89PNG\r\n\x1a\n'
+    assert make_chart(csv_path, output) is False
+    assert make_chart(csv_path, output, title='Sprint 4') is True
+    assert make_chart(csv_path, output, title='Sprint 4', force=True) is True
+
+    csv_path.write_text('Day,Tasks Remaining\n1,15\n2,12\n3,11\n')
+    assert make_chart(csv_path, output, title='Sprint 4') is True
+    assert 'matplotlib.pyplot' not in sys.modules or not sys.modules['matplotlib.pyplot'].get_fignums()
+
+    monkeypatch.chdir(tmp_path)
+    assert make_burndown.main(['missing.csv']) == 1
@@ -0,0 +1,128 @@
+# test_migrations.py - Tests for the schema migration runner
+# Course: IST 303 Fall 2025
+
+import sqlite3
+
+import pytest
+
+import migrations
+from migrations import migrate, get_version, find_duplicate_indexes, SCHEMA_VERSION, DEFAULT_CATEGORIES
+from rollups import verify_rollup
+
+# The schema init_db.py used to create before migrations existed
+LEGACY_SCHEMA = '''
+    CREATE TABLE users (id INTEGER PRIMARY KEY AUTOINCREMENT, username TEXT UNIQUE NOT NULL,
+                        email TEXT UNIQUE, password_hash TEXT NOT NULL);
+    CREATE TABLE transactions (id INTEGER PRIMARY KEY AUTOINCREMENT, user_id INTEGER NOT NULL,
+                               amount DECIMAL(10, 2) NOT NULL, category TEXT NOT NULL, description TEXT,
+                               date DATE NOT NULL, type TEXT NOT NULL);
+    CREATE TABLE budgets (id INTEGER PRIMARY KEY AUTOINCREMENT, user_id INTEGER NOT NULL,
+                          category TEXT NOT NULL, amount DECIMAL(10, 2) NOT NULL, month TEXT NOT NULL,
+                          UNIQUE(user_id, category, month));
+    CREATE INDEX idx_transactions_user ON transactions (user_id);
+    CREATE INDEX idx_transactions_date ON transactions (date);
+    CREATE INDEX idx_budgets_user_month ON budgets (user_id, month);
+    CREATE INDEX idx_budget_user_month ON budgets (user_id, month);
+'''
+
+@pytest.fixture
+def legacy_db(tmp_path):
+    """A pre-migration database with data for five users"""
+    conn = sqlite3.connect(tmp_path / 'legacy.db')
+    conn.executescript(LEGACY_SCHEMA)
+    conn.executemany("INSERT INTO transactions (user_id, amount, category, date, type) VALUES (?, ?, ?, ?, 'expense')",
+                     [(user_id, 10.0 * day, 'Food', f'2025-10-{day:02d}')
+                      for user_id in range(1, 6) for day in range(1, 4)])
+    conn.execute("INSERT INTO budgets (user_id, category, amount, month) VALUES (1, 'Food', 19.99, '2025-10')")
+    conn.commit()
+    yield conn
+    conn.close()
+
+def test_migrate_new_database(tmp_path):
+    """Test that a new database is built by the migrations and stamped with the version"""
+    conn = sqlite3.connect(tmp_path / 'new.db')
+    assert migrate(conn, report=None) == SCHEMA_VERSION
+    assert get_version(conn) == SCHEMA_VERSION
+    tables = {row[0] for row in conn.execute("SELECT name FROM sqlite_master WHERE type = 'table'")}
+    assert {'users', 'transactions', 'budgets', 'categories', 'monthly_category_spend',
+            'import_checkpoints'} <= tables
+    # Users can budget against the default categories straight away
+    assert conn.execute('SELECT COUNT(*) FROM categories').fetchone()[0] == len(DEFAULT_CATEGORIES)
+
+    # Nothing left to do on a second run
+    messages = []
+    assert migrate(conn, report=messages.append) == SCHEMA_VERSION
+    assert messages == []
+    conn.close()
+
+def test_migrate_legacy_database_in_place(legacy_db, monkeypatch):
+    """Test batched rollup backfill and duplicate index removal on an existing database"""
+    assert sorted(find_duplicate_indexes(legacy_db)) == [
+        ('idx_budgets_user_month', 'idx_budget_user_month'),
+    ]
+
+    monkeypatch.setattr(migrations, 'ROLLUP_BATCH_USERS', 2)
+    monkeypatch.setattr(migrations, 'BATCH_PAUSE', 0)
+    messages = []
+    migrate(legacy_db, report=messages.append)
+
+    # users 1-2, 3-4, 5 in each of add_monthly_rollup, store_amounts_in_cents and normalize_category_ids
+    assert sum('rollup backfilled' in message for message in messages) == 9
+    assert legacy_db.execute('SELECT COUNT(*) FROM transactions').fetchone()[0] == 15
+    assert verify_rollup(legacy_db) == []
+
+    # REAL dollars became INTEGER cents, and the rollup sums them exactly
+    assert legacy_db.execute('''
+        SELECT SUM(amount_cents), MIN(typeof(amount_cents)), MAX(typeof(amount_cents)) FROM transactions
+    ''').fetchone() == (30000, 'integer', 'integer')
+    assert legacy_db.execute("SELECT total_cents FROM monthly_category_spend WHERE user_id = 1").fetchone() == (6000,)
+    assert legacy_db.execute('SELECT amount_cents FROM budgets').fetchall() == [(1999,)]
+
+    # Category names became ids into categories
+    food = legacy_db.execute("SELECT id FROM categories WHERE name = 'Food'").fetchone()[0]
+    assert legacy_db.execute('SELECT DISTINCT category_id FROM transactions').fetchall() == [(food,)]
+    assert legacy_db.execute('SELECT category_id FROM budgets').fetchall() == [(food,)]
+    assert 'category' not in migrations.table_columns(legacy_db, 'transactions')
+
+    indexes = {row[0] for row in legacy_db.execute("SELECT name FROM sqlite_master WHERE type = 'index'")}
+    assert 'idx_budgets_user_month' not in indexes
+    assert 'idx_transactions_user' not in indexes  # prefix of the covering index
+    assert {'idx_budget_user_month', 'idx_transactions_date', 'idx_transactions_covering'} <= indexes
+    assert find_duplicate_indexes(legacy_db) == []
+
+def test_failed_migration_rolls_back(tmp_path, monkeypatch):
+    """Test that a failing migration leaves the version and schema unchanged"""
+    def broken(conn):
+        """Broken migration"""
+        conn.execute('CREATE TABLE half_done (id INTEGER)')
+        raise RuntimeError('boom')
+
+    monkeypatch.setattr(migrations, 'MIGRATIONS', migrations.MIGRATIONS + [broken])
+    conn = sqlite3.connect(tmp_path / 'broken.db')
+    with pytest.raises(RuntimeError):
+        migrate(conn, target=SCHEMA_VERSION + 1, report=None)
+
+    assert get_version(conn) == SCHEMA_VERSION
+    assert conn.execute("SELECT COUNT(*) FROM sqlite_master WHERE name = 'half_done'").fetchone()[0] == 0
+    conn.close()
+
+def test_released_migrations_build_their_own_rollup(legacy_db):
+    """Test that each older migration still builds the rollup it was released with"""
+    def rollup_totals():
+        columns = migrations.table_columns(legacy_db, 'monthly_category_spend')
+        total = 'total' if 'total' in columns else 'total_cents'
+        return legacy_db.execute(f'SELECT category, SUM({total}) FROM monthly_category_spend '
+                                 'GROUP BY category').fetchall()
+
+    migrate(legacy_db, target=migrations.version_of(migrations.add_monthly_rollup), report=None)
+    assert rollup_totals() == [('Food', 300.0)]
+
+    migrate(legacy_db, target=migrations.version_of(migrations.store_amounts_in_cents), report=None)
+    assert rollup_totals() == [('Food', 30000)]
+
+    migrate(legacy_db, target=migrations.version_of(migrations.add_archive_state), report=None)
+    trigger = legacy_db.execute("SELECT sql FROM sqlite_master WHERE name = 'trg_transactions_rollup_delete'").fetchone()[0]
+    assert 'archive_state' in trigger and 'OLD.category ' in trigger
+
+    migrate(legacy_db, report=None)
+    assert verify_rollup(legacy_db) == []
@@ -0,0 +1,40 @@
+# test_money.py - Tests for the money conversion layer
+# Course: IST 303 Fall 2025
+
+from decimal import Decimal
+
+import pytest
+
+from app import create_app
+from money import MAX_CENTS, to_cents, to_dollars, format_money
+
+def test_to_cents_is_exact():
+    """Test parsing dollars into integer cents without float drift"""
+    assert to_cents('19.99') == 1999
+    assert to_cents(' 12 ') == 1200
+    assert to_cents('1.005') == 101  # half up, not float's 1.00499...
+    assert to_cents(0.1) == 10
+    assert to_cents(Decimal('2.5')) == 250
+    assert sum(to_cents('0.10') for _ in range(10)) == 100
+
+    for bad in ['', 'abc', 'nan', 'Infinity', None, float('inf')]:
+        with pytest.raises(ValueError):
+            to_cents(bad)
+
+def test_to_cents_rejects_out_of_range_amounts():
+    """Test huge amounts raise ValueError instead of decimal errors or INTEGER overflow"""
+    assert to_cents('92233720368547758.07') == MAX_CENTS
+    for bad in ['1e30', 1e30, '-1e30', '92233720368547758.08', '-92233720368547758.08']:
+        with pytest.raises(ValueError, match='out of range'):
+            to_cents(bad)
+
+def test_format_money_and_template_filter():
+    """Test dollar formatting and the `money` Jinja filter"""
+    assert to_dollars(1999) == Decimal('19.99')
+    assert format_money(123456) == '$1,234.56'
+    assert format_money(-500) == '-$5.00'
+    assert format_money(0) == '$0.00'
+
+    app = create_app({'SECRET_KEY': 'test-secret-key', 'TESTING': True})
+    with app.app_context():
+        assert app.jinja_env.from_string('{{ 2500 | money }}').render() == '$25.00'
@@ -0,0 +1,61 @@
+# test_pe3.py - Tests for the pe3 table-driven Caesar cipher
+# Course: IST 303 Fall 2025
+
+import random
+import string
+
+import pytest
+
+import pe3
+
+# ASCII, Latin-1 letters and letters beyond Latin-1 (isalpha() is true for all of them)
+CHARS = string.printable + 'éÉßÆøñÑµªÿΩωЖж中😀'
+
+def reference(text, shift):
+    """The original per-character encoding"""
+    return ''.join(pe3._shift_char_lower(c, shift) for c in text)
+
+@pytest.mark.parametrize('chars', [string.printable, string.printable + 'éÉßÆøñÑµªÿ', CHARS])
+def test_encode_decode_match_per_character_version(chars):
+    """Test every shift, including negative and > 26, gives the original output"""
+    rng = random.Random(3)
+    text = ''.join(rng.choice(chars) for _ in range(2000))
+    for shift in range(-30, 60):
+        alphabet, encoded = pe3.encode(text, shift)
+        assert alphabet == list(string.ascii_lowercase)
+        assert encoded == reference(text, shift)
+        assert pe3.decode(text, shift) == reference(text, -shift)
+    assert pe3.encode('Hello, World!', 3) == (list(string.ascii_lowercase), 'khoor, zruog!')
+    assert pe3.decode('khoor, zruog!', 3) == 'hello, world!'
+
+def test_bytes_and_array_paths():
+    """Test bytes are encoded as Latin-1 text, through bytes.translate and NumPy"""
+    data = bytes(range(256))
+    for shift in (0, 5, -1, 77):
+        expected = reference(data.decode('latin-1'), shift).encode('latin-1')
+        assert pe3.encode_bytes(data, shift) == expected
+        assert pe3.encode_bytes(bytearray(data), shift) == expected
+        assert pe3.decode_bytes(expected, shift) == reference(expected.decode('latin-1'), -shift).encode('latin-1')
+
+    np = pytest.importorskip('numpy')
+    array = pe3.encode_array(np.frombuffer(data, dtype=np.uint8), 5)
+    assert array.dtype == np.uint8 and array.tobytes() == pe3.encode_bytes(data, 5)
+    assert pe3.encode_array(data, 5).tobytes() == pe3.encode_bytes(data, 5)
+
+def test_streams_and_files(tmp_path):
+    """Test chunked encoding gives the same text whatever the chunk boundaries"""
+    text = 'Café Größe,\r\nBudget 42.50\nЖж 😀 over!\n' * 50
+    chunks = [text[i:i + 7] for i in range(0, len(text), 7)]
+    assert ''.join(pe3.encode_stream(chunks, 11)) == reference(text, 11)
+    assert ''.join(pe3.decode_stream(pe3.encode_stream(chunks, 11), 11)) == reference(text, 0)
+    assert b''.join(pe3.encode_stream([b'Ab', b'Z!'], 1)) == b'bca!'
+
+    def read(path):
+        with open(path, encoding='utf-8', newline='') as f:
+            return f.read()
+
+    (tmp_path / 'plain.txt').write_text(text, encoding='utf-8', newline='')
+    assert pe3.encode_file(tmp_path / 'plain.txt', tmp_path / 'cipher.txt', 11, chunk_size=5) == len(text)
+    assert read(tmp_path / 'cipher.txt') == reference(text, 11)
+    pe3.decode_file(tmp_path / 'cipher.txt', tmp_path / 'back.txt', 11)
+    assert read(tmp_path / 'back.txt') == reference(text, 0)  # letters lowercased, \r\n kept
@@ -0,0 +1,97 @@
+# test_progress_charts.py - Tests for the progress chart endpoint and its caching
+# Course: IST 303 Fall 2025
+
+import sqlite3
+
+import pytest
+
+pytest.importorskip('matplotlib')
+
+import progress_charts
+from categories import ensure_category_ids
+from progress_charts import data_version, render_progress_chart
+from conftest import create_test_app
+
+PNG_SIGNATURE = b'\x89PNG\r\n\x1a\n'
+
+@pytest.fixture
+def app(conn):
+    return create_test_app()
+
+@pytest.fixture
+def client(app):
+    client = app.test_client()
+    with client.session_transaction() as session:
+        session['_user_id'] = '1'
+    return client
+
+@pytest.fixture
+def renders(monkeypatch):
+    """Count chart renders done by the route"""
+    calls = []
+    def counting(*args, **kwargs):
+        calls.append(args[1])
+        return render_progress_chart(*args, **kwargs)
+    monkeypatch.setattr('budget_routes.render_progress_chart', counting)
+    return calls
+
+def test_render_progress_chart_formats():
+    """Test PNG and SVG output, with and without budgets"""
+    progress_data = [{'category': 'Food', 'budget_cents': 10000, 'spent_cents': 12500, 'spent': 125.0,
+                      'budget_amount': 100.0, 'actual_percentage': 125.0, 'color': 'danger'}]
+    assert render_progress_chart(progress_data).startswith(PNG_SIGNATURE)
+    svg = render_progress_chart(progress_data, 'svg')
+    assert b'<svg' in svg and svg == render_progress_chart(progress_data, 'svg')
+    assert render_progress_chart([]).startswith(PNG_SIGNATURE)
+
+    assert data_version(progress_data, '2025-10') != data_version(progress_data, '2025-11')
+    changed = [dict(progress_data[0], spent_cents=12600)]
+    assert data_version(progress_data, '2025-10') != data_version(changed, '2025-10')
+
+def test_category_names_are_not_math_text(app, client):
+    """Test a '$' in a category name is drawn as text instead of failing to parse as math"""
+    name = 'Gifts $\\foo{$'
+    progress_data = [{'category': name, 'budget_cents': 10000, 'spent_cents': 2500, 'spent': 25.0,
+                      'budget_amount': 100.0, 'actual_percentage': 25.0, 'color': 'success'}]
+    assert render_progress_chart(progress_data).startswith(PNG_SIGNATURE)
+    assert b'<svg' in render_progress_chart(progress_data, 'svg')
+
+    conn = sqlite3.connect('finance.db')
+    with conn:
+        ensure_category_ids(conn, [name])
+    conn.close()
+    client.post('/budget/set', data={'category': name, 'amount': '100', 'month': '2025-10'})
+    assert client.get('/budget/progress.png?month=2025-10').status_code == 200
+    assert client.get('/budget/progress.svg?month=2025-10').status_code == 200
+
+def test_progress_chart_etag_and_cache(app, client, renders):
+    """Test unchanged charts are served by 304 or from memory and writes produce a new one"""
+    response = client.get('/budget/progress.png?month=2025-10')
+    assert response.status_code == 200
+    assert response.mimetype == 'image/png'
+    assert response.data.startswith(PNG_SIGNATURE)
+    assert response.headers['Cache-Control'] == 'private, no-cache'
+    etag = response.headers['ETag']
+
+    assert client.get('/budget/progress.png?month=2025-10', headers={'If-None-Match': etag}).status_code == 304
+    assert client.get('/budget/progress.png?month=2025-10').data == response.data
+    assert renders == ['png']
+
+    svg = client.get('/budget/progress.svg?month=2025-10')
+    assert svg.mimetype == 'image/svg+xml' and svg.headers['ETag'] != etag
+    assert renders == ['png', 'svg']
+
+    # A budget write changes the data version, so the old ETag no longer matches
+    client.post('/budget/set', data={'category': 'Food', 'amount': '25', 'month': '2025-10'})
+    response = client.get('/budget/progress.png?month=2025-10', headers={'If-None-Match': etag})
+    assert response.status_code == 200 and response.headers['ETag'] != etag
+    assert renders == ['png', 'svg', 'png']
+    assert app.extensions['budget_chart_cache'].stats()['entries'] == 3
+
+    assert client.get('/budget/progress.png?month=October').status_code == 400
+    assert client.get('/budget/progress.gif').status_code == 404
+
+def test_progress_chart_requires_login(app):
+    """Test anonymous requests are redirected to the login page"""
+    assert app.test_client().get('/budget/progress.png').status_code == 302
+    assert progress_charts.CHART_FORMATS['svg'] == 'image/svg+xml'
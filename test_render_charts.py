@@ -0,0 +1,73 @@
+# test_render_charts.py - Tests for batch chart rendering
+# Course: IST 303 Fall 2025
+
+import json
+import os
+import sqlite3
+
+import pytest
+
+pytest.importorskip('pandas')
+pytest.importorskip('matplotlib')
+
+import render_charts
+from budget_sheets import upsert_budgets
+from conftest import category_id
+from render_charts import monthly_spending, render_all, spending_manifest
+
+@pytest.fixture
+def database(conn, tmp_path):
+    """finance.db where users 1 and 2 have budgets and spending in 2025"""
+    upsert_budgets(conn, 1, [('Food', '2025-01', 20000), ('Rent', '2025-01', 90000), ('Food', '2025-03', 25000)])
+    upsert_budgets(conn, 2, [('Food', '2025-02', 10000)])
+    food = category_id(conn, 'Food')
+    conn.executemany('''
+        INSERT INTO transactions (user_id, category_id, amount_cents, date, type)
+        VALUES (?, ?, ?, ?, ?)
+    ''', [(1, food, 15000, '2025-01-05', 'expense'), (1, food, 5000, '2025-01-20', 'expense'),
+          (1, food, 300000, '2025-01-31', 'income'), (2, food, 7000, '2025-02-11', 'expense')])
+    conn.commit()
+    return str(tmp_path / 'finance.db')
+
+def test_monthly_spending_fills_every_month(database):
+    """Test spending and budget totals line up month by month, zeros included"""
+    conn = sqlite3.connect(database)
+    assert monthly_spending(conn, 1, '2025-01', '2025-03') == (
+        ['2025-01', '2025-02', '2025-03'], [20000, 0, 0], [110000, 0, 25000])
+    conn.close()
+
+def test_render_all_skips_unchanged_and_reports_failures(database, tmp_path):
+    """Test a mixed manifest renders across workers, writes atomically and redraws only changed charts"""
+    (tmp_path / 'team.csv').write_text('Day,Tasks Remaining\n1,9\n2,4\n')
+    conn = sqlite3.connect(database)
+    jobs = spending_manifest(conn, '2025-01', '2025-03', str(tmp_path / 'charts'))
+    conn.close()
+    assert [job['user_id'] for job in jobs] == [1, 2]
+    jobs += [{'type': 'burndown', 'csv': str(tmp_path / 'team.csv'), 'output': str(tmp_path / 'charts' / 'team.png')},
+             {'type': 'burndown', 'csv': str(tmp_path / 'missing.csv'), 'output': str(tmp_path / 'charts' / 'x.png')},
+             {'type': 'pie', 'output': 'pie.png'}]
+
+    summary = render_all(jobs, database, workers=2)
+    assert (summary['rendered'], summary['skipped'], summary['failed']) == (3, 0, 2)
+    assert [output for output, _ in summary['errors']] == [str(tmp_path / 'charts' / 'x.png'), 'pie.png']
+    assert sorted(os.listdir(tmp_path / 'charts')) == [
+        'team.png', 'team.png.sha256', 'user-1.png', 'user-1.png.sha256', 'user-2.png', 'user-2.png.sha256']
+
+    conn = sqlite3.connect(database)
+    conn.execute("INSERT INTO transactions (user_id, category_id, amount_cents, date, type) "
+                 "VALUES (2, 1, 100, '2025-03-01', 'expense')")
+    conn.commit()
+    conn.close()
+    summary = render_all(jobs[:3], database, workers=1)
+    assert (summary['rendered'], summary['skipped'], summary['failed']) == (1, 2, 0)
+
+def test_cli_writes_manifest_and_renders(database, tmp_path, capsys):
+    """Test the spending-manifest and render commands"""
+    manifest = str(tmp_path / 'jobs.jsonl')
+    assert render_charts.main(['--database', database, 'spending-manifest', manifest,
+                               '--months', '2025-01', '2025-02', '--output-dir', str(tmp_path / 'out')]) == 0
+    with open(manifest) as f:
+        assert [json.loads(line)['user_id'] for line in f] == [1, 2]
+    assert render_charts.main(['--database', database, 'render', manifest, '--workers', '1']) == 0
+    assert '2 rendered, 0 up to date, 0 failed' in capsys.readouterr().out
+    assert render_charts.main(['render', str(tmp_path / 'nope.jsonl')]) == 1
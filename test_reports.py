@@ -0,0 +1,80 @@
+# test_reports.py - Tests for the all-user month-end reports
+# Course: IST 303 Fall 2025
+
+import csv
+import json
+import sqlite3
+
+import pytest
+
+import reports
+from budget_engine import get_progress, build_alerts
+from budget_sheets import upsert_budgets
+from categories import ensure_category_ids
+
+MONTH = '2025-10'
+
+@pytest.fixture
+def database(conn, tmp_path):
+    """finance.db with users 1-6 budgeted in MONTH (user 4 has none) and some spending"""
+    with conn:
+        ensure_category_ids(conn, ['Fun'])
+    for user_id in (1, 2, 3, 5, 6):
+        upsert_budgets(conn, user_id, [('Food', MONTH, 10000), ('Rent', MONTH, 50000), ('Fun', '2025-11', 100)])
+    ids = dict(conn.execute('SELECT name, id FROM categories'))
+    conn.executemany('''
+        INSERT INTO transactions (user_id, category_id, amount_cents, date, type)
+        VALUES (?, ?, ?, '2025-10-15', 'expense')
+    ''', [(user_id, ids['Food'], 2000 * user_id) for user_id in range(1, 7)]
+         + [(5, ids['Rent'], 45000)])
+    conn.commit()
+    return str(tmp_path / 'finance.db')
+
+def read_jsonl(path):
+    with open(path) as f:
+        return [json.loads(line) for line in f]
+
+def test_report_matches_progress_and_alerts(database, tmp_path):
+    """Test every budgeted user gets the same rows, stats and alerts as the progress page"""
+    counts = reports.generate_report(database, MONTH, str(tmp_path / 'out' / 'report.jsonl'),
+                                     workers=2, shard_users=2)
+    assert counts == {'users': 5, 'rows': 10, 'alerts': 3, 'shards': 3}
+
+    records = read_jsonl(tmp_path / 'out' / 'report.jsonl')
+    assert [record['user_id'] for record in records] == [1, 2, 3, 5, 6]
+    conn = sqlite3.connect(database)
+    for record in records:
+        progress_data = get_progress(conn, record['user_id'], MONTH)
+        assert record['progress'] == progress_data
+        assert record['alerts'] == build_alerts(progress_data)
+    conn.close()
+    assert records[-1]['stats']['categories_over_budget'] == 1
+
+    # The in-process path writes the same report
+    reports.generate_report(database, MONTH, str(tmp_path / 'serial.jsonl'), workers=1)
+    assert read_jsonl(tmp_path / 'serial.jsonl') == records
+
+def test_csv_report_has_one_row_per_category(database, tmp_path):
+    """Test the flat report carries each category's status and alert level"""
+    path = tmp_path / 'report.csv'
+    assert reports.main(['--month', MONTH, '--output', str(path), '--database', database,
+                         '--workers', '1']) == 0
+    with open(path, newline='') as f:
+        rows = list(csv.DictReader(f))
+    assert len(rows) == 10
+    assert {key: rows[8][key] for key in ('user_id', 'category', 'status', 'is_over', 'alert_level')} == \
+        {'user_id': '6', 'category': 'Food', 'status': 'Over Budget!', 'is_over': 'True', 'alert_level': 'danger'}
+    assert rows[0]['alert_level'] == ''
+
+    assert reports.generate_report(database, '2030-01', str(tmp_path / 'empty.csv'))['users'] == 0
+    assert reports.main(['--month', MONTH, '--output', str(tmp_path / 'report.txt'),
+                         '--database', database]) == 1
+
+def test_parquet_report(database, tmp_path):
+    """Test Parquet output holds the same rows as the CSV"""
+    pd = pytest.importorskip('pandas')
+    pytest.importorskip('pyarrow')
+    reports.generate_report(database, MONTH, str(tmp_path / 'report.parquet'), workers=1)
+    frame = pd.read_parquet(tmp_path / 'report.parquet')
+    assert list(frame.columns) == reports.FLAT_COLUMNS
+    assert len(frame) == 10